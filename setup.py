@@ -1,5 +1,6 @@
 
 import setuptools
+from setuptools.command.build_py import build_py
 import os
 
 with open("README.md", "r") as fh:
@@ -13,6 +14,19 @@ def get_version():
                 return eval(line.split('=')[-1])
 
 
+class BuildPyWithImageBundle(build_py):
+    '''
+    packages src/images with all png in one file, see src/view/util/ImageBundle.py
+    '''
+
+    def run(self):
+        build_py.run(self)
+        from src.view.util.ImageBundle import writeBundle
+        imagePath = os.path.join(self.build_lib, 'src', 'images')
+        if os.path.isdir(imagePath):
+            writeBundle(imagePath, release=True)
+
+
 setuptools.setup(
     name="sql_editor",
     version=get_version(),
@@ -30,6 +44,10 @@ setuptools.setup(
         'wxpython==4.0.6',
         'sqlparse'
     ],
+    extras_require={
+        # parquet export and zstd compression of exports
+        'export': ['pyarrow', 'zstandard'],
+    },
     python_requires='>=3',
     entry_points={
         'console_scripts': [
@@ -49,6 +67,7 @@ setuptools.setup(
     ],
     package_data={'src.images': ['*.png'], 'src.view.util.styles':['*.ess'], 'src.bin':['*.dll', '*.exe']},
     include_package_data=True,
+    cmdclass={'build_py': BuildPyWithImageBundle},
 
     zip_safe=False,
 )
@@ -1,9 +1,20 @@
 # -*- mode: python -*-
 import os
+import sys
+
+# spec is run from the repository root
+sys.path.insert(0, os.path.abspath('.'))
+from src.view.util.ImageBundle import IMAGE_BUNDLE_NAME, writeBundle
 
 block_cipher = None
 
+# all png in one file, read at start instead of each png
+os.makedirs('build', exist_ok=True)
+imageBundle = os.path.join('build', IMAGE_BUNDLE_NAME)
+writeBundle(os.path.join('src','images'), imageBundle, release=True)
+
 filelist= [(os.path.join('src','images',file), "src\images") for file in os.listdir(os.path.join('src','images')) if file.endswith('.png')]
+filelist.append((imageBundle, "src\images"))
 
 a = Analysis(['src\\TheEclipse.py'],
              pathex=['c:\\1\\sql_editor'],
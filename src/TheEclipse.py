@@ -1,4 +1,5 @@
 import logging.config
+import multiprocessing
 
 from src.view.constants import LOG_SETTINGS
 from src.view.EditorSplash import MyApp
@@ -9,6 +10,10 @@ logging.config.dictConfig(LOG_SETTINGS)
 
 
 def main():
+    # book ingest worker processes of a frozen build
+    multiprocessing.freeze_support()
+    # workers start a fresh interpreter, forking the GUI process is not safe
+    multiprocessing.set_start_method('spawn')
     app = MyApp(False)
     app.MainLoop()
 
@@ -15,6 +15,7 @@ from src.dao.Author import Author
 from src.dao.AuthorBookLink import AuthorBookLink
 import json
 from src.dao.Book import Base, Book
+from src.dao.BookSearchIndex import BookSearchIndex
 # from src.dao.Book import engine
 import shutil
 import traceback
@@ -47,18 +48,24 @@ class CreateDatabase():
         self.engine = create_engine(databaseFilePath , echo=True, connect_args={'check_same_thread': False})
         Session = sessionmaker(autoflush=True, autocommit=False, bind=self.engine)
         self.session = Session()
+        self.searchIndex = BookSearchIndex(self.engine)
         
         os.makedirs(libraryPath, exist_ok=True)
         if not isDatabaseExist:
 #             os.mkdir(libraryPath)
             self.creatingDatabase()
+        else:
+            # libraries created before the search index
+            self.searchIndex.create()
         os.chdir(libraryPath)
 
     def creatingDatabase(self):
         logger.debug('creatingDatabase')
         os.chdir(self.libraryPath)
+        self.searchIndex.drop()
         Base.metadata.drop_all(self.engine)
         Base.metadata.create_all(self.engine)
+        self.searchIndex.create()
         logger.debug('database created blank')
 
     def addSingleBookData(self, dirName):
@@ -152,7 +159,7 @@ class CreateDatabase():
                     author = Author()
                     for aKey in a:
                         author.__dict__[aKey] = a[aKey]
-                        authorList.append(author)
+                    authorList.append(author)
                 book.authors = authorList
         return book
     
@@ -195,6 +202,18 @@ class CreateDatabase():
             self.session.rollback()
             raise
 
+    def saveBooks(self, books=None):
+        '''
+        Saves books in one transaction.
+        '''
+        self.session.add_all(books)
+        try:
+            self.session.commit()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            self.session.rollback()
+            raise
+
     def countAllBooks(self):
         logger.debug('countAllBooks')
         bookCount = 0
@@ -311,6 +330,30 @@ class CreateDatabase():
         except Exception as e:
             logger.error(e, exc_info=True)
 
+    def findBySearchText(self, searchText=None, limit=50, offset=0):
+        '''
+        Ranked full text search of book name, authors, tag, publisher and isbn.
+        Words match as prefixes, "quoted words" as a phrase. Each book gets
+        searchSnippet, the matching text with matches in brackets.
+        '''
+        logger.debug('findBySearchText searchText: %s', searchText)
+        if not self.searchIndex.available:
+            return self.findBySimlarBookName(bookName=searchText, limit=limit, offset=offset)
+        books = list()
+        count = 0
+        try:
+            rows, count = self.searchIndex.search(self.session, searchText=searchText, limit=limit, offset=offset)
+            if rows:
+                booksById = {book.id: book for book in self.session.query(Book).filter(Book.id.in_([bookId for bookId, snippet in rows]))}
+                for bookId, snippet in rows:
+                    book = booksById.get(bookId)
+                    if book:
+                        book.searchSnippet = snippet
+                        books.append(book)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        return books, count
+
     def findByIsbn_13Name(self, isbn_13=None):
         logger.debug('findBySimlarBookName isbn_13: %s', isbn_13)
         if isbn_13:
@@ -330,6 +373,10 @@ class CreateDatabase():
             books = query.all()
             return books
         
+    def findAllBookFileNames(self):
+        logger.debug('findAllBookFileNames')
+        return [bookFileName for bookFileName, in self.session.query(Book.bookFileName)]
+
     def findBook(self, book=None):
         '''
         This method will find the book in database . It will return true.If book present.
@@ -0,0 +1,253 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import math
+import threading
+from sqlalchemy import event, func
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from src.dao.Book import Book
+from src.dao.BookDao import CreateDatabase
+
+import logging
+
+logger = logging.getLogger('extensive')
+
+
+class BookPagination():
+    '''
+    Pages of the book library for the book browser.
+
+    Without search text pages are read by keyset on Book.id: next and
+    previous page continue after the last or before the first id of the
+    current page, first and last page read the ends of the id index. Each
+    reads page size rows whatever the library size. Going to a page number
+    seeks its first id on the id index. Search results are in rank order and
+    paged by offset within the matches.
+
+    Counts are cached per library and search text until a book is inserted,
+    updated or deleted in this process. Pages next to the current one are
+    read on a background thread with their own session, moving to them does
+    not query the database.
+
+    @param libraryPath: library folder
+    @param pageSize: number of books on a page
+    '''
+
+    lock = threading.Lock()
+    # changed on every insert, update or delete of a book, see invalidate
+    generation = 0
+    counts = dict()
+
+    def __init__(self, libraryPath=None, pageSize=10):
+        self.libraryPath = libraryPath
+        self.pageSize = pageSize
+        self.searchText = None
+        self.createDatabase = CreateDatabase(libraryPath=libraryPath)
+        self.session = self.createDatabase.session
+        self.Session = sessionmaker(bind=self.createDatabase.engine)
+        self.currentPage = 0
+        self.books = list()
+        # (page number, state) to books read ahead
+        self.adjacentPages = dict()
+
+    @classmethod
+    def invalidate(cls):
+        with cls.lock:
+            cls.generation += 1
+            cls.counts.clear()
+
+    def setQuery(self, searchText=None, pageSize=None):
+        '''
+        other search text or page size starts at the first page.
+        '''
+        searchText = searchText or None
+        pageSize = pageSize or self.pageSize
+        if searchText != self.searchText or pageSize != self.pageSize:
+            self.searchText = searchText
+            self.pageSize = pageSize
+            self.currentPage = 0
+            self.books = list()
+            self.adjacentPages.clear()
+
+    def getState(self):
+        return (self.searchText, self.pageSize, BookPagination.generation)
+
+    def getCachedCount(self, searchText=None, countQuery=None):
+        key = (self.libraryPath, searchText)
+        with BookPagination.lock:
+            generation = BookPagination.generation
+            count = BookPagination.counts.get(key)
+        if count is None:
+            count = countQuery()
+            with BookPagination.lock:
+                if generation == BookPagination.generation:
+                    BookPagination.counts[key] = count
+        return count
+
+    def getCount(self):
+        '''
+        @return: number of books matching search text, all books without search text
+        '''
+        if not self.searchText:
+            return self.getTotalCount()
+        if not self.createDatabase.searchIndex.available:
+            return self.getCachedCount(self.searchText, lambda: (self.createDatabase.findBySimlarBookName(bookName=self.searchText, limit=1) or (list(), 0))[1])
+        return self.getCachedCount(self.searchText, lambda: self.createDatabase.searchIndex.count(self.session, self.searchText))
+
+    def getTotalCount(self):
+        return self.getCachedCount(None, lambda: self.session.query(func.count(Book.id)).scalar())
+
+    def getPages(self):
+        return max(1, math.ceil(self.getCount() / self.pageSize))
+
+    def firstPage(self):
+        return self.showPage(0, lambda session: self.readFirst(session))
+
+    def lastPage(self):
+        return self.showPage(self.getPages() - 1, lambda session: self.readLast(session))
+
+    def nextPage(self):
+        if self.currentPage + 1 >= self.getPages():
+            return self.books
+        if self.books and not self.searchText:
+            lastId = self.books[-1].id
+            return self.showPage(self.currentPage + 1, lambda session: self.readAfter(session, lastId))
+        return self.gotoPage(self.currentPage + 1)
+
+    def previousPage(self):
+        if self.currentPage == 0:
+            return self.books
+        if self.books and not self.searchText:
+            firstId = self.books[0].id
+            return self.showPage(self.currentPage - 1, lambda session: self.readBefore(session, firstId))
+        return self.gotoPage(self.currentPage - 1)
+
+    def gotoPage(self, pageNumber=0):
+        pageNumber = min(max(pageNumber, 0), self.getPages() - 1)
+        return self.showPage(pageNumber, lambda session: self.readPage(session, pageNumber))
+
+    def reload(self):
+        '''
+        read current page again, after books were changed.
+        '''
+        self.adjacentPages.clear()
+        return self.gotoPage(self.currentPage)
+
+    def showPage(self, pageNumber=0, readPage=None):
+        '''
+        page read ahead by prefetchAdjacentPages, else read now.
+        @return: books of the page
+        '''
+        books = self.adjacentPages.get((pageNumber, self.getState()))
+        if books is None:
+            books = readPage(self.session)
+        else:
+            # attach books read by the background session, lazy loads keep working
+            books = [self.mergeBook(book) for book in books]
+        self.adjacentPages.clear()
+        self.currentPage = pageNumber
+        self.books = books
+        return books
+
+    def mergeBook(self, book=None):
+        searchSnippet = getattr(book, 'searchSnippet', None)
+        book = self.session.merge(book, load=False)
+        if searchSnippet:
+            book.searchSnippet = searchSnippet
+        return book
+
+    def prefetchAdjacentPages(self, onPrefetch=None):
+        '''
+        read next and previous page on a background thread.
+        @param onPrefetch: callable(books) called on the background thread for each page read
+        '''
+        if not self.books or (self.searchText and not self.createDatabase.searchIndex.available):
+            # LIKE search reads with the session of the page
+            return
+        state = self.getState()
+        pages = list()
+        nextPage, previousPage = self.currentPage + 1, self.currentPage - 1
+        lastId, firstId = self.books[-1].id, self.books[0].id
+        if nextPage < self.getPages():
+            if self.searchText:
+                pages.append((nextPage, lambda session: self.readPage(session, nextPage)))
+            else:
+                pages.append((nextPage, lambda session: self.readAfter(session, lastId)))
+        if previousPage >= 0:
+            if self.searchText:
+                pages.append((previousPage, lambda session: self.readPage(session, previousPage)))
+            else:
+                pages.append((previousPage, lambda session: self.readBefore(session, firstId)))
+        if pages:
+            threading.Thread(target=self.runPrefetch, args=(state, pages, onPrefetch), name='BookPagination', daemon=True).start()
+
+    def runPrefetch(self, state=None, pages=None, onPrefetch=None):
+        session = self.Session()
+        try:
+            for pageNumber, readPage in pages:
+                books = readPage(session)
+                session.expunge_all()
+                if state != self.getState():
+                    return
+                self.adjacentPages[(pageNumber, state)] = books
+                if onPrefetch:
+                    onPrefetch(books)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        finally:
+            session.close()
+
+    def getBookQuery(self, session=None):
+        # authors are read with the page, books of the background session are used after it is closed
+        return session.query(Book).options(selectinload(Book.authors))
+
+    def readFirst(self, session=None):
+        if self.searchText:
+            return self.readPage(session, 0)
+        return self.getBookQuery(session).order_by(Book.id).limit(self.pageSize).all()
+
+    def readLast(self, session=None):
+        if self.searchText:
+            return self.readPage(session, self.getPages() - 1)
+        lastPageSize = self.getCount() % self.pageSize or self.pageSize
+        return list(reversed(self.getBookQuery(session).order_by(Book.id.desc()).limit(lastPageSize).all()))
+
+    def readAfter(self, session=None, bookId=None):
+        return self.getBookQuery(session).filter(Book.id > bookId).order_by(Book.id).limit(self.pageSize).all()
+
+    def readBefore(self, session=None, bookId=None):
+        return list(reversed(self.getBookQuery(session).filter(Book.id < bookId).order_by(Book.id.desc()).limit(self.pageSize).all()))
+
+    def readPage(self, session=None, pageNumber=0):
+        offset = pageNumber * self.pageSize
+        if self.searchText:
+            return self.readSearchPage(session, offset)
+        # seek first id of the page on the id index, then read the page by keyset
+        firstId = session.query(Book.id).order_by(Book.id).offset(offset).limit(1).scalar()
+        if firstId is None:
+            return list()
+        return self.getBookQuery(session).filter(Book.id >= firstId).order_by(Book.id).limit(self.pageSize).all()
+
+    def readSearchPage(self, session=None, offset=0):
+        if not self.createDatabase.searchIndex.available:
+            books, count = self.createDatabase.findBySimlarBookName(bookName=self.searchText, limit=self.pageSize, offset=offset) or (list(), 0)
+            return books
+        rows = self.createDatabase.searchIndex.find(session, self.searchText, limit=self.pageSize, offset=offset)
+        booksById = {book.id: book for book in self.getBookQuery(session).filter(Book.id.in_([bookId for bookId, snippet in rows]))}
+        books = list()
+        for bookId, snippet in rows:
+            book = booksById.get(bookId)
+            if book:
+                book.searchSnippet = snippet
+                books.append(book)
+        return books
+
+
+@event.listens_for(Book, 'after_insert')
+@event.listens_for(Book, 'after_update')
+@event.listens_for(Book, 'after_delete')
+def invalidateCounts(mapper, connection, target):
+    BookPagination.invalidate()
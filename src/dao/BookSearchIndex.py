@@ -0,0 +1,152 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import re
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import logging
+
+logger = logging.getLogger('extensive')
+
+# relevance weight of book_name, authors, tag, publisher and isbn
+SEARCH_RANK = 'bm25(10.0, 5.0, 2.0, 1.0, 5.0)'
+SNIPPET_START = '['
+SNIPPET_END = ']'
+SNIPPET_TOKENS = 10
+# quoted phrase, unterminated quote runs to the end, or a word
+SEARCH_TERM_PATTERN = re.compile(r'"([^"]*)"?|(\S+)')
+# token characters of the unicode61 tokenizer
+SEARCH_TOKEN_PATTERN = re.compile(r'\w+')
+
+# author_book_link.author_id holds the book id and book_id the author id, see AuthorBookLink
+AUTHORS_OF_BOOK = '''(SELECT group_concat(author.author_name, ', ') FROM author
+    JOIN author_book_link ON author.id = author_book_link.book_id WHERE author_book_link.author_id = {bookId})'''
+CREATE_SEARCH_INDEX = (
+    '''CREATE VIRTUAL TABLE book_search USING fts5(book_name, authors, tag, publisher, isbn,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')''',
+    f'''INSERT INTO book_search(book_search, rank) VALUES('rank', '{SEARCH_RANK}')''',
+    '''CREATE TRIGGER book_search_insert AFTER INSERT ON book BEGIN
+        INSERT INTO book_search(rowid, book_name, authors, tag, publisher, isbn)
+        VALUES (new.id, new.book_name, ''' + AUTHORS_OF_BOOK.format(bookId='new.id') + ''', new.tag, new.publisher,
+        trim(coalesce(new.isbn_13, '') || ' ' || coalesce(new.isbn_10, '')));
+    END''',
+    '''CREATE TRIGGER book_search_update AFTER UPDATE OF book_name, tag, publisher, isbn_13, isbn_10 ON book BEGIN
+        UPDATE book_search SET book_name = new.book_name, tag = new.tag, publisher = new.publisher,
+        isbn = trim(coalesce(new.isbn_13, '') || ' ' || coalesce(new.isbn_10, '')) WHERE rowid = old.id;
+    END''',
+    '''CREATE TRIGGER book_search_delete AFTER DELETE ON book BEGIN
+        DELETE FROM book_search WHERE rowid = old.id;
+    END''',
+    '''CREATE TRIGGER book_search_link_insert AFTER INSERT ON author_book_link BEGIN
+        UPDATE book_search SET authors = ''' + AUTHORS_OF_BOOK.format(bookId='new.author_id') + ''' WHERE rowid = new.author_id;
+    END''',
+    '''CREATE TRIGGER book_search_link_delete AFTER DELETE ON author_book_link BEGIN
+        UPDATE book_search SET authors = ''' + AUTHORS_OF_BOOK.format(bookId='old.author_id') + ''' WHERE rowid = old.author_id;
+    END''',
+    '''CREATE TRIGGER book_search_author_update AFTER UPDATE OF author_name ON author BEGIN
+        UPDATE book_search SET authors = ''' + AUTHORS_OF_BOOK.format(bookId='book_search.rowid') + '''
+        WHERE rowid IN (SELECT author_id FROM author_book_link WHERE book_id = new.id);
+    END''',
+    '''INSERT INTO book_search(rowid, book_name, authors, tag, publisher, isbn)
+        SELECT id, book_name, ''' + AUTHORS_OF_BOOK.format(bookId='book.id') + ''', tag, publisher,
+        trim(coalesce(isbn_13, '') || ' ' || coalesce(isbn_10, '')) FROM book''',
+)
+DROP_SEARCH_INDEX = (
+    'DROP TRIGGER IF EXISTS book_search_insert',
+    'DROP TRIGGER IF EXISTS book_search_update',
+    'DROP TRIGGER IF EXISTS book_search_delete',
+    'DROP TRIGGER IF EXISTS book_search_link_insert',
+    'DROP TRIGGER IF EXISTS book_search_link_delete',
+    'DROP TRIGGER IF EXISTS book_search_author_update',
+    'DROP TABLE IF EXISTS book_search',
+)
+
+
+def getMatchQuery(searchText=None):
+    '''
+    FTS5 query of search text. Quoted text is a phrase, other words match
+    as prefixes, all terms must match.
+    @return: match query, empty when search text has no word
+    '''
+    terms = list()
+    for phrase, word in SEARCH_TERM_PATTERN.findall(searchText or ''):
+        if phrase:
+            tokens = SEARCH_TOKEN_PATTERN.findall(phrase)
+            if tokens:
+                terms.append('"{}"'.format(' '.join(tokens)))
+        else:
+            terms.extend(f'"{token}"*' for token in SEARCH_TOKEN_PATTERN.findall(word))
+    return ' '.join(terms)
+
+
+class BookSearchIndex():
+    '''
+    SQLite FTS5 index over book name, authors, tag, publisher and isbn of the
+    library database. Triggers on book, author and author_book_link keep it
+    up to date, so saving books through the session is enough. Rowid of
+    book_search is the book id.
+
+    available is False when sqlite is built without FTS5, callers fall back
+    to LIKE search.
+
+    @param engine: engine of the library database
+    '''
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.available = True
+
+    def exists(self):
+        with self.engine.connect() as connection:
+            return connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'book_search'").first() is not None
+
+    def create(self):
+        '''
+        create index, triggers and index existing books, once per database.
+        '''
+        try:
+            if not self.exists():
+                logger.info('creating book search index')
+                with self.engine.begin() as connection:
+                    for statement in CREATE_SEARCH_INDEX:
+                        connection.execute(statement)
+        except OperationalError as e:
+            # no such module: fts5
+            logger.error(e, exc_info=True)
+            self.available = False
+
+    def drop(self):
+        with self.engine.begin() as connection:
+            for statement in DROP_SEARCH_INDEX:
+                connection.execute(statement)
+
+    def search(self, session=None, searchText=None, limit=50, offset=0):
+        '''
+        @return: list of (book id, snippet) best match first, number of matching books
+        '''
+        return self.find(session, searchText, limit, offset), self.count(session, searchText)
+
+    def find(self, session=None, searchText=None, limit=50, offset=0):
+        '''
+        @return: list of (book id, snippet) best match first
+        '''
+        matchQuery = getMatchQuery(searchText)
+        if not matchQuery:
+            return list()
+        rows = session.execute(text(f'''SELECT rowid, snippet(book_search, -1, '{SNIPPET_START}', '{SNIPPET_END}', '...', {SNIPPET_TOKENS})
+            FROM book_search WHERE book_search MATCH :matchQuery ORDER BY rank LIMIT :limit OFFSET :offset'''),
+                               {'matchQuery': matchQuery, 'limit': limit if limit else -1, 'offset': offset}).fetchall()
+        return [tuple(row) for row in rows]
+
+    def count(self, session=None, searchText=None):
+        '''
+        @return: number of matching books
+        '''
+        matchQuery = getMatchQuery(searchText)
+        if not matchQuery:
+            return 0
+        return session.execute(text('SELECT count(*) FROM book_search WHERE book_search MATCH :matchQuery'),
+                               {'matchQuery': matchQuery}).scalar()
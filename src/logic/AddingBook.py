@@ -4,6 +4,7 @@ Created on Jan 1, 2016
 @author: vijay
 '''
 from PyPDF2.pdf import PdfFileReader
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import copy
 from datetime import datetime
 import json
@@ -34,19 +35,40 @@ import uuid
 
 # logger = logging.getLogger('extensive')
 
+# books submitted to the worker processes ahead, per worker
+INGEST_QUEUE_FACTOR = 2
+
+
+def extractBook(libraryPath=None, sourcePath=None, bookPath=None):
+    '''
+    Runs in a worker process of BulkAddBook. Copies the book to bookPath,
+    reads its metadata, creates the cover image and writes book.json.
+    @return: book.json content
+    '''
+    addBook = AddBook(libraryPath=libraryPath, connectDatabase=False)
+    try:
+        return addBook.preparingBook(sourcePath, bookPath)
+    except Exception:
+        # number of a failed book is not reused, its folder is removed
+        shutil.rmtree(bookPath, ignore_errors=True)
+        raise
+
 
 class AddBook():
     '''
     This class have been written to add book to Opal workspace library.
     '''
 
-    def __init__(self, libraryPath=None):
+    def __init__(self, libraryPath=None, connectDatabase=True):
         self.book = Book()
         self.book.uuid = str(uuid.uuid4())
         self.book.tag = None
         self.book.authors = list()
         self.libraryPath = libraryPath
-        self.createDatabase = CreateDatabase(libraryPath=libraryPath)
+        self.bookFileBaseName = None
+        self.createDatabase = None
+        if connectDatabase:
+            self.createDatabase = CreateDatabase(libraryPath=libraryPath)
 
     def getMaxBookID(self):
 
@@ -68,58 +90,68 @@ class AddBook():
         '''
 
         if sourcePath:
-            #             if maxBookId:
-            #                 maxBookId = self.createDatabase.getMaxBookID()
-            #
-            #                 if maxBookId == None:
-            #                     maxBookId = 0
-            #             workspacePath = Workspace().libraryPath
-            self.book.bookPath = os.path.join(self.libraryPath,
-                                              str(maxBookId + 1))
-
-            head, tail = os.path.split(sourcePath)
-            self.book.bookFileName = tail
-
-            self.book.inLanguage = 'English'
-            self.book.hasCover = 'Y'
-
-            splited_name = tail.split(".")
-            self.book.bookFormat = splited_name[-1:][0]
-            splited_name.remove(self.book.bookFormat)
-            book_file_name = '.'.join(splited_name)
-            self.book.bookName = book_file_name
-            self.book.wishListed = 'No'
+            self.settingBookFile(sourcePath, os.path.join(self.libraryPath, str(maxBookId + 1)))
 
             if not self.findingSameBook():
+                self.copyingBook(sourcePath)
 
-                self.book.bookPath = os.path.join(self.libraryPath,
-                                                  str(maxBookId + 1))
-                if not os.path.exists(self.book.bookPath):
-                    os.makedirs(self.book.bookPath)
+                book_copy1 = copy.deepcopy(self.book)
+                self.writeBookJson(self.book.bookPath, book_copy1)
+                self.addingBookInfoInDatabase(self.book)
 
-                dest = os.path.join(self.book.bookPath, tail)
-                if sourcePath != dest:
-                    shutil.copy(sourcePath, dest)
+    def preparingBook(self, sourcePath=None, bookPath=None):
+        '''
+        Everything addingBookToWorkspace does except the database steps.
+        @return: book.json content
+        '''
+        self.settingBookFile(sourcePath, bookPath)
+        self.copyingBook(sourcePath)
+        return self.writeBookJson(self.book.bookPath, self.book)
 
-                if 'pdf' == self.book.bookFormat:
-                    self.getPdfMetadata(sourcePath)
-                if 'epub' == self.book.bookFormat:
-                    self.getEpubMetadata(sourcePath)
-                    pass
+    def settingBookFile(self, sourcePath=None, bookPath=None):
+        '''
+        Book name and format from the file name of sourcePath.
+        '''
+        self.book.bookPath = bookPath
 
-                os.chdir(self.book.bookPath)
-                self.book.bookImgName = book_file_name + '.jpg'
-                BookImage().getBookImage(self.book.bookPath, book_file_name,
-                                         self.book.bookFormat)
+        head, tail = os.path.split(sourcePath)
+        self.book.bookFileName = tail
 
-                book_copy1 = copy.deepcopy(self.book)
-                self.writeBookJson(self.book.bookPath, book_copy1)
-                self.addingBookInfoInDatabase(self.book)
+        self.book.inLanguage = 'English'
+        self.book.hasCover = 'Y'
+
+        splited_name = tail.split(".")
+        self.book.bookFormat = splited_name[-1:][0]
+        splited_name.remove(self.book.bookFormat)
+        self.bookFileBaseName = '.'.join(splited_name)
+        self.book.bookName = self.bookFileBaseName
+        self.book.wishListed = 'No'
+
+    def copyingBook(self, sourcePath=None):
+        '''
+        Copy the book file into its folder, read metadata and create cover image.
+        Only absolute paths are used, working directory is not changed.
+        '''
+        if not os.path.exists(self.book.bookPath):
+            os.makedirs(self.book.bookPath)
+
+        dest = os.path.join(self.book.bookPath, self.book.bookFileName)
+        if sourcePath != dest:
+            shutil.copy(sourcePath, dest)
+
+        if 'pdf' == self.book.bookFormat:
+            self.getPdfMetadata(sourcePath)
+        if 'epub' == self.book.bookFormat:
+            self.getEpubMetadata(dest)
+
+        self.book.bookImgName = self.bookFileBaseName + '.jpg'
+        BookImage().getBookImage(self.book.bookPath, self.bookFileBaseName,
+                                 self.book.bookFormat)
 
     def getImageFileName(self):
         imgFilePath = os.path.join(self.book.bookPath, self.book.bookImgName)
         if not os.path.exists(imgFilePath):
-            directory = '.'
+            directory = self.book.bookPath
             pattern = re.compile(r"\-(\d*)\.jpg$")
             for file in os.listdir(directory):
                 print(file)
@@ -158,6 +190,7 @@ class AddBook():
     def writeBookJson(self, newDirPath=None, book=None):
         '''
         This function will write book.json (metadata) of the newly added book in workspace.
+        @return: book.json content
         '''
         logger.debug('writeBookJson newDirPath: %s', newDirPath)
         f = open(os.path.join(newDirPath, 'book.json'), 'w')
@@ -192,13 +225,12 @@ class AddBook():
         f.write(json.dumps(row2dict, sort_keys=True, indent=4))
 
         f.close()
+        return row2dict
 
     def getEpubMetadata(self, path=None):
         logger.debug('getEpubMetadata')
-        os.chdir(self.book.bookPath)
-        file_name = self.book.bookName + '.epub'
         epubBook = EpubBook()
-        epubBook.open(file_name)
+        epubBook.open(path)
 
         epubBook.parse_contents()
 
@@ -212,7 +244,6 @@ class AddBook():
         self.book.authors = authorList
 
         self.book.tag = epubBook.subjectTag
-        epubBook.extract_cover_image(outdir='.')
         self.book.createdOn = datetime.now()
 
     def getPdfMetadata(self, path=None):
@@ -222,85 +253,184 @@ class AddBook():
         logger.debug('getPdfMetadata path: %s', path)
 
         if path:
+            # one reader for encryption check and metadata, closed when done
+            pdfFile = open(path, "rb")
             try:
-                input = PdfFileReader(open(path, "rb"))
-                logger.debug('getIsEncrypted : %s ', input.getIsEncrypted())
-            except Exception as e:
-                logger.error(e, exc_info=True)
-            pdf_info = None
-            try:
-                pdf_toread = PdfFileReader(open(path, "rb"))
-                if pdf_toread.isEncrypted:
-                    try:
-                        pdf_toread.decrypt('')
-                    except Exception as e:
-                        logger.error(e, exc_info=True)
-            except Exception as e:
-                logger.error(e, exc_info=True)
-            try:
-                pdf_info = pdf_toread.getDocumentInfo()
-                logger.debug('NumPages:%s', pdf_toread.getNumPages())
-                self.book.numberOfPages = pdf_toread.getNumPages()
-                #             value = pdf_info.subject
-                subject = None
-                if pdf_info.subject and type(pdf_info.subject) == str:
-                    # Ignore errors even if the string is not proper UTF-8 or has
-                    # broken marker bytes.
-                    # Python built-in function unicode() can do this.
-                    subject = pdf_info.subject
-
-#                 else:
-#                     # Assume the value object has proper __unicode__() method
-#                     value = unicode(pdf_info.subject)
-#                     print 'else'
-                if not self.book.tag and subject:
-                    self.book.tag = subject
-                elif self.book.tag and subject:
-                    self.book.tag = self.book.tag + '' + subject
-            except Exception as e:
-                logger.error(e, exc_info=True)
-            try:
-                if pdf_info.title != None and pdf_info.title.strip() != '':
-                    self.book.bookName = str(pdf_info.title)
-            except Exception as e:
-                logger.error(e, exc_info=True)
-
-            try:
-                if pdf_info.creator:
-                    self.book.publisher = str(pdf_info.creator.encode('utf-8'))
-            except Exception as e:
-                logger.error(e, exc_info=True)
-            self.book.createdOn = datetime.now()
-            try:
-                #                 print str(pdf_info['/CreationDate'])[2:10]
-                date = datetime.strptime(
-                    str(pdf_info['/CreationDate'])[2:10], '%Y%m%d')
-                self.book.publishedOn = date
-            except Exception as e:
-                logger.error(e, exc_info=True)
-                logger.error('CreationDate not found')
-
-            logger.debug(Util().convert_bytes(os.path.getsize(path)))
-            self.book.fileSize = Util().convert_bytes(os.path.getsize(path))
+                pdf_info = None
+                pdf_toread = None
+                try:
+                    pdf_toread = PdfFileReader(pdfFile)
+                    logger.debug('getIsEncrypted : %s ', pdf_toread.isEncrypted)
+                    if pdf_toread.isEncrypted:
+                        try:
+                            pdf_toread.decrypt('')
+                        except Exception as e:
+                            logger.error(e, exc_info=True)
+                except Exception as e:
+                    logger.error(e, exc_info=True)
+                try:
+                    pdf_info = pdf_toread.getDocumentInfo()
+                    logger.debug('NumPages:%s', pdf_toread.getNumPages())
+                    self.book.numberOfPages = pdf_toread.getNumPages()
+                    #             value = pdf_info.subject
+                    subject = None
+                    if pdf_info.subject and type(pdf_info.subject) == str:
+                        # Ignore errors even if the string is not proper UTF-8 or has
+                        # broken marker bytes.
+                        # Python built-in function unicode() can do this.
+                        subject = pdf_info.subject
+
+    #                 else:
+    #                     # Assume the value object has proper __unicode__() method
+    #                     value = unicode(pdf_info.subject)
+    #                     print 'else'
+                    if not self.book.tag and subject:
+                        self.book.tag = subject
+                    elif self.book.tag and subject:
+                        self.book.tag = self.book.tag + '' + subject
+                except Exception as e:
+                    logger.error(e, exc_info=True)
+                try:
+                    if pdf_info.title != None and pdf_info.title.strip() != '':
+                        self.book.bookName = str(pdf_info.title)
+                except Exception as e:
+                    logger.error(e, exc_info=True)
+
+                try:
+                    if pdf_info.creator:
+                        self.book.publisher = str(pdf_info.creator.encode('utf-8'))
+                except Exception as e:
+                    logger.error(e, exc_info=True)
+                self.book.createdOn = datetime.now()
+                try:
+                    #                 print str(pdf_info['/CreationDate'])[2:10]
+                    date = datetime.strptime(
+                        str(pdf_info['/CreationDate'])[2:10], '%Y%m%d')
+                    self.book.publishedOn = date
+                except Exception as e:
+                    logger.error(e, exc_info=True)
+                    logger.error('CreationDate not found')
+
+                logger.debug(Util().convert_bytes(os.path.getsize(path)))
+                self.book.fileSize = Util().convert_bytes(os.path.getsize(path))
+
+                #             if 'ISBN'.lower() in str(pdf_info['/Subject']).lower():
+                #                 self.book.isbn_13 = str(pdf_info['/Subject'])[6:]
+
+                author = Author()
+                val = 'Unknown'
+                try:
+                    if pdf_info.author != None and pdf_info.author.strip() != '':
+                        val = pdf_info.author
+
+
+    #                     val = val.encode("utf8", "ignore")
+                except Exception as e:
+                    logger.error(e, exc_info=True)
+                author.authorName = val
+
+                authorList = list()
+                authorList.append(author)
+                self.book.authors = authorList
+            finally:
+                pdfFile.close()
+
+
+class BulkAddBook():
+    '''
+    Adds many books to the library. Copying, metadata and cover image of
+    each book run in a pool of worker processes. At most INGEST_QUEUE_FACTOR
+    books per worker are submitted ahead, the rest wait in the list. All new
+    books are saved to database in one transaction at the end, a cancelled
+    ingest saves the books finished until then.
+
+    @param libraryPath: library folder
+    @param maxWorkers: number of worker processes, cpu count when None
+    '''
 
-            #             if 'ISBN'.lower() in str(pdf_info['/Subject']).lower():
-            #                 self.book.isbn_13 = str(pdf_info['/Subject'])[6:]
+    def __init__(self, libraryPath=None, maxWorkers=None):
+        self.libraryPath = libraryPath
+        self.maxWorkers = maxWorkers or os.cpu_count() or 1
+        self.createDatabase = CreateDatabase(libraryPath=libraryPath)
+        self.cancelled = False
+        # callable(done, total, sourcePath) called after each book
+        self.onProgress = None
+        self.skipped = list()
+        self.failed = list()
 
-            author = Author()
-            val = 'Unknown'
-            try:
-                if pdf_info.author != None and pdf_info.author.strip() != '':
-                    val = pdf_info.author
+    def cancel(self):
+        self.cancelled = True
 
+    def getNewSourcePaths(self, sourcePaths=None):
+        '''
+        Files whose file name is not in library yet, each file name once.
+        '''
+        fileNames = {fileName.lower() for fileName in self.createDatabase.findAllBookFileNames() if fileName}
+        newSourcePaths = list()
+        for sourcePath in sourcePaths:
+            fileName = os.path.basename(sourcePath).lower()
+            if not os.path.isfile(sourcePath) or fileName in fileNames:
+                self.skipped.append(sourcePath)
+            else:
+                fileNames.add(fileName)
+                newSourcePaths.append(sourcePath)
+        return newSourcePaths
 
-#                     val = val.encode("utf8", "ignore")
-            except Exception as e:
-                logger.error(e, exc_info=True)
-            author.authorName = val
+    def getMaxBookID(self):
+        '''
+        Highest book folder number in database or library folder.
+        '''
+        folderIds = [int(name) for name in os.listdir(self.libraryPath) if name.isdigit()]
+        return max([self.createDatabase.getMaxBookID() or 0] + folderIds)
 
-            authorList = list()
-            authorList.append(author)
-            self.book.authors = authorList
+    def addingBooksToWorkspace(self, sourcePaths=None):
+        '''
+        @param sourcePaths: paths of selected books
+        @return: list of added Book
+        '''
+        sourcePaths = self.getNewSourcePaths(sourcePaths)
+        logger.info('adding %s books, %s skipped', len(sourcePaths), len(self.skipped))
+        maxBookId = self.getMaxBookID()
+        nextBooks = enumerate(sourcePaths, start=maxBookId + 1)
+        bookJsons = list()
+        running = dict()
+        done = 0
+        # main() sets the spawn start method, forking the GUI process is not safe
+        with ProcessPoolExecutor(max_workers=self.maxWorkers) as executor:
+            while True:
+                while not self.cancelled and len(running) < self.maxWorkers * INGEST_QUEUE_FACTOR:
+                    nextBook = next(nextBooks, None)
+                    if nextBook is None:
+                        break
+                    bookId, sourcePath = nextBook
+                    future = executor.submit(extractBook, self.libraryPath, sourcePath, os.path.join(self.libraryPath, str(bookId)))
+                    running[future] = sourcePath
+                if not running:
+                    break
+                finished, notFinished = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    sourcePath = running.pop(future)
+                    try:
+                        bookJsons.append(future.result())
+                    except Exception as e:
+                        logger.error('%s: %s', sourcePath, e, exc_info=True)
+                        self.failed.append(sourcePath)
+                    done += 1
+                    if self.onProgress:
+                        self.onProgress(done, len(sourcePaths), sourcePath)
+        return self.addingBooksInfoInDatabase(bookJsons)
+
+    def addingBooksInfoInDatabase(self, bookJsons=None):
+        '''
+        Books are created from book.json content the same way reloading the
+        library does. Ids follow folder numbers, books finish in any order.
+        '''
+        bookJsons = sorted(bookJsons, key=lambda bookJson: int(os.path.basename(bookJson['bookPath'])))
+        books = [self.createDatabase.createBookFromJson(bookJson=bookJson) for bookJson in bookJsons]
+        if books:
+            self.createDatabase.saveBooks(books)
+        logger.info('added %s books', len(books))
+        return books
 
 if __name__ == '__main__':
     #     sourcePath='C:\\Users\\vijay\\Downloads\\ST-52900095-16911.pdf'
@@ -6,7 +6,7 @@ from src.view.views.calibre.book.browser.epub.opal_epub_worker import EpubBook
 import traceback
 import rarfile
 
-import logging
+import logging.config
 from PIL import Image as Img
 import platform
 from src.view.constants import LOG_SETTINGS
@@ -25,35 +25,36 @@ class BookImage():
 #             img.save(filename=destImg)
         if platform.system() == 'Windows':
             path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'bin', 'pdftocairo.exe')
-#             os.chdir(path)
-            cmd = f'''{path} -f 1 -l 1 -jpeg "{name}.pdf" "{name}"'''
+            cmd = [path, '-f', '1', '-l', '1', '-jpeg', name + '.pdf', name]
         else:
-            cmd = 'convert -background white -alpha remove "' + name + '.pdf[0]' + '" "' + name + '.jpg' + '"'
-            
+            cmd = ['convert', '-background', 'white', '-alpha', 'remove', name + '.pdf[0]', name + '.jpg']
         logger.debug(cmd)
-        subprocess.call(cmd, shell=True)
-        
+        subprocess.call(cmd)
+
     def getDjuvBookImage(self, name=None):
-        cmd = 'ddjvu -page=1 -format=pnm "' + name + '.djvu" 1.pnm && pnmtojpeg 1.pnm > "' + name + '.jpg" && rm *.pnm'
-        subprocess.call(cmd, shell=True)
-        
+        pnmFile = name + '.pnm'
+        subprocess.call(['ddjvu', '-page=1', '-format=pnm', name + '.djvu', pnmFile])
+        try:
+            with open(name + '.jpg', 'wb') as jpgFile:
+                subprocess.call(['pnmtojpeg', pnmFile], stdout=jpgFile)
+        finally:
+            if os.path.exists(pnmFile):
+                os.remove(pnmFile)
+
     def getChmBookImage(self, name=None):
         pass
 
 #         print 'getChmBookImage'
     def getCbrBookImage(self, name=None):
-        
+
         logger.info('getCbrBookImage')
         rar = rarfile.RarFile(name + ".cbr")
         nameList = rar.namelist()
         nameList.sort()
         try:
-            cmd = '''
-            unrar e -v "''' + name + '''.cbr" "''' + nameList[0] + '''"
-            mv "''' + nameList[0] + '''" "''' + name + '''.jpg"
-            '''
-            logger.info(cmd)
-            subprocess.call(cmd, shell=True)
+            outDir = os.path.dirname(name)
+            subprocess.call(['unrar', 'e', '-o+', name + '.cbr', nameList[0], outDir + os.sep])
+            os.replace(os.path.join(outDir, os.path.basename(nameList[0])), name + '.jpg')
         except:
             traceback.print_exc()
 
@@ -65,33 +66,40 @@ class BookImage():
         convert cbr.png -resize 50% cbr.png
         convert -thumbnail x300 -background white -alpha remove input_file.pdf[0] output_thumbnail.png
         convert azw.png -resize 16% azw3.png
+
+        Commands get absolute paths, working directory of the process is not
+        changed so books can be added from several threads or processes.
         '''
         logger.debug('getBookImage')
-        os.chdir(filePath)
-        if 'pdf' == bookFormat.lower():
-            self.getPdfBookImage(name)
-            
+        name = os.path.join(filePath, name)
+        try:
+            if 'pdf' == bookFormat.lower():
+                self.getPdfBookImage(name)
+
 #             self.convert(os.path.join(filePath,name))
 
-        elif 'djvu' == bookFormat.lower():
-            self.getDjuvBookImage(name)
-            
-        elif 'chm' == bookFormat.lower():
-            self.getChmBookImage(name)
-            
-        elif 'epub' == bookFormat.lower():
-            file_name = name + '.epub'
-            epubBook = EpubBook()
-            epubBook.open(file_name)
-        
-            epubBook.parse_contents()
-            epubBook.extract_cover_image(name + '.jpg', outdir='.',)
-        elif 'cbr' == bookFormat.lower():
-            logger.info('bookFormat:' + bookFormat)
-            self.getCbrBookImage(name)    
-        elif 'mobi' == bookFormat:
-            print('work in progress')
-        print('getBookImage completed')
+            elif 'djvu' == bookFormat.lower():
+                self.getDjuvBookImage(name)
+
+            elif 'chm' == bookFormat.lower():
+                self.getChmBookImage(name)
+
+            elif 'epub' == bookFormat.lower():
+                file_name = name + '.epub'
+                epubBook = EpubBook()
+                epubBook.open(file_name)
+
+                epubBook.parse_contents()
+                epubBook.extract_cover_image(name + '.jpg', outdir=filePath)
+            elif 'cbr' == bookFormat.lower():
+                logger.info('bookFormat:' + bookFormat)
+                self.getCbrBookImage(name)
+            elif 'mobi' == bookFormat:
+                logger.info('mobi cover: work in progress')
+        except Exception as e:
+            # a book without cover image is still added
+            logger.error(e, exc_info=True)
+        logger.debug('getBookImage completed')
 
 
 if __name__ == "__main__":
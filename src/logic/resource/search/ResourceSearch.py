@@ -32,8 +32,6 @@ class ResourceSearchLogic():
                         if re.search(pattern,file, re.I):
 #                         if file.endswith(searchText):
                             self.resultDict[len(self.resultDict)] = [file, root.split(basePath)[1][1:], root]
-                            filePath=os.path.join(root,file)
-                            print(filePath)
                             if len(self.resultDict) > 100:
                                 break
 
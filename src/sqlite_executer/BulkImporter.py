@@ -0,0 +1,301 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import csv
+import re
+import time
+from datetime import datetime
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectExecuteSqlite import ManageSqliteDatabase
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_SAMPLE_SIZE = 1000
+# pragmas set for the duration of the import, restored afterwards
+FAST_IMPORT_PRAGMAS = (('journal_mode', 'MEMORY'), ('synchronous', 'OFF'))
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%d/%m/%Y %H:%M:%S')
+INTEGER_PATTERN = re.compile(r'^[+-]?(0|[1-9][0-9]*)$')
+# range of sqlite INTEGER, larger integers are stored as REAL or TEXT
+INTEGER_MIN = -2 ** 63
+INTEGER_MAX = 2 ** 63 - 1
+REAL_PATTERN = re.compile(r'^[+-]?([0-9]+\.?[0-9]*|\.[0-9]+)([eE][+-]?[0-9]+)?$')
+
+
+class ImportStatus():
+    '''
+    Result of one import run.
+    '''
+
+    def __init__(self, tableName=None):
+        self.tableName = tableName
+        self.rowCount = 0
+        self.committedRowCount = 0
+        self.columnTypes = None
+        self.startTime = time.time()
+        self.endTime = None
+        self.cancelled = False
+        self.error = None
+
+    def getElapsedTime(self):
+        endTime = self.endTime if self.endTime else time.time()
+        return endTime - self.startTime
+
+    def getRowsPerSecond(self):
+        elapsedTime = self.getElapsedTime()
+        if elapsedTime <= 0:
+            return 0
+        return int(self.rowCount / elapsedTime)
+
+    def __str__(self):
+        if self.error:
+            return f"Import failed after {self.rowCount} rows: {self.error}"
+        if self.cancelled:
+            return f"Import cancelled, {self.committedRowCount} rows kept in {self.tableName}."
+        return f"Total rows {self.rowCount} inserted into {self.tableName} in {self.getElapsedTime():.2f} s ({self.getRowsPerSecond()} rows/s)."
+
+
+class ColumnTypeInference():
+    '''
+    Infers INTEGER, REAL, DATE or TEXT for each column from sample rows and
+    converts values to the inferred type. A column falls back to the wider
+    type when sample values conflict (INTEGER -> REAL -> TEXT, DATE -> TEXT).
+    Numbers with leading zeros are kept as TEXT, integers out of the sqlite
+    INTEGER range as REAL or TEXT. Empty values are ignored while
+    sampling and stored as NULL in typed columns.
+    '''
+
+    def __init__(self, columnTypes=None, dateFormats=None):
+        self.columnTypes = columnTypes
+        self.dateFormats = dateFormats
+
+    def inferValueType(self, value):
+        if INTEGER_PATTERN.match(value) and INTEGER_MIN <= int(value) <= INTEGER_MAX:
+            return 'INTEGER'
+        digits = value.lstrip('+-')
+        if REAL_PATTERN.match(value) and not (len(digits) > 1 and digits[0] == '0' and digits[1] != '.'):
+            return 'REAL'
+        return 'TEXT'
+
+    def findDateFormat(self, values):
+        '''
+        @return: first date format parsing all given values or None
+        '''
+        for dateFormat in DATE_FORMATS:
+            try:
+                for value in values:
+                    datetime.strptime(value, dateFormat)
+                return dateFormat
+            except ValueError:
+                pass
+        return None
+
+    def infer(self, sampleRows=None, columnCount=0):
+        '''
+        @return: list of column types
+        '''
+        self.columnTypes = list()
+        self.dateFormats = list()
+        for col in range(columnCount):
+            values = [row[col] for row in sampleRows if col < len(row) and row[col] != '']
+            columnType = None
+            for value in values:
+                valueType = self.inferValueType(value)
+                if columnType is None or valueType == 'TEXT':
+                    columnType = valueType
+                elif columnType != valueType:
+                    columnType = 'REAL'
+                if columnType == 'TEXT':
+                    break
+            dateFormat = None
+            if columnType == 'TEXT':
+                dateFormat = self.findDateFormat(values)
+                if dateFormat:
+                    columnType = 'DATE'
+            self.columnTypes.append(columnType if columnType else 'TEXT')
+            self.dateFormats.append(dateFormat)
+        return self.columnTypes
+
+    def convertValue(self, value, col):
+        columnType = self.columnTypes[col]
+        if value is None or columnType == 'TEXT':
+            return value
+        if value == '':
+            return None
+        try:
+            if columnType == 'INTEGER':
+                intValue = int(value)
+                if INTEGER_MIN <= intValue <= INTEGER_MAX:
+                    return intValue
+                return value
+            if columnType == 'REAL':
+                return float(value)
+            if columnType == 'DATE' and self.dateFormats[col]:
+                dateValue = datetime.strptime(value, self.dateFormats[col])
+                if '%H' in self.dateFormats[col]:
+                    return dateValue.isoformat(sep=' ')
+                return dateValue.date().isoformat()
+        except (ValueError, OverflowError):
+            # value not matching the sample, sqlite keeps it as text
+            pass
+        return value
+
+    def convertRow(self, row):
+        return [self.convertValue(value, col) for col, value in enumerate(row)]
+
+
+class BulkImporter():
+    '''
+    Streaming CSV import. The file is read in chunks with csv.reader and each
+    chunk is inserted with executemany using bound parameters.
+
+    @param connectionName: connection name
+    @param databaseAbsolutePath: database file path
+    @param chunkSize: number of rows read and inserted per executemany
+    @param batchSize: commit after this many rows, 0 commits once at the end
+    @param fastPragmas: relax journal_mode and synchronous during the import
+    @param onProgress: callable(importStatus) called after each chunk
+    '''
+
+    def __init__(self, connectionName=None, databaseAbsolutePath=None, chunkSize=DEFAULT_CHUNK_SIZE, batchSize=0, fastPragmas=True, onProgress=None):
+        self.connectionName = connectionName
+        self.databaseAbsolutePath = databaseAbsolutePath
+        self.chunkSize = chunkSize
+        self.batchSize = batchSize
+        self.fastPragmas = fastPragmas
+        self.onProgress = onProgress
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def readCsvChunks(self, filePath=None, delimiter=',', quotechar='"', encoding='utf-8', trimFields=False):
+        '''
+        @return: generator of list of rows
+        '''
+        with open(filePath, newline='', encoding=encoding) as csvFile:
+            reader = csv.reader(csvFile, delimiter=delimiter, quotechar=quotechar)
+            chunk = list()
+            for row in reader:
+                if trimFields:
+                    row = [value.strip() for value in row]
+                chunk.append(row)
+                if len(chunk) >= self.chunkSize:
+                    yield chunk
+                    chunk = list()
+            if chunk:
+                yield chunk
+
+    def createTableSql(self, tableName=None, columnHeader=None, columnTypes=None):
+        columns = list()
+        for idx, column in enumerate(columnHeader):
+            columnType = columnTypes[idx] if columnTypes else 'TEXT'
+            columns.append('"{}" {}'.format(column.replace('"', '""'), columnType))
+        return 'CREATE TABLE IF NOT EXISTS "{}" ({});'.format(tableName.replace('"', '""'), ', '.join(columns))
+
+    def insertSql(self, tableName=None, columnHeader=None):
+        columns = ', '.join('"{}"'.format(column.replace('"', '""')) for column in columnHeader)
+        placeholders = ', '.join('?' for _ in columnHeader)
+        return 'INSERT INTO "{}" ({}) VALUES ({})'.format(tableName.replace('"', '""'), columns, placeholders)
+
+    def setPragmas(self, conn):
+        '''
+        @return: list of (pragma, previous value) to restore
+        '''
+        previous = list()
+        if self.fastPragmas:
+            for pragma, value in FAST_IMPORT_PRAGMAS:
+                previous.append((pragma, conn.execute(f'PRAGMA {pragma}').fetchone()[0]))
+                conn.execute(f'PRAGMA {pragma}={value}')
+        return previous
+
+    def restorePragmas(self, conn, previous):
+        for pragma, value in previous:
+            try:
+                conn.execute(f'PRAGMA {pragma}={value}')
+            except Exception as e:
+                logger.error(e, exc_info=True)
+
+    def createIndexes(self, conn, tableName=None, indexColumns=None):
+        for column in indexColumns:
+            indexName = 'idx_{}_{}'.format(tableName, column).replace('"', '""')
+            conn.execute('CREATE INDEX IF NOT EXISTS "{}" ON "{}" ("{}")'.format(indexName, tableName.replace('"', '""'), column.replace('"', '""')))
+        conn.execute('ANALYZE "{}"'.format(tableName.replace('"', '""')))
+
+    def fitRow(self, row, columnCount):
+        '''
+        pad or cut the row to the number of columns
+        '''
+        if len(row) < columnCount:
+            return row + [None] * (columnCount - len(row))
+        return row[:columnCount]
+
+    def importCsv(self, filePath=None, tableName=None, columnNameFirstRow=False, delimiter=',', quotechar='"', encoding='utf-8', trimFields=False,
+                  inferTypes=True, sampleSize=DEFAULT_SAMPLE_SIZE, indexColumns=None):
+        '''
+        Create table tableName if needed and insert all rows of the csv file.
+        @param inferTypes: create typed columns inferred from the first sampleSize rows
+        @param indexColumns: list of column names indexed after the load
+        @return: ImportStatus
+        '''
+        columnTypeInference = None
+        importStatus = ImportStatus(tableName=tableName)
+        chunks = self.readCsvChunks(filePath=filePath, delimiter=delimiter, quotechar=quotechar, encoding=encoding, trimFields=trimFields)
+        with ManageSqliteDatabase(connectionName=self.connectionName, databaseAbsolutePath=self.databaseAbsolutePath) as manageSqliteDatabase:
+            conn = manageSqliteDatabase.conn
+            previous = self.setPragmas(conn)
+            try:
+                columnHeader = None
+                insertSql = None
+                uncommitted = 0
+                for chunk in chunks:
+                    if columnHeader is None:
+                        if columnNameFirstRow:
+                            columnHeader = chunk.pop(0)
+                        else:
+                            columnHeader = ["Col_{}".format(idx) for idx in range(len(chunk[0]))]
+                        if inferTypes:
+                            columnTypeInference = ColumnTypeInference()
+                            columnTypeInference.infer(sampleRows=chunk[:sampleSize], columnCount=len(columnHeader))
+                            importStatus.columnTypes = columnTypeInference.columnTypes
+                        # table is created in the data transaction, rollback of the first batch removes it
+                        if not conn.in_transaction:
+                            conn.execute('BEGIN')
+                        conn.execute(self.createTableSql(tableName=tableName, columnHeader=columnHeader, columnTypes=importStatus.columnTypes))
+                        insertSql = self.insertSql(tableName=tableName, columnHeader=columnHeader)
+                    if self.cancelled:
+                        break
+                    columnCount = len(columnHeader)
+                    rows = (self.fitRow(row, columnCount) for row in chunk)
+                    if columnTypeInference:
+                        rows = (columnTypeInference.convertRow(row) for row in rows)
+                    conn.executemany(insertSql, rows)
+                    importStatus.rowCount += len(chunk)
+                    uncommitted += len(chunk)
+                    if self.batchSize and uncommitted >= self.batchSize:
+                        conn.commit()
+                        importStatus.committedRowCount = importStatus.rowCount
+                        uncommitted = 0
+                    if self.onProgress:
+                        self.onProgress(importStatus)
+                if self.cancelled:
+                    conn.rollback()
+                    importStatus.cancelled = True
+                else:
+                    conn.commit()
+                    importStatus.committedRowCount = importStatus.rowCount
+                    if indexColumns and columnHeader:
+                        self.createIndexes(conn, tableName=tableName, indexColumns=indexColumns)
+            except Exception as e:
+                logger.error(e, exc_info=True)
+                conn.rollback()
+                importStatus.error = e
+            finally:
+                self.restorePragmas(conn, previous)
+                importStatus.endTime = time.time()
+        logger.info(str(importStatus))
+        return importStatus
@@ -0,0 +1,177 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectionPool import ConnectionPoolManager
+from src.sqlite_executer.TablePager import quoteName
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+
+class RowChange():
+    '''
+    Edit state of one grid row.
+
+    @param key: tuple of key values identifying the row in the table, None for new rows
+    @param values: original values of the row
+    '''
+
+    def __init__(self, key=None, values=None):
+        self.key = key
+        self.values = list(values) if values else list()
+        self.changes = dict()
+
+    def isNew(self):
+        return self.key is None
+
+    def isDirty(self):
+        return self.isNew() or len(self.changes) > 0
+
+    def getValues(self):
+        return [self.changes.get(col, value) for col, value in enumerate(self.values)]
+
+
+class SaveResult():
+
+    def __init__(self):
+        self.updated = 0
+        self.inserted = 0
+        self.deleted = 0
+        self.error = None
+
+    def __str__(self):
+        if self.error:
+            return f'Save failed, nothing written: {self.error}'
+        return f'Saved: {self.updated} updated, {self.inserted} inserted, {self.deleted} deleted.'
+
+
+class ChangeTracker():
+    '''
+    Records edits of a table page as they happen and writes them back with
+    parameterized executemany statements in one transaction. Rows are
+    addressed by key columns, rowid or the primary key of WITHOUT ROWID
+    tables. Updates are grouped by the set of changed columns so each group
+    is one executemany.
+
+    @param databaseAbsolutePath: database file path
+    @param tableName: table name
+    @param headers: column names in grid order
+    @param keyColumns: quoted key column names, as TablePager.keyColumns
+    '''
+
+    def __init__(self, databaseAbsolutePath=None, tableName=None, headers=None, keyColumns=None):
+        self.databaseAbsolutePath = databaseAbsolutePath
+        self.tableName = tableName
+        self.headers = tuple(headers) if headers else tuple()
+        self.keyColumns = list(keyColumns) if keyColumns else list()
+        self.rows = list()
+        self.deletedKeys = list()
+
+    def trackPage(self, page=None, keyColumns=None):
+        '''
+        start tracking rows of a TablePage, dropping unsaved edits.
+        '''
+        self.headers = tuple(page.headers) if page.headers else tuple()
+        if keyColumns is not None:
+            self.keyColumns = list(keyColumns)
+        keyCount = len(self.keyColumns)
+        self.rows = [RowChange(key=tuple(key[-keyCount:]), values=values) for key, values in zip(page.keys, page.rows)]
+        self.deletedKeys = list()
+
+    def hasChanges(self):
+        return len(self.deletedKeys) > 0 or any(rowChange.isDirty() for rowChange in self.rows)
+
+    def setValue(self, row, col, value):
+        '''
+        record cell edit, grid text NULL is stored as NULL.
+        '''
+        rowChange = self.rows[row]
+        if value == 'NULL':
+            value = None
+        if not rowChange.isNew() and self.toText(value) == self.toText(rowChange.values[col]):
+            rowChange.changes.pop(col, None)
+        else:
+            rowChange.changes[col] = value
+
+    def toText(self, value):
+        '''
+        text the grid shows for a value
+        '''
+        return 'NULL' if value is None else str(value)
+
+    def appendRow(self, values=None):
+        '''
+        @return: grid row index of the new row
+        '''
+        self.rows.append(RowChange(key=None, values=values if values else [None] * len(self.headers)))
+        return len(self.rows) - 1
+
+    def deleteRow(self, row):
+        rowChange = self.rows.pop(row)
+        if not rowChange.isNew():
+            self.deletedKeys.append(rowChange.key)
+
+    def getKeyClause(self):
+        return ' AND '.join(f'{column} = ?' for column in self.keyColumns)
+
+    def getStatements(self):
+        '''
+        @return: list of (dml, sql, list of parameter rows)
+        '''
+        table = quoteName(self.tableName)
+        updates = dict()
+        inserts = list()
+        for rowChange in self.rows:
+            if rowChange.isNew():
+                inserts.append(rowChange.getValues())
+            elif rowChange.changes:
+                cols = tuple(sorted(rowChange.changes.keys()))
+                updates.setdefault(cols, list()).append([rowChange.changes[col] for col in cols] + list(rowChange.key))
+        statements = list()
+        if self.deletedKeys:
+            statements.append(('DELETE', f'DELETE FROM {table} WHERE {self.getKeyClause()}', [list(key) for key in self.deletedKeys]))
+        for cols, params in updates.items():
+            assignments = ', '.join(f'{quoteName(self.headers[col])} = ?' for col in cols)
+            statements.append(('UPDATE', f'UPDATE {table} SET {assignments} WHERE {self.getKeyClause()}', params))
+        if inserts:
+            columns = ', '.join(quoteName(header) for header in self.headers)
+            placeholders = ', '.join('?' for _ in self.headers)
+            statements.append(('INSERT', f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', inserts))
+        return statements
+
+    def save(self):
+        '''
+        Write all changes in one transaction, nothing is written if one
+        statement fails.
+        @return: SaveResult
+        '''
+        saveResult = SaveResult()
+        statements = self.getStatements()
+        if not statements:
+            return saveResult
+        conn = ConnectionPoolManager.lease(self.databaseAbsolutePath)
+        try:
+            with conn:
+                for dml, sql, params in statements:
+                    logger.debug('%s %s rows: %s', dml, sql, len(params))
+                    count = conn.executemany(sql, params).rowcount
+                    if dml == 'UPDATE':
+                        saveResult.updated += count
+                    elif dml == 'INSERT':
+                        saveResult.inserted += count
+                    else:
+                        saveResult.deleted += count
+            self.deletedKeys = list()
+            for rowChange in self.rows:
+                rowChange.changes = dict()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            saveResult.error = e
+            saveResult.updated = saveResult.inserted = saveResult.deleted = 0
+        finally:
+            ConnectionPoolManager.release(self.databaseAbsolutePath, conn)
+        return saveResult
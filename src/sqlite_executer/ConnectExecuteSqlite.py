@@ -15,6 +15,10 @@ from src.view.constants import LOG_SETTINGS
 import sqlparse
 import platform
 import pathlib
+from src.sqlite_executer.ResultCursor import ResultCursor, DEFAULT_PAGE_SIZE
+from src.sqlite_executer.ResultSet import ResultSet
+from src.sqlite_executer.ConnectionPool import ConnectionPoolManager
+from src.sqlite_executer.SqlHistoryWriter import SqlHistoryWriter
 
 logging.config.dictConfig(LOG_SETTINGS)
 logger = logging.getLogger('extensive')
@@ -32,6 +36,8 @@ class SqlType():
         self.rootpage = rootpage
         self.sql = sql
         self.columns = None
+        self.indexes = None
+        self.foreignKeys = None
 
     def getCreateSql(self):
         
@@ -103,12 +109,38 @@ class IndexInfo():
 
     '''
 
-    def __init__(self, sequence, name, unique, origin, partialIndex):
+    def __init__(self, sequence, name, unique, origin, partialIndex, columns=None):
         self.sequence = sequence
         self.name = name
         self.unique = unique
         self.origin = origin
         self.partialIndex = partialIndex
+        self.columns = columns if columns else list()
+
+
+class ForeignKey():
+    '''
+    @param id: foreign key id, columns of a composite key share the id
+    @param sequence: column position within the key
+    @param tableName: table owning the foreign key
+    @param refTableName: referenced table
+    @param fromColumn: column of tableName
+    @param toColumn: referenced column
+    '''
+
+    def __init__(self, id, sequence, tableName, refTableName, fromColumn, toColumn, onUpdate=None, onDelete=None, match=None):
+        self.id = id
+        self.sequence = sequence
+        self.tableName = tableName
+        self.refTableName = refTableName
+        self.fromColumn = fromColumn
+        self.toColumn = toColumn
+        self.onUpdate = onUpdate
+        self.onDelete = onDelete
+        self.match = match
+
+    def __repr__(self):
+        return f'''ForeignKey(id={self.id}, tableName={self.tableName}, fromColumn={self.fromColumn}, refTableName={self.refTableName}, toColumn={self.toColumn})'''
 
 
 class SQLExecuter():
@@ -120,8 +152,29 @@ class SQLExecuter():
         home = expanduser("~")
         databasePath = os.path.join(home, database)
         logger.debug('databasePath: %s', databasePath)
-        self.conn = sqlite3.connect(databasePath)
+        self.databasePath = databasePath
+        self.conn = ConnectionPoolManager.lease(databasePath)
 #         self.createOpalTables()
+
+    def close(self):
+        '''
+        release leased connection back to the pool
+        '''
+        if self.conn:
+            ConnectionPoolManager.release(self.databasePath, self.conn)
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
         
     def sqlite_insert(self, table, rows):
         '''
@@ -209,35 +262,25 @@ class SQLExecuter():
     
     def executeText(self, text=None):
         ''' This method takes input text to execute in database.
-        returns output as dict
+        @return: ResultSet, without columns for statements returning no rows
         '''
         logger.debug('text: %s', text)
-        error = 'success'
-        sqlOutput = dict()
+        resultSet = ResultSet()
         try:
             with self.conn:    
                 cur = self.conn.cursor() 
-#                 logger.debug('before')
                 if text.strip().lower().startswith('update'):
                     cur.execute(text)
                 else:
                     rows = cur.execute(text).fetchall()
-#                     logger.debug(rows)
                     logger.debug(cur.description) 
-    #                 logger.debug(rows)
                     if cur.description:
-                        headerList = list()
-                        for idx, desc in enumerate(cur.description):
-        #                     logger.debug(idx, desc)
-                            headerList.append(desc[0])
-                        sqlOutput[0] = tuple(headerList)
-                        for idx, item in enumerate(rows):
-                            sqlOutput[idx + 1] = item
+                        resultSet = ResultSet.fromRows(headers=[desc[0] for desc in cur.description], rows=rows)
         except Exception as e:
             logger.error(e, exc_info=True)
             self.conn.rollback()
-        logger.debug('len(sqlOutput) : %s', len(sqlOutput))
-        return sqlOutput
+        logger.debug('rowCount : %s', resultSet.getRowCount())
+        return resultSet
     
     def createOpalTables(self):
         '''
@@ -282,6 +325,8 @@ class SQLExecuter():
             executed INTEGER,
             duration INTEGER
           );
+        CREATE INDEX if not exists idx_sql_log_created_time ON sql_log (created_time);
+        CREATE INDEX if not exists idx_sql_log_connection_name ON sql_log (connection_name);
           
 
           
@@ -349,18 +394,17 @@ class SQLExecuter():
             cur = self.conn.cursor()    
             cur.execute('SELECT SQLITE_VERSION()')
             sqliteVersion = cur.fetchone()
-            logger.debug(f"SQLite version: {sqliteVersion[0]}")
+            logger.debug("SQLite version: %s", sqliteVersion[0])
             
             sqliteTypes = cur.execute("select distinct type from sqlite_master;").fetchall()
             for sqliteType in sqliteTypes:
                 query = f"""select * from sqlite_master where type='{sqliteType[0]}' \nAND name NOT LIKE 'sqlite_%' \nAND name != 'SAMPLE' ;
                 """
-                logger.debug(query)
                 queryResult = cur.execute(query).fetchall()
                 for typeObject in queryResult:
                     sqlType = SqlType(type=typeObject[0], name=typeObject[1], tbl_name=typeObject[2], rootpage=typeObject[3], sql=typeObject[4])
                     sqlTypeObjectList.append(sqlType)
-                    logger.debug(typeObject)
+            logger.debug('getSqlObjects: %s objects', len(sqlTypeObjectList))
                 
         except sqlite3.Error as e:
             logger.error(e, exc_info=True)
@@ -400,18 +444,12 @@ class SQLUtils():
 
     def updateSqlLog(self, sqlText, duration, connectionName=None):
         logger.debug('updateSqlLog : %s', sqlText)
-        sqlExecuter = SQLExecuter(database='_opal.sqlite')
-        table = 'sql_log'
-        rows = [{'id':None, 'sql':str(sqlText), 'connection_name':connectionName, 'created_time':datetime.now(), 'executed':'1', 'duration':duration}]
-        sqlExecuter.sqlite_insert(table, rows)
+        SqlHistoryWriter.getInstance().log(sqlText, duration, connectionName=connectionName)
     
     def refreshSqlLogUi(self):
         logger.debug('refreshSqlLogUi')
         historyGrid = self.GetTopLevelParent()._mgr.GetPane("sqlLog").window
-        sqlText = 'select * from sql_log order by created_time desc;'
-        sqlExecuter = SQLExecuter(database='_opal.sqlite')
-        sqlOutput = sqlExecuter.executeText(sqlText)
-        historyGrid.addData(data=sqlOutput)
+        historyGrid.reload()
     
     def getDbFilePath(self, connectionName):
         sqlExecuter = SQLExecuter(database='_opal.sqlite')
@@ -443,21 +481,6 @@ class SQLUtils():
         
         return tableName
     
-    def importingData(self, connectionName=None, sqlList=None):
-        logger.info('importingData to {}'.format(connectionName))
-        count = 0
-        try:
-            manageSqliteDatabase = ManageSqliteDatabase(connectionName=connectionName, databaseAbsolutePath=self.getDbFilePath(connectionName))
-            for sql in sqlList:
-                manageSqliteDatabase.executeText(sql)
-                count += 1
-        except Exception as e:
-            count -= 1
-            logger.error(e, exc_info=True)      
-        importStatus = f"Total rows {count} / {len(sqlList) - 1} inserted."
-        logger.info(f"Total rows {count} / {len(sqlList) - 1} inserted.")
-        return importStatus
-
 
 class ManageSqliteDatabase():
 
@@ -469,11 +492,29 @@ class ManageSqliteDatabase():
 #         databaseAbsolutePath=os.path.abspath(databaseAbsolutePath)
 #         databasePath=os.path.abspath(databaseAbsolutePath)
 #         databaseAbsolutePath=os.path.normpath(databaseAbsolutePath)
-        pathDir = os.path.dirname(databaseAbsolutePath)
-        head, tail = os.path.split(databaseAbsolutePath)
-        os.chdir(pathDir)
-        self.conn = sqlite3.connect(tail)
+        self.databaseAbsolutePath = os.path.abspath(databaseAbsolutePath)
+        self.conn = ConnectionPoolManager.lease(self.databaseAbsolutePath)
         self.connectionName = connectionName
+
+    def close(self):
+        '''
+        release leased connection back to the pool
+        '''
+        if self.conn:
+            ConnectionPoolManager.release(self.databaseAbsolutePath, self.conn)
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
  
     def createTable(self):
         sqlScript = '''
@@ -487,37 +528,24 @@ class ManageSqliteDatabase():
         rows = cur.executescript(sqlScript).fetchall()
         logger.debug(cur.description)
 
+    def getSchemaCatalog(self):
+        '''
+        @return: SchemaCatalog of this database, reloaded only if the schema has changed
+        '''
+        from src.sqlite_executer.SchemaCatalog import SchemaCatalogManager
+        return SchemaCatalogManager.getCatalog(self.databaseAbsolutePath).refresh(self.conn)
+
     def getSqlObjects(self):
         '''
         @return list of SqlType object [ table, view, index, trigger] from the given sqlite database path
         '''
         sqlTypeObjectList = []
         try:
-            cur = self.conn.cursor()    
-            cur.execute('SELECT SQLITE_VERSION()')
-            sqliteVersion = cur.fetchone()
-            logger.debug(f"SQLite version: {sqliteVersion[0]}")
-            
-            sqliteTypes = cur.execute("select distinct type from sqlite_master;").fetchall()
-            for sqliteType in sqliteTypes:
-                query = f"""select * from sqlite_master where type='{sqliteType[0]}' 
-                    AND name NOT LIKE 'sqlite_%' 
-                    AND name != 'SAMPLE' order by 2;
-                """
-                logger.debug(query)
-                queryResult = cur.execute(query).fetchall()
-                for typeObject in queryResult:
-                    sqlType = SqlType(type=typeObject[0], name=typeObject[1], tbl_name=typeObject[2], rootpage=typeObject[3], sql=typeObject[4])
-                    if sqlType.type == 'table':
-                        sqlType.columns = self.getColumns(sqlType.name)
-                    sqlTypeObjectList.append(sqlType)
-                    logger.debug(typeObject)
-                
+            sqlTypeObjectList = self.getSchemaCatalog().getSqlObjects()
         except sqlite3.Error as e:
             logger.error(e, exc_info=True)
         finally:
-            if self.conn:
-                self.conn.close()
+            self.close()
         return sqlTypeObjectList
 
     def getObject(self):
@@ -575,8 +603,7 @@ class ManageSqliteDatabase():
             logger.error(e, exc_info=True)
             sys.exit(1)
         finally:
-            if self.conn:
-                self.conn.close()
+            self.close()
         databaseList.append(self.connectionName)
         databaseList.append(dbObjects)
         return databaseList        
@@ -678,64 +705,50 @@ class ManageSqliteDatabase():
 
     def executeText(self, text=None):
         ''' This method takes input text to execute in database.
-        @return script output as dict
+        @return: ResultSet
         '''
-        sqlOutput = dict()
-        try:
-            with self.conn:    
-                cur = self.conn.cursor() 
+        resultCursor = self.executeTextStream(text)
+        return resultCursor.fetchAllAsResultSet()
 
-                if text.count(';') > 1 :
-                    result = cur.executescript(text)
-                elif text.strip().lower().startswith(('update', 'drop', 'alter')):
+    def executeTextStream(self, text=None, pageSize=DEFAULT_PAGE_SIZE):
+        ''' This method takes input text to execute in database.
+        The cursor is kept open, rows are fetched on demand from returned object.
+        @return: ResultCursor
+        '''
+        columnDatatype = None
+        try:
+            cur = self.conn.cursor()
+            if text.count(';') > 1 :
+                with self.conn:
+                    cur.executescript(text)
+            elif text.strip().lower().startswith(('update', 'drop', 'alter')):
+                with self.conn:
                     cur.execute(text)
-#                 elif text.strip().lower().startswith(('insert')):
-#                     parsedInsert = self.parseInsertSql(sql=text)
-#                     tableName = parsedInsert.get('tableName').replace('`', '')
-#                     tableName = tableName.replace("'", '')
-#                     columnsDatatype = self.getColumnsDatatype(cur, tableName)
-# #                     sqlOutput[-1] = columnDatatype
-#                     sqlText, dataTuple = self.createInsertSql(parsedInsert, columnsDatatype)
-#                     result = cur.execute(sqlText, dataTuple)
+            else:
+                cur.execute(text)
+                if not cur.description:
+                    self.conn.commit()
                 else:
-                    if text.strip().lower().startswith(('pragma')):
-                        pass
-                    else:
-                        try:
-                            parsedSelect = self.parseSelectSql(sql=text)
-                            if parsedSelect and parsedSelect.get('tableName'):
-                                tableName = parsedSelect.get('tableName').replace('`', '')
-                                columnDatatype = self.getColumnsDatatype(cur, tableName)
-                                sqlOutput[-1] = tuple(columnDatatype)
-                        except Exception as e:
-                            logger.error(e)
-                            logger.error(text)
-                            logger.error(parsedSelect)
-                        
-                    rows = cur.execute(text).fetchall()
-                    if cur.description:
-                        headerList = list()
-                        for idx, desc in enumerate(cur.description):
-                            headerList.append(desc[0])
-                        sqlOutput[0] = tuple(headerList)
-                        for idx, item in enumerate(rows):
-                            items = []
-                            for v in item:
-                                if v is None:
-                                    v = '-______-NULL'  # this is to make a distinguish between Null
-#                                 elif self.isBlob(v):
-#                                     v = '-______-BLOB'
-                                    
-                                items.append(v)
-#                             item=['-______-Null' if v is None else v for v in item] 
-                            sqlOutput[idx + 1] = items
+                    columnDatatype = self.getResultColumnTypes(text, cur.description)
         except Exception as e:
             logger.error(e, exc_info=True)
             logger.error(text)
-            raise e
             self.conn.rollback()
-        return sqlOutput 
+            raise e
+        return ResultCursor(cur, pageSize=pageSize, columnTypes=columnDatatype)
     
+    def getResultColumnTypes(self, text=None, description=None):
+        '''
+        declared types of result columns from the cached schema catalog,
+        None for expressions.
+        '''
+        headers = tuple([desc[0] for desc in description])
+        try:
+            return self.getSchemaCatalog().getResultColumnTypes(text, headers)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        return tuple([None] * len(headers))
+
     def isBlob(self, data):
         blob = False
         try:
@@ -0,0 +1,201 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import sqlite3
+import os
+import threading
+import time
+import logging.config
+from src.view.constants import LOG_SETTINGS
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_IDLE_TIMEOUT = 300
+DEFAULT_LEASE_TIMEOUT = 10
+
+
+class PooledConnection():
+    '''
+    sqlite connection with its lease information.
+    '''
+
+    def __init__(self, conn=None):
+        self.conn = conn
+        self.threadId = None
+        self.leaseCount = 0
+        self.lastUsed = time.time()
+
+
+class ConnectionPool():
+    '''
+    Pool of sqlite connections to one database file.
+
+    A thread leasing the pool again gets the connection it already holds
+    (thread affinity), so nested use on the same thread shares one connection.
+    Idle connections are health checked before reuse and closed after
+    idleTimeout seconds.
+
+    @param databasePath: absolute path of database file
+    @param maxSize: maximum number of open connections
+    @param idleTimeout: seconds after which an unused connection is closed
+    @param leaseTimeout: seconds to wait for a free connection
+    '''
+
+    def __init__(self, databasePath=None, maxSize=DEFAULT_POOL_SIZE, idleTimeout=DEFAULT_IDLE_TIMEOUT, leaseTimeout=DEFAULT_LEASE_TIMEOUT):
+        self.databasePath = databasePath
+        self.maxSize = maxSize
+        self.idleTimeout = idleTimeout
+        self.leaseTimeout = leaseTimeout
+        self.connections = list()
+        self.condition = threading.Condition()
+
+    def createConnection(self):
+        logger.debug('creating connection: %s', self.databasePath)
+        conn = sqlite3.connect(self.databasePath, check_same_thread=False)
+        return PooledConnection(conn)
+
+    def isHealthy(self, pooledConnection):
+        try:
+            pooledConnection.conn.execute('SELECT 1').fetchone()
+            return True
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            return False
+
+    def closeConnection(self, pooledConnection):
+        try:
+            pooledConnection.conn.close()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        if pooledConnection in self.connections:
+            self.connections.remove(pooledConnection)
+
+    def findLeased(self, threadId):
+        for pooledConnection in self.connections:
+            if pooledConnection.leaseCount > 0 and pooledConnection.threadId == threadId:
+                return pooledConnection
+        return None
+
+    def findIdle(self, threadId):
+        '''
+        @return: idle connection, preferring one last used by given thread
+        '''
+        idleConnections = [pc for pc in self.connections if pc.leaseCount == 0]
+        for pooledConnection in idleConnections:
+            if pooledConnection.threadId == threadId:
+                return pooledConnection
+        if idleConnections:
+            return idleConnections[0]
+        return None
+
+    def lease(self):
+        '''
+        @return: sqlite3 connection, give it back with release
+        '''
+        threadId = threading.get_ident()
+        deadline = time.time() + self.leaseTimeout
+        with self.condition:
+            pooledConnection = self.findLeased(threadId)
+            if pooledConnection:
+                pooledConnection.leaseCount += 1
+                return pooledConnection.conn
+            self.evictIdle()
+            while True:
+                pooledConnection = self.findIdle(threadId)
+                if pooledConnection and not self.isHealthy(pooledConnection):
+                    self.closeConnection(pooledConnection)
+                    continue
+                if pooledConnection is None and len(self.connections) < self.maxSize:
+                    pooledConnection = self.createConnection()
+                    self.connections.append(pooledConnection)
+                if pooledConnection:
+                    pooledConnection.threadId = threadId
+                    pooledConnection.leaseCount = 1
+                    pooledConnection.lastUsed = time.time()
+                    return pooledConnection.conn
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError(f'No free connection in pool for {self.databasePath}')
+                self.condition.wait(remaining)
+
+    def release(self, conn=None):
+        with self.condition:
+            for pooledConnection in self.connections:
+                if pooledConnection.conn is conn and pooledConnection.leaseCount > 0:
+                    pooledConnection.leaseCount -= 1
+                    pooledConnection.lastUsed = time.time()
+                    if pooledConnection.leaseCount == 0:
+                        try:
+                            if conn.in_transaction:
+                                conn.rollback()
+                        except Exception as e:
+                            logger.error(e, exc_info=True)
+                            self.closeConnection(pooledConnection)
+                        self.condition.notify()
+                    break
+
+    def evictIdle(self):
+        now = time.time()
+        with self.condition:
+            for pooledConnection in list(self.connections):
+                if pooledConnection.leaseCount == 0 and now - pooledConnection.lastUsed > self.idleTimeout:
+                    logger.debug('closing idle connection: %s', self.databasePath)
+                    self.closeConnection(pooledConnection)
+
+    def closeAll(self):
+        with self.condition:
+            for pooledConnection in list(self.connections):
+                self.closeConnection(pooledConnection)
+
+
+class ConnectionPoolManager():
+    '''
+    Process wide registry of ConnectionPool keyed by database path.
+    '''
+    pools = dict()
+    lock = threading.Lock()
+    maxSize = DEFAULT_POOL_SIZE
+    idleTimeout = DEFAULT_IDLE_TIMEOUT
+
+    @classmethod
+    def configure(cls, maxSize=None, idleTimeout=None):
+        with cls.lock:
+            if maxSize:
+                cls.maxSize = maxSize
+            if idleTimeout:
+                cls.idleTimeout = idleTimeout
+            for pool in cls.pools.values():
+                pool.maxSize = cls.maxSize
+                pool.idleTimeout = cls.idleTimeout
+
+    @classmethod
+    def getPool(cls, databasePath=None):
+        key = os.path.normcase(os.path.abspath(databasePath))
+        with cls.lock:
+            pool = cls.pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(databasePath=os.path.abspath(databasePath), maxSize=cls.maxSize, idleTimeout=cls.idleTimeout)
+                cls.pools[key] = pool
+            otherPools = [p for p in cls.pools.values() if p is not pool]
+        for otherPool in otherPools:
+            otherPool.evictIdle()
+        return pool
+
+    @classmethod
+    def lease(cls, databasePath=None):
+        return cls.getPool(databasePath).lease()
+
+    @classmethod
+    def release(cls, databasePath=None, conn=None):
+        cls.getPool(databasePath).release(conn)
+
+    @classmethod
+    def closeAll(cls):
+        with cls.lock:
+            pools = list(cls.pools.values())
+        for pool in pools:
+            pool.closeAll()
@@ -0,0 +1,340 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import base64
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from itertools import repeat
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectExecuteSqlite import ManageSqliteDatabase
+from src.sqlite_executer.ResultCursor import VALUE_TYPES
+from src.sqlite_executer.ResultSet import getTypecode, INTEGER_TYPECODE, REAL_TYPECODE
+try:
+    import zstandard
+except ImportError:  # zstd compression is offered only when zstandard is installed
+    zstandard = None
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # parquet export is offered only when pyarrow is installed
+    pyarrow = None
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+DEFAULT_EXPORT_CHUNK_SIZE = 10000
+PARQUET_ROW_GROUP_SIZE = 100000
+WRITE_BUFFER_SIZE = 1 << 20
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+FILE_EXTENSIONS = {'csv': '.csv', 'jsonl': '.jsonl', 'parquet': '.parquet'}
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+FORMAT_LABELS = {'csv': 'CSV', 'jsonl': 'JSON Lines', 'parquet': 'Parquet'}
+
+
+def getExportFormats():
+    '''
+    @return: list of export formats available in this installation
+    '''
+    return [fileFormat for fileFormat in FILE_EXTENSIONS if fileFormat != 'parquet' or pyarrow is not None]
+
+
+def getCompressions(fileFormat='csv'):
+    '''
+    @return: list of compressions for fileFormat, None for uncompressed
+    '''
+    compressions = [None, 'gzip']
+    if zstandard is not None or fileFormat == 'parquet':
+        compressions.append('zstd')
+    return compressions
+
+
+def getFileName(name=None, fileFormat='csv', compression=None):
+    '''
+    parquet compresses inside the file, other formats get compression extension
+    '''
+    fileName = name + FILE_EXTENSIONS[fileFormat]
+    if compression and fileFormat != 'parquet':
+        fileName += COMPRESSION_EXTENSIONS[compression]
+    return fileName
+
+
+def encodeBlob(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode('ascii')
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def openTextStream(filePath=None, compression=None):
+    if compression == 'gzip':
+        return gzip.open(filePath, 'wt', compresslevel=GZIP_LEVEL, encoding='utf-8', newline='')
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError('zstd compression needs the zstandard package')
+        rawStream = open(filePath, 'wb')
+        compressedStream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(rawStream, closefd=True)
+        return io.TextIOWrapper(io.BufferedWriter(compressedStream, buffer_size=WRITE_BUFFER_SIZE), encoding='utf-8', newline='')
+    return open(filePath, 'w', buffering=WRITE_BUFFER_SIZE, encoding='utf-8', newline='')
+
+
+class ExportStatus():
+    '''
+    Result of one export run.
+    '''
+
+    def __init__(self, filePath=None):
+        self.filePath = filePath
+        self.rowCount = 0
+        self.startTime = time.time()
+        self.endTime = None
+        self.cancelled = False
+        self.error = None
+
+    def getElapsedTime(self):
+        endTime = self.endTime if self.endTime else time.time()
+        return endTime - self.startTime
+
+    def getRowsPerSecond(self):
+        elapsedTime = self.getElapsedTime()
+        if elapsedTime <= 0:
+            return 0
+        return int(self.rowCount / elapsedTime)
+
+    def __str__(self):
+        if self.error:
+            return f"Export failed after {self.rowCount} rows: {self.error}"
+        if self.cancelled:
+            return f"Export cancelled after {self.rowCount} rows, {self.filePath} removed."
+        return f"Total rows {self.rowCount} exported to {self.filePath} in {self.getElapsedTime():.2f} s ({self.getRowsPerSecond()} rows/s)."
+
+
+class CsvExportWriter():
+    '''
+    Rows go to csv.writer.writerows as fetched. Blob values are written base64
+    encoded. Each chunk is checked for blob columns, column by column with the
+    types of its values, a column NULL in the first chunks may hold blobs
+    later.
+    '''
+
+    def __init__(self, filePath=None, headers=None, compression=None, includeHeader=True, delimiter=','):
+        self.stream = openTextStream(filePath, compression)
+        self.writer = csv.writer(self.stream, delimiter=delimiter)
+        if includeHeader:
+            self.writer.writerow(headers)
+
+    def writeRows(self, rows):
+        blobColumns = [col for col, values in enumerate(zip(*rows)) if bytes in set(map(type, values))]
+        if blobColumns:
+            rows = map(self.encodeRow, rows, repeat(blobColumns))
+        self.writer.writerows(rows)
+
+    def encodeRow(self, row, blobColumns=None):
+        row = list(row)
+        for col in blobColumns:
+            if isinstance(row[col], bytes):
+                row[col] = encodeBlob(row[col])
+        return row
+
+    def close(self):
+        self.stream.close()
+
+
+class JsonLinesExportWriter():
+    '''
+    One JSON object per row, keys are the column names. Objects of a chunk are
+    built and encoded by map over the rows, blobs are base64 encoded.
+    '''
+
+    def __init__(self, filePath=None, headers=None, compression=None):
+        self.stream = openTextStream(filePath, compression)
+        self.headers = tuple(headers)
+        self.encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=encodeBlob)
+
+    def writeRows(self, rows):
+        if rows:
+            self.stream.write('\n'.join(map(self.encoder.encode, map(dict, map(zip, repeat(self.headers), rows)))))
+            self.stream.write('\n')
+
+    def close(self):
+        self.stream.close()
+
+
+class ParquetExportWriter():
+    '''
+    Columnar parquet file written with pyarrow, one row group per
+    PARQUET_ROW_GROUP_SIZE rows. Column types come from declared types.
+    Columns without declared type take the type of their values in the first
+    chunk, text when the types differ. Values of other types in text columns
+    are written as text.
+    '''
+
+    def __init__(self, filePath=None, headers=None, compression=None, columnTypes=None):
+        if pyarrow is None:
+            raise ValueError('parquet export needs the pyarrow package')
+        self.filePath = filePath
+        self.headers = tuple(headers)
+        self.columnTypes = columnTypes
+        self.compression = compression.upper() if compression else 'NONE'
+        self.writer = None
+        self.schema = None
+        self.pendingRows = list()
+
+    def getFieldType(self, col, rows):
+        columnType = self.columnTypes[col] if self.columnTypes and col < len(self.columnTypes) else None
+        if not columnType:
+            valueTypes = {type(row[col]) for row in rows if row[col] is not None}
+            if valueTypes == {int, float}:
+                valueTypes = {float}
+            columnType = VALUE_TYPES.get(valueTypes.pop(), 'TEXT') if len(valueTypes) == 1 else 'TEXT'
+        typecode = getTypecode(columnType)
+        if typecode == INTEGER_TYPECODE:
+            return pyarrow.int64()
+        if typecode == REAL_TYPECODE:
+            return pyarrow.float64()
+        if 'BLOB' in str(columnType).upper():
+            return pyarrow.binary()
+        return pyarrow.string()
+
+    def writeRows(self, rows):
+        if self.schema is None:
+            self.schema = pyarrow.schema([(str(header), self.getFieldType(col, rows)) for col, header in enumerate(self.headers)])
+            self.writer = pyarrow.parquet.ParquetWriter(self.filePath, self.schema, compression=self.compression)
+        self.pendingRows.extend(rows)
+        if len(self.pendingRows) >= PARQUET_ROW_GROUP_SIZE:
+            self.writeRowGroup()
+
+    def writeRowGroup(self):
+        if not self.pendingRows:
+            return
+        columns = list(zip(*self.pendingRows))
+        self.pendingRows = list()
+        arrays = list()
+        for col, field in enumerate(self.schema):
+            try:
+                arrays.append(pyarrow.array(columns[col], type=field.type))
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, TypeError, OverflowError) as e:
+                if field.type != pyarrow.string():
+                    raise ValueError(f'column {field.name} has values not matching {field.type}, export as CSV or JSON Lines: {e}')
+                arrays.append(pyarrow.array([value if value is None or isinstance(value, str) else str(value) for value in columns[col]], type=field.type))
+        self.writer.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        try:
+            self.writeRowGroup()
+        finally:
+            if self.writer:
+                self.writer.close()
+            elif self.schema is None:
+                # empty result, still write a file with the columns
+                pyarrow.parquet.write_table(pyarrow.table({str(header): pyarrow.array([], type=pyarrow.string()) for header in self.headers}), self.filePath)
+
+
+class DataExporter():
+    '''
+    Streaming export of a table or query. Rows are read with fetchmany in
+    chunks of chunkSize and handed to the writer as they are, the result is
+    never held in memory.
+
+    @param connectionName: connection name
+    @param databaseAbsolutePath: database file path
+    @param chunkSize: number of rows fetched and written at once
+    @param onProgress: callable(exportStatus) called after each chunk
+    '''
+
+    def __init__(self, connectionName=None, databaseAbsolutePath=None, chunkSize=DEFAULT_EXPORT_CHUNK_SIZE, onProgress=None):
+        self.connectionName = connectionName
+        self.databaseAbsolutePath = databaseAbsolutePath
+        self.chunkSize = chunkSize
+        self.onProgress = onProgress
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def createWriter(self, filePath=None, headers=None, fileFormat='csv', compression=None, columnTypes=None):
+        if fileFormat == 'csv':
+            return CsvExportWriter(filePath=filePath, headers=headers, compression=compression)
+        if fileFormat == 'jsonl':
+            return JsonLinesExportWriter(filePath=filePath, headers=headers, compression=compression)
+        if fileFormat == 'parquet':
+            return ParquetExportWriter(filePath=filePath, headers=headers, compression=compression, columnTypes=columnTypes)
+        raise ValueError(f'unknown export format: {fileFormat}')
+
+    def exportTable(self, tableName=None, filePath=None, fileFormat='csv', compression=None):
+        '''
+        @return: ExportStatus
+        '''
+        return self.exportQuery(sqlText='SELECT * FROM "{}"'.format(tableName.replace('"', '""')), filePath=filePath, fileFormat=fileFormat, compression=compression)
+
+    def exportQuery(self, sqlText=None, filePath=None, fileFormat='csv', compression=None):
+        '''
+        @return: ExportStatus
+        '''
+        exportStatus = ExportStatus(filePath=filePath)
+        try:
+            with ManageSqliteDatabase(connectionName=self.connectionName, databaseAbsolutePath=self.databaseAbsolutePath) as manageSqliteDatabase:
+                cursor = manageSqliteDatabase.conn.execute(sqlText)
+                try:
+                    if not cursor.description:
+                        raise ValueError('statement returns no rows to export')
+                    headers = tuple(desc[0] for desc in cursor.description)
+                    columnTypes = None
+                    if fileFormat == 'parquet':
+                        columnTypes = manageSqliteDatabase.getSchemaCatalog().getResultColumnTypes(sqlText=sqlText, headers=headers)
+                    chunks = iter(lambda: cursor.fetchmany(self.chunkSize), [])
+                    self.writeChunks(exportStatus, headers, chunks, fileFormat=fileFormat, compression=compression, columnTypes=columnTypes)
+                finally:
+                    cursor.close()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            exportStatus.error = e
+        self.finish(exportStatus)
+        return exportStatus
+
+    def exportRows(self, headers=None, rows=None, filePath=None, fileFormat='csv', compression=None, columnTypes=None):
+        '''
+        export rows already fetched, as a result grid holds them.
+        @param rows: iterable of row tuples
+        @return: ExportStatus
+        '''
+        exportStatus = ExportStatus(filePath=filePath)
+        rows = iter(rows)
+        chunks = iter(lambda: [row for _, row in zip(range(self.chunkSize), rows)], [])
+        try:
+            self.writeChunks(exportStatus, headers, chunks, fileFormat=fileFormat, compression=compression, columnTypes=columnTypes)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            exportStatus.error = e
+        self.finish(exportStatus)
+        return exportStatus
+
+    def writeChunks(self, exportStatus, headers=None, chunks=None, fileFormat='csv', compression=None, columnTypes=None):
+        writer = self.createWriter(filePath=exportStatus.filePath, headers=headers, fileFormat=fileFormat, compression=compression, columnTypes=columnTypes)
+        try:
+            for chunk in chunks:
+                if self.cancelled:
+                    exportStatus.cancelled = True
+                    break
+                writer.writeRows(chunk)
+                exportStatus.rowCount += len(chunk)
+                if self.onProgress:
+                    self.onProgress(exportStatus)
+        finally:
+            writer.close()
+
+    def finish(self, exportStatus):
+        exportStatus.endTime = time.time()
+        if (exportStatus.cancelled or exportStatus.error) and exportStatus.filePath and os.path.exists(exportStatus.filePath):
+            # partial file is not a valid export
+            try:
+                os.remove(exportStatus.filePath)
+            except OSError as e:
+                logger.error(e, exc_info=True)
+        logger.info(str(exportStatus))
@@ -0,0 +1,557 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import difflib
+import hashlib
+import pickle
+import re
+import time
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectExecuteSqlite import ManageSqliteDatabase
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+COMPARE_RANGE_SIZE = 10000
+SCRIPT_CHUNK_SIZE = 500
+ROW_DIFFERENCE_LIMIT = 100
+COMPARED_PRAGMAS = ('encoding', 'page_size', 'auto_vacuum', 'journal_mode', 'user_version', 'application_id')
+# other compared pragmas need a VACUUM or a new database file to change
+SETTABLE_PRAGMAS = ('journal_mode', 'user_version', 'application_id')
+SOURCE_ONLY = 'only in source'
+TARGET_ONLY = 'only in target'
+CHANGED = 'changed'
+CREATE_ORDER = ('table', 'index', 'view', 'trigger')
+# ALTER TABLE ADD COLUMN can not add these
+ADD_COLUMN_CONSTRAINT_PATTERN = re.compile(r'\b(PRIMARY\s+KEY|UNIQUE)\b', re.IGNORECASE)
+OLD_TABLE_SUFFIX = '__old'
+
+
+def quoteName(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def normalizeSql(sql):
+    return ' '.join(sql.split()) if sql else sql
+
+
+def toSqlLiteral(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value) if value == value and abs(value) != float('inf') else ('9e999' if value > 0 else '-9e999')
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "X'{}'".format(bytes(value).hex())
+    return "'{}'".format(str(value).replace("'", "''"))
+
+
+def splitDefinitions(text):
+    '''
+    split column definitions on commas outside of parentheses and quotes.
+    '''
+    definitions, depth, quote, start = list(), 0, None, 0
+    for position, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"`[':
+            quote = ']' if char == '[' else char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            definitions.append(text[start:position].strip())
+            start = position + 1
+    definitions.append(text[start:].strip())
+    return definitions
+
+
+def getRangeDigest(rows):
+    '''
+    pickle keeps the storage class apart, 1 and 1.0 give different digests.
+    '''
+    return hashlib.blake2b(pickle.dumps(rows, protocol=4), digest_size=16).digest()
+
+
+def isRowChanged(sourceRow, targetRow):
+    return sourceRow != targetRow or list(map(type, sourceRow)) != list(map(type, targetRow))
+
+
+class SchemaDifference():
+    '''
+    One table, index, view, trigger or pragma that differs.
+
+    @param objectType: table, index, view, trigger or pragma
+    @param status: SOURCE_ONLY, TARGET_ONLY or CHANGED
+    @param sourceSql: create statement or pragma value in source
+    @param targetSql: create statement or pragma value in target
+    '''
+
+    def __init__(self, objectType=None, name=None, status=None, sourceSql=None, targetSql=None, tableName=None):
+        self.objectType = objectType
+        self.name = name
+        self.status = status
+        self.sourceSql = sourceSql
+        self.targetSql = targetSql
+        self.tableName = tableName
+
+    def getDiffText(self):
+        sourceLines = str(self.sourceSql).splitlines() if self.sourceSql is not None else []
+        targetLines = str(self.targetSql).splitlines() if self.targetSql is not None else []
+        return '\n'.join(difflib.unified_diff(targetLines, sourceLines, fromfile='target', tofile='source', lineterm=''))
+
+    def __repr__(self):
+        return f'SchemaDifference(objectType={self.objectType}, name={self.name}, status={self.status})'
+
+
+class TableDataDifference():
+    '''
+    Rows of one table that differ, by primary key. Tables without primary
+    key are compared by rowid.
+
+    @param keyColumns: primary key columns, or ['rowid']
+    @param columns: key columns followed by the other columns of both tables
+    '''
+
+    def __init__(self, tableName=None, keyColumns=None, columns=None):
+        self.tableName = tableName
+        self.keyColumns = keyColumns
+        self.columns = columns
+        self.sourceOnlyKeys = list()
+        self.targetOnlyKeys = list()
+        self.changedKeys = list()
+        self.sourceRowCount = 0
+        self.targetRowCount = 0
+        self.rangeCount = 0
+        self.changedRangeCount = 0
+        self.skipReason = None
+
+    def hasDifferences(self):
+        return bool(self.sourceOnlyKeys or self.targetOnlyKeys or self.changedKeys)
+
+    def __str__(self):
+        if self.skipReason:
+            return f'{self.tableName}: data not compared, {self.skipReason}'
+        return (f'{self.tableName}: {len(self.sourceOnlyKeys)} rows only in source, {len(self.targetOnlyKeys)} rows only in target, '
+                f'{len(self.changedKeys)} rows changed ({self.changedRangeCount} of {self.rangeCount} ranges differ)')
+
+
+class CompareResult():
+    '''
+    Schema and data differences of source and target database. A migration
+    script made from it changes target into source.
+    '''
+
+    def __init__(self, sourcePath=None, targetPath=None):
+        self.sourcePath = sourcePath
+        self.targetPath = targetPath
+        self.sourceObjects = dict()
+        self.targetObjects = dict()
+        self.sourceColumns = dict()
+        self.targetColumns = dict()
+        self.schemaDifferences = list()
+        self.dataDifferences = dict()
+        self.tableName = None
+        self.rowCount = 0
+        self.startTime = time.time()
+        self.endTime = None
+        self.cancelled = False
+        self.error = None
+
+    def getElapsedTime(self):
+        endTime = self.endTime if self.endTime else time.time()
+        return endTime - self.startTime
+
+    def getRowsPerSecond(self):
+        elapsedTime = self.getElapsedTime()
+        if elapsedTime <= 0:
+            return 0
+        return int(self.rowCount / elapsedTime)
+
+    def getSchemaDifference(self, objectType=None, name=None):
+        for schemaDifference in self.schemaDifferences:
+            if schemaDifference.objectType == objectType and schemaDifference.name == name:
+                return schemaDifference
+        return None
+
+    def hasDifferences(self):
+        return bool(self.schemaDifferences) or any(dataDifference.hasDifferences() for dataDifference in self.dataDifferences.values())
+
+    def __str__(self):
+        if self.error:
+            return f"Compare failed: {self.error}"
+        if self.cancelled:
+            return f"Compare cancelled after {self.rowCount} rows."
+        changedTables = sum(1 for dataDifference in self.dataDifferences.values() if dataDifference.hasDifferences())
+        return (f"{len(self.schemaDifferences)} schema differences, {changedTables} of {len(self.dataDifferences)} tables with data differences, "
+                f"{self.rowCount} rows compared in {self.getElapsedTime():.2f} s ({self.getRowsPerSecond()} rows/s).")
+
+
+class DatabaseCompare():
+    '''
+    Compares schema and data of two databases.
+
+    Schema comes from sqlite_master and table_info of each database, along
+    with the COMPARED_PRAGMAS. Data of tables present in both is compared by
+    primary key in ranges of rangeSize source rows, read with keyset queries
+    on both sides. Each range is reduced to a digest and dropped, only ranges
+    whose digests differ are read again and compared row by row. Memory use
+    is one range, and equal ranges never reach the row comparison.
+
+    @param rangeSize: number of source rows hashed as one range
+    @param onProgress: callable(compareResult) called after each range
+    '''
+
+    def __init__(self, sourceConnectionName=None, sourcePath=None, targetConnectionName=None, targetPath=None,
+                 rangeSize=COMPARE_RANGE_SIZE, onProgress=None):
+        self.sourceConnectionName = sourceConnectionName
+        self.sourcePath = sourcePath
+        self.targetConnectionName = targetConnectionName
+        self.targetPath = targetPath
+        self.rangeSize = rangeSize
+        self.onProgress = onProgress
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def openSource(self):
+        return ManageSqliteDatabase(connectionName=self.sourceConnectionName, databaseAbsolutePath=self.sourcePath)
+
+    def openTarget(self):
+        return ManageSqliteDatabase(connectionName=self.targetConnectionName, databaseAbsolutePath=self.targetPath)
+
+    def compare(self, compareData=True):
+        '''
+        @param compareData: compare rows of tables present in both databases
+        @return: CompareResult
+        '''
+        result = CompareResult(sourcePath=self.sourcePath, targetPath=self.targetPath)
+        try:
+            with self.openSource() as source, self.openTarget() as target:
+                self.comparePragmas(source.conn, target.conn, result)
+                self.compareSchema(source, target, result)
+                if compareData:
+                    for tableName in sorted(result.sourceObjects['table']):
+                        if self.cancelled:
+                            result.cancelled = True
+                            break
+                        if tableName in result.targetObjects['table']:
+                            result.dataDifferences[tableName] = self.compareTableData(source.conn, target.conn, tableName, result)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            result.error = e
+        result.endTime = time.time()
+        logger.info(str(result))
+        return result
+
+    def comparePragmas(self, sourceConn, targetConn, result):
+        for pragma in COMPARED_PRAGMAS:
+            sourceValue = sourceConn.execute(f'PRAGMA {pragma}').fetchone()[0]
+            targetValue = targetConn.execute(f'PRAGMA {pragma}').fetchone()[0]
+            if sourceValue != targetValue:
+                result.schemaDifferences.append(SchemaDifference('pragma', pragma, CHANGED, sourceSql=sourceValue, targetSql=targetValue))
+
+    def compareSchema(self, source, target, result):
+        for catalog, objects, columns in ((source.getSchemaCatalog(), result.sourceObjects, result.sourceColumns),
+                                          (target.getSchemaCatalog(), result.targetObjects, result.targetColumns)):
+            for objectType in CREATE_ORDER:
+                objects[objectType] = dict()
+            for sqlType in catalog.getSqlObjects():
+                if sqlType.type in objects and sqlType.sql:
+                    objects[sqlType.type][sqlType.name] = sqlType
+            for tableName in objects['table']:
+                columns[tableName] = catalog.getColumns(tableName)
+
+        for objectType in CREATE_ORDER:
+            sourceObjects, targetObjects = result.sourceObjects[objectType], result.targetObjects[objectType]
+            for name in sorted(set(sourceObjects) | set(targetObjects)):
+                sourceType, targetType = sourceObjects.get(name), targetObjects.get(name)
+                if targetType is None:
+                    status = SOURCE_ONLY
+                elif sourceType is None:
+                    status = TARGET_ONLY
+                elif normalizeSql(sourceType.sql) != normalizeSql(targetType.sql):
+                    status = CHANGED
+                else:
+                    continue
+                result.schemaDifferences.append(SchemaDifference(objectType, name, status,
+                                                                 sourceSql=sourceType.sql if sourceType else None,
+                                                                 targetSql=targetType.sql if targetType else None,
+                                                                 tableName=(sourceType or targetType).tbl_name))
+
+    def getKeyColumns(self, columns):
+        '''
+        @return: primary key column names in key order, ['rowid'] for rowid tables without primary key
+        '''
+        keyColumns = [column.name for column in sorted(columns, key=lambda column: column.primaryKey) if column.primaryKey]
+        return keyColumns if keyColumns else ['rowid']
+
+    def compareTableData(self, sourceConn, targetConn, tableName, result):
+        '''
+        @return: TableDataDifference
+        '''
+        sourceKey = self.getKeyColumns(result.sourceColumns[tableName])
+        targetKey = self.getKeyColumns(result.targetColumns[tableName])
+        targetNames = {column.name for column in result.targetColumns[tableName]}
+        columns = sourceKey + [column.name for column in result.sourceColumns[tableName] if column.name in targetNames and column.name not in sourceKey]
+        tableDifference = TableDataDifference(tableName=tableName, keyColumns=sourceKey, columns=columns)
+        if sourceKey != targetKey:
+            tableDifference.skipReason = 'primary keys differ'
+            return tableDifference
+
+        result.tableName = tableName
+        keyCount = len(sourceKey)
+        keyText = ', '.join(map(quoteName, sourceKey))
+        keyParams = ', '.join('?' * keyCount)
+        selectText = 'SELECT {} FROM {}'.format(', '.join(map(quoteName, columns)), quoteName(tableName))
+        firstRangeSql = f'{selectText} ORDER BY {keyText} LIMIT ?'
+        nextRangeSql = f'{selectText} WHERE ({keyText}) > ({keyParams}) ORDER BY {keyText} LIMIT ?'
+        firstBoundedSql = f'{selectText} WHERE ({keyText}) <= ({keyParams}) ORDER BY {keyText}'
+        nextBoundedSql = f'{selectText} WHERE ({keyText}) > ({keyParams}) AND ({keyText}) <= ({keyParams}) ORDER BY {keyText}'
+
+        def getSourceRange(conn, lastKey):
+            if lastKey is None:
+                return conn.execute(firstRangeSql, (self.rangeSize,)).fetchall()
+            return conn.execute(nextRangeSql, lastKey + (self.rangeSize,)).fetchall()
+
+        def getTargetRange(lastKey, rangeEnd):
+            if lastKey is None:
+                return targetConn.execute(firstBoundedSql, rangeEnd).fetchall()
+            return targetConn.execute(nextBoundedSql, lastKey + rangeEnd).fetchall()
+
+        lastKey = None
+        while not self.cancelled:
+            sourceRows = getSourceRange(sourceConn, lastKey)
+            if not sourceRows:
+                break
+            rangeEnd = sourceRows[-1][:keyCount]
+            sourceCount, sourceDigest = len(sourceRows), getRangeDigest(sourceRows)
+            del sourceRows
+            targetRows = getTargetRange(lastKey, rangeEnd)
+            targetCount, targetDigest = len(targetRows), getRangeDigest(targetRows)
+            del targetRows
+            tableDifference.rangeCount += 1
+            if sourceDigest != targetDigest:
+                # drill down into the differing range only
+                tableDifference.changedRangeCount += 1
+                self.diffRange(tableDifference, getSourceRange(sourceConn, lastKey), getTargetRange(lastKey, rangeEnd), keyCount)
+            tableDifference.sourceRowCount += sourceCount
+            tableDifference.targetRowCount += targetCount
+            result.rowCount += sourceCount
+            lastKey = rangeEnd
+            if self.onProgress:
+                self.onProgress(result)
+
+        # target rows after the last source key
+        while not self.cancelled:
+            targetRows = getSourceRange(targetConn, lastKey)
+            if not targetRows:
+                break
+            tableDifference.rangeCount += 1
+            tableDifference.changedRangeCount += 1
+            tableDifference.targetRowCount += len(targetRows)
+            tableDifference.targetOnlyKeys.extend(row[:keyCount] for row in targetRows)
+            lastKey = targetRows[-1][:keyCount]
+            if self.onProgress:
+                self.onProgress(result)
+        if self.cancelled:
+            result.cancelled = True
+        logger.debug(str(tableDifference))
+        return tableDifference
+
+    def diffRange(self, tableDifference, sourceRows, targetRows, keyCount):
+        sourceByKey = {row[:keyCount]: row for row in sourceRows}
+        for targetRow in targetRows:
+            key = targetRow[:keyCount]
+            sourceRow = sourceByKey.pop(key, None)
+            if sourceRow is None:
+                tableDifference.targetOnlyKeys.append(key)
+            elif isRowChanged(sourceRow, targetRow):
+                tableDifference.changedKeys.append(key)
+        tableDifference.sourceOnlyKeys.extend(sourceByKey)
+
+    def getRowsByKeys(self, conn, tableName=None, columns=None, keyColumns=None, keys=None):
+        '''
+        @return: generator of rows of keys, in chunks of SCRIPT_CHUNK_SIZE keys
+        '''
+        keyText = ', '.join(map(quoteName, keyColumns))
+        keyParams = '({})'.format(', '.join('?' * len(keyColumns)))
+        selectText = 'SELECT {} FROM {}'.format(', '.join(map(quoteName, columns)), quoteName(tableName))
+        for start in range(0, len(keys), SCRIPT_CHUNK_SIZE):
+            chunk = keys[start:start + SCRIPT_CHUNK_SIZE]
+            sqlText = '{} WHERE ({}) IN (VALUES {}) ORDER BY {}'.format(selectText, keyText, ', '.join([keyParams] * len(chunk)), keyText)
+            yield from conn.execute(sqlText, [value for key in chunk for value in key])
+
+    def getRowDifferences(self, result, tableName=None, limit=ROW_DIFFERENCE_LIMIT):
+        '''
+        differing rows of a table for display.
+        @return: (columns, list of (status, sourceRow, targetRow))
+        '''
+        tableDifference = result.dataDifferences[tableName]
+        columns, keyColumns = tableDifference.columns, tableDifference.keyColumns
+        rowDifferences = list()
+        with self.openSource() as source, self.openTarget() as target:
+            for status, keys in ((CHANGED, tableDifference.changedKeys), (SOURCE_ONLY, tableDifference.sourceOnlyKeys), (TARGET_ONLY, tableDifference.targetOnlyKeys)):
+                keys = keys[:max(limit - len(rowDifferences), 0)]
+                if not keys:
+                    continue
+                keyCount = len(keyColumns)
+                sourceRows = {row[:keyCount]: row for row in self.getRowsByKeys(source.conn, tableName, columns, keyColumns, keys)} if status != TARGET_ONLY else dict()
+                targetRows = {row[:keyCount]: row for row in self.getRowsByKeys(target.conn, tableName, columns, keyColumns, keys)} if status != SOURCE_ONLY else dict()
+                for key in keys:
+                    rowDifferences.append((status, sourceRows.get(key), targetRows.get(key)))
+        return columns, rowDifferences
+
+    def getMigrationScript(self, result, sourceConn):
+        '''
+        Statements changing target into source. Foreign keys are off while the
+        script runs. Tables with changed columns are rebuilt from the source
+        definition, or get ALTER TABLE ADD COLUMN when source only appends
+        columns. Triggers are created after the data statements so they do
+        not fire for them. New columns of rows equal in both databases keep
+        their default value.
+        @return: generator of statement text
+        '''
+        sourceObjects = result.sourceObjects
+        differences = {objectType: [d for d in result.schemaDifferences if d.objectType == objectType] for objectType in CREATE_ORDER + ('pragma',)}
+        rebuiltTables = list()
+        alteredColumns = dict()
+        for difference in differences['table']:
+            if difference.status == CHANGED:
+                addedColumns = self.getAddedColumns(result, difference.name)
+                if addedColumns is None:
+                    rebuiltTables.append(difference.name)
+                else:
+                    alteredColumns[difference.name] = addedColumns
+
+        yield f'-- Migration of {result.targetPath}\n-- to {result.sourcePath}'
+        if rebuiltTables:
+            yield 'PRAGMA legacy_alter_table = ON;'
+        yield 'PRAGMA foreign_keys = OFF;'
+        yield 'BEGIN TRANSACTION;'
+
+        for objectType in reversed(CREATE_ORDER[1:]):
+            for difference in differences[objectType]:
+                if difference.status in (TARGET_ONLY, CHANGED):
+                    yield f'DROP {objectType.upper()} IF EXISTS {quoteName(difference.name)};'
+        for difference in differences['table']:
+            if difference.status == TARGET_ONLY:
+                yield f'DROP TABLE IF EXISTS {quoteName(difference.name)};'
+
+        for difference in differences['table']:
+            if difference.status == SOURCE_ONLY:
+                yield difference.sourceSql + ';'
+            elif difference.name in alteredColumns:
+                for definition in alteredColumns[difference.name]:
+                    yield f'ALTER TABLE {quoteName(difference.name)} ADD COLUMN {definition};'
+        for tableName in rebuiltTables:
+            yield from self.getRebuildStatements(result, tableName)
+
+        for difference in differences['table']:
+            if difference.status == SOURCE_ONLY:
+                sourceColumns = [column.name for column in result.sourceColumns[difference.name]]
+                yield from self.getInsertStatements(sourceConn.execute('SELECT {} FROM {}'.format(', '.join(map(quoteName, sourceColumns)), quoteName(difference.name))),
+                                                    difference.name, sourceColumns)
+        for tableName, tableDifference in sorted(result.dataDifferences.items()):
+            if tableDifference.hasDifferences():
+                yield from self.getDataStatements(result, sourceConn, tableDifference)
+
+        for objectType in CREATE_ORDER[1:]:
+            names = [difference.name for difference in differences[objectType] if difference.status in (SOURCE_ONLY, CHANGED)]
+            # indexes and triggers of rebuilt tables went with the old table
+            names += [name for name, sqlType in sourceObjects[objectType].items()
+                      if sqlType.tbl_name in rebuiltTables and objectType in ('index', 'trigger') and name not in names]
+            for name in names:
+                yield sourceObjects[objectType][name].sql + ';'
+
+        yield 'PRAGMA foreign_key_check;'
+        yield 'COMMIT;'
+        yield 'PRAGMA foreign_keys = ON;'
+        if rebuiltTables:
+            yield 'PRAGMA legacy_alter_table = OFF;'
+        for difference in differences['pragma']:
+            if difference.name in SETTABLE_PRAGMAS:
+                yield f'PRAGMA {difference.name} = {difference.sourceSql};'
+            else:
+                yield f'-- PRAGMA {difference.name} is {difference.sourceSql} in source and {difference.targetSql} in target, it needs a new database file or VACUUM'
+
+    def getAddedColumns(self, result, tableName):
+        '''
+        Source definition must be the target definition with column
+        definitions appended, as ALTER TABLE ADD COLUMN leaves it.
+        @return: list of appended column definitions, None when table needs a rebuild
+        '''
+        sourceColumns, targetColumns = result.sourceColumns[tableName], result.targetColumns[tableName]
+        if len(sourceColumns) <= len(targetColumns):
+            return None
+        sourceSql = normalizeSql(result.sourceObjects['table'][tableName].sql).rstrip(' ;')
+        targetSql = normalizeSql(result.targetObjects['table'][tableName].sql).rstrip(' ;')
+        if not sourceSql.endswith(')') or not targetSql.endswith(')'):
+            return None
+        prefix = targetSql[:-1].rstrip()
+        appended = sourceSql[:-1]
+        if not appended.startswith(prefix) or not appended[len(prefix):].lstrip().startswith(','):
+            return None
+        definitions = splitDefinitions(appended[len(prefix):].lstrip()[1:])
+        addedColumns = sourceColumns[len(targetColumns):]
+        if len(definitions) != len(addedColumns):
+            return None
+        for column, definition in zip(addedColumns, definitions):
+            if column.primaryKey or (column.nullable and column.defultValue is None) or ADD_COLUMN_CONSTRAINT_PATTERN.search(definition):
+                return None
+        return definitions
+
+    def getRebuildStatements(self, result, tableName):
+        '''
+        rename target table, create source definition and copy common columns.
+        '''
+        oldName = tableName + OLD_TABLE_SUFFIX
+        sourceNames = [column.name for column in result.sourceColumns[tableName]]
+        commonNames = ', '.join(quoteName(column.name) for column in result.targetColumns[tableName] if column.name in sourceNames)
+        yield f'ALTER TABLE {quoteName(tableName)} RENAME TO {quoteName(oldName)};'
+        yield result.sourceObjects['table'][tableName].sql + ';'
+        if commonNames:
+            yield f'INSERT INTO {quoteName(tableName)} ({commonNames}) SELECT {commonNames} FROM {quoteName(oldName)};'
+        yield f'DROP TABLE {quoteName(oldName)};'
+
+    def getInsertStatements(self, rows, tableName, columns):
+        insertText = 'INSERT INTO {} ({}) VALUES'.format(quoteName(tableName), ', '.join(map(quoteName, columns)))
+        for row in rows:
+            yield '{} ({});'.format(insertText, ', '.join(map(toSqlLiteral, row)))
+
+    def getKeyCondition(self, keyColumns, key):
+        return ' AND '.join(f'{quoteName(name)} = {toSqlLiteral(value)}' for name, value in zip(keyColumns, key))
+
+    def getDataStatements(self, result, sourceConn, tableDifference):
+        tableName, keyColumns = tableDifference.tableName, tableDifference.keyColumns
+        for key in tableDifference.targetOnlyKeys:
+            yield f'DELETE FROM {quoteName(tableName)} WHERE {self.getKeyCondition(keyColumns, key)};'
+        # rows get all source columns, including columns target does not have yet
+        columns = keyColumns + [column.name for column in result.sourceColumns[tableName] if column.name not in keyColumns]
+        keyCount = len(keyColumns)
+        for row in self.getRowsByKeys(sourceConn, tableName, columns, keyColumns, tableDifference.changedKeys):
+            assignments = ', '.join(f'{quoteName(name)} = {toSqlLiteral(value)}' for name, value in zip(columns[keyCount:], row[keyCount:]))
+            if assignments:
+                yield f'UPDATE {quoteName(tableName)} SET {assignments} WHERE {self.getKeyCondition(keyColumns, row[:keyCount])};'
+        yield from self.getInsertStatements(self.getRowsByKeys(sourceConn, tableName, columns, keyColumns, tableDifference.sourceOnlyKeys), tableName, columns)
+
+    def writeMigrationScript(self, result, filePath=None):
+        '''
+        @return: number of statements written
+        '''
+        statementCount = 0
+        with self.openSource() as source, open(filePath, 'w', encoding='utf-8') as scriptFile:
+            for statement in self.getMigrationScript(result, source.conn):
+                if self.cancelled:
+                    break
+                scriptFile.write(statement)
+                scriptFile.write('\n')
+                statementCount += 1
+        return statementCount
@@ -0,0 +1,505 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import math
+import re
+import sqlite3
+import time
+import sqlparse
+from sqlparse import tokens as T
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectExecuteSqlite import ManageSqliteDatabase
+from src.sqlite_executer.ConnectionPool import ConnectionPoolManager
+from src.sqlite_executer.SqlHistoryWriter import SqlHistoryWriter
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+# statements averaging less than this many seconds are not worth an index
+SLOW_STATEMENT_DURATION = 0.01
+WORKLOAD_LIMIT = 500
+RECOMMENDATION_LIMIT = 20
+EQUALITY_OPERATORS = ('=', '==', 'IN', 'IS')
+RANGE_OPERATORS = ('<', '>', '<=', '>=', 'BETWEEN')
+CONDITION_KEYWORDS = ('WHERE', 'ON')
+ORDER_KEYWORDS = ('ORDER BY', 'GROUP BY')
+TABLE_KEYWORDS = ('FROM', 'UPDATE', 'JOIN')
+# rows a lookup is assumed to return, as the sqlite planner assumes without statistics
+EQUALITY_ROWS = 10
+RANGE_FRACTION = 0.25
+ADVISOR_INDEX_NAME = 'advisor_candidate'
+# table name or alias, sqlite before 3.36 prints "SCAN TABLE name AS alias"
+PLAN_STEP_PATTERN = re.compile(r'^(SCAN|SEARCH) (?:TABLE )?(\S+)(?: AS (\S+))?(?: USING (.*?))?(?: \((.*)\))?$')
+
+
+def getKeyword(token):
+    return ' '.join(token.value.upper().split())
+
+
+def getName(token):
+    value = token.value
+    if value[0] in '"`[':
+        return value[1:-1]
+    return value
+
+
+class StatementUsage():
+    '''
+    Columns one statement filters, joins and orders on, by table.
+
+    @param sqlText: statement text as logged
+    @param count: number of runs in sql_log
+    @param totalDuration: seconds of all runs
+    '''
+
+    def __init__(self, sqlText=None, count=0, totalDuration=0):
+        self.sqlText = sqlText
+        self.count = count
+        self.totalDuration = totalDuration
+        self.fingerprint = None
+        self.tables = dict()
+        self.equalityColumns = dict()
+        self.rangeColumns = dict()
+        self.orderColumns = dict()
+
+    def getTableNames(self):
+        return set(self.tables.values())
+
+    def addColumn(self, columns, tableName, columnName):
+        tableColumns = columns.setdefault(tableName, list())
+        if columnName not in tableColumns:
+            tableColumns.append(columnName)
+
+    def getCandidates(self):
+        '''
+        Equality columns first, then one range column or the order by
+        columns, the column order sqlite can use an index in.
+        @return: set of (table name, tuple of columns)
+        '''
+        candidates = set()
+        for tableName in self.getTableNames():
+            equalityColumns = self.equalityColumns.get(tableName, [])
+            for columnName in equalityColumns:
+                candidates.add((tableName, (columnName,)))
+            if len(equalityColumns) > 1:
+                candidates.add((tableName, tuple(equalityColumns)))
+            for columnName in self.rangeColumns.get(tableName, []):
+                if columnName not in equalityColumns:
+                    candidates.add((tableName, tuple(equalityColumns) + (columnName,)))
+            orderColumns = [columnName for columnName in self.orderColumns.get(tableName, []) if columnName not in equalityColumns]
+            if orderColumns:
+                candidates.add((tableName, tuple(equalityColumns + orderColumns)))
+        return candidates
+
+
+class WorkloadParser():
+    '''
+    Finds columns of WHERE, JOIN ON and ORDER BY / GROUP BY of a statement
+    from its sqlparse tokens. Column references are resolved to tables with
+    the aliases of FROM, JOIN and UPDATE and the table columns of the schema.
+
+    @param tableColumns: dict of table name to list of column names
+    '''
+
+    def __init__(self, tableColumns=None):
+        self.tableColumns = tableColumns
+        self.tableNames = {tableName.lower(): tableName for tableName in tableColumns}
+
+    def parse(self, statementUsage):
+        tokens = [token for token in sqlparse.parse(statementUsage.sqlText)[0].flatten() if not token.is_whitespace and token.ttype not in T.Comment]
+        statementUsage.fingerprint = ' '.join('?' if token.ttype in T.Literal and token.ttype not in T.String.Symbol else token.value.lower() for token in tokens)
+        self.findTables(statementUsage, tokens)
+        if not statementUsage.tables:
+            return statementUsage
+        clause = None
+        for index, token in enumerate(tokens):
+            if token.is_keyword and token.ttype in (T.Keyword, T.Keyword.DML):
+                keyword = getKeyword(token)
+                if keyword in CONDITION_KEYWORDS or keyword in ORDER_KEYWORDS:
+                    clause = keyword
+                    continue
+                if keyword not in ('AND', 'OR', 'NOT', 'IN', 'IS', 'BETWEEN', 'NULL', 'ASC', 'DESC') and not self.isColumnToken(statementUsage, token):
+                    clause = None
+            if clause is None:
+                continue
+            column = self.getColumnReference(statementUsage, tokens, index)
+            if column is None:
+                continue
+            tableName, columnName, nextIndex = column
+            if clause in ORDER_KEYWORDS:
+                statementUsage.addColumn(statementUsage.orderColumns, tableName, columnName)
+                continue
+            operator = self.getOperator(tokens, nextIndex)
+            referenceStart = index - 2 if index >= 2 and tokens[index - 1].value == '.' else index
+            previousOperator = self.getOperator(tokens, referenceStart - 1)
+            if operator in EQUALITY_OPERATORS or previousOperator in ('=', '=='):
+                statementUsage.addColumn(statementUsage.equalityColumns, tableName, columnName)
+            elif operator in RANGE_OPERATORS or operator == 'LIKE':
+                statementUsage.addColumn(statementUsage.rangeColumns, tableName, columnName)
+        return statementUsage
+
+    def findTables(self, statementUsage, tokens):
+        for index, token in enumerate(tokens[:-1]):
+            if token.is_keyword and (getKeyword(token) in TABLE_KEYWORDS or getKeyword(token).endswith(' JOIN')):
+                nameIndex = index + 1
+                # schema qualified name
+                if nameIndex + 2 < len(tokens) and tokens[nameIndex + 1].value == '.':
+                    nameIndex += 2
+                tableName = self.tableNames.get(getName(tokens[nameIndex]).lower())
+                if tableName is None:
+                    continue
+                statementUsage.tables[tableName.lower()] = tableName
+                aliasIndex = nameIndex + 1
+                if aliasIndex < len(tokens) and tokens[aliasIndex].is_keyword and getKeyword(tokens[aliasIndex]) == 'AS':
+                    aliasIndex += 1
+                if aliasIndex < len(tokens) and tokens[aliasIndex].ttype in (T.Name, T.String.Symbol):
+                    statementUsage.tables[getName(tokens[aliasIndex]).lower()] = tableName
+
+    def isColumnToken(self, statementUsage, token):
+        '''
+        column names like date or type are keyword tokens to sqlparse.
+        '''
+        name = getName(token).lower()
+        return any(name in (columnName.lower() for columnName in self.tableColumns[tableName]) for tableName in statementUsage.getTableNames())
+
+    def getColumnReference(self, statementUsage, tokens, index):
+        '''
+        @return: (table name, column name, index after reference) or None
+        '''
+        token = tokens[index]
+        if token.ttype not in (T.Name, T.String.Symbol) and not (token.is_keyword and self.isColumnToken(statementUsage, token)):
+            return None
+        if index + 1 < len(tokens) and tokens[index + 1].value == '.':
+            # qualifier of a reference, the column follows
+            return None
+        if index >= 2 and tokens[index - 1].value == '.':
+            tableName = statementUsage.tables.get(getName(tokens[index - 2]).lower())
+            tableNames = [tableName] if tableName else []
+        else:
+            tableNames = statementUsage.getTableNames()
+        name = getName(token).lower()
+        for tableName in sorted(tableNames):
+            for columnName in self.tableColumns[tableName]:
+                if columnName.lower() == name:
+                    return tableName, columnName, index + 1
+        return None
+
+    def getOperator(self, tokens, index):
+        if 0 <= index < len(tokens):
+            token = tokens[index]
+            if token.ttype in T.Operator.Comparison or (token.is_keyword and getKeyword(token) in ('IN', 'IS', 'BETWEEN', 'LIKE', 'GLOB')):
+                return getKeyword(token)
+        return None
+
+
+class IndexRecommendation():
+    '''
+    Index proposed by IndexAdvisor with the statements it helps.
+    '''
+
+    def __init__(self, tableName=None, columns=None):
+        self.tableName = tableName
+        self.columns = columns
+        self.savedTime = 0
+        self.statements = list()
+
+    def getIndexName(self):
+        return 'idx_{}_{}'.format(self.tableName, '_'.join(self.columns)).lower().replace(' ', '_')
+
+    def getCreateSql(self):
+        return 'CREATE INDEX IF NOT EXISTS {} ON {} ({});'.format(quoteName(self.getIndexName()), quoteName(self.tableName), ', '.join(map(quoteName, self.columns)))
+
+    def getText(self):
+        lines = [self.getCreateSql(), f'Estimated time saved: {self.savedTime:.3f} s over {len(self.statements)} statements', '']
+        for statementUsage, planBefore, planAfter, savedTime in self.statements:
+            lines += [f'{statementUsage.count} runs, {statementUsage.totalDuration:.3f} s, saves {savedTime:.3f} s', statementUsage.sqlText,
+                      '  before: ' + '; '.join(planBefore), '  after:  ' + '; '.join(planAfter), '']
+        return '\n'.join(lines)
+
+
+def quoteName(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+class IndexAdvice():
+    '''
+    Result of one IndexAdvisor run.
+    '''
+
+    def __init__(self):
+        self.recommendations = list()
+        self.statementCount = 0
+        self.startTime = time.time()
+        self.endTime = None
+        self.cancelled = False
+        self.error = None
+
+    def getElapsedTime(self):
+        endTime = self.endTime if self.endTime else time.time()
+        return endTime - self.startTime
+
+    def __str__(self):
+        if self.error:
+            return f'Index advisor failed: {self.error}'
+        if self.cancelled:
+            return 'Index advisor cancelled.'
+        return f'{len(self.recommendations)} indexes recommended from {self.statementCount} slow statements in {self.getElapsedTime():.2f} s.'
+
+
+class IndexAdvisor():
+    '''
+    Recommends indexes from the workload in sql_log.
+
+    Statements of the connection averaging at least minDuration seconds are
+    grouped by text with literals replaced, their WHERE, JOIN ON and ORDER BY
+    columns give candidate indexes. Candidates that are a prefix of an
+    existing index are dropped. Each remaining candidate is created on a
+    schema only copy of the database in memory, with the row counts of the
+    real tables as sqlite_stat1, and the statements on its table are
+    explained before and after. Cost of a plan is estimated from the row
+    counts, the time saved is the total duration of a statement in the
+    same proportion as its cost drops.
+
+    @param minDuration: average seconds of a statement to be mined
+    @param onProgress: callable(text) called per evaluated candidate
+    '''
+
+    def __init__(self, connectionName=None, databaseAbsolutePath=None, minDuration=SLOW_STATEMENT_DURATION, onProgress=None):
+        self.connectionName = connectionName
+        self.databaseAbsolutePath = databaseAbsolutePath
+        self.minDuration = minDuration
+        self.onProgress = onProgress
+        self.cancelled = False
+        self.rowCounts = dict()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def getWorkload(self, limit=WORKLOAD_LIMIT):
+        '''
+        @return: list of StatementUsage, slowest total first
+        '''
+        databasePath = SqlHistoryWriter.getInstance().databasePath
+        conn = ConnectionPoolManager.lease(databasePath)
+        try:
+            rows = conn.execute('''SELECT sql, count(*), sum(duration) FROM sql_log WHERE connection_name = ? AND duration IS NOT NULL
+                GROUP BY sql HAVING avg(duration) >= ? ORDER BY sum(duration) DESC LIMIT ?''', (self.connectionName, self.minDuration, limit)).fetchall()
+        finally:
+            ConnectionPoolManager.release(databasePath, conn)
+        return [StatementUsage(sqlText, count, totalDuration) for sqlText, count, totalDuration in rows]
+
+    def advise(self):
+        '''
+        @return: IndexAdvice
+        '''
+        indexAdvice = IndexAdvice()
+        try:
+            with ManageSqliteDatabase(connectionName=self.connectionName, databaseAbsolutePath=self.databaseAbsolutePath) as manageSqliteDatabase:
+                catalog = manageSqliteDatabase.getSchemaCatalog()
+                tableColumns = {tableName: [column.name for column in catalog.getColumns(tableName)] for tableName in catalog.getTableNames()}
+                statementUsages = self.parseWorkload(self.getWorkload(), tableColumns)
+                indexAdvice.statementCount = len(statementUsages)
+                candidates = self.getCandidates(statementUsages, catalog)
+                # every table of the workload, outer loops of a join are costed by their rows too
+                for tableName in set().union(*(statementUsage.getTableNames() for statementUsage in statementUsages)):
+                    self.rowCounts[tableName] = catalog.getRowCount(manageSqliteDatabase.conn, tableName)
+                scratchConn = self.createScratch(manageSqliteDatabase.conn)
+            try:
+                indexAdvice.recommendations = self.evaluate(scratchConn, candidates, statementUsages)
+            finally:
+                scratchConn.close()
+            indexAdvice.cancelled = self.cancelled
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            indexAdvice.error = e
+        indexAdvice.endTime = time.time()
+        logger.info(str(indexAdvice))
+        return indexAdvice
+
+    def parseWorkload(self, statementUsages, tableColumns):
+        '''
+        statements differing only in literals are merged.
+        @return: list of StatementUsage using at least one table
+        '''
+        workloadParser = WorkloadParser(tableColumns)
+        byFingerprint = dict()
+        for statementUsage in statementUsages:
+            try:
+                workloadParser.parse(statementUsage)
+            except Exception as e:
+                logger.error(e, exc_info=True)
+                continue
+            if not statementUsage.tables:
+                continue
+            merged = byFingerprint.get(statementUsage.fingerprint)
+            if merged:
+                merged.count += statementUsage.count
+                merged.totalDuration += statementUsage.totalDuration
+            else:
+                byFingerprint[statementUsage.fingerprint] = statementUsage
+        return list(byFingerprint.values())
+
+    def getCandidates(self, statementUsages, catalog):
+        '''
+        @return: sorted list of (table name, columns) not covered by an existing index
+        '''
+        candidates = set()
+        for statementUsage in statementUsages:
+            candidates |= statementUsage.getCandidates()
+        existing = dict()
+        for tableName in {tableName for tableName, columns in candidates}:
+            indexColumns = [tuple(indexInfo.columns) for indexInfo in catalog.getIndexes(tableName) if indexInfo.partialIndex in (0, '0')]
+            # INTEGER PRIMARY KEY is the rowid, an index of its own
+            indexColumns += [(column.name,) for column in catalog.getColumns(tableName)
+                             if column.primaryKey == 1 and str(column.dataType).upper() == 'INTEGER']
+            existing[tableName] = indexColumns
+        return sorted((tableName, columns) for tableName, columns in candidates
+                      if not any(indexColumns[:len(columns)] == columns for indexColumns in existing[tableName]))
+
+    def createScratch(self, conn):
+        '''
+        @return: in memory connection with the schema of conn, no rows
+        '''
+        scratchConn = sqlite3.connect(':memory:', check_same_thread=False)
+        rows = conn.execute('''SELECT type, sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'
+            ORDER BY CASE type WHEN 'table' THEN 0 WHEN 'index' THEN 1 ELSE 2 END''').fetchall()
+        for objectType, sql in rows:
+            if objectType == 'trigger':
+                continue
+            try:
+                scratchConn.execute(sql)
+            except sqlite3.Error as e:
+                # virtual tables of modules not loaded here
+                logger.debug('scratch schema: %s %s', e, sql)
+        scratchConn.execute('ANALYZE sqlite_master')
+        scratchConn.execute('DELETE FROM sqlite_stat1')
+        try:
+            scratchConn.executemany('INSERT INTO sqlite_stat1 VALUES (?, ?, ?)', conn.execute('SELECT tbl, idx, stat FROM sqlite_stat1').fetchall())
+        except sqlite3.OperationalError:
+            # database was never analyzed, row counts are enough for the planner
+            scratchConn.executemany('INSERT INTO sqlite_stat1 VALUES (?, NULL, ?)', [(tableName, str(rowCount)) for tableName, rowCount in self.rowCounts.items()])
+        # reloads sqlite_stat1
+        scratchConn.execute('ANALYZE sqlite_master')
+        scratchConn.commit()
+        return scratchConn
+
+    def getPlan(self, scratchConn, sqlText=None):
+        try:
+            return [row[3] for row in scratchConn.execute('EXPLAIN QUERY PLAN ' + sqlText)]
+        except sqlite3.Error as e:
+            logger.debug('explain: %s %s', e, sqlText)
+            return None
+
+    def getTableRows(self, name=None, statementUsage=None):
+        '''
+        @param name: table name or alias of a plan step
+        @return: row count of the table, 1 when unknown
+        '''
+        tableName = statementUsage.tables.get(name.lower(), name) if statementUsage else name
+        rowCounts = {tableName.lower(): rowCount for tableName, rowCount in self.rowCounts.items()}
+        return max(rowCounts.get(tableName.lower(), 1), 1)
+
+    def getPlanCost(self, plan, statementUsage=None):
+        '''
+        Nested loop estimate: each scan or search runs once per row of the
+        loops before it. A temp b-tree sorts the rows found so far.
+        @param statementUsage: resolves the table aliases plan steps are named by
+        '''
+        cost, rows = 0, 1
+        for detail in plan:
+            if detail.startswith('USE TEMP B-TREE'):
+                cost += rows * math.log2(rows + 1)
+                continue
+            match = PLAN_STEP_PATTERN.match(detail)
+            if not match:
+                continue
+            step, tableName, alias, using, constraint = match.groups()
+            tableRows = self.getTableRows(alias or tableName, statementUsage)
+            if step == 'SCAN':
+                cost += rows * tableRows
+                rows *= tableRows
+                continue
+            stepRows = self.getSearchRows(tableRows, using, constraint)
+            cost += rows * (math.log2(tableRows + 1) + stepRows)
+            rows *= stepRows
+        return cost
+
+    def getSearchRows(self, tableRows=1, using=None, constraint=None):
+        '''
+        rows one search finds: the equality prefix of the constraint narrows
+        the table to EQUALITY_ROWS, a range on the next column to
+        RANGE_FRACTION of that.
+        '''
+        terms = constraint.split(' AND ') if constraint else []
+        rangeTerms = [term for term in terms if '<' in term or '>' in term]
+        equalityTerms = [term for term in terms if '=' in term and term not in rangeTerms]
+        if equalityTerms and not rangeTerms and using and ('PRIMARY KEY' in using or 'rowid' in constraint):
+            return 1
+        rows = min(EQUALITY_ROWS, tableRows) if equalityTerms else tableRows
+        if rangeTerms or not equalityTerms:
+            rows = max(rows * RANGE_FRACTION, 1)
+        return rows
+
+    def evaluate(self, scratchConn, candidates, statementUsages):
+        '''
+        @return: list of IndexRecommendation, most time saved first
+        '''
+        plans = dict()
+        for statementUsage in statementUsages:
+            plan = self.getPlan(scratchConn, statementUsage.sqlText)
+            if plan is not None:
+                plans[statementUsage.fingerprint] = (plan, self.getPlanCost(plan, statementUsage))
+        recommendations = list()
+        for position, (tableName, columns) in enumerate(candidates):
+            if self.cancelled:
+                break
+            if self.onProgress:
+                self.onProgress(f'Candidate {position + 1} of {len(candidates)}: {tableName} ({", ".join(columns)})')
+            recommendation = IndexRecommendation(tableName, columns)
+            scratchConn.execute('CREATE INDEX {} ON {} ({})'.format(ADVISOR_INDEX_NAME, quoteName(tableName), ', '.join(map(quoteName, columns))))
+            try:
+                for statementUsage in statementUsages:
+                    if tableName not in statementUsage.getTableNames() or statementUsage.fingerprint not in plans:
+                        continue
+                    planBefore, costBefore = plans[statementUsage.fingerprint]
+                    planAfter = self.getPlan(scratchConn, statementUsage.sqlText)
+                    if not planAfter or not any(ADVISOR_INDEX_NAME in detail for detail in planAfter):
+                        continue
+                    costAfter = self.getPlanCost(planAfter, statementUsage)
+                    if costBefore <= 0 or costAfter >= costBefore:
+                        continue
+                    savedTime = statementUsage.totalDuration * (1 - costAfter / costBefore)
+                    recommendation.savedTime += savedTime
+                    planAfter = [detail.replace(ADVISOR_INDEX_NAME, recommendation.getIndexName()) for detail in planAfter]
+                    recommendation.statements.append((statementUsage, planBefore, planAfter, savedTime))
+            finally:
+                scratchConn.execute(f'DROP INDEX {ADVISOR_INDEX_NAME}')
+            if recommendation.statements:
+                recommendations.append(recommendation)
+        # of equal savings the narrower index ranks first, it is cheaper to keep up
+        recommendations.sort(key=lambda recommendation: (-recommendation.savedTime, len(recommendation.columns)))
+        return self.removeRedundant(recommendations)[:RECOMMENDATION_LIMIT]
+
+    def removeRedundant(self, recommendations):
+        '''
+        an index is dropped when a better ranked index of the same table,
+        one leading the other, saves at least as much on each of its
+        statements.
+        '''
+        kept = list()
+        for recommendation in recommendations:
+            if not any(self.isCoveredBy(recommendation, other) for other in kept):
+                kept.append(recommendation)
+        return kept
+
+    def isCoveredBy(self, recommendation, other):
+        if other.tableName != recommendation.tableName:
+            return False
+        length = min(len(recommendation.columns), len(other.columns))
+        if recommendation.columns[:length] != other.columns[:length]:
+            return False
+        otherSavings = {statementUsage.fingerprint: savedTime for statementUsage, planBefore, planAfter, savedTime in other.statements}
+        return all(otherSavings.get(statementUsage.fingerprint, -1) >= savedTime for statementUsage, planBefore, planAfter, savedTime in recommendation.statements)
@@ -0,0 +1,193 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import threading
+import queue
+import time
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectExecuteSqlite import ManageSqliteDatabase
+from src.sqlite_executer.ResultCursor import DEFAULT_PAGE_SIZE
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+PROGRESS_HANDLER_STEPS = 1000
+
+
+class QueryJob():
+    '''
+    State of one statement executed by QueryExecutor.
+    '''
+
+    def __init__(self, sqlText=None, connectionName=None, onPage=None, onDone=None, onError=None):
+        self.sqlText = sqlText
+        self.connectionName = connectionName
+        self.onPage = onPage
+        self.onDone = onDone
+        self.onError = onError
+        self.resultCursor = None
+        self.headers = tuple()
+        self.columnTypes = None
+        self.rowCount = 0
+        self.cancelled = False
+        self.done = False
+        self.error = None
+        self.startTime = None
+        self.endTime = None
+
+    def getElapsedTime(self):
+        if self.startTime is None:
+            return 0
+        endTime = self.endTime if self.endTime else time.time()
+        return endTime - self.startTime
+
+    def isResultSet(self):
+        return len(self.headers) > 0
+
+    def hasMoreRows(self):
+        return not self.cancelled and self.resultCursor is not None and self.resultCursor.hasMoreRows()
+
+
+class QueryExecutor():
+    '''
+    Executes sql statements of one connection on a worker thread. The sqlite
+    connection is leased from the connection pool by the worker thread and
+    the cursors are used only by the worker thread.
+    Callbacks are posted through dispatch, for UI use wx.CallAfter.
+
+    @param connectionName: connection name
+    @param databaseAbsolutePath: database file path
+    @param dispatch: callable(function, *args) used to post callbacks
+    @param pageSize: number of rows posted per batch
+    '''
+
+    def __init__(self, connectionName=None, databaseAbsolutePath=None, dispatch=None, pageSize=DEFAULT_PAGE_SIZE):
+        self.connectionName = connectionName
+        self.databaseAbsolutePath = databaseAbsolutePath
+        self.dispatch = dispatch if dispatch else self.callDirect
+        self.pageSize = pageSize
+        self.currentJob = None
+        self.manageSqliteDatabase = None
+        self.tasks = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name=f'QueryExecutor-{connectionName}', daemon=True)
+        self.thread.start()
+
+    def callDirect(self, function, *args):
+        function(*args)
+
+    def execute(self, sqlText=None, onPage=None, onDone=None, onError=None):
+        '''
+        Queue sql statement for execution.
+        @param onPage: callable(job, rows) called with each fetched batch
+        @param onDone: callable(job) called when statement is finished
+        @param onError: callable(job, error)
+        @return: QueryJob
+        '''
+        job = QueryJob(sqlText=sqlText, connectionName=self.connectionName, onPage=onPage, onDone=onDone, onError=onError)
+        self.tasks.put((self.runJob, job))
+        return job
+
+    def fetchNextPage(self, job=None):
+        '''
+        Queue fetching of next batch of rows of job, posted to job.onPage.
+        '''
+        if job and job.hasMoreRows():
+            self.tasks.put((self.runFetchPage, job))
+
+    def cancel(self, job=None):
+        '''
+        Cancel given job or running job. A running statement is interrupted.
+        '''
+        if job is None:
+            job = self.currentJob
+        if job is None or job.cancelled:
+            return
+        job.cancelled = True
+        if self.manageSqliteDatabase and self.currentJob is job:
+            try:
+                self.manageSqliteDatabase.conn.interrupt()
+            except Exception as e:
+                logger.error(e, exc_info=True)
+
+    def close(self):
+        self.cancel()
+        self.tasks.put(None)
+
+    def run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                break
+            function, job = task
+            try:
+                function(job)
+            except Exception as e:
+                logger.error(e, exc_info=True)
+        if self.manageSqliteDatabase:
+            # connection goes back to the pool, it must not keep our handler
+            self.manageSqliteDatabase.conn.set_progress_handler(None, 0)
+            self.manageSqliteDatabase.close()
+
+    def progressHandler(self):
+        job = self.currentJob
+        if job and job.cancelled:
+            # non zero value aborts running statement
+            return 1
+        return 0
+
+    def getManageSqliteDatabase(self):
+        if self.manageSqliteDatabase is None:
+            self.manageSqliteDatabase = ManageSqliteDatabase(connectionName=self.connectionName, databaseAbsolutePath=self.databaseAbsolutePath)
+            self.manageSqliteDatabase.conn.set_progress_handler(self.progressHandler, PROGRESS_HANDLER_STEPS)
+        return self.manageSqliteDatabase
+
+    def runJob(self, job):
+        self.currentJob = job
+        job.startTime = time.time()
+        try:
+            if job.cancelled:
+                return
+            manageSqliteDatabase = self.getManageSqliteDatabase()
+            job.resultCursor = manageSqliteDatabase.executeTextStream(job.sqlText, pageSize=self.pageSize)
+            job.headers = job.resultCursor.headers
+            job.columnTypes = job.resultCursor.columnTypes
+            rows = job.resultCursor.fetchPage() if job.resultCursor.isResultSet() else list()
+            job.rowCount += len(rows)
+            if job.onPage and not job.cancelled:
+                self.dispatch(job.onPage, job, rows)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            job.error = e
+            if job.onError:
+                self.dispatch(job.onError, job, e)
+        finally:
+            job.done = True
+            job.endTime = time.time()
+            self.currentJob = None
+            if job.cancelled and job.resultCursor:
+                job.resultCursor.close()
+            if job.onDone:
+                self.dispatch(job.onDone, job)
+
+    def runFetchPage(self, job):
+        if job.cancelled and job.resultCursor:
+            job.resultCursor.close()
+        if not job.hasMoreRows():
+            return
+        self.currentJob = job
+        try:
+            rows = job.resultCursor.fetchPage()
+            job.rowCount += len(rows)
+            if job.onPage and not job.cancelled:
+                self.dispatch(job.onPage, job, rows)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            job.error = e
+            job.resultCursor.close()
+            if job.onError:
+                self.dispatch(job.onError, job, e)
+        finally:
+            self.currentJob = None
@@ -0,0 +1,295 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import sqlite3
+import statistics
+import time
+from datetime import datetime
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectExecuteSqlite import ManageSqliteDatabase
+from src.sqlite_executer.ConnectionPool import ConnectionPoolManager
+from src.sqlite_executer.SqlHistoryWriter import SqlHistoryWriter
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+# progress handler is called every PROFILE_STEP_INTERVAL virtual machine steps
+PROFILE_STEP_INTERVAL = 100
+PROFILE_FETCH_SIZE = 10000
+PROFILE_HISTORY_LIMIT = 10
+# a run costing this factor more than the median of earlier runs is a regression
+REGRESSION_FACTOR = 1.5
+# shorter runs are timer noise
+REGRESSION_MIN_DURATION = 0.01
+SQL_PROFILE_SCRIPT = '''
+    CREATE TABLE IF NOT EXISTS sql_profile
+      (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        sql TEXT,
+        connection_name TEXT,
+        created_time [timestamp] DEFAULT (datetime('now', 'localtime')),
+        duration REAL,
+        row_count INTEGER,
+        vm_steps INTEGER,
+        full_scan_steps INTEGER,
+        sort_count INTEGER,
+        autoindex_count INTEGER,
+        warnings TEXT,
+        plan TEXT
+      );
+    CREATE INDEX IF NOT EXISTS idx_sql_profile_sql ON sql_profile (sql, connection_name);
+'''
+SQL_PROFILE_COLUMNS = ('id', 'sql', 'connection_name', 'created_time', 'duration', 'row_count', 'vm_steps',
+                       'full_scan_steps', 'sort_count', 'autoindex_count', 'warnings', 'plan')
+FULL_SCAN = 'full scan'
+TEMP_B_TREE = 'temp b-tree'
+AUTOMATIC_INDEX = 'automatic index'
+
+
+def normalizeSql(sqlText):
+    '''
+    same statement with other whitespace or trailing semicolon is one profile history.
+    '''
+    return ' '.join(sqlText.split()).rstrip(';').rstrip()
+
+
+class QueryPlanNode():
+    '''
+    One row of EXPLAIN QUERY PLAN.
+    '''
+
+    def __init__(self, id=None, parent=None, detail=None):
+        self.id = id
+        self.parent = parent
+        self.detail = detail
+        self.children = list()
+
+    def getWarnings(self):
+        warnings = list()
+        if self.detail.startswith('SCAN ') and not self.detail.startswith('SCAN CONSTANT ROW'):
+            warnings.append(FULL_SCAN)
+        if 'TEMP B-TREE' in self.detail:
+            warnings.append(TEMP_B_TREE)
+        if 'AUTOMATIC' in self.detail and 'INDEX' in self.detail:
+            warnings.append(AUTOMATIC_INDEX)
+        return warnings
+
+    def iterNodes(self):
+        yield self
+        for child in self.children:
+            yield from child.iterNodes()
+
+    def getText(self, depth=0):
+        lines = ['  ' * depth + self.detail]
+        for child in self.children:
+            lines.append(child.getText(depth + 1))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f'QueryPlanNode(id={self.id}, parent={self.parent}, detail={self.detail})'
+
+
+class QueryProfile():
+    '''
+    Plan and cost of one run of a statement.
+
+    vmSteps, fullScanSteps, sortCount and autoindexCount are the statement
+    status counters read from the sqlite_stmt virtual table, available when
+    sqlite is built with SQLITE_ENABLE_STMTVTAB. Without it vmSteps is counted
+    by the progress handler, to PROFILE_STEP_INTERVAL steps, and the other
+    counters are None.
+    '''
+
+    def __init__(self, sqlText=None, connectionName=None):
+        self.sqlText = sqlText
+        self.connectionName = connectionName
+        self.createdTime = None
+        self.plan = list()
+        self.duration = None
+        self.rowCount = 0
+        self.vmSteps = None
+        self.fullScanSteps = None
+        self.sortCount = None
+        self.autoindexCount = None
+        self.stmtStatus = False
+        self.history = list()
+        self.cancelled = False
+        self.error = None
+
+    def getPlanText(self):
+        return '\n'.join(node.getText() for node in self.plan)
+
+    def getWarnings(self):
+        '''
+        @return: list of (warning, plan detail)
+        '''
+        return [(warning, node.detail) for root in self.plan for node in root.iterNodes() for warning in node.getWarnings()]
+
+    def getRegressions(self):
+        '''
+        compare with the median of earlier runs in history.
+        @return: list of text
+        '''
+        regressions = list()
+        for label, attribute, index in (('duration', 'duration', 4), ('VM steps', 'vmSteps', 6)):
+            value = getattr(self, attribute)
+            earlier = [row[index] for row in self.history if row[index] is not None]
+            if value is None or not earlier or (attribute == 'duration' and value < REGRESSION_MIN_DURATION):
+                continue
+            median = statistics.median(earlier)
+            if median and value > median * REGRESSION_FACTOR:
+                regressions.append(f'{label} {value / median:.1f}x of median of {len(earlier)} earlier runs')
+        return regressions
+
+    def __str__(self):
+        if self.error:
+            return f'Profile failed: {self.error}'
+        if self.cancelled:
+            return 'Profile cancelled.'
+        steps = self.vmSteps if self.stmtStatus else f'~{self.vmSteps}'
+        text = f'{self.rowCount} rows in {self.duration:.3f} s, {steps} VM steps'
+        if self.stmtStatus:
+            text += f', {self.fullScanSteps} full scan steps, {self.sortCount} sorts, {self.autoindexCount} automatic index rows'
+        return text
+
+
+class QueryProfiler():
+    '''
+    Runs EXPLAIN QUERY PLAN and one profiled run of a statement. Statements
+    that change the database run inside a savepoint that is rolled back, a
+    profile never changes data. Profiles are written to sql_profile next to
+    sql_log, with the plan and warnings of each run.
+
+    @param connectionName: connection name
+    @param databaseAbsolutePath: database file path
+    '''
+
+    historyTableCreated = False
+
+    def __init__(self, connectionName=None, databaseAbsolutePath=None):
+        self.connectionName = connectionName
+        self.databaseAbsolutePath = databaseAbsolutePath
+        self.cancelled = False
+        self.progressCalls = 0
+
+    def cancel(self):
+        self.cancelled = True
+
+    def progressHandler(self):
+        self.progressCalls += 1
+        # non zero value aborts running statement
+        return 1 if self.cancelled else 0
+
+    def getQueryPlan(self, conn, sqlText=None):
+        '''
+        @return: list of root QueryPlanNode
+        '''
+        nodes = dict()
+        roots = list()
+        for id, parent, notused, detail in conn.execute('EXPLAIN QUERY PLAN ' + sqlText):
+            node = QueryPlanNode(id, parent, detail)
+            nodes[id] = node
+            if parent in nodes:
+                nodes[parent].children.append(node)
+            else:
+                roots.append(node)
+        return roots
+
+    def profile(self, sqlText=None, save=True):
+        '''
+        @return: QueryProfile
+        '''
+        sqlText = sqlText.strip().rstrip(';')
+        queryProfile = QueryProfile(sqlText=sqlText, connectionName=self.connectionName)
+        try:
+            with ManageSqliteDatabase(connectionName=self.connectionName, databaseAbsolutePath=self.databaseAbsolutePath) as manageSqliteDatabase:
+                conn = manageSqliteDatabase.conn
+                queryProfile.plan = self.getQueryPlan(conn, sqlText)
+                self.run(conn, queryProfile)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            if self.cancelled:
+                queryProfile.cancelled = True
+            else:
+                queryProfile.error = e
+        queryProfile.createdTime = str(datetime.now())
+        if save and not queryProfile.error and not queryProfile.cancelled:
+            try:
+                queryProfile.history = self.getHistory(sqlText)
+                self.saveProfile(queryProfile)
+                SqlHistoryWriter.getInstance().log(sqlText, queryProfile.duration, connectionName=self.connectionName)
+            except Exception as e:
+                logger.error(e, exc_info=True)
+        return queryProfile
+
+    def run(self, conn, queryProfile):
+        # unique text gets a newly prepared statement with zeroed status counters
+        profiledSql = f'{queryProfile.sqlText}\n/* profile {id(queryProfile)} {time.time()} */'
+        self.progressCalls = 0
+        conn.execute('SAVEPOINT query_profile')
+        conn.set_progress_handler(self.progressHandler, PROFILE_STEP_INTERVAL)
+        try:
+            startTime = time.perf_counter()
+            cursor = conn.execute(profiledSql)
+            while True:
+                rows = cursor.fetchmany(PROFILE_FETCH_SIZE)
+                if not rows:
+                    break
+                queryProfile.rowCount += len(rows)
+            queryProfile.duration = time.perf_counter() - startTime
+            conn.set_progress_handler(None, 0)
+            queryProfile.vmSteps = self.progressCalls * PROFILE_STEP_INTERVAL
+            self.readStmtStatus(conn, profiledSql, queryProfile)
+            cursor.close()
+        finally:
+            conn.set_progress_handler(None, 0)
+            conn.execute('ROLLBACK TO query_profile')
+            conn.execute('RELEASE query_profile')
+
+    def readStmtStatus(self, conn, profiledSql, queryProfile):
+        try:
+            row = conn.execute('SELECT nstep, nscan, nsort, naidx FROM sqlite_stmt WHERE sql = ?', (profiledSql,)).fetchone()
+        except sqlite3.OperationalError:
+            # sqlite built without SQLITE_ENABLE_STMTVTAB
+            return
+        if row:
+            queryProfile.vmSteps, queryProfile.fullScanSteps, queryProfile.sortCount, queryProfile.autoindexCount = row
+            queryProfile.stmtStatus = True
+
+    def getHistory(self, sqlText=None, limit=PROFILE_HISTORY_LIMIT):
+        '''
+        @return: earlier profiles of the statement on this connection, newest first, as tuples in SQL_PROFILE_COLUMNS order
+        '''
+        conn = self.leaseHistory()
+        try:
+            return conn.execute('SELECT {} FROM sql_profile WHERE sql = ? AND connection_name = ? ORDER BY id DESC LIMIT ?'.format(', '.join(SQL_PROFILE_COLUMNS)),
+                                (normalizeSql(sqlText), self.connectionName, limit)).fetchall()
+        finally:
+            ConnectionPoolManager.release(SqlHistoryWriter.getInstance().databasePath, conn)
+
+    def saveProfile(self, queryProfile):
+        conn = self.leaseHistory()
+        try:
+            with conn:
+                conn.execute('''INSERT INTO sql_profile (sql, connection_name, created_time, duration, row_count, vm_steps, full_scan_steps,
+                    sort_count, autoindex_count, warnings, plan) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                             (normalizeSql(queryProfile.sqlText), queryProfile.connectionName, queryProfile.createdTime, queryProfile.duration,
+                              queryProfile.rowCount, queryProfile.vmSteps, queryProfile.fullScanSteps, queryProfile.sortCount,
+                              queryProfile.autoindexCount, ', '.join(sorted({warning for warning, detail in queryProfile.getWarnings()})),
+                              queryProfile.getPlanText()))
+        finally:
+            ConnectionPoolManager.release(SqlHistoryWriter.getInstance().databasePath, conn)
+
+    def leaseHistory(self):
+        conn = ConnectionPoolManager.lease(SqlHistoryWriter.getInstance().databasePath)
+        if not QueryProfiler.historyTableCreated:
+            try:
+                conn.executescript(SQL_PROFILE_SCRIPT)
+            except Exception:
+                ConnectionPoolManager.release(SqlHistoryWriter.getInstance().databasePath, conn)
+                raise
+            QueryProfiler.historyTableCreated = True
+        return conn
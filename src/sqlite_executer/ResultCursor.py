@@ -0,0 +1,107 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ResultSet import ResultSet
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+DEFAULT_PAGE_SIZE = 500
+# sqlite storage class of python values, used for columns without declared type
+VALUE_TYPES = {int: 'INTEGER', float: 'REAL', str: 'TEXT', bytes: 'BLOB'}
+
+
+class ResultCursor():
+    '''
+    Streaming result of a sql statement. The sqlite cursor is kept open and
+    rows are fetched page by page with fetchmany. One row is always read ahead
+    so that the caller knows if more rows are available.
+
+    @param cursor: executed sqlite3 cursor
+    @param pageSize: number of rows returned by fetchPage
+    @param columnTypes: tuple of declared column types or None, columns
+    without declared type take the type of their value in the first row
+    '''
+
+    def __init__(self, cursor=None, pageSize=DEFAULT_PAGE_SIZE, columnTypes=None):
+        self.cursor = cursor
+        self.pageSize = pageSize
+        self.columnTypes = columnTypes
+        self.headers = tuple()
+        self.rowCount = 0
+        self._lookAhead = None
+        self._exhausted = True
+        if cursor is not None and cursor.description:
+            self.headers = tuple([desc[0] for desc in cursor.description])
+            self._exhausted = False
+            self._readAhead()
+            if columnTypes is not None:
+                self.columnTypes = self.resolveColumnTypes(columnTypes)
+
+    def resolveColumnTypes(self, columnTypes):
+        resolved = list()
+        for idx, columnType in enumerate(columnTypes):
+            if not columnType and self._lookAhead is not None:
+                columnType = VALUE_TYPES.get(type(self._lookAhead[idx]))
+            resolved.append(columnType if columnType else '')
+        return tuple(resolved)
+
+    def _readAhead(self):
+        if self._exhausted:
+            return
+        self._lookAhead = self.cursor.fetchone()
+        if self._lookAhead is None:
+            self._exhausted = True
+            self.close()
+
+    def isResultSet(self):
+        '''
+        @return: True if statement returned columns (select, pragma ...)
+        '''
+        return len(self.headers) > 0
+
+    def hasMoreRows(self):
+        return self._lookAhead is not None
+
+    def fetchPage(self, pageSize=None):
+        '''
+        @return: list of next rows, empty list when cursor is exhausted.
+        '''
+        if pageSize is None:
+            pageSize = self.pageSize
+        rows = list()
+        if self._lookAhead is None:
+            return rows
+        rows.append(self._lookAhead)
+        if pageSize > 1:
+            rows.extend(self.cursor.fetchmany(pageSize - 1))
+        self._readAhead()
+        self.rowCount += len(rows)
+        return rows
+
+    def fetchAllAsResultSet(self):
+        '''
+        @return: ResultSet of all remaining rows
+        '''
+        resultSet = ResultSet(headers=self.headers, columnTypes=self.columnTypes)
+        while self.hasMoreRows():
+            resultSet.appendRows(self.fetchPage())
+        return resultSet
+
+    def __iter__(self):
+        while self.hasMoreRows():
+            yield self.fetchPage()
+
+    def close(self):
+        self._lookAhead = None
+        self._exhausted = True
+        if self.cursor is not None:
+            try:
+                self.cursor.close()
+            except Exception as e:
+                logger.error(e, exc_info=True)
+            self.cursor = None
@@ -0,0 +1,229 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+from array import array
+
+INTEGER_TYPECODE = 'q'
+REAL_TYPECODE = 'd'
+TYPECODE_VALUE_TYPES = {INTEGER_TYPECODE: int, REAL_TYPECODE: float}
+
+
+def getTypecode(columnType=None):
+    '''
+    typed storage for a declared column type, following sqlite type affinity.
+    @return: array typecode or None for list storage
+    '''
+    if not columnType:
+        return None
+    columnType = str(columnType).upper()
+    if 'INT' in columnType:
+        return INTEGER_TYPECODE
+    if 'CHAR' in columnType or 'CLOB' in columnType or 'TEXT' in columnType or 'BLOB' in columnType:
+        return None
+    if 'REAL' in columnType or 'FLOA' in columnType or 'DOUB' in columnType:
+        return REAL_TYPECODE
+    return None
+
+
+class ResultColumn():
+    '''
+    Values of one result column. INTEGER and REAL columns are kept in an
+    array with a null bitmap, 8 bytes per value. Other columns, and typed
+    columns once a value of another type shows up, are kept in a list with
+    None for NULL.
+
+    @param typecode: INTEGER_TYPECODE, REAL_TYPECODE or None
+    '''
+
+    def __init__(self, typecode=None):
+        self.typecode = typecode
+        self.values = array(typecode) if typecode else list()
+        self.nulls = bytearray()
+        self.nullCount = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def isNull(self, row):
+        if self.typecode:
+            return self.nullCount > 0 and row >> 3 < len(self.nulls) and (self.nulls[row >> 3] >> (row & 7)) & 1 == 1
+        return self.values[row] is None
+
+    def setNull(self, row, isNull=True):
+        while len(self.nulls) <= row >> 3:
+            self.nulls.append(0)
+        bit = 1 << (row & 7)
+        wasNull = self.nulls[row >> 3] & bit != 0
+        if isNull and not wasNull:
+            self.nulls[row >> 3] |= bit
+            self.nullCount += 1
+        elif not isNull and wasNull:
+            self.nulls[row >> 3] &= ~bit
+            self.nullCount -= 1
+
+    def fits(self, value):
+        return type(value) is TYPECODE_VALUE_TYPES[self.typecode] and (self.typecode != INTEGER_TYPECODE or -2 ** 63 <= value < 2 ** 63)
+
+    def toList(self):
+        '''
+        move typed storage to list storage.
+        '''
+        if self.typecode:
+            self.values = [self.get(row) for row in range(len(self.values))]
+            self.typecode = None
+            self.nulls = bytearray()
+            self.nullCount = 0
+
+    def append(self, value):
+        if self.typecode:
+            if value is None:
+                self.setNull(len(self.values))
+                self.values.append(0)
+                return
+            if self.fits(value):
+                self.values.append(value)
+                return
+            self.toList()
+        self.values.append(value)
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def get(self, row):
+        if self.typecode and self.isNull(row):
+            return None
+        return self.values[row]
+
+    def set(self, row, value):
+        if self.typecode:
+            if value is None:
+                self.setNull(row)
+                return
+            if self.fits(value):
+                self.setNull(row, isNull=False)
+                self.values[row] = value
+                return
+            self.toList()
+        self.values[row] = value
+
+    def delete(self, pos=0, numRows=1):
+        if self.typecode and self.nullCount:
+            nullRows = self.getNullRows()
+            del self.values[pos:pos + numRows]
+            self.nulls = bytearray()
+            self.nullCount = 0
+            for row in nullRows:
+                if row < pos:
+                    self.setNull(row)
+                elif row >= pos + numRows:
+                    self.setNull(row - numRows)
+        else:
+            del self.values[pos:pos + numRows]
+
+    def getNullRows(self):
+        nullRows = list()
+        for index, byte in enumerate(self.nulls):
+            if byte:
+                nullRows.extend(index * 8 + bit for bit in range(8) if (byte >> bit) & 1)
+        return nullRows
+
+    def getValues(self):
+        '''
+        @return: list of column values with None for NULL
+        '''
+        values = list(self.values)
+        if self.typecode and self.nullCount:
+            for row in self.getNullRows():
+                values[row] = None
+        return values
+
+
+class ResultSet():
+    '''
+    Columnar store of query result. Each column is a ResultColumn, typed by
+    the declared column type. None is used for sql NULL. version is
+    incremented on every change, views over the result use it to drop
+    cached orderings.
+
+    @param headers: tuple of column names
+    @param columnTypes: tuple of declared column types or None
+    '''
+
+    def __init__(self, headers=None, columnTypes=None):
+        self.headers = tuple(headers) if headers else tuple()
+        self.columnTypes = tuple(columnTypes) if columnTypes else None
+        self.columns = [ResultColumn(getTypecode(self.columnTypes[col] if self.columnTypes and col < len(self.columnTypes) else None)) for col in range(len(self.headers))]
+        self.rowCount = 0
+        self.version = 0
+
+    def getColumnCount(self):
+        return len(self.headers)
+
+    def getRowCount(self):
+        return self.rowCount
+
+    def getColumnType(self, col):
+        '''
+        @return: lower case declared type of column or None
+        '''
+        if self.columnTypes and col < len(self.columnTypes) and self.columnTypes[col]:
+            return str(self.columnTypes[col]).lower()
+        return None
+
+    def appendRows(self, rows):
+        for row in rows:
+            for col, column in enumerate(self.columns):
+                column.append(row[col])
+            self.rowCount += 1
+        self.version += 1
+
+    def appendEmptyRows(self, numRows=1):
+        for column in self.columns:
+            column.extend([None] * numRows)
+        self.rowCount += numRows
+        self.version += 1
+
+    def deleteRows(self, pos=0, numRows=1):
+        for column in self.columns:
+            column.delete(pos, numRows)
+        self.rowCount = len(self.columns[0]) if self.columns else 0
+        self.version += 1
+
+    def isNull(self, row, col):
+        return self.columns[col].isNull(row)
+
+    def getValue(self, row, col):
+        return self.columns[col].get(row)
+
+    def setValue(self, row, col, value):
+        self.columns[col].set(row, value)
+        self.version += 1
+
+    def getRow(self, row):
+        return tuple([column.get(row) for column in self.columns])
+
+    def fromText(self, col, text=None):
+        '''
+        value of grid text for the storage type of the column.
+        '''
+        typecode = self.columns[col].typecode
+        if typecode and text is not None:
+            try:
+                return TYPECODE_VALUE_TYPES[typecode](text)
+            except ValueError:
+                pass
+        return text
+
+    def iterRows(self):
+        for row in range(self.rowCount):
+            yield self.getRow(row)
+
+    @staticmethod
+    def fromRows(headers=None, columnTypes=None, rows=None):
+        resultSet = ResultSet(headers=headers, columnTypes=columnTypes)
+        if rows:
+            resultSet.appendRows(rows)
+        return resultSet
@@ -0,0 +1,302 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+from collections import Counter
+from itertools import compress, repeat
+from operator import eq, ne, lt, le, gt, ge, is_, is_not, contains
+import logging.config
+from src.view.constants import LOG_SETTINGS
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+FILTER_OPERATORS = ('=', '!=', '<', '<=', '>', '>=', 'contains', 'is null', 'is not null')
+GROUP_COUNT_LIMIT = 50
+NAN = float('nan')
+
+
+def getSortKey(value):
+    '''
+    sqlite order of mixed values: NULL, numbers, text, blob.
+    '''
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, bytes(value))
+
+
+class ResultFilter():
+    '''
+    Quick filter on one column, shown as a chip above the grid.
+
+    @param col: column index
+    @param operator: one of FILTER_OPERATORS
+    @param value: value compared with, as stored in the ResultSet
+    '''
+
+    def __init__(self, col=0, operator='=', value=None):
+        self.col = col
+        self.operator = operator
+        self.value = value
+
+    def getLabel(self, headers=None):
+        column = headers[self.col] if headers and self.col < len(headers) else f'Col_{self.col}'
+        if self.operator in ('is null', 'is not null'):
+            return f'{column} {self.operator}'
+        value = 'NULL' if self.value is None else self.value
+        return f'{column} {self.operator} {value}'
+
+    def getMask(self, values=None, numeric=False):
+        '''
+        Comparisons run in C through operator functions, NULL never matches
+        a comparison.
+        @param values: list of column values
+        @param numeric: values are int or float or None
+        @return: bytearray with 1 for kept rows
+        '''
+        operator, value = self.operator, self.value
+        if operator == 'is null' or (operator == '=' and value is None):
+            return bytearray(map(is_, values, repeat(None)))
+        notNull = bytearray(map(is_not, values, repeat(None)))
+        if operator == 'is not null' or (operator == '!=' and value is None):
+            return notNull
+        if operator == '=':
+            return bytearray(map(eq, values, repeat(value)))
+        if operator == 'contains':
+            texts = map(str.lower, map(str, values))
+            return andMasks(bytearray(map(contains, texts, repeat(str(value).lower()))), notNull)
+        compare = {'!=': ne, '<': lt, '<=': le, '>': gt, '>=': ge}.get(operator)
+        if compare is None:
+            raise ValueError(f'unknown filter operator: {operator}')
+        if numeric and isinstance(value, (int, float)):
+            return andMasks(bytearray(map(compare, map(nullToNan, values), repeat(value))), notNull)
+        return andMasks(bytearray(map(compare, map(getSortKey, values), repeat(getSortKey(value)))), notNull)
+
+
+def nullToNan(value):
+    return NAN if value is None else value
+
+
+def andMasks(*masks):
+    combined = int.from_bytes(masks[0], 'little')
+    for mask in masks[1:]:
+        combined &= int.from_bytes(mask, 'little')
+    return bytearray(combined.to_bytes(len(masks[0]), 'little'))
+
+
+class ResultView():
+    '''
+    Sorted and filtered view over a ResultSet, without copying it.
+
+    Sort is done on a list of source row numbers. A multi column sort is one
+    stable sort per sort column, last column first, so earlier passes break
+    the ties of later ones. NULL rows are split off before each pass and
+    placed first for ascending, last for descending, as sqlite does. The row
+    order of each single column sort is cached until the ResultSet changes,
+    and so is the composite order of the sort columns, a filter change only
+    compresses it again. Each filter keeps a byte mask over the rows, masks are combined with a
+    bitwise and. The visible rows are None when neither sort nor filter is
+    set.
+
+    @param resultSet: ResultSet
+    '''
+
+    def __init__(self, resultSet=None):
+        self.resultSet = resultSet
+        self.sortColumns = list()
+        self.filters = list()
+        self.rows = None
+        self.cacheVersion = None
+        self.values = dict()
+        self.orders = dict()
+        self.masks = dict()
+        # ((sort columns, ResultSet version), source rows) of the last multi column sort
+        self.sortedRows = (None, None)
+
+    def setResultSet(self, resultSet=None, keepView=False):
+        '''
+        @param keepView: keep sort and filters when headers are the same, used for paging
+        '''
+        headers = self.resultSet.headers if self.resultSet else None
+        self.resultSet = resultSet
+        if not keepView or not resultSet or resultSet.headers != headers:
+            self.sortColumns = list()
+            self.filters = list()
+        self.clearCache()
+        self.apply()
+
+    def clearCache(self):
+        self.cacheVersion = self.resultSet.version if self.resultSet else None
+        self.values = dict()
+        self.orders = dict()
+        self.masks = dict()
+        self.sortedRows = (None, None)
+
+    def checkCache(self):
+        if self.resultSet and self.cacheVersion != self.resultSet.version:
+            self.clearCache()
+
+    def isActive(self):
+        return self.rows is not None
+
+    def getRowCount(self):
+        if self.rows is not None:
+            return len(self.rows)
+        return self.resultSet.getRowCount() if self.resultSet else 0
+
+    def getSourceRow(self, row):
+        if self.rows is not None:
+            return self.rows[row]
+        return row
+
+    def getSourceRows(self, rows=None):
+        return [self.getSourceRow(row) for row in rows]
+
+    def getColumnValues(self, col):
+        '''
+        @return: (list of values, has NULL, values are of one type or numeric)
+        '''
+        if col not in self.values:
+            column = self.resultSet.columns[col]
+            values = column.getValues()
+            if column.typecode:
+                self.values[col] = (values, column.nullCount > 0, True)
+            else:
+                valueTypes = set(map(type, values))
+                hasNull = type(None) in valueTypes
+                valueTypes.discard(type(None))
+                self.values[col] = (values, hasNull, len(valueTypes) <= 1 or valueTypes <= {int, float, bool})
+        return self.values[col]
+
+    def sortRows(self, rows=None, col=0, ascending=True):
+        '''
+        stable sort of source rows by one column.
+        @return: list of source rows
+        '''
+        values, hasNull, uniform = self.getColumnValues(col)
+        nullRows = list()
+        if hasNull:
+            nullRows = [row for row in rows if values[row] is None]
+            rows = [row for row in rows if values[row] is not None]
+        else:
+            rows = list(rows)
+        if uniform:
+            rows.sort(key=values.__getitem__, reverse=not ascending)
+        else:
+            rows.sort(key=lambda row: getSortKey(values[row]), reverse=not ascending)
+        return nullRows + rows if ascending else rows + nullRows
+
+    def getOrder(self, col, ascending=True):
+        key = (col, ascending)
+        if key not in self.orders:
+            self.orders[key] = self.sortRows(range(self.resultSet.getRowCount()), col, ascending)
+        return self.orders[key]
+
+    def getMask(self, resultFilter):
+        key = (resultFilter.col, resultFilter.operator, resultFilter.value)
+        if key not in self.masks:
+            values = self.getColumnValues(resultFilter.col)[0]
+            self.masks[key] = resultFilter.getMask(values, numeric=self.resultSet.columns[resultFilter.col].typecode is not None)
+        return self.masks[key]
+
+    def getCombinedMask(self):
+        if not self.filters:
+            return None
+        return andMasks(*[self.getMask(resultFilter) for resultFilter in self.filters])
+
+    def getSortedRows(self):
+        if not self.sortColumns:
+            return None
+        col, ascending = self.sortColumns[-1]
+        rows = self.getOrder(col, ascending)
+        if len(self.sortColumns) == 1:
+            return rows
+        key = (tuple(self.sortColumns), self.resultSet.version)
+        if self.sortedRows[0] != key:
+            for col, ascending in reversed(self.sortColumns[:-1]):
+                rows = self.sortRows(rows, col, ascending)
+            self.sortedRows = (key, rows)
+        return self.sortedRows[1]
+
+    def apply(self):
+        '''
+        recompute visible rows from sort columns and filters.
+        '''
+        self.checkCache()
+        if not self.resultSet or (not self.sortColumns and not self.filters):
+            self.rows = None
+            return
+        order = self.getSortedRows()
+        mask = self.getCombinedMask()
+        if mask is None:
+            self.rows = list(order)
+        elif order is None:
+            self.rows = list(compress(range(len(mask)), mask))
+        else:
+            self.rows = list(compress(order, map(mask.__getitem__, order)))
+
+    def setSort(self, col, ascending=True, append=False):
+        '''
+        @param append: add col as next sort column, else sort by col only
+        '''
+        sortColumns = [sortColumn for sortColumn in self.sortColumns if sortColumn[0] != col] if append else list()
+        sortColumns.append((col, ascending))
+        self.sortColumns = sortColumns
+        self.apply()
+
+    def clearSort(self):
+        self.sortColumns = list()
+        self.apply()
+
+    def getSortColumn(self, col):
+        '''
+        @return: (position, ascending) of col in sort columns or None
+        '''
+        for position, (sortCol, ascending) in enumerate(self.sortColumns):
+            if sortCol == col:
+                return position, ascending
+        return None
+
+    def addFilter(self, resultFilter=None):
+        self.filters.append(resultFilter)
+        self.apply()
+
+    def removeFilter(self, resultFilter=None):
+        if resultFilter in self.filters:
+            self.filters.remove(resultFilter)
+        self.apply()
+
+    def clearFilters(self):
+        self.filters = list()
+        self.apply()
+
+    def appendSourceRows(self, start=0, numRows=1):
+        '''
+        rows appended to the ResultSet are shown at the end until the view is applied again.
+        '''
+        if self.rows is not None:
+            self.rows.extend(range(start, start + numRows))
+
+    def removeSourceRow(self, sourceRow=0):
+        '''
+        keep the order of visible rows after a row is deleted from the ResultSet.
+        '''
+        if self.rows is not None:
+            self.rows = [row - (row > sourceRow) for row in self.rows if row != sourceRow]
+
+    def getGroupCounts(self, col, limit=GROUP_COUNT_LIMIT):
+        '''
+        @return: list of (value, count) of visible rows, most common first
+        '''
+        self.checkCache()
+        values = self.getColumnValues(col)[0]
+        if self.rows is None:
+            counter = Counter(values)
+        else:
+            counter = Counter(map(values.__getitem__, self.rows))
+        return counter.most_common(limit)
@@ -0,0 +1,290 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import os
+import re
+import threading
+from collections import OrderedDict
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectExecuteSqlite import SqlType, Column, IndexInfo, ForeignKey
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+SQL_OBJECTS_QUERY = '''SELECT type, name, tbl_name, rootpage, sql FROM sqlite_master
+    WHERE name NOT LIKE 'sqlite_%' AND name != 'SAMPLE' ORDER BY type, name'''
+# table valued pragma functions load the details of all tables in one query each
+COLUMNS_QUERY = '''SELECT m.name, p.cid, p.name, p.type, p."notnull", p.dflt_value, p.pk
+    FROM sqlite_master m JOIN pragma_table_info(m.name) p
+    WHERE m.type = 'table' ORDER BY m.name, p.cid'''
+INDEXES_QUERY = '''SELECT m.name, il.seq, il.name, il."unique", il.origin, il.partial, ii.name
+    FROM sqlite_master m JOIN pragma_index_list(m.name) il JOIN pragma_index_info(il.name) ii
+    WHERE m.type = 'table' ORDER BY m.name, il.seq, ii.seqno'''
+FOREIGN_KEYS_QUERY = '''SELECT m.name, fk.id, fk.seq, fk."table", fk."from", fk."to", fk.on_update, fk.on_delete, fk."match"
+    FROM sqlite_master m JOIN pragma_foreign_key_list(m.name) fk
+    WHERE m.type = 'table' ORDER BY m.name, fk.id, fk.seq'''
+# tables named after FROM and JOIN, enough to map result columns to declared types
+TABLE_REFERENCE_PATTERN = re.compile(r'\b(?:from|join)\s+(`[^`]+`|"[^"]+"|\[[^\]]+\]|[\w$.]+)', re.IGNORECASE)
+RESULT_SHAPE_CACHE_SIZE = 256
+
+
+class ResultShapeCache():
+    '''
+    LRU cache of statement text to result shape (headers, column types).
+    '''
+
+    def __init__(self, maxSize=RESULT_SHAPE_CACHE_SIZE):
+        self.maxSize = maxSize
+        self.shapes = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, sqlText=None):
+        with self.lock:
+            shape = self.shapes.get(sqlText)
+            if shape is not None:
+                self.shapes.move_to_end(sqlText)
+            return shape
+
+    def put(self, sqlText=None, shape=None):
+        with self.lock:
+            self.shapes[sqlText] = shape
+            self.shapes.move_to_end(sqlText)
+            while len(self.shapes) > self.maxSize:
+                self.shapes.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.shapes.clear()
+
+
+class SchemaCatalog():
+    '''
+    In memory copy of the schema of one database: tables with columns, indexes
+    and foreign keys, views, indexes and triggers.
+
+    The catalog records PRAGMA schema_version and reloads only when it has
+    changed. PRAGMA data_version and total_changes of the connection are
+    recorded per connection, row counts cached by getRowCount are dropped
+    when they change on any connection. Refreshing through another pooled
+    connection keeps the cache.
+
+    @param databasePath: absolute path of database file
+    '''
+
+    def __init__(self, databasePath=None):
+        self.databasePath = databasePath
+        self.schemaVersion = None
+        # id of connection to (data_version, total_changes) seen last
+        self.dataVersions = dict()
+        self.sqlObjects = list()
+        self.tables = dict()
+        self.views = dict()
+        self.indexes = dict()
+        self.triggers = dict()
+        self.rowCounts = dict()
+        self.resultShapes = ResultShapeCache()
+        self.lock = threading.RLock()
+
+    def getSchemaVersion(self, conn):
+        return conn.execute('PRAGMA schema_version').fetchone()[0]
+
+    def getDataVersion(self, conn):
+        '''
+        data_version does not change for commits of the connection itself,
+        total_changes covers those. Both are counted per connection and are
+        compared with earlier values of the same connection only.
+        '''
+        return (conn.execute('PRAGMA data_version').fetchone()[0], conn.total_changes)
+
+    def isDataChanged(self, conn):
+        '''
+        a connection seen first has changed data only if it wrote any, commits
+        of other connections show in data_version of connections seen before.
+        @return: True if data has changed since conn was seen last
+        '''
+        dataVersion = self.getDataVersion(conn)
+        lastDataVersion = self.dataVersions.get(id(conn))
+        self.dataVersions[id(conn)] = dataVersion
+        if lastDataVersion is None:
+            return dataVersion[1] != 0
+        return dataVersion != lastDataVersion
+
+    def isStale(self, conn):
+        return self.schemaVersion is None or self.schemaVersion != self.getSchemaVersion(conn)
+
+    def refresh(self, conn):
+        '''
+        reload catalog if schema has changed.
+        @return: self
+        '''
+        with self.lock:
+            schemaVersion = self.getSchemaVersion(conn)
+            if schemaVersion != self.schemaVersion:
+                self.load(conn)
+                self.schemaVersion = schemaVersion
+            if self.isDataChanged(conn):
+                self.rowCounts = dict()
+        return self
+
+    def invalidate(self):
+        with self.lock:
+            self.schemaVersion = None
+            self.dataVersions = dict()
+            self.rowCounts = dict()
+
+    def load(self, conn):
+        logger.debug('loading schema catalog: %s', self.databasePath)
+        sqlObjects = list()
+        tables, views, indexes, triggers = dict(), dict(), dict(), dict()
+        byType = {'table': tables, 'view': views, 'index': indexes, 'trigger': triggers}
+        for row in conn.execute(SQL_OBJECTS_QUERY).fetchall():
+            sqlType = SqlType(type=row[0], name=row[1], tbl_name=row[2], rootpage=row[3], sql=row[4])
+            if sqlType.type == 'table':
+                sqlType.columns = list()
+                sqlType.indexes = list()
+                sqlType.foreignKeys = list()
+            sqlObjects.append(sqlType)
+            if sqlType.type in byType:
+                byType[sqlType.type][sqlType.name] = sqlType
+
+        for row in conn.execute(COLUMNS_QUERY).fetchall():
+            if row[0] in tables:
+                tables[row[0]].columns.append(Column(row[1], row[2], row[3], row[4], row[5], row[6]))
+
+        for row in conn.execute(INDEXES_QUERY).fetchall():
+            sqlType = tables.get(row[0])
+            if sqlType is None:
+                continue
+            if not sqlType.indexes or sqlType.indexes[-1].name != row[2]:
+                sqlType.indexes.append(IndexInfo(row[1], row[2], row[3], row[4], row[5]))
+            sqlType.indexes[-1].columns.append(row[6])
+
+        for row in conn.execute(FOREIGN_KEYS_QUERY).fetchall():
+            if row[0] in tables:
+                tables[row[0]].foreignKeys.append(ForeignKey(row[1], row[2], row[0], row[3], row[4], row[5], onUpdate=row[6], onDelete=row[7], match=row[8]))
+
+        self.sqlObjects = sqlObjects
+        self.tables = tables
+        self.views = views
+        self.indexes = indexes
+        self.triggers = triggers
+        self.rowCounts = dict()
+        self.resultShapes.clear()
+
+    def getSqlObjects(self):
+        '''
+        @return: list of SqlType [table, view, index, trigger] ordered by type and name
+        '''
+        return list(self.sqlObjects)
+
+    def getTableNames(self):
+        return list(self.tables.keys())
+
+    def getViewNames(self):
+        return list(self.views.keys())
+
+    def getSqlType(self, name=None):
+        for objects in (self.tables, self.views, self.indexes, self.triggers):
+            if name in objects:
+                return objects[name]
+        return None
+
+    def getColumns(self, tableName=None):
+        sqlType = self.tables.get(tableName)
+        return list(sqlType.columns) if sqlType else list()
+
+    def getIndexes(self, tableName=None):
+        sqlType = self.tables.get(tableName)
+        return list(sqlType.indexes) if sqlType else list()
+
+    def getForeignKeys(self, tableName=None):
+        sqlType = self.tables.get(tableName)
+        return list(sqlType.foreignKeys) if sqlType else list()
+
+    def getReferences(self, tableName=None):
+        '''
+        @return: list of ForeignKey of other tables referencing tableName
+        '''
+        references = list()
+        for sqlType in self.tables.values():
+            for foreignKey in sqlType.foreignKeys:
+                if foreignKey.refTableName == tableName:
+                    references.append(foreignKey)
+        return references
+
+    def getTriggers(self, tableName=None):
+        return [sqlType for sqlType in self.triggers.values() if sqlType.tbl_name == tableName]
+
+    def getReferencedTables(self, sqlText=None):
+        '''
+        @return: list of table names following FROM or JOIN in sqlText
+        '''
+        tableNames = list()
+        for name in TABLE_REFERENCE_PATTERN.findall(sqlText):
+            if name[0] in '`"[':
+                name = name[1:-1]
+            elif '.' in name:
+                # schema qualified name
+                name = name.split('.')[-1]
+            if name not in tableNames:
+                tableNames.append(name)
+        return tableNames
+
+    def getResultColumnTypes(self, sqlText=None, headers=None):
+        '''
+        Declared types of result columns, looked up by column name in the
+        tables referenced by the statement. The result is cached per statement
+        text until the schema changes.
+        @return: tuple of declared type or None for expressions and unknown columns
+        '''
+        headers = tuple(headers)
+        shape = self.resultShapes.get(sqlText)
+        if shape and shape[0] == headers:
+            return shape[1]
+        columnTypesByName = dict()
+        # first referenced table wins for ambiguous names
+        for tableName in reversed(self.getReferencedTables(sqlText)):
+            sqlType = self.tables.get(tableName)
+            if sqlType is None:
+                sqlType = next((t for name, t in self.tables.items() if name.lower() == tableName.lower()), None)
+            if sqlType:
+                for column in sqlType.columns:
+                    columnTypesByName[column.name.lower()] = column.dataType if column.dataType else None
+        columnTypes = tuple(columnTypesByName.get(str(header).lower()) for header in headers)
+        self.resultShapes.put(sqlText, (headers, columnTypes))
+        return columnTypes
+
+    def getRowCount(self, conn, tableName=None):
+        '''
+        @return: row count of table, cached until data of the database changes
+        '''
+        with self.lock:
+            self.refresh(conn)
+            if tableName not in self.rowCounts:
+                self.rowCounts[tableName] = conn.execute('SELECT count(*) FROM "{}"'.format(tableName.replace('"', '""'))).fetchone()[0]
+            return self.rowCounts[tableName]
+
+
+class SchemaCatalogManager():
+    '''
+    Process wide registry of SchemaCatalog keyed by database path.
+    '''
+    catalogs = dict()
+    lock = threading.Lock()
+
+    @classmethod
+    def getCatalog(cls, databasePath=None):
+        key = os.path.normcase(os.path.abspath(databasePath))
+        with cls.lock:
+            catalog = cls.catalogs.get(key)
+            if catalog is None:
+                catalog = SchemaCatalog(databasePath=os.path.abspath(databasePath))
+                cls.catalogs[key] = catalog
+        return catalog
+
+    @classmethod
+    def invalidate(cls, databasePath=None):
+        cls.getCatalog(databasePath).invalidate()
@@ -0,0 +1,130 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from os.path import expanduser
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectionPool import ConnectionPoolManager
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+HISTORY_BATCH_SIZE = 100
+# seconds the writer waits to collect more rows into one transaction
+HISTORY_FLUSH_INTERVAL = 0.5
+# seconds exit waits for queued rows to be written
+HISTORY_EXIT_TIMEOUT = 5
+SQL_LOG_COLUMNS = ('id', 'sql', 'connection_name', 'created_time', 'executed', 'duration')
+SQL_LOG_INDEXES_SCRIPT = '''
+    CREATE INDEX IF NOT EXISTS idx_sql_log_created_time ON sql_log (created_time);
+    CREATE INDEX IF NOT EXISTS idx_sql_log_connection_name ON sql_log (connection_name);
+'''
+
+
+class SqlHistoryWriter():
+    '''
+    Writes sql_log rows on a background thread. Rows are collected for
+    HISTORY_FLUSH_INTERVAL seconds and inserted in one transaction. Listeners
+    are called on the writer thread with the inserted rows, id included.
+    Queued rows are written at exit.
+
+    @param database: database file name in user home
+    '''
+    instance = None
+    instanceLock = threading.Lock()
+
+    def __init__(self, database='_opal.sqlite'):
+        self.databasePath = os.path.join(expanduser("~"), database)
+        self.rows = queue.Queue()
+        self.listeners = list()
+        self.indexesCreated = False
+        self.thread = threading.Thread(target=self.run, name='SqlHistoryWriter', daemon=True)
+        self.thread.start()
+        atexit.register(self.flush, timeout=HISTORY_EXIT_TIMEOUT)
+
+    @classmethod
+    def getInstance(cls):
+        with cls.instanceLock:
+            if cls.instance is None:
+                cls.instance = SqlHistoryWriter()
+            return cls.instance
+
+    def addListener(self, listener=None):
+        '''
+        @param listener: callable(rows) with rows as list of tuple in SQL_LOG_COLUMNS order
+        '''
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def removeListener(self, listener=None):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def log(self, sqlText=None, duration=None, connectionName=None):
+        # same text format the sqlite3 datetime adapter writes
+        self.rows.put((str(sqlText), connectionName, str(datetime.now()), '1', duration))
+
+    def flush(self, timeout=None):
+        '''
+        block until all queued rows are written.
+        @param timeout: seconds to wait at most, None waits until written
+        '''
+        done = threading.Event()
+        self.rows.put(done)
+        done.wait(timeout)
+
+    def run(self):
+        while True:
+            batch = [self.rows.get()]
+            waiters = list()
+            deadline = time.time() + HISTORY_FLUSH_INTERVAL
+            try:
+                while len(batch) < HISTORY_BATCH_SIZE and not isinstance(batch[-1], threading.Event):
+                    batch.append(self.rows.get(timeout=max(deadline - time.time(), 0)))
+            except queue.Empty:
+                pass
+            rows = list()
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+            if rows:
+                self.writeRows(rows)
+            for waiter in waiters:
+                waiter.set()
+
+    def createIndexes(self, conn):
+        if not self.indexesCreated:
+            conn.executescript(SQL_LOG_INDEXES_SCRIPT)
+            self.indexesCreated = True
+
+    def writeRows(self, rows):
+        conn = ConnectionPoolManager.lease(self.databasePath)
+        insertedRows = list()
+        try:
+            self.createIndexes(conn)
+            with conn:
+                cur = conn.cursor()
+                for row in rows:
+                    cur.execute('INSERT INTO sql_log (sql, connection_name, created_time, executed, duration) VALUES (?, ?, ?, ?, ?)', row)
+                    insertedRows.append((cur.lastrowid,) + row)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            insertedRows = list()
+        finally:
+            ConnectionPoolManager.release(self.databasePath, conn)
+        if insertedRows:
+            for listener in list(self.listeners):
+                try:
+                    listener(insertedRows)
+                except Exception as e:
+                    logger.error(e, exc_info=True)
@@ -0,0 +1,390 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import threading
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ConnectionPool import ConnectionPoolManager
+from src.sqlite_executer.SchemaCatalog import SchemaCatalogManager
+from src.sqlite_executer.ResultCursor import VALUE_TYPES
+from src.sqlite_executer.ResultSet import ResultSet
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+DEFAULT_TABLE_PAGE_SIZE = 500
+ROWID_ALIASES = ('rowid', '_rowid_', 'oid')
+
+
+def quoteName(name):
+    return '"{}"'.format(str(name).replace('"', '""'))
+
+
+class TablePage():
+    '''
+    One page of table rows.
+
+    @param pageNumber: 1 based page number
+    @param headers: tuple of column names
+    @param rows: list of row tuples, without key columns
+    @param keys: list of (sort value, key values...) of each row
+    '''
+
+    def __init__(self, pageNumber=1, headers=None, columnTypes=None, rows=None, keys=None):
+        self.pageNumber = pageNumber
+        self.headers = headers
+        self.columnTypes = columnTypes
+        self.rows = rows if rows else list()
+        self.keys = keys if keys else list()
+        self.isLast = False
+
+    def getFirstKey(self):
+        return self.keys[0] if self.keys else None
+
+    def getLastKey(self):
+        return self.keys[-1] if self.keys else None
+
+    def toResultSet(self):
+        return ResultSet.fromRows(headers=self.headers, columnTypes=self.columnTypes, rows=self.rows)
+
+
+class TablePager():
+    '''
+    Pages through a table by keyset instead of OFFSET. Each page is read with
+    a WHERE clause seeking past the key of the last row of the previous page,
+    so page 100000 costs the same index seek as page 1.
+
+    Rows are keyed by rowid, or by the primary key of WITHOUT ROWID tables.
+    With a sort column the key is (sort column, rowid). The following page is
+    read ahead on a background thread. Jumping to a page far from the visited
+    ones skips rows on the key columns only, see jumpToPage.
+
+    @param databaseAbsolutePath: database file path
+    @param tableName: table name
+    @param pageSize: number of rows per page
+    '''
+
+    def __init__(self, databaseAbsolutePath=None, tableName=None, pageSize=DEFAULT_TABLE_PAGE_SIZE):
+        self.databaseAbsolutePath = databaseAbsolutePath
+        self.tableName = tableName
+        self.pageSize = pageSize
+        self.sortColumn = None
+        self.descending = False
+        self.keyColumns = None
+        self.columnTypes = None
+        self.page = None
+        # page number to key of the last row before the page, None for first page
+        self.pageBoundaries = dict()
+        self.prefetched = None
+        self.prefetchThread = None
+        self.lock = threading.Lock()
+        self.generation = 0
+
+    def lease(self):
+        return ConnectionPoolManager.lease(self.databaseAbsolutePath)
+
+    def release(self, conn):
+        ConnectionPoolManager.release(self.databaseAbsolutePath, conn)
+
+    def loadKeyColumns(self, conn):
+        catalog = SchemaCatalogManager.getCatalog(self.databaseAbsolutePath).refresh(conn)
+        sqlType = catalog.getSqlType(self.tableName)
+        columns = catalog.getColumns(self.tableName)
+        columnNames = [column.name.lower() for column in columns]
+        self.columnTypes = tuple(column.dataType for column in columns)
+        if sqlType and sqlType.sql and 'without rowid' in sqlType.sql.lower():
+            primaryKey = sorted((column for column in columns if column.primaryKey), key=lambda column: column.primaryKey)
+            self.keyColumns = [quoteName(column.name) for column in primaryKey]
+        else:
+            alias = next((alias for alias in ROWID_ALIASES if alias not in columnNames), ROWID_ALIASES[0])
+            self.keyColumns = [alias]
+
+    def setSortColumn(self, sortColumn=None, descending=False):
+        '''
+        Sort by column, None sorts by key. Goes back to the first page.
+        '''
+        with self.lock:
+            self.sortColumn = sortColumn
+            self.descending = descending
+            self.resetPages()
+
+    def resetPages(self):
+        self.generation += 1
+        self.page = None
+        self.pageBoundaries = dict()
+        self.prefetched = None
+
+    def getOrderColumns(self):
+        if self.sortColumn:
+            return [quoteName(self.sortColumn)] + self.keyColumns
+        return list(self.keyColumns)
+
+    def getSeekSegments(self, key=None, forward=True):
+        '''
+        WHERE clauses selecting the rows after (forward) or before key in sort
+        order, read one after the other. Key columns are never NULL, the sort
+        column may be and SQLite sorts NULL before any value. NULL and non NULL
+        rows are read separately so each clause is a plain row value seek on
+        the index instead of an OR over two ranges.
+        @return: list of (clause, params), clause None for no WHERE
+        '''
+        if key is None:
+            return [(None, list())]
+        ascending = forward != self.descending
+        op = '>' if ascending else '<'
+        keyValues = list(key[-len(self.keyColumns):])
+        if not self.sortColumn:
+            return [(self.getRowValueClause(self.keyColumns, op), keyValues)]
+        sortColumn = quoteName(self.sortColumn)
+        sortValue = key[0]
+        if sortValue is None:
+            nullSegment = (f'{sortColumn} IS NULL AND ' + self.getRowValueClause(self.keyColumns, op), keyValues)
+            if ascending:
+                return [nullSegment, (f'{sortColumn} IS NOT NULL', list())]
+            return [nullSegment]
+        valueSegment = (self.getRowValueClause(self.getOrderColumns(), op), [sortValue] + keyValues)
+        if ascending:
+            return [valueSegment]
+        return [valueSegment, (f'{sortColumn} IS NULL', list())]
+
+    def getRowValueClause(self, columns, op):
+        return '({}) {} ({})'.format(', '.join(columns), op, ', '.join('?' for _ in columns))
+
+    def getOrderBy(self, clause=None, forward=True):
+        sql = f' FROM {quoteName(self.tableName)}'
+        if clause:
+            sql += f' WHERE {clause}'
+        direction = 'ASC' if forward != self.descending else 'DESC'
+        return sql + ' ORDER BY ' + ', '.join(f'{column} {direction}' for column in self.getOrderColumns())
+
+    def getSelectSql(self, clause=None, forward=True):
+        '''
+        @return: sql reading rows matching clause in sort order, takes
+        clause parameters followed by limit
+        '''
+        keyNames = ', '.join(f'{column} AS "_key_{idx}"' for idx, column in enumerate(self.getOrderColumns()))
+        return f'SELECT {keyNames}, *' + self.getOrderBy(clause=clause, forward=forward) + ' LIMIT ?'
+
+    def getKeySql(self, clause=None):
+        '''
+        @return: sql reading the key of one row matching clause in sort
+        order, takes clause parameters followed by offset
+        '''
+        return 'SELECT ' + ', '.join(self.getOrderColumns()) + self.getOrderBy(clause=clause) + ' LIMIT 1 OFFSET ?'
+
+    def seekKey(self, conn, key=None, offset=0):
+        '''
+        Key of the row offset rows after key in sort order. Only the key
+        columns are read, from the index of the sort column or the rowid
+        b-tree, table rows in between are not decoded. The rows are still
+        skipped one by one, cost grows with offset.
+        @return: key, None when the table has no row at offset
+        '''
+        if self.keyColumns is None:
+            self.loadKeyColumns(conn)
+        for clause, params in self.getSeekSegments(key=key, forward=True):
+            row = conn.execute(self.getKeySql(clause=clause), params + [offset]).fetchone()
+            if row:
+                return tuple(row)
+            # offset reaches past this segment, skip its rows in the next one
+            countSql = f'SELECT count(*) FROM (SELECT 1 FROM {quoteName(self.tableName)}{" WHERE " + clause if clause else ""} LIMIT ?)'
+            offset -= conn.execute(countSql, params + [offset]).fetchone()[0]
+        return None
+
+    def readPage(self, conn, pageNumber=1, key=None, forward=True):
+        if self.keyColumns is None:
+            self.loadKeyColumns(conn)
+        keyCount = len(self.getOrderColumns())
+        headers = None
+        rows = list()
+        # one row more tells if a following page exists
+        limit = self.pageSize + 1
+        for clause, params in self.getSeekSegments(key=key, forward=forward):
+            if len(rows) >= limit:
+                break
+            cur = conn.execute(self.getSelectSql(clause=clause, forward=forward), params + [limit - len(rows)])
+            headers = tuple(desc[0] for desc in cur.description[keyCount:])
+            rows.extend(cur.fetchall())
+        hasMore = len(rows) > self.pageSize
+        rows = rows[:self.pageSize]
+        if not forward:
+            rows.reverse()
+        columnTypes = self.columnTypes
+        if not columnTypes or len(columnTypes) != len(headers):
+            columnTypes = tuple(VALUE_TYPES.get(type(value), '') for value in rows[0][keyCount:]) if rows else tuple('' for _ in headers)
+        else:
+            columnTypes = tuple(columnType if columnType else '' for columnType in columnTypes)
+        page = TablePage(pageNumber=pageNumber, headers=headers, columnTypes=columnTypes,
+                         rows=[row[keyCount:] for row in rows], keys=[row[:keyCount] for row in rows])
+        page.isLast = not hasMore if forward else False
+        return page
+
+    def fetch(self, pageNumber=1, key=None, forward=True):
+        conn = self.lease()
+        try:
+            return self.readPage(conn, pageNumber=pageNumber, key=key, forward=forward)
+        finally:
+            self.release(conn)
+
+    def setPage(self, page):
+        '''
+        make page current and read the following page ahead.
+        '''
+        with self.lock:
+            self.page = page
+            if page.pageNumber == 1:
+                self.pageBoundaries[1] = None
+            if page.keys and not page.isLast:
+                self.pageBoundaries[page.pageNumber + 1] = page.getLastKey()
+        if page.keys and not page.isLast:
+            self.prefetch(page)
+        return page
+
+    def prefetch(self, page):
+        generation = self.generation
+
+        def run():
+            try:
+                nextPage = self.fetch(pageNumber=page.pageNumber + 1, key=page.getLastKey(), forward=True)
+                with self.lock:
+                    if generation == self.generation:
+                        self.prefetched = nextPage
+            except Exception as e:
+                logger.error(e, exc_info=True)
+        self.prefetchThread = threading.Thread(target=run, name='TablePagerPrefetch', daemon=True)
+        self.prefetchThread.start()
+
+    def takePrefetched(self, pageNumber):
+        if self.prefetchThread:
+            self.prefetchThread.join()
+        with self.lock:
+            page = self.prefetched
+            self.prefetched = None
+        if page and page.pageNumber == pageNumber:
+            return page
+        return None
+
+    def firstPage(self):
+        return self.setPage(self.fetch(pageNumber=1))
+
+    def nextPage(self):
+        '''
+        @return: following page, current page when it is the last one
+        '''
+        if self.page is None:
+            return self.firstPage()
+        if self.page.isLast or not self.page.keys:
+            return self.page
+        page = self.takePrefetched(self.page.pageNumber + 1)
+        if page is None:
+            page = self.fetch(pageNumber=self.page.pageNumber + 1, key=self.page.getLastKey(), forward=True)
+        if not page.rows:
+            self.page.isLast = True
+            return self.page
+        return self.setPage(page)
+
+    def previousPage(self):
+        if self.page is None or self.page.pageNumber <= 1 or not self.page.keys:
+            return self.firstPage()
+        page = self.fetch(pageNumber=self.page.pageNumber - 1, key=self.page.getFirstKey(), forward=False)
+        if len(page.rows) < self.pageSize:
+            # reached start of table, page numbers were estimated
+            return self.firstPage()
+        page.isLast = False
+        return self.setPage(page)
+
+    def lastPage(self, rowCount=None):
+        '''
+        @param rowCount: row count or estimate used to number the last page
+        '''
+        page = self.fetch(key=None, forward=False)
+        lastPageSize = 0
+        if rowCount:
+            pageNumber = max((rowCount + self.pageSize - 1) // self.pageSize, 1)
+            lastPageSize = rowCount - (pageNumber - 1) * self.pageSize
+        else:
+            pageNumber = 1
+        if 0 < lastPageSize < len(page.rows):
+            # show the rows of the last page only
+            page.rows = page.rows[-lastPageSize:]
+            page.keys = page.keys[-lastPageSize:]
+        page.pageNumber = pageNumber
+        page.isLast = True
+        with self.lock:
+            self.resetPages()
+            self.page = page
+        return page
+
+    def jumpToPage(self, pageNumber=1):
+        '''
+        Start at the nearest visited page before pageNumber, seek the key of
+        the last row before the page with seekKey and read the page from that
+        key. Far jumps stay linear in the rows skipped, but read key columns
+        only.
+        '''
+        pageNumber = max(pageNumber, 1)
+        if pageNumber == 1:
+            return self.firstPage()
+        if self.page and pageNumber == self.page.pageNumber:
+            return self.page
+        if self.page and pageNumber == self.page.pageNumber + 1:
+            return self.nextPage()
+        with self.lock:
+            known = [number for number in self.pageBoundaries.keys() if number <= pageNumber]
+            startNumber = max(known) if known else 1
+            key = self.pageBoundaries.get(startNumber)
+        conn = self.lease()
+        try:
+            if startNumber < pageNumber:
+                key = self.seekKey(conn, key=key, offset=(pageNumber - startNumber) * self.pageSize - 1)
+            page = self.readPage(conn, pageNumber=pageNumber, key=key, forward=True) if key is not None else None
+        finally:
+            self.release(conn)
+        if not page or not page.rows:
+            return self.lastPage()
+        with self.lock:
+            self.pageBoundaries[pageNumber] = key
+        return self.setPage(page)
+
+    def refresh(self):
+        '''
+        read the current page again.
+        '''
+        pageNumber = self.page.pageNumber if self.page else 1
+        with self.lock:
+            key = self.pageBoundaries.get(pageNumber)
+            self.generation += 1
+            self.page = None
+            self.prefetched = None
+        if pageNumber == 1:
+            return self.firstPage()
+        if key is not None:
+            return self.setPage(self.fetch(pageNumber=pageNumber, key=key, forward=True))
+        return self.jumpToPage(pageNumber)
+
+    def estimateRowCount(self):
+        '''
+        Cheap row count: sqlite_stat1 when the table was analyzed, else
+        max(rowid) - min(rowid) + 1 which both are index seeks.
+        @return: (rowCount, exact)
+        '''
+        conn = self.lease()
+        try:
+            if self.keyColumns is None:
+                self.loadKeyColumns(conn)
+            try:
+                row = conn.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1', (self.tableName,)).fetchone()
+                if row and row[0]:
+                    return int(str(row[0]).split()[0]), False
+            except Exception:
+                # no sqlite_stat1 before first ANALYZE
+                pass
+            if len(self.keyColumns) == 1 and self.keyColumns[0] in ROWID_ALIASES:
+                key = self.keyColumns[0]
+                row = conn.execute(f'SELECT max({key}) - min({key}) + 1 FROM {quoteName(self.tableName)}').fetchone()
+                return (row[0] if row and row[0] else 0), False
+            return SchemaCatalogManager.getCatalog(self.databaseAbsolutePath).getRowCount(conn, self.tableName), True
+        finally:
+            self.release(conn)
@@ -248,8 +248,8 @@ class HistoryGrid(gridlib.Grid):
         logger.debug('cols: %s', self.GetNumberCols())
 #         self.DeleteRows()
         currentRows,currentCols = (self.GetNumberRows(), self.GetNumberCols())
-        newRows = len(data) - 1
-        newCols = len(data[0])
+        newRows = data.getRowCount()
+        newCols = data.getColumnCount()
 #         self.AppendRows(numRows=len(data)-1, updateLabels=True)   
 #         if len(data) > 0 :
 #             self.AppendCols(numCols=len(data[0]), updateLabels=True)  
@@ -271,7 +271,7 @@ class HistoryGrid(gridlib.Grid):
             self.AppendCols(newCols - currentCols)
         
 
-        for dataKey, dataValue in data.items():
+        for dataKey, dataValue in enumerate([data.headers] + list(data.iterRows())):
 #             logger.error("dataKey: %s dataValue: %s",dataKey, dataValue)
             for idx, colValue in enumerate(dataValue):
 #                 print(idx, dataValue)
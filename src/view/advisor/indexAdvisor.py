@@ -0,0 +1,133 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import wx
+
+import logging.config
+from src.view.constants import LOG_SETTINGS
+import threading
+from src.sqlite_executer.IndexAdvisor import IndexAdvisor
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+
+class AdvisorProgress():
+    '''
+    Runs IndexAdvisor on a worker thread. Progress dialog shows the candidate
+    being evaluated and cancels the advisor on abort.
+    '''
+
+    def __init__(self, parent=None, indexAdvisor=None, title='Index advisor'):
+        self.parent = parent
+        self.indexAdvisor = indexAdvisor
+        self.title = title
+        self.progressDialog = None
+
+    def start(self):
+        self.progressDialog = wx.ProgressDialog(self.title, "Reading workload from sql_log...", maximum=100, parent=self.parent,
+                                                style=wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME | wx.PD_APP_MODAL)
+        self.indexAdvisor.onProgress = lambda text: wx.CallAfter(self.onProgress, text)
+        threading.Thread(target=self.runAdvisor, name='IndexAdvisor', daemon=True).start()
+
+    def runAdvisor(self):
+        indexAdvice = self.indexAdvisor.advise()
+        wx.CallAfter(self.onAdviceDone, indexAdvice)
+
+    def onProgress(self, text):
+        if self.progressDialog:
+            keepGoing, skip = self.progressDialog.Pulse(text)
+            if not keepGoing:
+                self.indexAdvisor.cancel()
+
+    def onAdviceDone(self, indexAdvice):
+        if self.progressDialog:
+            self.progressDialog.Destroy()
+            self.progressDialog = None
+        if indexAdvice.error or not indexAdvice.recommendations:
+            dlg = wx.MessageDialog(self.parent, str(indexAdvice), 'Index advisor status',
+                                   wx.OK | (wx.ICON_ERROR if indexAdvice.error else wx.ICON_INFORMATION))
+            dlg.ShowModal()
+            dlg.Destroy()
+        else:
+            frame = IndexAdvisorFrame(None, self.title, indexAdvice=indexAdvice)
+            frame.Show()
+
+
+class IndexAdvisorFrame(wx.Frame):
+    '''
+    Recommended indexes, most time saved first. Selecting one shows the
+    statements it helps with their plans before and after.
+    '''
+
+    def __init__(self, parent, title, indexAdvice=None):
+        wx.Frame.__init__(self, parent, -1, title, size=(970, 720),
+                          style=wx.DEFAULT_FRAME_STYLE | wx.NO_FULL_REPAINT_ON_RESIZE)
+        self.indexAdvice = indexAdvice
+        self.SetMinSize((640, 480))
+
+        self.splitter = wx.SplitterWindow(self, -1, style=wx.SP_3DBORDER)
+        self.splitter.SetMinimumPaneSize(20)
+        self.recommendationList = wx.ListCtrl(self.splitter, -1, style=wx.LC_REPORT)
+        self.recommendationList.InsertColumn(0, "Saved time (s)", width=100)
+        self.recommendationList.InsertColumn(1, "Statements", width=80)
+        self.recommendationList.InsertColumn(2, "Index", width=710)
+        self.Bind(wx.EVT_LIST_ITEM_SELECTED, self.onItemSelected, self.recommendationList)
+        self.detailText = wx.TextCtrl(self.splitter, -1, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.HSCROLL | wx.TE_DONTWRAP)
+        self.detailText.SetFont(wx.Font(10, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+        self.splitter.SplitHorizontally(self.recommendationList, self.detailText, sashPosition=300)
+
+        copyButton = wx.Button(self, -1, "Copy SQL")
+        copyButton.SetToolTip("Copy CREATE INDEX of the selected indexes, all when none is selected")
+        self.Bind(wx.EVT_BUTTON, self.onCopySql, copyButton)
+        closeButton = wx.Button(self, wx.ID_CLOSE, "Close")
+        self.Bind(wx.EVT_BUTTON, lambda e: self.Close(), closeButton)
+        buttonSizer = wx.BoxSizer(wx.HORIZONTAL)
+        buttonSizer.AddStretchSpacer()
+        buttonSizer.Add(copyButton, 0, wx.ALL, 5)
+        buttonSizer.Add(closeButton, 0, wx.ALL, 5)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.splitter, 1, wx.EXPAND)
+        sizer.Add(buttonSizer, 0, wx.EXPAND)
+        self.SetSizer(sizer)
+        self.statusbar = self.CreateStatusBar(1, wx.STB_SIZEGRIP)
+        self.statusbar.SetStatusText(str(indexAdvice))
+        self.addRecommendations()
+        self.Center()
+
+    def addRecommendations(self):
+        for index, recommendation in enumerate(self.indexAdvice.recommendations):
+            self.recommendationList.InsertItem(index, f'{recommendation.savedTime:.3f}')
+            self.recommendationList.SetItem(index, 1, str(len(recommendation.statements)))
+            self.recommendationList.SetItem(index, 2, recommendation.getCreateSql())
+
+    def getSelectedRecommendations(self):
+        selected = list()
+        index = self.recommendationList.GetFirstSelected()
+        while index != -1:
+            selected.append(self.indexAdvice.recommendations[index])
+            index = self.recommendationList.GetNextSelected(index)
+        return selected
+
+    def onItemSelected(self, event):
+        recommendation = self.indexAdvice.recommendations[event.GetIndex()]
+        self.detailText.SetValue(recommendation.getText())
+
+    def onCopySql(self, event):
+        logger.debug('onCopySql')
+        recommendations = self.getSelectedRecommendations() or self.indexAdvice.recommendations
+        if wx.TheClipboard.Open():
+            wx.TheClipboard.SetData(wx.TextDataObject('\n'.join(recommendation.getCreateSql() for recommendation in recommendations)))
+            wx.TheClipboard.Close()
+            self.statusbar.SetStatusText(f'{len(recommendations)} CREATE INDEX statements copied')
+
+
+def adviseIndexes(parent=None, connectionName=None, databaseAbsolutePath=None):
+    '''
+    Recommend indexes for the slow statements of connectionName in sql_log.
+    '''
+    indexAdvisor = IndexAdvisor(connectionName=connectionName, databaseAbsolutePath=databaseAbsolutePath)
+    AdvisorProgress(parent=parent, indexAdvisor=indexAdvisor, title=f'Index advisor {connectionName}').start()
@@ -0,0 +1,170 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import wx
+
+import logging.config
+from src.view.constants import LOG_SETTINGS
+import os
+import threading
+from src.sqlite_executer.DatabaseCompare import DatabaseCompare, SOURCE_ONLY, TARGET_ONLY
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+
+class CompareProgress():
+    '''
+    Runs DatabaseCompare on a worker thread. Progress dialog shows compared
+    rows and cancels the compare on abort.
+    '''
+
+    def __init__(self, parent=None, databaseCompare=None, title='Compare databases'):
+        self.parent = parent
+        self.databaseCompare = databaseCompare
+        self.title = title
+        self.progressDialog = None
+
+    def start(self):
+        self.progressDialog = wx.ProgressDialog(self.title, "Comparing schema...", maximum=100, parent=self.parent,
+                                                style=wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME | wx.PD_APP_MODAL)
+        self.databaseCompare.onProgress = lambda compareResult: wx.CallAfter(self.onProgress, compareResult)
+        threading.Thread(target=self.runCompare, name='DatabaseCompare', daemon=True).start()
+
+    def runCompare(self):
+        compareResult = self.databaseCompare.compare()
+        wx.CallAfter(self.onCompareDone, compareResult)
+
+    def onProgress(self, compareResult):
+        if self.progressDialog:
+            keepGoing, skip = self.progressDialog.Pulse(f"Table {compareResult.tableName}: {compareResult.rowCount} rows compared, {compareResult.getRowsPerSecond()} rows/s")
+            if not keepGoing:
+                self.databaseCompare.cancel()
+
+    def onCompareDone(self, compareResult):
+        if self.progressDialog:
+            self.progressDialog.Destroy()
+            self.progressDialog = None
+        if compareResult.error or compareResult.cancelled:
+            dlg = wx.MessageDialog(self.parent, str(compareResult), 'Compare databases status',
+                                   wx.OK | (wx.ICON_ERROR if compareResult.error else wx.ICON_INFORMATION))
+            dlg.ShowModal()
+            dlg.Destroy()
+        else:
+            frame = DatabaseCompareFrame(None, self.title, databaseCompare=self.databaseCompare, compareResult=compareResult)
+            frame.Show()
+
+
+class DatabaseCompareFrame(wx.Frame):
+    '''
+    Differences of a compare. Selecting a schema difference shows a unified
+    diff of its definition, selecting a table shows its differing rows.
+    '''
+
+    def __init__(self, parent, title, databaseCompare=None, compareResult=None):
+        wx.Frame.__init__(self, parent, -1, title, size=(970, 720),
+                          style=wx.DEFAULT_FRAME_STYLE | wx.NO_FULL_REPAINT_ON_RESIZE)
+        self.databaseCompare = databaseCompare
+        self.compareResult = compareResult
+        self.items = list()
+        self.SetMinSize((640, 480))
+
+        self.splitter = wx.SplitterWindow(self, -1, style=wx.SP_3DBORDER)
+        self.splitter.SetMinimumPaneSize(20)
+        self.differenceList = wx.ListCtrl(self.splitter, -1, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        self.differenceList.InsertColumn(0, "Type", width=80)
+        self.differenceList.InsertColumn(1, "Name", width=250)
+        self.differenceList.InsertColumn(2, "Difference", width=560)
+        self.Bind(wx.EVT_LIST_ITEM_SELECTED, self.onItemSelected, self.differenceList)
+        self.detailText = wx.TextCtrl(self.splitter, -1, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.HSCROLL | wx.TE_DONTWRAP)
+        self.detailText.SetFont(wx.Font(10, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+        self.splitter.SplitHorizontally(self.differenceList, self.detailText, sashPosition=300)
+
+        saveButton = wx.Button(self, -1, "Save migration script")
+        self.Bind(wx.EVT_BUTTON, self.onSaveMigrationScript, saveButton)
+        closeButton = wx.Button(self, wx.ID_CLOSE, "Close")
+        self.Bind(wx.EVT_BUTTON, lambda e: self.Close(), closeButton)
+        buttonSizer = wx.BoxSizer(wx.HORIZONTAL)
+        buttonSizer.AddStretchSpacer()
+        buttonSizer.Add(saveButton, 0, wx.ALL, 5)
+        buttonSizer.Add(closeButton, 0, wx.ALL, 5)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.splitter, 1, wx.EXPAND)
+        sizer.Add(buttonSizer, 0, wx.EXPAND)
+        self.SetSizer(sizer)
+        self.statusbar = self.CreateStatusBar(1, wx.STB_SIZEGRIP)
+        self.statusbar.SetStatusText(str(compareResult))
+        self.addDifferences()
+        self.Center()
+
+    def addDifferences(self):
+        for schemaDifference in self.compareResult.schemaDifferences:
+            self.addItem(schemaDifference.objectType, schemaDifference.name, schemaDifference.status, schemaDifference)
+        for tableName, tableDifference in sorted(self.compareResult.dataDifferences.items()):
+            if tableDifference.hasDifferences() or tableDifference.skipReason:
+                self.addItem('data', tableName, str(tableDifference).split(': ', 1)[1], tableDifference)
+        if not self.items:
+            self.detailText.SetValue(f'{self.compareResult.sourcePath}\nand\n{self.compareResult.targetPath}\nare the same.')
+
+    def addItem(self, objectType=None, name=None, difference=None, item=None):
+        index = self.differenceList.InsertItem(self.differenceList.GetItemCount(), objectType)
+        self.differenceList.SetItem(index, 1, name)
+        self.differenceList.SetItem(index, 2, difference)
+        self.items.append(item)
+
+    def onItemSelected(self, event):
+        item = self.items[event.GetIndex()]
+        if hasattr(item, 'getDiffText'):
+            self.detailText.SetValue(item.getDiffText())
+        elif item.skipReason:
+            self.detailText.SetValue(str(item))
+        else:
+            self.detailText.SetValue(self.getRowDifferenceText(item.tableName))
+
+    def getRowDifferenceText(self, tableName=None):
+        try:
+            columns, rowDifferences = self.databaseCompare.getRowDifferences(self.compareResult, tableName)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            return str(e)
+        lines = [str(self.compareResult.dataDifferences[tableName]), '    ' + ', '.join(columns)]
+        for status, sourceRow, targetRow in rowDifferences:
+            lines.append('')
+            if status != TARGET_ONLY:
+                lines.append(f'{"+" if status == SOURCE_ONLY else "~"} source {sourceRow}')
+            if status != SOURCE_ONLY:
+                lines.append(f'{"-" if status == TARGET_ONLY else "~"} target {targetRow}')
+        return '\n'.join(lines)
+
+    def onSaveMigrationScript(self, event):
+        logger.debug('onSaveMigrationScript')
+        dlg = wx.FileDialog(self, "Save migration script", defaultDir=os.path.dirname(self.compareResult.targetPath),
+                            defaultFile='migration.sql', wildcard="SQL files (*.sql)|*.sql|All files (*.*)|*.*",
+                            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT)
+        if dlg.ShowModal() == wx.ID_OK:
+            filePath = dlg.GetPath()
+            try:
+                wx.BeginBusyCursor()
+                statementCount = self.databaseCompare.writeMigrationScript(self.compareResult, filePath)
+                self.statusbar.SetStatusText(f'{statementCount} statements written to {filePath}')
+            except Exception as e:
+                logger.error(e, exc_info=True)
+                self.statusbar.SetStatusText(f'Migration script failed: {e}')
+            finally:
+                wx.EndBusyCursor()
+        dlg.Destroy()
+
+
+def compareDatabases(parent=None, sourceConnectionName=None, sourcePath=None, targetConnectionName=None, targetPath=None):
+    '''
+    Compare source with target and show the differences. Migration script
+    changes target into source.
+    '''
+    databaseCompare = DatabaseCompare(sourceConnectionName=sourceConnectionName, sourcePath=sourcePath,
+                                      targetConnectionName=targetConnectionName, targetPath=targetPath)
+    compareProgress = CompareProgress(parent=parent, databaseCompare=databaseCompare,
+                                      title=f'Compare {sourceConnectionName} with {targetConnectionName}')
+    compareProgress.start()
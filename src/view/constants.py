@@ -1,7 +1,6 @@
 import wx
-import tempfile
-import os
 from src.view.util.common.ed_glob import ID_GOTO_LINE
+from src.view.util.LogManager import LogManager
 # from src.settings.workspace import Setting
 
 TITLE = "Eclipse"
@@ -83,6 +82,9 @@ ID_NEW_PYTHON_PACKAGE = wx.NewIdRef()
 ID_NEW_PYTHON_MODULE = wx.NewIdRef()
 
 ID_RUN = wx.NewIdRef()
+ID_CANCEL_QUERY = wx.NewIdRef()
+ID_EXPORT_QUERY = wx.NewIdRef()
+ID_EXPLAIN_QUERY = wx.NewIdRef()
 ID_SQL_TEXT = wx.NewIdRef()
 ID_DEBUG = wx.NewIdRef()
 ID_RUN_HISTORY = wx.NewIdRef()
@@ -322,42 +324,8 @@ if 'wxMac' in wx.PlatformInfo:
 else:
     keyMap[wx.WXK_COMMAND] = "WXK_COMMAND"
     keyMap[wx.WXK_CONTROL] = "WXK_CONTROL"
-LOG_SETTINGS = {
-'version': 1,
-'handlers': {
-    'console': {
-        'class': 'logging.StreamHandler',
-        'level': 'DEBUG',
-        'formatter': 'detailed',
-        'stream': 'ext://sys.stdout',
-    },
-    'file': {
-        'class': 'logging.handlers.RotatingFileHandler',
-        'level': 'DEBUG',
-        'formatter': 'detailed',
-        'filename': os.path.join(tempfile.gettempdir(), 'eclipse.log'),
-        'mode': 'a',
-        'maxBytes': 10485760,
-        'backupCount': 5,
-    },
-
-},
-'formatters': {
-    'detailed': {
-        'format': '%(asctime)s %(module)-17s line:%(lineno)-4d %(levelname)-8s %(message)s',
-    },
-    'email': {
-        'format': 'Timestamp: %(asctime)s\nModule: %(module)s\n' \
-        'Line: %(lineno)d\nMessage: %(message)s',
-    },
-},
-'loggers': {
-    'extensive': {
-        'level': 'DEBUG',
-        'handlers': ['file', 'console']
-        },
-}
-}
+# handlers are set up once by LogManager, see LogManager.configure
+LOG_SETTINGS = LogManager.configure()
 
 baseList = [
         [ID_NEW_PROJECT, 'Project', "new_con.png", None],
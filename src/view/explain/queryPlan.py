@@ -0,0 +1,174 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import wx
+
+import logging.config
+from src.view.constants import LOG_SETTINGS
+import threading
+from src.sqlite_executer.QueryProfiler import QueryProfiler, SQL_PROFILE_COLUMNS
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+HISTORY_COLUMNS = (('created_time', 'Time', 160), ('duration', 'Duration (s)', 90), ('row_count', 'Rows', 80),
+                   ('vm_steps', 'VM steps', 110), ('full_scan_steps', 'Full scan steps', 110), ('sort_count', 'Sorts', 60),
+                   ('warnings', 'Warnings', 200))
+
+
+class ProfileProgress():
+    '''
+    Runs QueryProfiler on a worker thread, progress dialog cancels the
+    running statement on abort.
+    '''
+
+    def __init__(self, parent=None, queryProfiler=None, title='Explain / Profile', onDone=None):
+        self.parent = parent
+        self.queryProfiler = queryProfiler
+        self.title = title
+        self.onDone = onDone
+        self.progressDialog = None
+        self.timer = None
+
+    def start(self, sqlText=None):
+        self.queryProfiler.cancelled = False
+        self.progressDialog = wx.ProgressDialog(self.title, "Profiling statement...", maximum=100, parent=self.parent,
+                                                style=wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME | wx.PD_APP_MODAL)
+        self.timer = wx.Timer()
+        self.timer.Bind(wx.EVT_TIMER, self.onTimer)
+        self.timer.Start(200)
+        threading.Thread(target=self.runProfile, args=(sqlText,), name='QueryProfiler', daemon=True).start()
+
+    def runProfile(self, sqlText=None):
+        queryProfile = self.queryProfiler.profile(sqlText)
+        wx.CallAfter(self.onProfileDone, queryProfile)
+
+    def onTimer(self, event):
+        if self.progressDialog:
+            keepGoing, skip = self.progressDialog.Pulse()
+            if not keepGoing:
+                self.queryProfiler.cancel()
+
+    def onProfileDone(self, queryProfile):
+        self.timer.Stop()
+        if self.progressDialog:
+            self.progressDialog.Destroy()
+            self.progressDialog = None
+        if self.onDone:
+            self.onDone(queryProfile)
+
+
+class QueryPlanFrame(wx.Frame):
+    '''
+    EXPLAIN QUERY PLAN tree with full scans, temp b-trees and automatic
+    indexes flagged, cost of the profiled run and earlier runs of the same
+    statement from sql_profile.
+    '''
+
+    def __init__(self, parent, title, queryProfiler=None, queryProfile=None):
+        wx.Frame.__init__(self, parent, -1, title, size=(970, 720),
+                          style=wx.DEFAULT_FRAME_STYLE | wx.NO_FULL_REPAINT_ON_RESIZE)
+        self.queryProfiler = queryProfiler
+        self.queryProfile = queryProfile
+        self.SetMinSize((640, 480))
+
+        self.splitter = wx.SplitterWindow(self, -1, style=wx.SP_3DBORDER)
+        self.splitter.SetMinimumPaneSize(20)
+        topSplitter = wx.SplitterWindow(self.splitter, -1, style=wx.SP_3DBORDER)
+        topSplitter.SetMinimumPaneSize(20)
+        self.planTree = wx.TreeCtrl(topSplitter, -1, style=wx.TR_DEFAULT_STYLE | wx.TR_HIDE_ROOT | wx.TR_FULL_ROW_HIGHLIGHT)
+        self.summaryText = wx.TextCtrl(topSplitter, -1, style=wx.TE_MULTILINE | wx.TE_READONLY)
+        topSplitter.SplitVertically(self.planTree, self.summaryText, sashPosition=560)
+        self.historyList = wx.ListCtrl(self.splitter, -1, style=wx.LC_REPORT | wx.LC_SINGLE_SEL)
+        for col, (name, label, width) in enumerate(HISTORY_COLUMNS):
+            self.historyList.InsertColumn(col, label, width=width)
+        self.splitter.SplitHorizontally(topSplitter, self.historyList, sashPosition=420)
+
+        profileButton = wx.Button(self, -1, "Profile again")
+        self.Bind(wx.EVT_BUTTON, self.onProfileAgain, profileButton)
+        closeButton = wx.Button(self, wx.ID_CLOSE, "Close")
+        self.Bind(wx.EVT_BUTTON, lambda e: self.Close(), closeButton)
+        buttonSizer = wx.BoxSizer(wx.HORIZONTAL)
+        buttonSizer.AddStretchSpacer()
+        buttonSizer.Add(profileButton, 0, wx.ALL, 5)
+        buttonSizer.Add(closeButton, 0, wx.ALL, 5)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.splitter, 1, wx.EXPAND)
+        sizer.Add(buttonSizer, 0, wx.EXPAND)
+        self.SetSizer(sizer)
+        self.statusbar = self.CreateStatusBar(1, wx.STB_SIZEGRIP)
+        self.setQueryProfile(queryProfile)
+        self.Center()
+
+    def setQueryProfile(self, queryProfile=None):
+        self.queryProfile = queryProfile
+        self.statusbar.SetStatusText(str(queryProfile))
+        self.setPlan(queryProfile.plan)
+        self.setSummary(queryProfile)
+        self.setHistory(queryProfile)
+
+    def setPlan(self, plan=None):
+        self.planTree.DeleteAllItems()
+        root = self.planTree.AddRoot('QUERY PLAN')
+        for node in plan:
+            self.addPlanNode(root, node)
+        self.planTree.ExpandAll()
+
+    def addPlanNode(self, parentItem, node):
+        warnings = node.getWarnings()
+        label = node.detail + (f'    [{", ".join(warnings)}]' if warnings else '')
+        item = self.planTree.AppendItem(parentItem, label)
+        if warnings:
+            self.planTree.SetItemTextColour(item, wx.RED)
+            self.planTree.SetItemBold(item)
+        for child in node.children:
+            self.addPlanNode(item, child)
+
+    def setSummary(self, queryProfile):
+        lines = [queryProfile.sqlText, '', str(queryProfile)]
+        if not queryProfile.stmtStatus and not queryProfile.error:
+            lines.append('VM steps counted by progress handler, sqlite_stmt is not available in this sqlite build.')
+        warnings = queryProfile.getWarnings()
+        if warnings:
+            lines += ['', 'Warnings:'] + [f'  {warning}: {detail}' for warning, detail in warnings]
+        regressions = queryProfile.getRegressions()
+        if regressions:
+            lines += ['', 'Regression:'] + [f'  {regression}' for regression in regressions]
+        self.summaryText.SetValue('\n'.join(lines))
+
+    def setHistory(self, queryProfile):
+        self.historyList.DeleteAllItems()
+        rows = list()
+        if not queryProfile.error and not queryProfile.cancelled:
+            rows.append({'created_time': f'{queryProfile.createdTime} (this run)', 'duration': queryProfile.duration,
+                         'row_count': queryProfile.rowCount, 'vm_steps': queryProfile.vmSteps,
+                         'full_scan_steps': queryProfile.fullScanSteps, 'sort_count': queryProfile.sortCount,
+                         'warnings': ', '.join(sorted({warning for warning, detail in queryProfile.getWarnings()}))})
+        rows += [dict(zip(SQL_PROFILE_COLUMNS, row)) for row in queryProfile.history]
+        for index, row in enumerate(rows):
+            self.historyList.InsertItem(index, str(row['created_time']))
+            for col, (name, label, width) in enumerate(HISTORY_COLUMNS[1:], 1):
+                value = row[name]
+                if name == 'duration' and value is not None:
+                    value = f'{value:.4f}'
+                self.historyList.SetItem(index, col, '' if value is None else str(value))
+
+    def onProfileAgain(self, event):
+        logger.debug('onProfileAgain')
+        ProfileProgress(parent=self, queryProfiler=self.queryProfiler, title=self.GetTitle(), onDone=self.setQueryProfile).start(self.queryProfile.sqlText)
+
+
+def explainQuery(parent=None, connectionName=None, databaseAbsolutePath=None, sqlText=None):
+    '''
+    Profile sqlText and show its plan. Statements changing data are rolled back.
+    '''
+    queryProfiler = QueryProfiler(connectionName=connectionName, databaseAbsolutePath=databaseAbsolutePath)
+
+    def onDone(queryProfile):
+        frame = QueryPlanFrame(None, f'Explain / Profile {connectionName}', queryProfiler=queryProfiler, queryProfile=queryProfile)
+        frame.Show()
+
+    ProfileProgress(parent=parent, queryProfiler=queryProfiler, title=f'Explain / Profile {connectionName}', onDone=onDone).start(sqlText)
@@ -0,0 +1,147 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import wx
+
+import logging.config
+from src.view.constants import LOG_SETTINGS
+import os
+import threading
+from src.sqlite_executer.DataExporter import DataExporter, FORMAT_LABELS, \
+    getExportFormats, getCompressions, getFileName
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+
+class ExportDataDialog(wx.Dialog):
+    '''
+    Asks for file format, compression and file path of an export.
+    @param name: file name without extension proposed to the user
+    '''
+
+    def __init__(self, parent, title='Export Data', name='export'):
+        wx.Dialog.__init__(self, parent, -1, title, style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.name = name
+        self.fileFormats = getExportFormats()
+        self.compressions = list()
+
+        formatLabel = wx.StaticText(self, -1, "Format")
+        self.formatChoice = wx.Choice(self, choices=[FORMAT_LABELS[fileFormat] for fileFormat in self.fileFormats])
+        self.formatChoice.SetSelection(0)
+        self.Bind(wx.EVT_CHOICE, self.onFormatChoice, self.formatChoice)
+
+        compressionLabel = wx.StaticText(self, -1, "Compression")
+        self.compressionChoice = wx.Choice(self, choices=[])
+        self.Bind(wx.EVT_CHOICE, self.onCompressionChoice, self.compressionChoice)
+
+        filePathLabel = wx.StaticText(self, -1, "File")
+        self.filePicker = wx.FilePickerCtrl(self, -1, path=os.path.join(wx.GetHomeDir(), getFileName(name)), size=(400, -1),
+                                            style=wx.FLP_SAVE | wx.FLP_OVERWRITE_PROMPT | wx.FLP_USE_TEXTCTRL)
+
+        gridSizer = wx.FlexGridSizer(cols=2, vgap=5, hgap=5)
+        gridSizer.AddGrowableCol(1)
+        gridSizer.Add(formatLabel, 0, wx.ALIGN_CENTER_VERTICAL)
+        gridSizer.Add(self.formatChoice, 0)
+        gridSizer.Add(compressionLabel, 0, wx.ALIGN_CENTER_VERTICAL)
+        gridSizer.Add(self.compressionChoice, 0)
+        gridSizer.Add(filePathLabel, 0, wx.ALIGN_CENTER_VERTICAL)
+        gridSizer.Add(self.filePicker, 1, wx.EXPAND)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(gridSizer, 1, wx.EXPAND | wx.ALL, 10)
+        sizer.Add(self.CreateStdDialogButtonSizer(wx.OK | wx.CANCEL), 0, wx.EXPAND | wx.ALL, 10)
+        self.SetSizerAndFit(sizer)
+        self.setCompressions()
+        self.Center()
+
+    def setCompressions(self):
+        self.compressions = getCompressions(self.getFileFormat())
+        self.compressionChoice.Set(['None' if compression is None else compression for compression in self.compressions])
+        self.compressionChoice.SetSelection(0)
+
+    def onFormatChoice(self, event):
+        logger.debug('onFormatChoice')
+        self.setCompressions()
+        self.updateFileName()
+
+    def onCompressionChoice(self, event):
+        logger.debug('onCompressionChoice')
+        self.updateFileName()
+
+    def updateFileName(self):
+        directory = os.path.dirname(self.filePicker.GetPath()) or wx.GetHomeDir()
+        self.filePicker.SetPath(os.path.join(directory, getFileName(self.name, self.getFileFormat(), self.getCompression())))
+
+    def getFileFormat(self):
+        return self.fileFormats[self.formatChoice.GetSelection()]
+
+    def getCompression(self):
+        return self.compressions[self.compressionChoice.GetSelection()]
+
+    def getFilePath(self):
+        return self.filePicker.GetPath()
+
+
+class ExportProgress():
+    '''
+    Runs an export of DataExporter on a worker thread. Progress dialog shows
+    exported rows and cancels the export on abort.
+    '''
+
+    def __init__(self, parent=None, dataExporter=None, title='Export Data'):
+        self.parent = parent
+        self.dataExporter = dataExporter
+        self.title = title
+        self.progressDialog = None
+
+    def start(self, exportMethod=None, **kwargs):
+        '''
+        @param exportMethod: exportTable, exportQuery or exportRows of dataExporter
+        '''
+        self.progressDialog = wx.ProgressDialog(self.title, "Starting export...", maximum=100, parent=self.parent,
+                                                style=wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME | wx.PD_APP_MODAL)
+        self.dataExporter.onProgress = lambda exportStatus: wx.CallAfter(self.onProgress, exportStatus)
+        threading.Thread(target=self.runExport, args=(exportMethod, kwargs), name='DataExporter', daemon=True).start()
+
+    def runExport(self, exportMethod, kwargs):
+        exportStatus = exportMethod(**kwargs)
+        wx.CallAfter(self.onExportDone, exportStatus)
+
+    def onProgress(self, exportStatus):
+        if self.progressDialog:
+            keepGoing, skip = self.progressDialog.Pulse(f"Exported {exportStatus.rowCount} rows, {exportStatus.getRowsPerSecond()} rows/s")
+            if not keepGoing:
+                self.dataExporter.cancel()
+
+    def onExportDone(self, exportStatus):
+        if self.progressDialog:
+            self.progressDialog.Destroy()
+            self.progressDialog = None
+        dlg = wx.MessageDialog(self.parent, str(exportStatus),
+                       'Exporting data status',
+                       wx.OK | (wx.ICON_ERROR if exportStatus.error else wx.ICON_INFORMATION)
+                       )
+        dlg.ShowModal()
+        dlg.Destroy()
+
+
+def exportData(parent=None, name='export', connectionName=None, databaseAbsolutePath=None, tableName=None, sqlText=None, headers=None, rows=None, columnTypes=None):
+    '''
+    Ask for export options and run the export. Exports tableName, else the
+    result of sqlText, else the given headers and rows.
+    '''
+    dlg = ExportDataDialog(parent, title=f'Export {name}', name=name)
+    if dlg.ShowModal() == wx.ID_OK and dlg.getFilePath():
+        kwargs = {'filePath': dlg.getFilePath(), 'fileFormat': dlg.getFileFormat(), 'compression': dlg.getCompression()}
+        dataExporter = DataExporter(connectionName=connectionName, databaseAbsolutePath=databaseAbsolutePath)
+        exportProgress = ExportProgress(parent=parent, dataExporter=dataExporter, title=f'Export {name}')
+        if tableName:
+            exportProgress.start(dataExporter.exportTable, tableName=tableName, **kwargs)
+        elif sqlText:
+            exportProgress.start(dataExporter.exportQuery, sqlText=sqlText, **kwargs)
+        else:
+            exportProgress.start(dataExporter.exportRows, headers=headers, rows=rows, columnTypes=columnTypes, **kwargs)
+    dlg.Destroy()
@@ -6,7 +6,10 @@ from src.view.constants import TITLE, LOG_SETTINGS
 import os
 from src.view.util.FileOperationsUtil import FileOperations
 import ntpath
+import threading
 from src.sqlite_executer.ConnectExecuteSqlite import SQLUtils
+from src.sqlite_executer.BulkImporter import BulkImporter, ColumnTypeInference, \
+    DEFAULT_SAMPLE_SIZE
 from src.view.views.console.worksheet.ResultGrid import ResultDataGrid
 
 logger = logging.getLogger('extensive')
@@ -20,6 +23,7 @@ class ImportingCsvExcelFrame(wx.Frame):
                           style=wx.DEFAULT_FRAME_STYLE | wx.NO_FULL_REPAINT_ON_RESIZE)
         self.Bind(wx.EVT_CLOSE, self.OnCloseFrame)
         self.connectionName = connectionName
+        self.bulkImporter = None
         self.SetMinSize((640, 480))
         sizer = wx.BoxSizer(wx.VERTICAL)        
         self.buttonPanel = CreateButtonPanel(self)
@@ -45,6 +49,8 @@ class ImportingCsvExcelFrame(wx.Frame):
         self.Show(True)
     
     def OnCloseFrame(self, event):
+        if self.bulkImporter:
+            self.bulkImporter.cancel()
         self.Destroy()  
     
     def createStatusBar(self):
@@ -54,12 +60,17 @@ class ImportingCsvExcelFrame(wx.Frame):
 #         self.statusbar.SetStatusText(self.getCurrentCursorPosition(), 0)
         self.statusbar.SetStatusText("Welcome {}".format(TITLE), 1)
 
+    def setImportProgress(self, importStatus):
+        if self:
+            self.statusbar.SetStatusText(f"Inserted {importStatus.rowCount} rows, {importStatus.getRowsPerSecond()} rows/s", 1)
+
         
 class CreateImportingCsvPanel(wx.Panel):
     
     def __init__(self, parent, *args, **kw):
         wx.Panel.__init__(self, parent, -1, style=wx.WANTS_CHARS | wx.SUNKEN_BORDER)
         self.parent = parent
+        self.filePath = None
         vBox = wx.BoxSizer(wx.VERTICAL)  
         
         ####################################################################
@@ -104,6 +115,9 @@ class CreateImportingCsvPanel(wx.Panel):
         self.trimFieldCheck = wx.CheckBox(self, -1, "", style=wx.ALIGN_RIGHT)
         self.trimFieldCheck.SetValue(1)
 
+        indexColumnLabel = wx.StaticText(self, -1, "Create index on")
+        self.indexColumnList = wx.CheckListBox(self, -1, size=(250, 150), choices=[])
+
         sizer.Add(fbbLabel, flag=wx.EXPAND, row=1, col=1)
         sizer.Add(self.fbb, flag=wx.EXPAND, row=1, col=2)
         sizer.Add(tableNameLabel, flag=wx.EXPAND, row=2, col=1)
@@ -119,6 +133,8 @@ class CreateImportingCsvPanel(wx.Panel):
         sizer.Add(self.encodingLabelChoice, row=6, col=2)
         sizer.Add(trimFieldsLabel, flag=wx.EXPAND, row=7, col=1)
         sizer.Add(self.trimFieldCheck, row=7, col=2)
+        sizer.Add(indexColumnLabel, flag=wx.EXPAND, row=1, col=4)
+        sizer.Add(self.indexColumnList, flag=wx.EXPAND, row=2, col=4, rowspan=6)
 #         sizer.Add(self.tableNameText, row=1, col=2)
         
         vBox1.Add(sizer)
@@ -162,12 +178,45 @@ class CreateImportingCsvPanel(wx.Panel):
         if self.filePath:
             self.loadingData(filePath=self.filePath, columnNameFirstRow=event.IsChecked())
 
-    def loadingData(self, filePath=None, columnNameFirstRow=False, delimiter=",", quotechar='|'):
+    def getCsvOptions(self):
+        '''
+        @return: dict of delimiter, quotechar, encoding and trimFields selected by user
+        '''
+        delimiter = self.fieldSeparatorChoice.GetStringSelection()
+        if delimiter == 'Tab':
+            delimiter = '\t'
+        elif delimiter == 'Other':
+            delimiter = ','
+        quotechar = self.quoteCharacterChoice.GetStringSelection()
+        if quotechar in ('Other', ' '):
+            quotechar = '"'
+        encoding = self.encodingLabelChoice.GetStringSelection()
+        if encoding == 'Other':
+            encoding = 'UTF-8'
+        return {'delimiter': delimiter, 'quotechar': quotechar, 'encoding': encoding.lower(), 'trimFields': self.trimFieldCheck.GetValue()}
+
+    def getIndexColumns(self):
+        '''
+        @return: list of column names checked for index creation
+        '''
+        return [self.data.headers[idx] for idx in self.indexColumnList.GetCheckedItems()]
+
+    def loadingData(self, filePath=None, columnNameFirstRow=False):
         head, tail = ntpath.split(filePath)
         tableName = "_".join(tail.split(sep=".")[:-1])
         self.tableNameText.SetValue(tableName)
         fileOperations = FileOperations()
-        self.data = fileOperations.readCsvFile(filePath=filePath, columnNameFirstRow=columnNameFirstRow, delimiter=delimiter, quotechar=quotechar)
+        csvOptions = self.getCsvOptions()
+        # only the sample rows are previewed, the import streams the whole file
+        self.data = fileOperations.readCsvFile(filePath=filePath, columnNameFirstRow=columnNameFirstRow, delimiter=csvOptions['delimiter'],
+                                               quotechar=csvOptions['quotechar'], encoding=csvOptions['encoding'], maxRows=DEFAULT_SAMPLE_SIZE)
+        if self.data.headers:
+            sampleRows = list(self.data.iterRows())
+            if csvOptions['trimFields']:
+                sampleRows = [[value.strip() if value else value for value in row] for row in sampleRows]
+            # declared types are shown in the preview, values stay text until import
+            self.data.columnTypes = tuple(ColumnTypeInference().infer(sampleRows=sampleRows, columnCount=self.data.getColumnCount()))
+            self.indexColumnList.Set([f"{column} ({columnType})" for column, columnType in zip(self.data.headers, self.data.columnTypes)])
         self.GetTopLevelParent().resultDataGrid.addData(self.data)
 
                 
@@ -179,7 +228,7 @@ class CreateButtonPanel(wx.Panel):
         self.parent = parent         
         sizer = wx.BoxSizer(wx.VERTICAL)
         hbox = wx.BoxSizer(wx.HORIZONTAL)
-        okButton = wx.Button(self, 50, "Ok", (20, 220))
+        self.okButton = okButton = wx.Button(self, 50, "Ok", (20, 220))
         okButton.SetToolTip("Execute script to create table.")
         self.Bind(wx.EVT_BUTTON, self.onOkClick, okButton)
         
@@ -203,19 +252,29 @@ class CreateButtonPanel(wx.Panel):
         
     def onOkClick(self, event):
         logger.debug('onOkClick')
-        data = self.GetTopLevelParent().createImportingCsvPanel.data
-        tableName = self.GetTopLevelParent().createImportingCsvPanel.tableNameText.GetValue()
-        fileOperations = FileOperations()
-#         data = fileOperations.readCsvFile(filePath=filePath, columnNameFirstRow=True, delimiter=",", quotechar='|')
-#         print(len(data))    
-#         print(data)
-        createTableScript = fileOperations.createTableScript(tableName=tableName, columnHeader=data[0])
-        logger.debug(createTableScript)
-        sqlList = fileOperations.sqlScript(tableName=tableName, data=data)
-        logger.debug(sqlList)
-        connectionName = self.GetTopLevelParent().connectionName
-        importStatus = SQLUtils().importingData(connectionName=connectionName, sqlList=sqlList)
-        dlg = wx.MessageDialog(self, importStatus,
+        frame = self.GetTopLevelParent()
+        importingCsvPanel = frame.createImportingCsvPanel
+        if not importingCsvPanel.filePath:
+            return
+        tableName = importingCsvPanel.tableNameText.GetValue()
+        connectionName = frame.connectionName
+        frame.bulkImporter = BulkImporter(connectionName=connectionName, databaseAbsolutePath=SQLUtils().getDbFilePath(connectionName),
+                                          onProgress=lambda importStatus: wx.CallAfter(frame.setImportProgress, importStatus))
+        self.okButton.Disable()
+        kwargs = importingCsvPanel.getCsvOptions()
+        kwargs.update(filePath=importingCsvPanel.filePath, tableName=tableName, columnNameFirstRow=importingCsvPanel.columNameFirstRow.GetValue(),
+                      indexColumns=importingCsvPanel.getIndexColumns())
+        threading.Thread(target=self.runImport, args=(frame.bulkImporter, kwargs), daemon=True).start()
+
+    def runImport(self, bulkImporter, kwargs):
+        importStatus = bulkImporter.importCsv(**kwargs)
+        wx.CallAfter(self.onImportDone, importStatus)
+
+    def onImportDone(self, importStatus):
+        if not self or importStatus.cancelled:
+            return
+        self.GetTopLevelParent().bulkImporter = None
+        dlg = wx.MessageDialog(self, str(importStatus),
                        'Importing data status',
                        wx.OK | wx.ICON_INFORMATION
                        #wx.YES_NO | wx.NO_DEFAULT | wx.CANCEL | wx.ICON_INFORMATION
@@ -226,7 +285,7 @@ class CreateButtonPanel(wx.Panel):
         
     def onCancelButtonClick(self, event):
         logger.debug('onCancelButtonClick')
-        self.GetTopLevelParent().Destroy()
+        self.GetTopLevelParent().Close()
 
         
 if __name__ == '__main__':
@@ -184,6 +184,7 @@ perferenceTreeList = [
         [wx.NewIdRef(), "Globalization", 'fileType_filter.png', None, None],
         [wx.NewIdRef(), "Keys", 'fileType_filter.png', None, None],
         [wx.NewIdRef(), "Keys", 'fileType_filter.png', None, None],
+        [wx.NewIdRef(), "Logging", 'fileType_filter.png', None, None],
         [wx.NewIdRef(), "Network Connections", 'folderType_filter.png', None, [
             [wx.NewIdRef(), "Cache", 'fileType_filter.png', None, None],
             [wx.NewIdRef(), "SSH2", 'fileType_filter.png', None, None],
@@ -0,0 +1,85 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import wx
+from src.view.preference.ApplyResetBtnPanel import ApplyResetButtonPanel
+import logging.config
+from src.view.constants import LOG_SETTINGS
+from src.view.util.LogManager import LogManager, SUBSYSTEMS, LEVELS, LOG_FILE
+
+logger = logging.getLogger('extensive')
+
+logging.config.dictConfig(LOG_SETTINGS)
+
+
+class LoggingPreferencePanel(wx.Panel):
+    '''
+    Log level of each subsystem. Apply changes the levels of the running
+    application and saves them for the next start.
+    '''
+
+    def __init__(self, parent=None, name=None, *args, **kw):
+        wx.Panel.__init__(self, parent, id=-1)
+        self.parent = parent
+
+        vBox = wx.BoxSizer(wx.VERTICAL)
+        vBoxHeader = wx.BoxSizer(wx.VERTICAL)
+        vBoxBody = wx.BoxSizer(wx.VERTICAL)
+        vBoxFooter = wx.BoxSizer(wx.VERTICAL)
+        ####################################################################
+        '''
+        Header section
+        '''
+        self.st = wx.StaticLine(self, wx.ID_ANY)
+        fs = self.GetFont().GetPointSize()
+        bf = wx.Font(fs + 4, wx.SWISS, wx.NORMAL, wx.BOLD)
+
+        self.header = wx.StaticText(self, -1, name)
+        self.header.SetFont(bf)
+        vBoxHeader.Add(self.header, 0, wx.ALL | wx.EXPAND, 5)
+        vBoxHeader.Add(self.st, 0, wx.ALL | wx.EXPAND, 5)
+        ####################################################################
+
+        self.levelChoices = dict()
+        grid = wx.FlexGridSizer(cols=2, vgap=5, hgap=10)
+        levels = LogManager.getLevels()
+        for subsystem, label in SUBSYSTEMS:
+            levelChoice = wx.Choice(self, -1, choices=list(LEVELS))
+            levelChoice.SetStringSelection(levels.get(subsystem, 'INFO'))
+            self.levelChoices[subsystem] = levelChoice
+            grid.Add(wx.StaticText(self, -1, f"{label}:"), 0, wx.ALIGN_LEFT | wx.ALIGN_CENTER_VERTICAL)
+            grid.Add(levelChoice, 0, wx.ALIGN_LEFT)
+        logFileLabel = wx.StaticText(self, -1, f"Log file: {LOG_FILE}")
+
+        ####################################################################
+        '''
+        Footer section
+        '''
+        self.applyResetButtonPanel = ApplyResetButtonPanel(self)
+        vBoxFooter.Add(self.applyResetButtonPanel, 0, wx.EXPAND | wx.ALL, 1)
+
+        ####################################################################
+        vBoxBody.Add(grid, 0, wx.EXPAND | wx.ALL, 5)
+        vBoxBody.Add(logFileLabel, 0, wx.EXPAND | wx.ALL, 5)
+
+        vBox.Add(vBoxHeader, 1, wx.EXPAND | wx.ALL, 1)
+        vBox.Add(vBoxBody, 99, wx.EXPAND | wx.ALL, 1)
+        vBox.Add(vBoxFooter, 1, wx.EXPAND | wx.ALL, 1)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(vBox, 1, wx.EXPAND, 1)
+        self.SetSizer(sizer)
+
+    def apply(self, event):
+        levels = {subsystem: levelChoice.GetStringSelection() for subsystem, levelChoice in self.levelChoices.items()}
+        logger.info('log levels: %s', levels)
+        try:
+            LogManager.setLevels(levels)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+
+    def reset(self, event):
+        for subsystem, level in LogManager.getDefaultLevels().items():
+            self.levelChoices[subsystem].SetStringSelection(level)
@@ -99,6 +99,7 @@ class Preference(wx.Frame):
 
 from src.view.preference.general.GeneralPanel import GeneralPreferencePanel
 from src.view.preference.general.AppearancePanel import AppearancePreferencePanel
+from src.view.preference.general.LoggingPanel import LoggingPreferencePanel
 from src.view.preference.calibre.CalibreGeneralPreference import CalibreGeneralPreferencePanel
 from src.view.preference.PreferencePanel import PreferencePanel, \
     SearchPanel, KeysPanel
@@ -141,6 +142,8 @@ class RightPanel(wx.Panel):
             preferencePanelObj = WorkspacePanel(self, name=name)
         elif name == 'Keys':
             preferencePanelObj = KeysPanel(self, name=name)
+        elif name == 'Logging':
+            preferencePanelObj = LoggingPreferencePanel(self, name=name)
         elif name == 'Sharing':
             preferencePanelObj = PreferencePanel(self, name=name)
         elif name == 'Calibre':
@@ -2,7 +2,11 @@ import os
 
 import logging.config
 import csv
+import io
+import threading
 from src.view.constants import LOG_SETTINGS
+from src.sqlite_executer.ResultSet import ResultSet
+from src.view.util.ImageBundle import IMAGE_BUNDLE_NAME, readBundle, writeBundle
 import wx
 
 logger = logging.getLogger('extensive')
@@ -11,6 +15,104 @@ logging.config.dictConfig(LOG_SETTINGS)
 BAD_IMAGE = -1
 
 
+class ImageCache():
+	'''
+	Process wide cache of decoded bitmaps keyed by image name and size.
+
+	The image directory is resolved once. If src/images has an image bundle
+	of the same images, all png are read from it in one read, otherwise each
+	image is read from its file on first use. A bundle built in a source
+	checkout is stale once a png is added, removed or replaced, packages get
+	one from setup.py and sql_editor.spec. Every image is decoded once per
+	process. Build the bundle after changing images with
+	python -c "from src.view.util.FileOperationsUtil import ImageCache; ImageCache.buildBundle()"
+	'''
+	bitmaps = dict()
+	bundle = None
+	imagePath = None
+	lock = threading.RLock()
+
+	@classmethod
+	def getImagePath(cls):
+		if cls.imagePath is None:
+			path = os.path.abspath(__file__)
+			tail = None
+			try:
+				while tail != 'src':
+					path = os.path.abspath(os.path.join(path, '..',))
+					head, tail = os.path.split(path)
+			except Exception as e:
+				logger.error(e, exc_info=True)
+			cls.imagePath = os.path.abspath(os.path.join(path, "images"))
+		return cls.imagePath
+
+	@classmethod
+	def getBitmap(cls, imageName=None, path=None, size=None):
+		'''
+		@param size: (width, height) to scale to, None keeps the image size
+		@return: wx.Bitmap shared by all callers, do not modify it
+		'''
+		if not path:
+			path = cls.getImagePath()
+		key = (imageName, path, tuple(size) if size else None)
+		with cls.lock:
+			bitmap = cls.bitmaps.get(key)
+			if bitmap is None:
+				bitmap = cls.loadBitmap(imageName, path, size)
+				cls.bitmaps[key] = bitmap
+		return bitmap
+
+	@classmethod
+	def loadBitmap(cls, imageName=None, path=None, size=None):
+		data = cls.getBundle().get(imageName) if path == cls.getImagePath() else None
+		if data is not None:
+			image = wx.Image(io.BytesIO(data), wx.BITMAP_TYPE_PNG)
+		elif size:
+			image = wx.Image(os.path.join(path, imageName), wx.BITMAP_TYPE_PNG)
+		else:
+			return wx.Bitmap(os.path.join(path, imageName), wx.BITMAP_TYPE_PNG)
+		if size and image.IsOk() and image.GetSize() != wx.Size(*size):
+			image.Rescale(size[0], size[1], wx.IMAGE_QUALITY_HIGH)
+		return wx.Bitmap(image)
+
+	@classmethod
+	def getBundle(cls):
+		'''
+		@return: dict of image name to png bytes, empty if there is no bundle or it is stale
+		'''
+		with cls.lock:
+			if cls.bundle is None:
+				cls.bundle = dict()
+				bundlePath = os.path.join(cls.getImagePath(), IMAGE_BUNDLE_NAME)
+				if os.path.exists(bundlePath):
+					try:
+						bundle = readBundle(cls.getImagePath(), bundlePath)
+						# images changed since the bundle was built are read from files
+						if bundle is not None:
+							cls.bundle = bundle
+						else:
+							logger.info('image bundle is stale, rebuild it with ImageCache.buildBundle: %s', bundlePath)
+					except Exception as e:
+						logger.error(e, exc_info=True)
+			return cls.bundle
+
+	@classmethod
+	def buildBundle(cls, bundlePath=None):
+		'''
+		write all png of the image directory to one file, see ImageBundle.writeBundle.
+		@return: number of images written
+		'''
+		count = writeBundle(cls.getImagePath(), bundlePath)
+		cls.clear()
+		return count
+
+	@classmethod
+	def clear(cls):
+		with cls.lock:
+			cls.bitmaps = dict()
+			cls.bundle = None
+
+
 class FileOperations():
 
 	def __init__(self):
@@ -40,26 +142,30 @@ class FileOperations():
 				logger.error(ex, exc_info=True)
 		return fileContent	
 	
-	def readCsvFile(self, filePath=None, columnNameFirstRow=False, delimiter=',', quotechar='|'):
-		data = {}
+	def readCsvFile(self, filePath=None, columnNameFirstRow=False, delimiter=',', quotechar='|', encoding='utf-8', maxRows=None):
+		'''
+		@param maxRows: read only first maxRows data rows, None reads whole file
+		@return: ResultSet of TEXT columns, rows shorter than the header are padded with None
+		'''
+		data = ResultSet()
 		if os.path.exists(filePath):
 			try:
-				with open(filePath, newline='', encoding='utf-8') as csvfile:
-					spamreader = csv.reader(csvfile, delimiter=delimiter, quotechar='|')
-					idKey = 1
-					if columnNameFirstRow:
-						idKey = 0
+				with open(filePath, newline='', encoding=encoding) as csvfile:
+					spamreader = csv.reader(csvfile, delimiter=delimiter, quotechar=quotechar)
+					rows = list()
+					header = next(spamreader, None) if columnNameFirstRow else None
 					for row in spamreader:
-						data[idKey] = tuple(row)
-						idKey += 1
-					if not columnNameFirstRow:
-						colName = list()
-						for idx, rowdata in enumerate(data[1]):
-							colName.append("Col_{}".format(idx))
-						data[0] = tuple(colName)
-# 						logger.info(', '.join(row))
+						if maxRows and len(rows) >= maxRows:
+							break
+						rows.append(row)
+					if header is None and rows:
+						header = ["Col_{}".format(idx) for idx in range(len(rows[0]))]
+					if header:
+						columnCount = len(header)
+						rows = [row[:columnCount] + [None] * (columnCount - len(row)) for row in rows]
+						data = ResultSet.fromRows(headers=header, columnTypes=['TEXT'] * columnCount, rows=rows)
 			except Exception as ex:
-				logger.error(ex, exc_info=True)		
+				logger.error(ex, exc_info=True)
 		return data
 
 	def createTableScript(self, tableName=None, columnHeader=None):
@@ -72,25 +178,6 @@ class FileOperations():
 		partialSql += ");"	
 		return partialSql
 
-	def sqlScript(self, tableName=None, data=None):
-
-		logger.info("insertScript")
-
-		sqlList = list()
-		sqlList.append(self.createTableScript(tableName, columnHeader=data[0]))
-		for row in data.items():
-			partialSql = "INSERT INTO '{}' (".format(tableName)
-			for column in data[0]:
-				partialSql += "'{}' ,".format(column)
-			partialSql = partialSql[:-1]
-			partialSql += ") VALUES ("
-			for dataRow in row[1]:
-				partialSql += "'{}' ,".format(dataRow)
-			partialSql = partialSql[:-1]
-			partialSql += ");"
-			sqlList.append(partialSql)
-		return sqlList
-	
 	def getStylePath(self, styleName="Default.ess"):
 		path = os.path.abspath(__file__)
 		tail = None
@@ -110,26 +197,11 @@ class FileOperations():
 		"""
 		this method return impagePath
 		"""
-		
-		path = os.path.abspath(__file__)
-		tail = None
-# 		 head, tail = os.path.split(path)
-# 		 logger.info('createAuiManager',head, tail )
-		try:
-			while tail != 'src':
-				path = os.path.abspath(os.path.join(path, '..',))
-				head, tail = os.path.split(path)
-		except Exception as e:
-			logger.error(e, exc_info=True)
-# 		logger.info('path {}'.format(path))
-		path = os.path.abspath(os.path.join(path, "images")) 
-		return path
+		return ImageCache.getImagePath()
 	
-	def getImageBitmap(self, imageName=None, path=None):
+	def getImageBitmap(self, imageName=None, path=None, size=None):
 # 		return wx.BitmapFromImage(self.ConvertBMP(imageName, path))
-		if not path:
-			path = self.getImagePath()
-		return wx.Bitmap(os.path.join(path, imageName), wx.BITMAP_TYPE_PNG)
+		return ImageCache.getBitmap(imageName=imageName, path=path, size=size)
 
 	def ConvertBMP(self, imageName=None, path=None):
 		"""
@@ -163,10 +235,8 @@ if __name__ == "__main__":
 	data = fileOperations.readCsvFile(filePath=r"C:\soft\Book1_csv.csv", columnNameFirstRow=True, delimiter=",", quotechar='|')
 	# print(len(data))	
 	# print(data)
-	script = fileOperations.createTableScript(tableName="ABCd", columnHeader=data[0])
+	script = fileOperations.createTableScript(tableName="ABCd", columnHeader=data.headers)
 	print(script)
-	sqlList = fileOperations.sqlScript(tableName="ABCd", data=data)
-	print(sqlList)
 # 	isFileRemoved = fileOperations.removeFile(r'C:\soft\sample db\4.sqlite')
 # 	print(isFileRemoved)
 # 	htmlDoc = fileOperations.readFile()
@@ -0,0 +1,62 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import os
+import pickle
+import struct
+
+# optional, all png of src/images in one file, see writeBundle
+IMAGE_BUNDLE_NAME = 'images.bundle'
+# modification time in ns of the image directory the bundle was built from
+BUNDLE_HEADER = struct.Struct('<q')
+# header of a bundle built for a package, its images do not change
+RELEASE_BUNDLE = -1
+
+
+def getImageNames(imagePath=None):
+    return [fileName for fileName in os.listdir(imagePath) if fileName.lower().endswith('.png')]
+
+
+def writeBundle(imagePath=None, bundlePath=None, release=False):
+    '''
+    Write all png of the image directory to one file. Imports nothing but
+    the standard library, setup.py and sql_editor.spec build the bundle.
+    @param release: bundle of a package, checked by image names only when read
+    @return: number of images written
+    '''
+    if not bundlePath:
+        bundlePath = os.path.join(imagePath, IMAGE_BUNDLE_NAME)
+    images = dict()
+    for fileName in getImageNames(imagePath):
+        with open(os.path.join(imagePath, fileName), 'rb') as imageFile:
+            images[fileName] = imageFile.read()
+    with open(bundlePath, 'wb') as bundleFile:
+        bundleFile.write(BUNDLE_HEADER.pack(RELEASE_BUNDLE))
+        pickle.dump(images, bundleFile, protocol=4)
+    if not release:
+        # creating the bundle changed the directory time, writing the header in place does not
+        with open(bundlePath, 'r+b') as bundleFile:
+            bundleFile.write(BUNDLE_HEADER.pack(os.stat(imagePath).st_mtime_ns))
+    return len(images)
+
+
+def readBundle(imagePath=None, bundlePath=None):
+    '''
+    A bundle built from a source checkout is stale once the image directory
+    changed, adding, removing or replacing a png changes its time. One stat
+    of the directory, no stat per image.
+    @return: dict of image name to png bytes, None when the bundle is stale
+    '''
+    with open(bundlePath, 'rb') as bundleFile:
+        header = bundleFile.read(BUNDLE_HEADER.size)
+        if len(header) != BUNDLE_HEADER.size:
+            return None
+        directoryTime, = BUNDLE_HEADER.unpack(header)
+        if directoryTime != RELEASE_BUNDLE and directoryTime != os.stat(imagePath).st_mtime_ns:
+            return None
+        images = pickle.load(bundleFile)
+    if set(images) != set(getImageNames(imagePath)):
+        return None
+    return images
@@ -0,0 +1,176 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import tempfile
+import threading
+
+LOGGER_NAME = 'extensive'
+LOG_FORMAT = '%(asctime)s %(module)-17s line:%(lineno)-4d %(levelname)-8s %(message)s'
+LOG_FILE = os.path.join(tempfile.gettempdir(), 'eclipse.log')
+LOG_FILE_MAX_BYTES = 10485760
+LOG_FILE_BACKUP_COUNT = 5
+# levels of subsystems, saved by the logging preference page
+LOG_SETTINGS_FILE = os.path.join(os.path.expanduser('~'), '_opal_logging.json')
+# set OPAL_LOG_LEVEL=DEBUG to debug all subsystems without changing preferences
+LOG_LEVEL_ENVIRONMENT = 'OPAL_LOG_LEVEL'
+DEFAULT_LEVEL = 'INFO'
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+# subsystem is the package under src a module lives in
+SUBSYSTEMS = (('sqlite_executer', 'Database'), ('view', 'User interface'), ('logic', 'Book library'), ('dao', 'Book database'),
+              ('file_browser', 'File browser'), ('other', 'Other'))
+OTHER_SUBSYSTEM = 'other'
+
+
+class SubsystemFilter(logging.Filter):
+    '''
+    Drops records below the level of the subsystem of the module logging
+    them. Runs in the thread calling the logger, before the record is queued.
+    '''
+
+    def __init__(self, levels=None):
+        logging.Filter.__init__(self)
+        self.levels = levels
+        self.subsystems = dict()
+        self.sourceRoot = os.path.normcase(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+    def getSubsystem(self, pathname=None):
+        subsystem = self.subsystems.get(pathname)
+        if subsystem is None:
+            subsystem = OTHER_SUBSYSTEM
+            path = os.path.normcase(os.path.abspath(pathname))
+            if path.startswith(self.sourceRoot + os.sep):
+                package = path[len(self.sourceRoot) + 1:].split(os.sep)[0]
+                if package in self.levels:
+                    subsystem = package
+            self.subsystems[pathname] = subsystem
+        return subsystem
+
+    def filter(self, record):
+        return record.levelno >= self.levels[self.getSubsystem(record.pathname)]
+
+
+class LogManager():
+    '''
+    Logging of the application, configured once per process.
+
+    Records of the 'extensive' logger go through a QueueHandler to a
+    QueueListener thread that writes them to stdout and the rotating log
+    file, a logging call never waits for file or console output. Each
+    subsystem has its own level, the logger level is the lowest of them so
+    disabled debug calls return before a record is made. DEBUG is off by
+    default.
+
+    Modules keep calling logging.config.dictConfig(LOG_SETTINGS) at import,
+    LOG_SETTINGS is an incremental configuration with the current logger
+    level, it does not replace handlers.
+    '''
+    lock = threading.Lock()
+    listener = None
+    queueHandler = None
+    subsystemFilter = None
+    levels = dict()
+    logSettings = {'version': 1, 'incremental': True, 'loggers': {LOGGER_NAME: {'level': DEFAULT_LEVEL}}}
+
+    @classmethod
+    def configure(cls):
+        '''
+        @return: LOG_SETTINGS for logging.config.dictConfig
+        '''
+        with cls.lock:
+            if cls.listener is None:
+                cls.levels = {subsystem: logging.getLevelName(level) for subsystem, level in cls.loadLevels().items()}
+                cls.subsystemFilter = SubsystemFilter(cls.levels)
+                formatter = logging.Formatter(LOG_FORMAT)
+                consoleHandler = logging.StreamHandler(sys.stdout)
+                consoleHandler.setFormatter(formatter)
+                fileHandler = logging.handlers.RotatingFileHandler(LOG_FILE, mode='a', maxBytes=LOG_FILE_MAX_BYTES,
+                                                                   backupCount=LOG_FILE_BACKUP_COUNT, delay=True)
+                fileHandler.setFormatter(formatter)
+                logQueue = queue.Queue(-1)
+                cls.queueHandler = logging.handlers.QueueHandler(logQueue)
+                cls.queueHandler.addFilter(cls.subsystemFilter)
+                logger = logging.getLogger(LOGGER_NAME)
+                logger.addHandler(cls.queueHandler)
+                logger.propagate = False
+                cls.listener = logging.handlers.QueueListener(logQueue, consoleHandler, fileHandler)
+                cls.listener.start()
+                atexit.register(cls.stop)
+                cls.applyLevels()
+        return cls.logSettings
+
+    @classmethod
+    def stop(cls):
+        '''
+        writes queued records and stops the listener thread.
+        '''
+        with cls.lock:
+            if cls.listener is not None:
+                cls.listener.stop()
+                cls.listener = None
+                logging.getLogger(LOGGER_NAME).removeHandler(cls.queueHandler)
+
+    @classmethod
+    def getDefaultLevels(cls):
+        level = os.environ.get(LOG_LEVEL_ENVIRONMENT, DEFAULT_LEVEL).upper()
+        if level not in LEVELS:
+            level = DEFAULT_LEVEL
+        return {subsystem: level for subsystem, label in SUBSYSTEMS}
+
+    @classmethod
+    def loadLevels(cls):
+        '''
+        @return: dict of subsystem to level name, saved levels over the defaults
+        '''
+        levels = cls.getDefaultLevels()
+        if os.environ.get(LOG_LEVEL_ENVIRONMENT):
+            return levels
+        try:
+            if os.path.exists(LOG_SETTINGS_FILE):
+                with open(LOG_SETTINGS_FILE) as settingsFile:
+                    for subsystem, level in json.load(settingsFile).get('levels', {}).items():
+                        if subsystem in levels and level in LEVELS:
+                            levels[subsystem] = level
+        except Exception as e:
+            logging.getLogger(LOGGER_NAME).error(e, exc_info=True)
+        return levels
+
+    @classmethod
+    def saveLevels(cls):
+        with open(LOG_SETTINGS_FILE, 'w') as settingsFile:
+            json.dump({'levels': cls.getLevels()}, settingsFile, indent=4, sort_keys=True)
+
+    @classmethod
+    def getLevels(cls):
+        '''
+        @return: dict of subsystem to level name
+        '''
+        return {subsystem: logging.getLevelName(level) for subsystem, level in cls.levels.items()}
+
+    @classmethod
+    def setLevels(cls, levels=None, save=True):
+        '''
+        change levels of running application.
+        @param levels: dict of subsystem to level name
+        '''
+        for subsystem, level in levels.items():
+            if subsystem in cls.levels:
+                cls.levels[subsystem] = logging.getLevelName(level)
+        cls.applyLevels()
+        if save:
+            cls.saveLevels()
+
+    @classmethod
+    def applyLevels(cls):
+        level = logging.getLevelName(min(cls.levels.values()))
+        # later imports re-run dictConfig(LOG_SETTINGS), it keeps this level
+        cls.logSettings['loggers'][LOGGER_NAME]['level'] = level
+        logging.getLogger(LOGGER_NAME).setLevel(level)
@@ -135,11 +135,8 @@ import sys
 from src.view.views.calibre.book.browser.SearchBook import FindingBook
 from src.logic.AddingBook import AddBook
 from src.view.views.calibre.book.browser.BookInfo import BookPropertyFrame
+from src.view.views.calibre.book.browser.ThumbnailCache import ThumbnailCache, ThumbnailLoader
 
-if six.PY3:
-    import _thread as thread
-else:
-    import thread
 import logging.config
 from src.view.constants import LOG_SETTINGS
 try:
@@ -923,6 +920,7 @@ class ThumbnailCtrl(wx.Panel):
                    "ShowFileNames", "SetPopupMenu", "GetPopupMenu", "SetGlobalPopupMenu",
                    "GetGlobalPopupMenu", "SetSelectionColour", "GetSelectionColour",
                    "EnableDragging", "SetThumbSize", "GetThumbSize", "ShowThumbs", "ShowDir", "ShowBook",
+                   "PrefetchBooks", "SetThumbnailCacheDir",
                    "GetShowDir", "SetSelection", "GetSelection", "SetZoomFactor",
                    "GetZoomFactor", "SetCaptionFont", "GetCaptionFont", "GetItemIndex",
                    "InsertItem", "RemoveItemAt", "IsSelected", "Rotate", "ZoomIn", "ZoomOut",
@@ -1137,6 +1135,8 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         self._zoomfactor = 1.1
         self.SetCaptionFont()
         self._items = []
+        self._thumbnailLoader = ThumbnailLoader(ThumbnailCache())
+        self._refreshPending = False
 
         self._enabletooltip = False
 
@@ -1447,6 +1447,10 @@ class ScrolledThumbnail(wx.ScrolledWindow):
                 if self._items[thumb].book.fileSize:
                     fileSize = self._items[thumb].book.fileSize
                 thumbinfo = f'''Name:{self._items[thumb].book.bookName}\nAuthor:{author}\nSize: {fileSize}'''
+                # set by search
+                searchSnippet = getattr(self._items[thumb].book, 'searchSnippet', None)
+                if searchSnippet:
+                    thumbinfo = f'{thumbinfo}\nMatch: {searchSnippet}'
         except Exception as e:
 #             logger.error(e)
             pass
@@ -1503,57 +1507,62 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         lSplitExt = os.path.splitext
         return [f for f in os.listdir(directory) if lSplitExt(f)[1].lower() in fileExtList]
 
-    def ThreadImage(self, filenames):
+    def SetThumbnailCacheDir(self, cacheDir=None):
         """
-        Threaded method to load images. Used internally.
+        Sets the folder of the thumbnail disk cache.
 
-        :param `filenames`: a Python list of file names containing images.
+        :param `cacheDir`: the cache folder, thumbnails are cached in memory only when ``None``.
         """
 
-        count = 0
-
-        while count < len(filenames):
-
-            if not self._isrunning:
-                self._isrunning = False
-                thread.exit()
-                return
+        self._thumbnailLoader.thumbnailCache.cacheDir = cacheDir
 
-            self.LoadImages(filenames[count], count)
-            if count < 4:
-                self.Refresh()
-            elif count % 4 == 0:
-                self.Refresh()
+    def GetVisibleRange(self):
+        """ Returns the index of the first visible thumbnail and the index after the last one. """
 
-            count = count + 1
+        x, y = self.CalcUnscrolledPosition(0, 0)
+        height = self.GetClientSize().GetHeight()
+        row = 0
+        top = self._tBorder
+        while row < self._rows and top + self._tHeight + self.GetCaptionHeight(row) < y:
+            top = top + self._tHeight + self._tBorder + self.GetCaptionHeight(row)
+            row = row + 1
+        first = row * self._cols
+        while row < self._rows and top < y + height:
+            top = top + self._tHeight + self._tBorder + self.GetCaptionHeight(row)
+            row = row + 1
 
-        self._isrunning = False
-        thread.exit()
+        return first, min(row * self._cols, len(self._items))
 
-    def LoadImages(self, newfile, imagecount):
+    def SetThumbImage(self, thumb, img):
         """
-        Threaded method to load images. Used internally.
+        Sets the loaded image of a thumbnail. Called on loader threads, the
+        window is repainted once for the images loaded until then.
 
-        :param `newfile`: a file name containing an image to thumbnail;
-        :param `imagecount`: the number of images loaded until now.
+        :param `thumb`: an instance of :class:`Thumb`;
+        :param `img`: the thumbnail :class:`wx.Image`, ``None`` if the file can not be read.
         """
 
-        if not self._isrunning:
-            thread.exit()
-            return
-
-        img, originalsize, alpha = self._imageHandler.LoadThumbnail(newfile, (300, 240))
-        try:
-            self._items[imagecount]._threadedimage = img
-            self._items[imagecount]._originalsize = originalsize
-            self._items[imagecount]._bitmap = img
-            self._items[imagecount]._alpha = alpha
-        except:
-            return
+        if img is None:
+            img = file_broken.GetImage()
+        thumb._threadedimage = img
+        thumb._originalsize = (img.GetWidth(), img.GetHeight())
+        thumb._bitmap = img
+        thumb._alpha = img.HasAlpha()
+        if not self._refreshPending:
+            self._refreshPending = True
+            wx.CallAfter(self.RefreshLoaded)
+
+    def RefreshLoaded(self):
+        """ Repaints the thumbnails loaded since the last repaint. """
+
+        self._refreshPending = False
+        if self:
+            self.Refresh()
 
     def ShowThumbs(self, thumbs, caption):
         """
-        Shows all the thumbnails.
+        Shows all the thumbnails. Cached thumbnails are shown at once, the
+        others are loaded by the thumbnail loader, visible ones first.
 
         :param `thumbs`: should be a sequence with instances of :class:`Thumb`;
         :param `caption`: the caption text for the current selected thumbnail.
@@ -1561,25 +1570,65 @@ class ScrolledThumbnail(wx.ScrolledWindow):
 
         self.SetCaption(caption)
 
-        self._isrunning = False
-
         # update items
         self._items = thumbs
-        myfiles = [thumb.GetFullFileName() for thumb in thumbs]
-
-        items = self._items[:]
         self._items.sort(key=KeyThumb)
 
-        newfiles = SortFiles(items, self._items, myfiles)
-        self._isrunning = True
-
-        thread.start_new_thread(self.ThreadImage, (newfiles,))
-        wx.MilliSleep(20)
-
         self._selectedarray = []
         self.UpdateProp()
+
+        thumbnailCache = self._thumbnailLoader.thumbnailCache
+        first, last = self.GetVisibleRange()
+        requests = []
+        for thumb in self._items[first:last] + self._items[:first] + self._items[last:]:
+            img = thumbnailCache.getCached(thumb.GetFullFileName())
+            if img is None:
+                requests.append((thumb.GetFullFileName(), lambda img, thumb=thumb: self.SetThumbImage(thumb, img)))
+            else:
+                self.SetThumbImage(thumb, img)
+        self._thumbnailLoader.load(requests)
+
         self.Refresh()
 
+    def GetBookImage(self, book):
+        """
+        Returns the folder and file name of the book cover image, ``None`` if
+        the book folder does not exist.
+
+        :param `book`: the book.
+        """
+
+        imageName = ''
+        if book.bookPath:
+            imagePath = book.bookPath
+            if not os.path.exists(imagePath):
+                return None
+            filenames = self.ListDirectory(imagePath, extensions)
+            if filenames:
+                imageName = filenames[0]
+
+            imagePath_1 = os.path.join(imagePath, book.bookImgName)
+            if os.path.exists(imagePath_1):
+                imageName = book.bookImgName
+        else:
+            imagePath = book.localImagePath
+            imageName = book.imageFileName
+        return imagePath, imageName
+
+    def PrefetchBooks(self, books):
+        """
+        Loads the thumbnails of books shown next, the next page, into the cache.
+
+        :param `books`: the books.
+        """
+
+        paths = []
+        for book in books or []:
+            bookImage = self.GetBookImage(book)
+            if bookImage:
+                paths.append(os.path.join(*bookImage))
+        self._thumbnailLoader.prefetch(paths)
+
     def ShowBook(self, books, filter=THUMB_FILTER_IMAGES):
         """
         Shows thumbnails for a particular books.
@@ -1591,23 +1640,11 @@ class ScrolledThumbnail(wx.ScrolledWindow):
         if books:   
             for book in books:
                 
-                imageName = ''
-                if book.bookPath:
-                    self._dir = book.bookPath
-                    imagePath = book.bookPath
-                    if not os.path.exists(imagePath):
-                        return
-                    filenames = self.ListDirectory(imagePath, extensions)
-                    if filenames:
-                        imageName = filenames[0]
-                        
-                    imagePath_1 = os.path.join(imagePath, book.bookImgName)
-                    if os.path.exists(imagePath_1):
-                        imageName = book.bookImgName
-                else:
-                    imagePath = book.localImagePath
-                    self._dir = book.localImagePath
-                    imageName = book.imageFileName
+                bookImage = self.GetBookImage(book)
+                if bookImage is None:
+                    return
+                imagePath, imageName = bookImage
+                self._dir = imagePath
                 bookName = book.bookName
     #                 imagePath=os.path.join(book.bookPath,imageName);
                     
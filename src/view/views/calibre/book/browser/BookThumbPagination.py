@@ -3,14 +3,18 @@ import wx
 import logging.config
 from src.view.constants import LOG_SETTINGS
 from src.view.views.calibre.book.browser.BookThumbCrtl import ThumbnailCtrl, NativeImageHandler
+from src.view.views.calibre.book.browser.ThumbnailCache import THUMBNAIL_CACHE_FOLDER
 import os
+import math
 from src.view.views.calibre.book.browser.SearchBook import FindingBook
 from src.view.util.FileOperationsUtil import FileOperations
 from src.view.constants import ID_FIRST_RESULT, ID_LAST_RESULT, ID_PREVIOUS_RESULT, ID_NEXT_RESULT
 from re import search
-from src.logic.AddingBook import AddBook
+from src.logic.AddingBook import BulkAddBook
+import threading
 from src.view.other.debounce import debounce
 from src.dao.BookDao import CreateDatabase
+from src.dao.BookPagination import BookPagination
 from pubsub import pub
 from src.logic.WorkspaceUtil import WorkspaceHelper
 
@@ -115,10 +119,13 @@ class ThumbnailCtrlPaginationPanel(wx.Panel, WorkspaceHelper):
         self.thumbnailCtrl = ThumbnailCtrl(self, -1, imagehandler=NativeImageHandler)
         self.thumbnailCtrl.EnableToolTips(enable=True)
         self.thumbnailCtrl.SetDropTarget(self.fileDropTarget)
+        if self.workspace and self.getWorkpacePath():
+            self.thumbnailCtrl.SetThumbnailCacheDir(os.path.join(self.getWorkpacePath(), THUMBNAIL_CACHE_FOLDER))
 #         self.thumbnailCtrl.ShowDir(r'/home/vijay/Pictures')
 #         findingBook = FindingBook(libraryPath=r'/docs/new/library')
 #         books = findingBook.searchingBook(searchText='head')
         self.page = Page()
+        self.bookPagination = None
         self.loadingBook()
         self.paginationBar = self.constructTopToolBar()
         self.setPaginationBarStatus()
@@ -134,36 +141,53 @@ class ThumbnailCtrlPaginationPanel(wx.Panel, WorkspaceHelper):
     @debounce(1)
     def OnSearch(self, event):
         logger.debug('onSearch')
-        self.page.searchText = self.search.GetValue()
+        self.page.currentPage = 0
         self.loadingBook(searchText=self.search.GetValue())
         self.updatePangnation()
 
+    def getBookPagination(self):
+        if self.bookPagination is None and self.libraryPath and os.path.exists(self.libraryPath):
+            os.chdir(self.libraryPath)
+            self.bookPagination = BookPagination(libraryPath=self.libraryPath, pageSize=self.page.pageSize)
+        return self.bookPagination
+
     def loadingBook(self, searchText=None):
-        
+        '''
+        Shows current page again, after search text, page size or books changed.
+        '''
+        if searchText is not None:
+            self.page.searchText = searchText
+        self.showingPage(lambda bookPagination: bookPagination.gotoPage(self.page.currentPage))
+
+    def showingPage(self, readPage=None):
+        '''
+        @param readPage: callable(bookPagination) returning books of the page to show
+        '''
         books = None
-        totalBooks=0
         count = 0
-        if self.libraryPath and os.path.exists(self.libraryPath):
-            findingBook = FindingBook(libraryPath=self.libraryPath)
-            if self.page.searchText:
-                books, count = findingBook.searchingBook(searchText=self.page.searchText, pageSize=self.page.pageSize, offset=self.page.pageSize * self.page.currentPage)
-            else:
-                books, count = findingBook.findAllBooks(pageSize=self.page.pageSize, offset=self.page.pageSize * self.page.currentPage)
-            totalBooks=findingBook.countAllBooks()
+        totalBooks = 0
+        bookPagination = self.getBookPagination()
+        if bookPagination:
+            try:
+                bookPagination.setQuery(searchText=self.page.searchText, pageSize=self.page.pageSize)
+                books = readPage(bookPagination)
+                # counts are cached until books are added or removed
+                count = bookPagination.getCount()
+                totalBooks = bookPagination.getTotalCount()
+                self.page.currentPage = bookPagination.currentPage
+            except Exception as e:
+                logger.error(e, exc_info=True)
         self.page.pageData = books
         self.page.total = count
-        self.page.pages = int(self.page.total // self.page.pageSize) + 1
-        self.page.searchText = searchText
-        
+        self.page.pages = max(1, math.ceil(self.page.total / self.page.pageSize))
+
         self.thumbnailCtrl.ShowBook(books)
-        
-        
-        
+        if bookPagination:
+            # next and previous page are read ahead with their thumbnails
+            bookPagination.prefetchAdjacentPages(onPrefetch=lambda books: wx.CallAfter(self.thumbnailCtrl.PrefetchBooks, books))
+
         self.updateStatusBar(text=f'found : {count} of {totalBooks}')
-        
-        # update pagination toolbar status
-        
-#         self.setPaginationBarStatus()
+
     def updateStatusBar(self, text=None):
             if text and str(type(self.GetTopLevelParent())) == "<class 'src.view.TheEclipseView.EclipseMainFrame'>":
                 self.GetTopLevelParent().SetStatusText(text, 0)        
@@ -252,6 +276,7 @@ class ThumbnailCtrlPaginationPanel(wx.Panel, WorkspaceHelper):
     def onPageSizeCtrl(self, event):
         logger.debug('onPageSizeCtrl')
         self.page.pageSize = int(event.GetString())
+        self.page.currentPage = 0
         self.loadingBook()
         if hasattr(self, 'pageNumberCtrl'):
             pageNumbers = [f'{1+pageNum}' for pageNum in range(self.page.pages)] 
@@ -301,7 +326,14 @@ class ThumbnailCtrlPaginationPanel(wx.Panel, WorkspaceHelper):
             self.paginationBar.EnableTool(ID_FIRST_RESULT, True)
             self.paginationBar.EnableTool(ID_PREVIOUS_RESULT, True)
         self.paginationBar.Realize()
-        self.loadingBook()
+        readPages = {
+            ID_FIRST_RESULT: lambda bookPagination: bookPagination.firstPage(),
+            ID_PREVIOUS_RESULT: lambda bookPagination: bookPagination.previousPage(),
+            ID_NEXT_RESULT: lambda bookPagination: bookPagination.nextPage(),
+            ID_LAST_RESULT: lambda bookPagination: bookPagination.lastPage(),
+            }
+        if e.Id in readPages:
+            self.showingPage(readPages[e.Id])
         self.updatePangnation()
 
     def reloadingDatabase(self, event):
@@ -309,9 +341,53 @@ class ThumbnailCtrlPaginationPanel(wx.Panel, WorkspaceHelper):
         self.createDatabase = CreateDatabase(libraryPath=self.libraryPath)
         self.createDatabase.creatingDatabase()
         self.createDatabase.addingData()
+        BookPagination.invalidate()
+        self.page.currentPage = 0
         self.loadingBook(searchText=self.search.GetValue())
 
 
+class AddBookProgress():
+    '''
+    Runs BulkAddBook on a worker thread with a progress dialog, abort cancels
+    the books not started yet. Book browser is reloaded when done.
+    '''
+
+    def __init__(self, parent=None, bulkAddBook=None):
+        self.parent = parent
+        self.bulkAddBook = bulkAddBook
+        self.progressDialog = None
+
+    def start(self, sourcePaths=None):
+        self.progressDialog = wx.ProgressDialog('Adding books', f"Adding {len(sourcePaths)} book(s)...", maximum=max(len(sourcePaths), 1),
+                                                parent=self.parent, style=wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME | wx.PD_REMAINING_TIME | wx.PD_AUTO_HIDE)
+        self.bulkAddBook.onProgress = lambda done, total, sourcePath: wx.CallAfter(self.onProgress, done, total, sourcePath)
+        threading.Thread(target=self.runAddBooks, args=(sourcePaths,), name='BulkAddBook', daemon=True).start()
+
+    def runAddBooks(self, sourcePaths=None):
+        books = list()
+        try:
+            books = self.bulkAddBook.addingBooksToWorkspace(sourcePaths)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        wx.CallAfter(self.onAddBooksDone, books)
+
+    def onProgress(self, done, total, sourcePath):
+        if self.progressDialog:
+            self.progressDialog.SetRange(max(total, 1))
+            keepGoing, skip = self.progressDialog.Update(min(done, total), os.path.basename(sourcePath))
+            if not keepGoing:
+                self.bulkAddBook.cancel()
+
+    def onAddBooksDone(self, books=None):
+        if self.progressDialog:
+            self.progressDialog.Destroy()
+            self.progressDialog = None
+        logger.debug('drop book completed. added: %s skipped: %s failed: %s', len(books), len(self.bulkAddBook.skipped), len(self.bulkAddBook.failed))
+        # books were saved on the worker thread, counts cached meanwhile are stale
+        BookPagination.invalidate()
+        self.parent.loadingBook(searchText=self.parent.search.GetValue())
+
+
 class FileDropTarget(wx.FileDropTarget):
     """ This object implements Drop Target functionality for Files """
 
@@ -332,17 +408,7 @@ class FileDropTarget(wx.FileDropTarget):
 #         self.obj.SetInsertionPointEnd()
         # append a list of the file names dropped
         logger.debug (f"{len(filenames)} file(s) dropped at {x}, {y}:\n")
-        # TODO : need to implement threading
-        addBook = AddBook(libraryPath=self.libraryPath)
-        maxBookID = addBook.getMaxBookID()
-        for file in filenames:
-            self.selectedFilePath = file
-            logger.debug ('file: %s' , file)
-            if file:
-                addBook = AddBook(libraryPath=self.libraryPath)
-                addBook.addingBookToWorkspace(file, maxBookID)
-            maxBookID = maxBookID + 1
-        logger.debug('drop book completed.')
+        AddBookProgress(self.obj, bulkAddBook=BulkAddBook(libraryPath=self.libraryPath)).start([file for file in filenames if file])
 #         text = self.obj.searchCtrlPanel.searchCtrl.GetValue()
 #         self.obj.searchCtrlPanel.doSearch(text)
         return True
@@ -16,7 +16,7 @@ class FindingBook():
     def searchingBook(self, searchText=None, exactSearchFlag=False, pageSize=10, offset=0):
         '''
         This method return list of books matching with search text.
-        @param searchText: may be a book name 
+        @param searchText: words of book name, authors, tag, publisher or isbn, "quoted" for a phrase
         '''
         books = list()
         if searchText != None and searchText != '':
@@ -24,7 +24,7 @@ class FindingBook():
             if exactSearchFlag:
                 books, count = self.createDatabase.findByBookName(searchText)
             else:
-                books, count = self.createDatabase.findBySimlarBookName(bookName=searchText, limit=pageSize, offset=0)
+                books, count = self.createDatabase.findBySearchText(searchText=searchText, limit=pageSize, offset=offset)
         else:
             books, count = self.findAllBooks()
         return books, count 
@@ -0,0 +1,181 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import hashlib
+import os
+import threading
+from collections import OrderedDict, deque
+
+import wx
+import logging.config
+from src.view.constants import LOG_SETTINGS
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+# thumbnails fit in this box, aspect ratio is kept
+THUMBNAIL_SIZE = (300, 240)
+# decoded thumbnails kept in memory, about 100 KB each
+MEMORY_CACHE_SIZE = 256
+LOADER_THREADS = 4
+# workspace folder of the disk cache
+THUMBNAIL_CACHE_FOLDER = '.thumbnails'
+
+
+class ThumbnailCache():
+    '''
+    Thumbnails of cover images, in memory and on disk.
+
+    Disk cache files are named by a hash of image path, modification time
+    and size, a changed cover gets a new file. Memory cache is an LRU of
+    decoded wx.Image by image path, checked against the same stat.
+    Thread safe, images are decoded on loader threads.
+
+    @param cacheDir: disk cache folder, memory only when None
+    '''
+
+    def __init__(self, cacheDir=None, memorySize=MEMORY_CACHE_SIZE, thumbnailSize=THUMBNAIL_SIZE):
+        self.cacheDir = cacheDir
+        self.memorySize = memorySize
+        self.thumbnailSize = thumbnailSize
+        self.lock = threading.Lock()
+        self.images = OrderedDict()
+
+    def getKey(self, path=None):
+        '''
+        @return: cache key of image file, None when it does not exist
+        '''
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return f'{os.path.abspath(path)}\0{stat.st_mtime_ns}\0{stat.st_size}\0{self.thumbnailSize[0]}x{self.thumbnailSize[1]}'
+
+    def getCachePath(self, key=None):
+        digest = hashlib.sha1(key.encode('utf-8', errors='surrogateescape')).hexdigest()
+        return os.path.join(self.cacheDir, digest[:2], digest + '.png')
+
+    def getCached(self, path=None):
+        '''
+        @return: wx.Image from memory, None when not cached
+        '''
+        key = self.getKey(path)
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+            return image
+
+    def getThumbnail(self, path=None):
+        '''
+        from memory, disk cache or decoded from image file, in that order.
+        @return: wx.Image, None when image file can not be read
+        '''
+        key = self.getKey(path)
+        if key is None:
+            return None
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+                return image
+        image = self.readCacheFile(key)
+        if image is None:
+            image = self.makeThumbnail(path)
+            if image is None:
+                return None
+            self.writeCacheFile(key, image)
+        with self.lock:
+            self.images[key] = image
+            while len(self.images) > self.memorySize:
+                self.images.popitem(last=False)
+        return image
+
+    def makeThumbnail(self, path=None):
+        image = wx.Image(path)
+        if not image.IsOk() or image.GetWidth() == 0 or image.GetHeight() == 0:
+            return None
+        width, height = image.GetWidth(), image.GetHeight()
+        scale = min(self.thumbnailSize[0] / width, self.thumbnailSize[1] / height, 1)
+        if scale < 1:
+            image.Rescale(max(int(width * scale), 1), max(int(height * scale), 1), wx.IMAGE_QUALITY_HIGH)
+        return image
+
+    def readCacheFile(self, key=None):
+        if not self.cacheDir:
+            return None
+        cachePath = self.getCachePath(key)
+        if os.path.exists(cachePath):
+            image = wx.Image(cachePath, wx.BITMAP_TYPE_PNG)
+            if image.IsOk():
+                return image
+        return None
+
+    def writeCacheFile(self, key=None, image=None):
+        if not self.cacheDir:
+            return
+        cachePath = self.getCachePath(key)
+        try:
+            os.makedirs(os.path.dirname(cachePath), exist_ok=True)
+            # other threads never read a partly written file
+            temporaryPath = f'{cachePath}.{threading.get_ident()}.tmp'
+            if image.SaveFile(temporaryPath, wx.BITMAP_TYPE_PNG):
+                os.replace(temporaryPath, cachePath)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+
+
+class ThumbnailLoader():
+    '''
+    Loads thumbnails on a pool of threads. load replaces the requests not
+    started yet, thumbnails of the page left behind are not decoded. Requests
+    are served in order: visible thumbnails, rest of the page, prefetch.
+
+    @param thumbnailCache: ThumbnailCache
+    @param threads: number of loader threads
+    '''
+
+    def __init__(self, thumbnailCache=None, threads=LOADER_THREADS):
+        self.thumbnailCache = thumbnailCache
+        self.threads = threads
+        self.condition = threading.Condition()
+        self.requests = deque()
+        self.workers = list()
+
+    def load(self, requests=None, prefetchPaths=None):
+        '''
+        @param requests: list of (image path, callback(wx.Image)) in priority order
+        @param prefetchPaths: image paths to put in cache after requests
+        '''
+        with self.condition:
+            self.requests = deque(requests or [])
+            self.requests.extend((path, None) for path in prefetchPaths or [])
+            self.startWorkers()
+            self.condition.notify_all()
+
+    def prefetch(self, paths=None):
+        with self.condition:
+            self.requests.extend((path, None) for path in paths)
+            self.startWorkers()
+            self.condition.notify_all()
+
+    def startWorkers(self):
+        while len(self.workers) < self.threads:
+            worker = threading.Thread(target=self.run, name=f'ThumbnailLoader-{len(self.workers)}', daemon=True)
+            self.workers.append(worker)
+            worker.start()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.requests:
+                    self.condition.wait()
+                path, callback = self.requests.popleft()
+            try:
+                image = self.thumbnailCache.getThumbnail(path)
+                if callback:
+                    callback(image)
+            except Exception as e:
+                logger.error(e, exc_info=True)
@@ -436,7 +436,7 @@ class EpubBook:
         if name == None:
             return None, None
         else:
-            outfp = open(name, 'w')
+            outfp = open(name, 'wb')
             outfp.write(infp.read())
             infp.close()
         outfp.close()
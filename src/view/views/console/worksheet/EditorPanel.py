@@ -17,6 +17,12 @@ from pubsub import pub
 from src.view.findAndReplace.GoToLinePanel import CreatingGoToLinePanel
 from src.sqlite_executer.ConnectExecuteSqlite import SQLExecuter, \
     ManageSqliteDatabase
+from src.sqlite_executer.QueryExecutor import QueryExecutor
+from src.sqlite_executer.SchemaCatalog import SchemaCatalogManager
+from src.sqlite_executer.SqlHistoryWriter import SqlHistoryWriter
+from src.view.exporting.exportData import exportData
+from src.view.explain.queryPlan import explainQuery
+from src.view.views.console.worksheet.SqlCompletion import StatementTokenizer, SqlCompleter
 import time
 from sqlite3 import OperationalError
 import sqlparse
@@ -49,6 +55,7 @@ keylist = {
     '/'     :stc.STC_KEY_DIVIDE,
 }
 demoText = """select * from table_name;"""
+QUERY_TIMER_INTERVAL = 200
 
 if wx.Platform == '__WXMSW__':
     faces = { 'times': 'Consolas',
@@ -102,6 +109,14 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
         self.popmenu = None
         self.frame = None
         self.adviceList = list()
+        self.databasePaths = dict()
+        self.statementTokenizer = StatementTokenizer(getTextRange=lambda start, end: bytes(self.GetTextRangeRaw(start, end)), getLength=self.GetLength)
+        self.sqlCompleter = SqlCompleter(tokenizer=self.statementTokenizer)
+        self.queryExecutors = dict()
+        self.queryJob = None
+        self.queryTimer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.onQueryTimer, self.queryTimer)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.onDestroy)
         self.SetHighlightGuide(1)
 #         self.CmdKeyAssign(ord('B'), stc.STC_SCMOD_CTRL, stc.STC_CMD_ZOOMIN)
 #         self.CmdKeyAssign(ord('N'), stc.STC_SCMOD_CTRL, stc.STC_CMD_ZOOMOUT)
@@ -215,6 +230,7 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
         self.Bind(wx.EVT_LEFT_UP, self.onLeftMouseUp)
         self.Bind(stc.EVT_STC_UPDATEUI, self.OnUpdateUI)
         self.Bind(stc.EVT_STC_MARGINCLICK, self.OnMarginClick)
+        self.Bind(stc.EVT_STC_MODIFIED, self.onModified)
         self.Bind(wx.EVT_KEY_DOWN, self.OnKeyPressed)
         self.Bind(wx.EVT_KEY_UP, self.OnKeyUp)
 
@@ -228,6 +244,13 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
         self.Bind(wx.EVT_MENU, lambda e:self.Paste(e), id=wx.ID_PASTE)
         self.Bind(wx.EVT_MENU, lambda e:self.copyClipboard(e), id=wx.ID_COPY)
 
+    def onDestroy(self, event):
+        if event.GetEventObject() is self:
+            self.queryTimer.Stop()
+            for queryExecutor in self.queryExecutors.values():
+                queryExecutor.close()
+        event.Skip()
+
     def registerAllImages(self):
         path = os.path.abspath(__file__)
         tail = None
@@ -303,7 +326,7 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
         if self.CallTipActive():
             self.CallTipCancel()
         key = event.GetKeyCode()
-        logger.debug(f'OnKeyUp: GetKeyCode:{event.GetKeyCode()} ControlDown:{event.ControlDown()} ShiftDown:{event.ShiftDown()}')
+        logger.debug('OnKeyUp: GetKeyCode:%s ControlDown:%s ShiftDown:%s', key, event.ControlDown(), event.ShiftDown())
 
         if event.ControlDown() and  key == 47:
             logger.debug(f'ctrl+/ {self.GetSelectedText()}')
@@ -478,7 +501,8 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
 #                     if kw[i] in keyword.kwlist:
 #                         kw[i] = kw[i] + "?1"
 
-                self.AutoCompShow(0, "|".join(self.getAdvice()))
+                adviceList, wordLength = self.getAdvice()
+                self.AutoCompShow(wordLength, "|".join(adviceList))
         else:
             event.Skip()
 
@@ -593,50 +617,46 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
 # =========================================================================
 
     def getAdvice(self):
+        '''
+        @return: (advice list, length of the word already typed)
+        '''
         del self.adviceList[:]
-        self.adviseUtil()
-        return self.adviceList
+        wordLength = self.adviseUtil()
+        return self.adviceList, wordLength
 
     def adviseUtil(self, previousText=None, curPos=None):
-        cur = self.GetCurrentPos()
-        previousString = self.GetRange(0, cur).lower()
-        initalPreviousString = str(previousString)
-        previousString = previousString.rstrip()
-        # Get all the table name
-        # if previous char is ; advise for "select * from "
-        # if previous str is from advise for all the table
-        sqlList = sqlparse.split(previousString)
-        tokens = None
-        for singleSql in sqlList:
-            parsedSingleSql = sqlparse.parse(singleSql)
-            tokens = parsedSingleSql[0].tokens
-            
-        # get previous keyword
-        isToken=False
-        count=-1
-        previousTokenKey=None
-        while not isToken:
-            if len(tokens)>abs(count):
-                isToken=tokens[count].is_keyword
-                if isToken:
-                    previousTokenKey=tokens[count]
-                count=count-1
-            else:
-                break
-        
-        if previousTokenKey.value == 'from':
-            
-            sqlText = "select name from sqlite_master where type='table' order by 1;"
-            tables = self.executeSqlText(sqlText)
-            for table in tables:
-                self.adviceList.append(table[0])
-        elif previousTokenKey.value == 'select':
-            # get all the columns for 
-            pass
-        else:
-            self.adviceList.append("select * from ")
-            self.adviceList.append("create table Table_1 ( id number); ")
-            self.adviceList.append("desc ")
+        '''
+        Only the statement around the caret is tokenized, see StatementTokenizer.
+        Tables and columns come from the schema catalog of the connection.
+        @return: length of the word already typed
+        '''
+        if curPos is None:
+            curPos = self.GetCurrentPos()
+        adviceList, wordLength = self.sqlCompleter.getAdvice(curPos, self.getSchemaCatalog())
+        self.adviceList.extend(adviceList)
+        return wordLength
+
+    def onModified(self, event):
+        if event.GetModificationType() & (stc.STC_MOD_INSERTTEXT | stc.STC_MOD_DELETETEXT):
+            self.statementTokenizer.onModified(event.GetPosition())
+        event.Skip()
+
+    def getSchemaCatalog(self):
+        '''
+        @return: SchemaCatalog of the selected connection, None if there is no database
+        '''
+        try:
+            connectionName = self.GetGrandParent().GetGrandParent()._ctrl.GetValue()
+            if connectionName not in self.databasePaths:
+                self.databasePaths[connectionName] = self.findingConnectionName()[1]
+            databaseAbsolutePath = self.databasePaths[connectionName]
+            if not databaseAbsolutePath or not os.path.isfile(databaseAbsolutePath):
+                return None
+            with ManageSqliteDatabase(connectionName=connectionName, databaseAbsolutePath=databaseAbsolutePath) as manageSqliteDatabase:
+                return manageSqliteDatabase.getSchemaCatalog()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        return None
 
     def OnUpdateUI(self, evt):
         # check for matching braces
@@ -962,8 +982,9 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
             
     def executeSQL(self, event=None):
         '''
+        Statement is executed on a worker thread of the connection. Result
+        rows are posted back in batches, see onQueryPage and onQueryDone.
         '''
-        error = 'success'
         sqlText = self.GetSelectedText()
         if self.GetSelectedText() == '' or self.GetSelectedText() == None:
             sqlText, column = self.GetCurLine()
@@ -975,95 +996,138 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
         logger.debug('executeSQL: %s' , sqlText)
         try:
             if os.path.isfile(dbFilePath):
-                sqlOutput = None
-                startTime = time.time()
-                try:
-                    manageSqliteDatabase = ManageSqliteDatabase(connectionName=selectedItemText, databaseAbsolutePath=dbFilePath)
-                    sqlOutput = manageSqliteDatabase.executeText(sqlText)
-                except OperationalError as oe:
-                    now = datetime.datetime.now()
-                    strftime = now.strftime("%Y-%m-%d %H:%M:%S")
-                    newline = "\n"
-                    try:
-                        if self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.Value.strip() == "":
-                            newline = ""
-                        self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.AppendText("{}{} {}".format(newline, strftime, oe))
-                    except Exception as e:
-                        pass
-#                     self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.AppendText("\n" + str(oe))
-                except Exception as e:
-                    logger.error(e, exc_info=True)
-                    now = datetime.datetime.now()
-                    strftime = now.strftime("%Y-%m-%d %H:%M:%S")
-                    newline = "\n"
-                    if self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.Value.strip() == "":
-                        newline = ""
-                    self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.AppendText("{}{} {}".format(newline, strftime, e))
-
-                endTime = time.time()
-                logger.debug('duration: %s', endTime - startTime)
-                duration = endTime - startTime
-                if selectedItemText:
-                    self.updateSqlLog(sqlText, duration, connectionName=selectedItemText)
-
                 if self.GetGrandParent().GetParent().resultPanel._nb.GetCurrentPage().pin:
                     logger.debug('adding a new tab')
                     self.GetGrandParent().GetParent().resultPanel.addTab()
-                creatingWorksheetPanel = self.GetGrandParent().GetParent()
-                creatingWorksheetPanel.setResultData(data=sqlOutput)
-#                 creatingWorksheetPanel = self.GetTopLevelParent()._mgr.GetPane("centerPane").window.GetChildren()[0].GetCurrentPage().Children[1]
-#                 creatingWorksheetPanel.setResultData(data=sqlOutput)
                 resultListPanel = self.GetGrandParent().Children[1]
-        #         if sqlOutput:
-                if sqlOutput and resultListPanel._nb.GetCurrentPage():
-                    resultListPanel._nb.GetCurrentPage().bottomResultToolbar.SetStatusText('Count: {}'.format(len(sqlOutput) - 1))
-                    resultListPanel._nb.GetCurrentPage().resultPanel.addData(data=sqlOutput)
-                    resultListPanel._nb.GetCurrentPage().resultPanel.setSqlText(sqlText)
-#                     resultListPanel._nb.GetCurrentPage().resultPanel.DoRefresh()
-#                 else:
-#                     # logic to add a new tab in result
-#                     logger.debug('adding a new tab')
-#                     self.GetGrandParent().GetParent().resultPanel.addTab()
+                resultPanel = None
+                if resultListPanel._nb.GetCurrentPage():
+                    resultPanel = resultListPanel._nb.GetCurrentPage().resultPanel
+                queryExecutor = self.getQueryExecutor(selectedItemText, dbFilePath)
+                self.queryJob = queryExecutor.execute(sqlText,
+                                                      onPage=lambda job, rows: self.onQueryPage(job, rows, resultPanel),
+                                                      onDone=lambda job: self.onQueryDone(job, selectedItemText),
+                                                      onError=self.onQueryError)
+                self.queryTimer.Start(QUERY_TIMER_INTERVAL)
         except TypeError as te:
             logger.error(te, exc_info=True)
             if not dbFilePath:
                 error = 'Unable to connect. Please choose a database to execute Script.'
-                now = datetime.datetime.now()
-                strftime = now.strftime("%Y-%m-%d %H:%M:%S")
-                newline = "\n"
-                if self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.Value.strip() == "":
-                    newline = ""
-                self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.AppendText("{}{} {}".format(newline, strftime, error))
+                self.printConsoleOutput(error)
         except Exception as e:
             logger.error(e, exc_info=True)
-            now = datetime.datetime.now()
-            strftime = now.strftime("%Y-%m-%d %H:%M:%S")
-            newline = "\n"
-            if self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.Value.strip() == "":
-                newline = ""
-            self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.AppendText("{}{} {}".format(newline, strftime, e))
+            self.printConsoleOutput(e)
+
+    def getQueryExecutor(self, connectionName=None, databaseAbsolutePath=None):
+        '''
+        One worker thread per connection of this worksheet.
+        '''
+        queryExecutor = self.queryExecutors.get(connectionName)
+        if queryExecutor and queryExecutor.databaseAbsolutePath != databaseAbsolutePath:
+            queryExecutor.close()
+            queryExecutor = None
+        if queryExecutor is None:
+            queryExecutor = QueryExecutor(connectionName=connectionName, databaseAbsolutePath=databaseAbsolutePath, dispatch=wx.CallAfter)
+            self.queryExecutors[connectionName] = queryExecutor
+        return queryExecutor
+
+    def cancelQuery(self, event=None):
+        if self.queryJob and not self.queryJob.cancelled:
+            logger.debug('cancelQuery: %s', self.queryJob.sqlText)
+            self.queryExecutors[self.queryJob.connectionName].cancel(self.queryJob)
+
+    def exportQuery(self, event=None):
+        '''
+        Statement at cursor, or selected text, is run again by the exporter
+        and streamed to file.
+        '''
+        sqlText = self.GetSelectedText()
+        if not sqlText:
+            sqlText, column = self.GetCurLine()
+        connectionName, dbFilePath = self.findingConnectionName()
+        if not sqlText.strip() or not dbFilePath or not os.path.isfile(dbFilePath):
+            self.printConsoleOutput('Please choose a database and a query to export.')
+            return
+        exportData(parent=self, name=f'{connectionName}_query', connectionName=connectionName, databaseAbsolutePath=dbFilePath, sqlText=sqlText)
 
-#             print(e)
-            error = str(e)
+    def explainQuery(self, event=None):
+        '''
+        Statement at cursor, or selected text, is explained and profiled.
+        '''
+        sqlText = self.GetSelectedText()
+        if not sqlText:
+            sqlText, column = self.GetCurLine()
+        connectionName, dbFilePath = self.findingConnectionName()
+        if not sqlText.strip() or not dbFilePath or not os.path.isfile(dbFilePath):
+            self.printConsoleOutput('Please choose a database and a query to explain.')
+            return
+        explainQuery(parent=self, connectionName=connectionName, databaseAbsolutePath=dbFilePath, sqlText=sqlText)
+
+    def onQueryPage(self, job, rows, resultPanel=None):
+        if not resultPanel:
+            return
+        if resultPanel.getQueryJob() is job:
+            resultPanel.appendQueryRows(rows)
+        else:
+            resultPanel.addQueryResult(job, rows, pageRequester=self.queryExecutors[job.connectionName].fetchNextPage)
+            resultPanel.setSqlText(job.sqlText)
+
+    def onQueryError(self, job, error):
+        self.printConsoleOutput(error)
+
+    def onQueryDone(self, job, connectionName=None):
+        if self.queryJob is job:
+            self.queryTimer.Stop()
+        duration = job.getElapsedTime()
+        logger.debug('duration: %s', duration)
+        status = f'Executed in {duration:.3f} s, rows fetched: {job.rowCount}'
+        if job.cancelled:
+            status = f'Cancelled after {duration:.3f} s, rows fetched: {job.rowCount}'
+            self.printConsoleOutput(f'Query cancelled: {job.sqlText}')
+        self.setStatusText(status)
+        if connectionName:
+            # history grid picks the row up from SqlHistoryWriter
+            self.updateSqlLog(job.sqlText, duration, connectionName=connectionName)
 
-        self.refreshSqlLogUi()
+        '''
+        logic to update connected tree if statement has changed the schema.
+        '''
+        if not job.error and not job.cancelled and self.isSchemaChanged(connectionName):
+            self.GetTopLevelParent()._mgr.GetPane("databaseNaviagor").window.tree.onRefresh(None, connectionName=connectionName)
 
+    def isSchemaChanged(self, connectionName=None):
         '''
-        logic to update connected tree if sqlText has create statement.
+        @return: True if PRAGMA schema_version differs from the cached schema catalog
         '''
-        for refreshItem in ['create table', 'drop', 'alter']:
-            if refreshItem in sqlText.lower() :
-                self.GetTopLevelParent()._mgr.GetPane("databaseNaviagor").window.tree.onRefresh(event, connectionName=selectedItemText)
-
-#         updateStatus="Unable to connect '"+dbFilePath +". "+error
-#         consoleOutputPanel = self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window
-#         consoleOutputPanel.text.AppendText(error)
-#             font = self.GetTopLevelParent().statusbar.GetFont()
-#             font.SetWeight(wx.BOLD)
-#             self.GetTopLevelParent().statusbar.SetFont(font)
-#             self.GetTopLevelParent().statusbar.SetForegroundColour(wx.RED)
-#             self.GetTopLevelParent().statusbar.SetStatusText(updateStatus,1)
-        # TODO Update update sql log history grid
+        queryExecutor = self.queryExecutors.get(connectionName)
+        if queryExecutor is None:
+            return False
+        try:
+            with ManageSqliteDatabase(connectionName=connectionName, databaseAbsolutePath=queryExecutor.databaseAbsolutePath) as manageSqliteDatabase:
+                return SchemaCatalogManager.getCatalog(queryExecutor.databaseAbsolutePath).isStale(manageSqliteDatabase.conn)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        return False
+
+    def onQueryTimer(self, event):
+        job = self.queryJob
+        if job and not job.done:
+            self.setStatusText(f'Executing {job.getElapsedTime():.1f} s, rows fetched: {job.rowCount}')
+
+    def setStatusText(self, text):
+        if hasattr(self.GetTopLevelParent(), 'statusbar'):
+            self.GetTopLevelParent().statusbar.SetStatusText(text, 1)
+
+    def printConsoleOutput(self, message=None):
+        try:
+            now = datetime.datetime.now()
+            strftime = now.strftime("%Y-%m-%d %H:%M:%S")
+            newline = "\n"
+            if self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.Value.strip() == "":
+                newline = ""
+            self.GetTopLevelParent()._mgr.GetPane("consoleOutput").window.text.AppendText("{}{} {}".format(newline, strftime, message))
+        except Exception as e:
+            logger.error(e, exc_info=True)
 
     def findingConnectionName(self):
         '''
@@ -1082,19 +1146,13 @@ class SqlStyleTextCtrl(stc.StyledTextCtrl):
 
     def updateSqlLog(self, sqlText, duration, connectionName=None):
         logger.debug('updateSqlLog : %s', sqlText)
-        sqlExecuter = SQLExecuter(database='_opal.sqlite')
-        table = 'sql_log'
-        rows = [{'id':None, 'sql':str(sqlText), 'connection_name':connectionName, 'created_time':datetime.datetime.now(), 'executed':'1', 'duration':duration}]
-        sqlExecuter.sqlite_insert(table, rows)
+        SqlHistoryWriter.getInstance().log(sqlText, duration, connectionName=connectionName)
 
     def refreshSqlLogUi(self):
         logger.debug('refreshSqlLogUi')
         historyGrid = self.GetTopLevelParent()._mgr.GetPane("sqlLog").window
         if historyGrid:
-            sqlText = 'select * from sql_log order by created_time desc;'
-            sqlExecuter = SQLExecuter(database='_opal.sqlite')
-            sqlOutput = sqlExecuter.executeText(sqlText)
-            historyGrid.addData(data=sqlOutput)
+            historyGrid.reload()
 
     def sqlStyle(self):
         # Sql styles
@@ -0,0 +1,49 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import wx
+import logging.config
+from src.view.constants import LOG_SETTINGS
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+
+class FilterChipBar(wx.Panel):
+    '''
+    Quick filters of a ResultDataGrid shown as chips above the grid. Clicking
+    a chip removes its filter. Bar is hidden while there is no filter.
+    '''
+
+    def __init__(self, parent=None, grid=None):
+        wx.Panel.__init__(self, parent, id=-1)
+        self.grid = grid
+        self.sizer = wx.WrapSizer(wx.HORIZONTAL)
+        self.SetSizer(self.sizer)
+        self.Hide()
+
+    def setFilters(self, filters=None, headers=None, rowCount=0, totalRowCount=0):
+        self.sizer.Clear(delete_windows=True)
+        if filters:
+            for resultFilter in filters:
+                chip = wx.Button(self, label=f'{resultFilter.getLabel(headers)}  ✕', style=wx.BU_EXACTFIT)
+                chip.SetToolTip('Remove filter')
+                chip.Bind(wx.EVT_BUTTON, lambda event, resultFilter=resultFilter: self.onRemoveFilter(event, resultFilter))
+                self.sizer.Add(chip, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 2)
+            clearButton = wx.Button(self, label='Clear all', style=wx.BU_EXACTFIT)
+            clearButton.Bind(wx.EVT_BUTTON, self.onClearFilters)
+            self.sizer.Add(clearButton, 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 2)
+            self.sizer.Add(wx.StaticText(self, label=f'{rowCount} of {totalRowCount} rows'), 0, wx.ALL | wx.ALIGN_CENTER_VERTICAL, 4)
+        self.Show(bool(filters))
+        self.GetParent().Layout()
+
+    def onRemoveFilter(self, event, resultFilter=None):
+        logger.debug(f'onRemoveFilter: {resultFilter.getLabel()}')
+        # chip is deleted while removing the filter, leave its event handler first
+        wx.CallAfter(self.grid.removeFilter, resultFilter)
+
+    def onClearFilters(self, event):
+        logger.debug('onClearFilters')
+        wx.CallAfter(self.grid.clearFilters)
@@ -15,6 +15,10 @@ from src.view.constants import LOG_SETTINGS
 from src.view.util.FileOperationsUtil import FileOperations
 from _io import StringIO
 import io
+from src.sqlite_executer.ResultSet import ResultSet
+from src.sqlite_executer.ResultView import ResultView, ResultFilter
+from src.sqlite_executer.ConnectExecuteSqlite import SQLUtils
+from src.view.exporting.exportData import exportData
 
 logging.config.dictConfig(LOG_SETTINGS)
 logger = logging.getLogger('extensive')
@@ -45,7 +49,7 @@ class MegaImageRenderer(gridlib.GridCellRenderer):
     def Draw(self, grid, attr, dc, rect, row, col, isSelected):
 #         choice = self.table.GetRawValue(row, col)
 #         if self._choices:
-        blobData = grid.data.get(row + 1)[col]
+        blobData = grid.getRawValue(row, col)
         bmp = wx.Bitmap(2, 2)
         try:
             
@@ -258,19 +262,191 @@ class MyCellEditor(gridlib.PyGridCellEditor):
         return MyCellEditor()
 
 
+class ResultGridTable(gridlib.GridTableBase):
+    '''
+    Virtual table over a columnar ResultSet. Grid asks only for the visible
+    cells, so values and attributes are resolved lazily. Cell attributes are
+    shared by all cells of the same column type. Grid rows are rows of a
+    ResultView, sort and filter only change the row mapping.
+    '''
+
+    def __init__(self, resultSet=None):
+        gridlib.GridTableBase.__init__(self)
+        self.resultSet = resultSet if resultSet else ResultSet()
+        self.resultView = ResultView(self.resultSet)
+        self.colLabels = dict()
+        self.typeAttrs = dict()
+        self.nullAttr = gridlib.GridCellAttr()
+        self.nullAttr.SetFont(wx.Font(10, wx.FONTFAMILY_SCRIPT, wx.FONTSTYLE_ITALIC, wx.FONTWEIGHT_NORMAL))
+        self.nullAttr.SetTextColour(wx.LIGHT_GREY)
+
+    def setResultSet(self, resultSet=None):
+        oldRows, oldCols = self.GetNumberRows(), self.GetNumberCols()
+        self.resultSet = resultSet if resultSet else ResultSet()
+        self.resultView.setResultSet(self.resultSet)
+        self.colLabels = dict()
+        self.resetView(oldRows, oldCols)
+
+    def appendResultRows(self, rows):
+        oldRows, oldCols = self.GetNumberRows(), self.GetNumberCols()
+        self.resultSet.appendRows(rows)
+        if self.resultView.isActive():
+            self.resultView.apply()
+        self.resetView(oldRows, oldCols)
+
+    def updateView(self, viewChange, *args, **kw):
+        '''
+        Applying a sort or filter change of the ResultView and redrawing rows.
+        @param viewChange: ResultView method
+        '''
+        oldRows, oldCols = self.GetNumberRows(), self.GetNumberCols()
+        viewChange(*args, **kw)
+        self.resetView(oldRows, oldCols)
+
+    def getSourceRow(self, row):
+        return self.resultView.getSourceRow(row)
+
+    def resetView(self, oldRows, oldCols):
+        '''
+        Notifying grid about changed number of rows and columns.
+        '''
+        grid = self.GetView()
+        if not grid:
+            return
+        grid.BeginBatch()
+        for current, new, deleteMsg, appendMsg in [
+                (oldRows, self.GetNumberRows(), gridlib.GRIDTABLE_NOTIFY_ROWS_DELETED, gridlib.GRIDTABLE_NOTIFY_ROWS_APPENDED),
+                (oldCols, self.GetNumberCols(), gridlib.GRIDTABLE_NOTIFY_COLS_DELETED, gridlib.GRIDTABLE_NOTIFY_COLS_APPENDED)]:
+            if new < current:
+                grid.ProcessTableMessage(gridlib.GridTableMessage(self, deleteMsg, new, current - new))
+            elif new > current:
+                grid.ProcessTableMessage(gridlib.GridTableMessage(self, appendMsg, new - current))
+        grid.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_REQUEST_VIEW_GET_VALUES))
+        grid.EndBatch()
+        grid.ForceRefresh()
+
+    def GetNumberRows(self):
+        return self.resultView.getRowCount()
+
+    def GetNumberCols(self):
+        return self.resultSet.getColumnCount()
+
+    def IsEmptyCell(self, row, col):
+        return False
+
+    def getRawValue(self, row, col):
+        return self.resultSet.getValue(self.resultView.getSourceRow(row), col)
+
+    def GetValue(self, row, col):
+        value = self.resultSet.getValue(self.resultView.getSourceRow(row), col)
+        if value is None:
+            return 'NULL'
+        return str(value)
+
+    def SetValue(self, row, col, value):
+        self.resultSet.setValue(self.resultView.getSourceRow(row), col, self.resultSet.fromText(col, value))
+
+    def GetColLabelValue(self, col):
+        if col in self.colLabels:
+            label = self.colLabels[col]
+        else:
+            label = str(self.resultSet.headers[col])
+        sortColumn = self.resultView.getSortColumn(col)
+        if sortColumn:
+            position, ascending = sortColumn
+            label = f"{label} {'▲' if ascending else '▼'}"
+            if len(self.resultView.sortColumns) > 1:
+                label = f'{label}{position + 1}'
+        return label
+
+    def SetColLabelValue(self, col, label):
+        self.colLabels[col] = label
+
+    def AppendRows(self, numRows=1):
+        start = self.resultSet.getRowCount()
+        self.resultSet.appendEmptyRows(numRows)
+        self.resultView.appendSourceRows(start, numRows)
+        grid = self.GetView()
+        if grid:
+            grid.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_APPENDED, numRows))
+        return True
+
+    def DeleteRows(self, pos=0, numRows=1):
+        if self.resultView.isActive():
+            self.deleteSourceRows(self.resultView.getSourceRows(range(pos, pos + numRows)))
+            return True
+        self.resultSet.deleteRows(pos, numRows)
+        grid = self.GetView()
+        if grid:
+            grid.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_DELETED, pos, numRows))
+        return True
+
+    def deleteSourceRows(self, sourceRows=None):
+        '''
+        deleting rows of the ResultSet, keeping order of the remaining visible rows.
+        '''
+        oldRows, oldCols = self.GetNumberRows(), self.GetNumberCols()
+        for sourceRow in sorted(set(sourceRows), reverse=True):
+            self.resultSet.deleteRows(sourceRow, 1)
+            self.resultView.removeSourceRow(sourceRow)
+        self.resetView(oldRows, oldCols)
+
+    def getTypeAttr(self, columnType):
+        if columnType not in self.typeAttrs:
+            attr = None
+            if columnType == 'blob':
+                attr = gridlib.GridCellAttr()
+                attr.SetRenderer(MegaImageRenderer(self))
+            elif columnType == 'integer':
+                attr = gridlib.GridCellAttr()
+                attr.SetRenderer(gridlib.GridCellNumberRenderer())
+            elif columnType == 'datetime':
+                attr = gridlib.GridCellAttr()
+                attr.SetRenderer(gridlib.GridCellDateTimeRenderer())
+            elif columnType == 'boolean':
+                attr = gridlib.GridCellAttr()
+                attr.SetRenderer(CheckBoxCellRenderer(self.GetView()))
+                attr.SetEditor(gridlib.GridCellBoolEditor())
+                attr.SetAlignment(wx.ALIGN_RIGHT, wx.ALIGN_CENTRE)
+            self.typeAttrs[columnType] = attr
+        return self.typeAttrs[columnType]
+
+    def GetAttr(self, row, col, kind):
+        attr = None
+        if row < self.GetNumberRows() and col < self.GetNumberCols():
+            if self.resultSet.getValue(self.resultView.getSourceRow(row), col) is None:
+                attr = self.nullAttr
+            else:
+                attr = self.getTypeAttr(self.resultSet.getColumnType(col))
+        if attr:
+            attr.IncRef()
+        return attr
+
+
 class ResultDataGrid(gridlib.Grid):
 
     def __init__(self, parent, model=None, data=None):
+        '''
+        Grid is backed by ResultGridTable and renders only visible cells of result.
+        '''
         gridlib.Grid.__init__(self, parent, -1, style=wx.BORDER_NONE)
         self.fileOperations = FileOperations()
-        self.CreateGrid(0, 0)
+        self.resultTable = ResultGridTable()
+        self.SetTable(self.resultTable, True)
         self.RowLabelSize = 32
         self.Bind(gridlib.EVT_GRID_CELL_RIGHT_CLICK, self.showGridCellPopupMenu)
         self.Bind(gridlib.EVT_GRID_LABEL_RIGHT_CLICK, self.showHeaderPopupMenu)
         self.Bind(wx.EVT_KEY_DOWN, self.OnKey)
         self.Bind(gridlib.EVT_GRID_CELL_CHANGED, self.cellChange) 
-        self.data = None
+        self.Bind(gridlib.EVT_GRID_SELECT_CELL, self.onSelectCell)
+        self.Bind(wx.EVT_SCROLLWIN, self.onScrollWin)
+        self.resultCursor = None
+        self.queryJob = None
+        self.pageRequester = None
+        self.pageRequested = False
         self.sqlText = ''
+        # callable(row, col, value) told about cell edits, paste and delete
+        self.cellChangeListener = None
 #         self.SetCellAlignment(row, col, horiz, vert)
 
         # Somebody changed the grid so the type registry takes precedence
@@ -302,10 +478,13 @@ class ResultDataGrid(gridlib.Grid):
         self.sqlText = sqlText
 
     def setData(self, data):
-        self.data = data
+        self.addData(data)
 
     def getData(self):
-        return self.data
+        '''
+        @return: ResultSet shown in grid
+        '''
+        return self.resultTable.resultSet
 
     def cellChange(self, evt):
         row = evt.GetRow()
@@ -314,6 +493,7 @@ class ResultDataGrid(gridlib.Grid):
         # #print 'Cell changed at', row, col
         value = self.GetTable().GetValue(row, col)
         logger.info(f'cellChange ({row,col}):{value}')
+        self.notifyCellChange(row, col, value)
         # #print 'New value', value
         # #print 'Type', type(value)
  
@@ -321,105 +501,195 @@ class ResultDataGrid(gridlib.Grid):
  
         return
 
+    def notifyCellChange(self, row, col, value):
+        '''
+        listener is told the row of the ResultSet, not the grid row.
+        '''
+        if self.cellChangeListener:
+            self.cellChangeListener(self.getSourceRow(row), col, value)
+
+    def getRawValue(self, row, col):
+        return self.resultTable.getRawValue(row, col)
+
+    def getSourceRow(self, row):
+        return self.resultTable.getSourceRow(row)
+
+    def getVisibleRowsSnapshot(self):
+        '''
+        Copy of the column values and visible row order, taken on the UI
+        thread. Export reads it on its own thread while the grid can change.
+        @return: iterator of visible row tuples
+        '''
+        resultSet = self.resultTable.resultSet
+        columns = [column.getValues() for column in resultSet.columns]
+        resultView = self.resultTable.resultView
+        if resultView.rows is None:
+            return zip(*columns)
+        sourceRows = list(resultView.rows)
+        return zip(*[map(values.__getitem__, sourceRows) for values in columns])
+
+    def exportResult(self):
+        '''
+        Query result is exported by running the query again and streaming it
+        to file. Rows held by the grid are exported as shown when there is no
+        query or the grid is sorted or filtered.
+        '''
+        resultSet = self.resultTable.resultSet
+        if self.queryJob and self.queryJob.sqlText and not self.resultTable.resultView.isActive():
+            connectionName = self.queryJob.connectionName
+            exportData(parent=self, name=f'{connectionName}_query', connectionName=connectionName,
+                       databaseAbsolutePath=SQLUtils().getDbFilePath(connectionName), sqlText=self.queryJob.sqlText)
+        else:
+            exportData(parent=self, name='result', headers=resultSet.headers, rows=self.getVisibleRowsSnapshot(), columnTypes=resultSet.columnTypes)
+
+    def getSourceRows(self, rows=None):
+        return self.resultTable.resultView.getSourceRows(rows)
+
+    def deleteSourceRows(self, sourceRows=None):
+        self.resultTable.deleteSourceRows(sourceRows)
+
+    def sortColumn(self, col, ascending=True, append=False):
+        '''
+        @param append: sort by col after the current sort columns
+        '''
+        self.resultTable.updateView(self.resultTable.resultView.setSort, col, ascending=ascending, append=append)
+
+    def clearSort(self):
+        self.resultTable.updateView(self.resultTable.resultView.clearSort)
+
+    def addFilter(self, resultFilter=None):
+        self.resultTable.updateView(self.resultTable.resultView.addFilter, resultFilter)
+        self.updateFilterChips()
+
+    def removeFilter(self, resultFilter=None):
+        self.resultTable.updateView(self.resultTable.resultView.removeFilter, resultFilter)
+        self.updateFilterChips()
+
+    def clearFilters(self):
+        self.resultTable.updateView(self.resultTable.resultView.clearFilters)
+        self.updateFilterChips()
+
+    def filterByCell(self, row, col, operator='='):
+        self.addFilter(ResultFilter(col, operator, self.getRawValue(row, col)))
+
+    def updateFilterChips(self):
+        parent = self.GetParent()
+        if hasattr(parent, 'filterChipBar'):
+            resultView = self.resultTable.resultView
+            parent.filterChipBar.setFilters(filters=resultView.filters, headers=self.resultTable.resultSet.headers,
+                                            rowCount=resultView.getRowCount(), totalRowCount=self.resultTable.resultSet.getRowCount())
+
+    def showGroupCounts(self, col):
+        '''
+        Count of each value of column in visible rows.
+        '''
+        groupCounts = self.resultTable.resultView.getGroupCounts(col)
+        lines = [f"{'NULL' if value is None else value}: {count}" for value, count in groupCounts]
+        dlg = wx.MessageDialog(self, '\n'.join(lines) if lines else 'No rows',
+                               f'Group Counts: {self.resultTable.resultSet.headers[col]}',
+                               wx.OK | wx.ICON_INFORMATION)
+        dlg.ShowModal()
+        dlg.Destroy()
+
     def addData(self, data=None):
-        self.data = data
-#         logger.info(self.GetRowSizes())
-#         logger.info(self.GetColSizes())
-        self.ClearGrid()
-        try:
-            if data and len(data) > 0:
-                dataTypeRow = data.get(-1)
-#                 logger.info('rows:', self.GetNumberRows())
-#                 logger.info('cols:', self.GetNumberCols())
-        #         self.DeleteRows()
-                currentRows, currentCols = (self.GetNumberRows(), self.GetNumberCols())
-                newRows = len(data) - 1
-                if dataTypeRow:
-                    newRows = newRows - 1
-                newCols = len(data[0])
-        #         self.AppendRows(numRows=len(data)-1, updateLabels=True)
-        #         if len(data) > 0 :
-        #             self.AppendCols(numCols=len(data[0]), updateLabels=True)
-                if newRows < currentRows:
-                    # - Delete rows:
-                    self.DeleteRows(0, currentRows - newRows, True)
-
-                if newRows > currentRows:
-                    # - append currentRows:
-                    self.AppendRows(newRows - currentRows)
-
-                if newCols < currentCols:
-                    # - Delete rows:
-                    self.DeleteCols(pos=0, numCols=currentCols - newCols, updateLabels=True)
-
-                if newCols > currentCols:
-                    # - append currentRows:
-                    self.AppendCols(newCols - currentCols)
-
-                for dataKey, dataValue in data.items():
-#                     logger.info(dataKey, dataValue)
-                    for idx, colValue in enumerate(dataValue):
-        #                 logger.info(idx, dataValue)
-
-                        if dataKey == 0:
-                            self.SetColLabelValue(idx, str(colValue))
-                        elif dataKey > 0:
-                            row = dataKey - 1
-                            col = idx
-                            try:
-#                                 if col==3:
-#                                     size=self.GetCellSize(row, col)
-#                                     data='3.jpg'
-#                                     self.SetCellRenderer(row, col, MegaImageRenderer(self.GetTable(), data))
-#                                 elif str(colValue).startswith('-______-'):
-                                    
-                                if str(colValue).startswith('-______-'):
-                                    newStringValue = str(colValue).replace('-______-', '')
-                                    self.SetCellFont(row, col, wx.Font(10, wx.FONTFAMILY_SCRIPT, wx.FONTSTYLE_ITALIC, wx.FONTWEIGHT_NORMAL))
-                                    self.SetCellTextColour(row, col, wx.LIGHT_GREY)
-                                    self.SetCellValue(row, col, newStringValue)
-                                else:
-                                    if dataTypeRow and dataTypeRow[col].lower() == 'blob':
-#                                         data='3.jpg'
-                                        if str(colValue).startswith('-______-'):
-                                            newStringValue = str(colValue).replace('-______-', '')
-                                            self.SetCellFont(row, col, wx.Font(10, wx.FONTFAMILY_SCRIPT, wx.FONTSTYLE_ITALIC, wx.FONTWEIGHT_NORMAL))
-                                            self.SetCellTextColour(row, col, wx.LIGHT_GREY)
-                                            self.SetCellValue(row, col, newStringValue)
-                                        else:
-                                            self.SetCellRenderer(row, col, MegaImageRenderer(self.GetTable(), colValue))
-                                    elif dataTypeRow and dataTypeRow[col].lower() == 'integer':
-                                        self.SetCellRenderer(row, col, gridlib.GridCellNumberRenderer())
-                                        self.SetCellValue(row, col, str(colValue))
-                                    elif dataTypeRow and dataTypeRow[col].lower() == 'datetime':
-                                        self.SetCellRenderer(row, col, gridlib.GridCellDateTimeRenderer())
-                                        self.SetCellValue(row, col, colValue)
-                                    elif dataTypeRow and dataTypeRow[col].lower() == 'boolean':
-                                        self.SetCellEditor(row, col, gridlib.GridCellBoolEditor())
-                                        self.SetCellRenderer(row, col, CheckBoxCellRenderer(self))
-                                        self.SetCellValue(row, col, str(colValue))
-                                        self.SetCellAlignment(row, col, wx.ALIGN_RIGHT, wx.ALIGN_CENTRE)
-#                                     elif dataTypeRow and dataTypeRow[col] in ['varchar', 'int']:
-                                    else:                               
-#                                     self.SetCellFont(dataKey - 1, idx,  wx.Font(10, wx.FONTFAMILY_ROMAN, wx.FONTSTYLE_ITALIC, wx.FONTWEIGHT_NORMAL))
-#                                     self.SetCellTextColour(dataKey - 1, idx,wx.LIGHT_GREY)
-                                        self.SetCellValue(row, col, str(colValue))
-#                                 self.SetCellAlignment(dataKey - 1,idx, wx.ALIGN_RIGHT)
-                            except Exception as e:
-                                logger.error(e, exc_info=True)
-            else:
-                numCols = self.GetNumberCols()
-                numRows = self.GetNumberRows()
-                logger.debug("numRows:%s, numCol: %s", numRows, numCols)
-                if numRows > 0 and numCols > 0:
-                    self.DeleteCols(pos=0, numCols=numCols, updateLabels=True)
-                    self.DeleteRows(pos=0, numRows=numRows, updateLabels=True)
-        except Exception as e:
-            logger.error(e, exc_info=True)
-        self.Refresh()
-#         self.SetColSize(0, 150)
-#         self.SetColSize(1, 150)
-#         self.SetColSize(2, 150)
+        '''
+        @param data: ResultSet
+        '''
+        self.resultTable.setResultSet(data)
+        self.updateFilterChips()
+
+    def addResultCursor(self, resultCursor=None):
+        '''
+        Shows first page of a streaming result. Following pages are fetched
+        when grid is scrolled to the last row.
+        @param resultCursor: ResultCursor
+        '''
+        if self.resultCursor and self.resultCursor is not resultCursor:
+            self.resultCursor.close()
+        self.resultCursor = resultCursor
+        self.queryJob = None
+        resultSet = None
+        if resultCursor and resultCursor.isResultSet():
+            resultSet = ResultSet(headers=resultCursor.headers, columnTypes=resultCursor.columnTypes)
+            resultSet.appendRows(resultCursor.fetchPage())
+        self.resultTable.setResultSet(resultSet)
+        self.updateFilterChips()
+        self.updateRowCountStatus()
+
+    def getQueryJob(self):
+        return self.queryJob
+
+    def addQueryResult(self, queryJob=None, rows=None, pageRequester=None):
+        '''
+        Shows first batch of rows of a statement running on QueryExecutor.
+        @param pageRequester: callable(queryJob) requesting next batch, rows are
+            delivered with appendQueryRows.
+        '''
+        if self.resultCursor:
+            self.resultCursor.close()
+            self.resultCursor = None
+        self.queryJob = queryJob
+        self.pageRequester = pageRequester
+        self.pageRequested = False
+        resultSet = None
+        if queryJob and queryJob.isResultSet():
+            resultSet = ResultSet(headers=queryJob.headers, columnTypes=queryJob.columnTypes)
+            resultSet.appendRows(rows if rows else list())
+        self.resultTable.setResultSet(resultSet)
+        self.updateFilterChips()
+        self.updateRowCountStatus()
+
+    def appendQueryRows(self, rows=None):
+        self.pageRequested = False
+        if rows:
+            self.resultTable.appendResultRows(rows)
+            self.updateFilterChips()
+        self.updateRowCountStatus()
+
+    def fetchNextPage(self):
+        '''
+        Appending next page of rows from result cursor to the grid.
+        '''
+        if self.queryJob:
+            if self.pageRequester and not self.pageRequested and self.queryJob.hasMoreRows():
+                self.pageRequested = True
+                self.pageRequester(self.queryJob)
+            return
+        if not self.resultCursor or not self.resultCursor.hasMoreRows():
+            return
+        self.resultTable.appendResultRows(self.resultCursor.fetchPage())
+        self.updateFilterChips()
+        self.updateRowCountStatus()
+
+    def hasMoreRows(self):
+        if self.queryJob:
+            return self.queryJob.hasMoreRows()
+        return self.resultCursor is not None and self.resultCursor.hasMoreRows()
+
+    def updateRowCountStatus(self):
+        parent = self.GetParent()
+        if hasattr(parent, 'bottomResultToolbar'):
+            countText = f'Count: {self.GetNumberRows()}'
+            if self.hasMoreRows():
+                countText = f'Count: {self.GetNumberRows()}+ (more rows available)'
+            parent.bottomResultToolbar.SetStatusText(countText)
+
+    def onScrollWin(self, event):
+        event.Skip()
+        wx.CallAfter(self.fetchNextPageIfNeeded)
+
+    def onSelectCell(self, event):
+        event.Skip()
+        if event.GetRow() >= self.GetNumberRows() - 1:
+            wx.CallAfter(self.fetchNextPage)
+
+    def fetchNextPageIfNeeded(self):
+        if not self.hasMoreRows():
+            return
+        scrollRange = self.GetScrollRange(wx.VERTICAL)
+        scrollEnd = self.GetScrollPos(wx.VERTICAL) + self.GetScrollThumb(wx.VERTICAL)
+        if scrollEnd >= scrollRange:
+            self.fetchNextPage()
 
     def selection(self):
         # Show cell selection
@@ -508,6 +778,7 @@ class ResultDataGrid(gridlib.Grid):
                 text4undo += \
                     str(self.GetCellValue(rowstart + r, colstart + c)) + '\t'
                 self.SetCellValue(rowstart + r, colstart + c, '')
+                self.notifyCellChange(rowstart + r, colstart + c, '')
 
             text4undo = text4undo[:-1] + '\n'
 
@@ -579,6 +850,7 @@ class ResultDataGrid(gridlib.Grid):
             for c in r.split('\t'):
                 x = x + 1
                 self.SetCellValue(self.GetGridCursorRow() + y, self.GetGridCursorCol() + x, c)
+                self.notifyCellChange(self.GetGridCursorRow() + y, self.GetGridCursorCol() + x, c)
 
     #----------------------------------------------------------------------
     def onCellEdit(self, event):
@@ -755,7 +1027,13 @@ class ResultDataGrid(gridlib.Grid):
         x = self.GetColSize(col) / 2
         menu = wx.Menu()
         copyHeaderId = wx.NewIdRef()
-        sortID = wx.NewIdRef()
+        sortAscendingID = wx.NewIdRef()
+        sortDescendingID = wx.NewIdRef()
+        thenSortAscendingID = wx.NewIdRef()
+        thenSortDescendingID = wx.NewIdRef()
+        clearSortID = wx.NewIdRef()
+        filterID = wx.NewIdRef()
+        groupCountsID = wx.NewIdRef()
 
         xo, yo = evt.GetPosition()
         self.SelectCol(col)
@@ -767,9 +1045,17 @@ class ResultDataGrid(gridlib.Grid):
         copyHeaderItem.SetBitmap(self.fileOperations.getImageBitmap(imageName="copy_edit_co.png"))
         copyHeaderMenu = menu.Append(copyHeaderItem)
 
-        sortHeaderItem = wx.MenuItem(menu, sortID, "Sort Column")
+        sortHeaderItem = wx.MenuItem(menu, sortAscendingID, "Sort Ascending")
         sortHeaderItem.SetBitmap(self.fileOperations.getImageBitmap(imageName="sort.png"))
         sortHeaderMenu = menu.Append(sortHeaderItem)
+        menu.Append(sortDescendingID, "Sort Descending")
+        if self.resultTable.resultView.sortColumns:
+            menu.Append(thenSortAscendingID, "Then Sort Ascending")
+            menu.Append(thenSortDescendingID, "Then Sort Descending")
+            menu.Append(clearSortID, "Clear Sort")
+        menu.AppendSeparator()
+        menu.Append(filterID, "Filter Column...")
+        menu.Append(groupCountsID, "Group Counts")
 
 #         menu.Append(copyHeaderId, "Copy Selected Header")
 #         menu.Append(sortID, "Sort Column")
@@ -789,10 +1075,15 @@ class ResultDataGrid(gridlib.Grid):
             logger.info('TODO delete')
             self.Reset()
 
-        def sort(event, self=self, col=col):
-            logger.info(f'TODO started sorting{col}: {self.IsSortOrderAscending()} :{self.GetSortingColumn()}')
-            self.IsSortOrderAscending()
-            self.SetSortingColumn(col, ascending=True)
+        def sort(event, self=self, col=col, ascending=True, append=False):
+            logger.info(f'sorting {col} ascending: {ascending} append: {append}')
+            self.sortColumn(col, ascending=ascending, append=append)
+
+        def filterColumn(event, self=self, col=col, header=header):
+            dlg = wx.TextEntryDialog(self, 'Show rows where column contains:', f'Filter {header}')
+            if dlg.ShowModal() == wx.ID_OK and dlg.GetValue():
+                self.addFilter(ResultFilter(col, 'contains', dlg.GetValue()))
+            dlg.Destroy()
 
 #             self._table.SortColumn(col)
 #             self.Reset()
@@ -811,7 +1102,13 @@ class ResultDataGrid(gridlib.Grid):
         self.Bind(wx.EVT_MENU, copyColumnName, id=copyHeaderId)
 
         if len(cols) == 1:
-            self.Bind(wx.EVT_MENU, lambda e:sort(e, col=cols[0]), id=sortID)
+            self.Bind(wx.EVT_MENU, lambda e:sort(e, col=cols[0]), id=sortAscendingID)
+            self.Bind(wx.EVT_MENU, lambda e:sort(e, col=cols[0], ascending=False), id=sortDescendingID)
+            self.Bind(wx.EVT_MENU, lambda e:sort(e, col=cols[0], append=True), id=thenSortAscendingID)
+            self.Bind(wx.EVT_MENU, lambda e:sort(e, col=cols[0], ascending=False, append=True), id=thenSortDescendingID)
+            self.Bind(wx.EVT_MENU, lambda e:filterColumn(e, col=cols[0]), id=filterID)
+            self.Bind(wx.EVT_MENU, lambda e:self.showGroupCounts(cols[0]), id=groupCountsID)
+        self.Bind(wx.EVT_MENU, lambda e:self.clearSort(), id=clearSortID)
 
         self.PopupMenu(menu)
         menu.Destroy()
@@ -822,6 +1119,7 @@ class ResultDataGrid(gridlib.Grid):
         """
         Create and display a popup menu on right-click event
         """
+        self.SetGridCursor(event.GetRow(), event.GetCol())
         menu = GridCellPopupMenu(self)
         self.PopupMenu(menu, event.GetPosition())
         menu.Destroy()
@@ -853,6 +1151,14 @@ class GridCellPopupMenu(wx.Menu):
         resultSetCountItemMenu = self.Append(resultSetCountItem)
         self.Bind(wx.EVT_MENU, self.countRows, resultSetCountItemMenu)
 
+        self.AppendSeparator()
+        filterItemMenu = self.Append(wx.NewIdRef(), "Filter by Value")
+        self.Bind(wx.EVT_MENU, lambda e: self.onFilterByValue(e, operator='='), filterItemMenu)
+        excludeItemMenu = self.Append(wx.NewIdRef(), "Exclude Value")
+        self.Bind(wx.EVT_MENU, lambda e: self.onFilterByValue(e, operator='!='), excludeItemMenu)
+        clearFiltersItemMenu = self.Append(wx.NewIdRef(), "Clear Filters")
+        self.Bind(wx.EVT_MENU, lambda e: self.GetWindow().clearFilters(), clearFiltersItemMenu)
+
     def onPasteSelection(self, event):
         logger.info('onPasteSelection')
         self.GetWindow().paste()
@@ -865,8 +1171,12 @@ class GridCellPopupMenu(wx.Menu):
 
     def onExport(self, event):
         logger.info('onExport')
-#         print "Item Two selected in the %s window" % self.WinName
-        pass
+        self.GetWindow().exportResult()
+
+    def onFilterByValue(self, event, operator='='):
+        grid = self.GetWindow()
+        logger.info(f'onFilterByValue: {operator}')
+        grid.filterByCell(grid.GetGridCursorRow(), grid.GetGridCursorCol(), operator=operator)
 
     def countRows(self, event):
         logger.info(f'countRows: {self.GetWindow().GetNumberRows()}')
@@ -947,14 +1257,8 @@ class TestFrame(wx.Frame):
         resultDataGrid = ResultDataGrid(self)
         buf = open("user_1.png", "rb").read()
         blobData = io.BytesIO(buf)
-        data = {
-            -1: ('int', 'varchar', 'varchar', 'blob'),
-            0: ('ID', 'PICTURE', 'TYPE', 'FILE_NAME'),
-            1: (1, None, u'.jpg', blobData),
-            2: (2, None, u'.jpg', blobData),
-            3: (3, None, u'.jpg', blobData),
-            4: (4, None, u'.jpg', blobData)
-            }
+        data = ResultSet.fromRows(headers=('ID', 'PICTURE', 'TYPE', 'FILE_NAME'), columnTypes=('int', 'varchar', 'varchar', 'blob'),
+                                  rows=[(idx, None, u'.jpg', blobData) for idx in range(1, 5)])
         resultDataGrid.addData(data)
 
 
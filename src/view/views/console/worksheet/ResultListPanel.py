@@ -3,6 +3,7 @@ import wx
 import wx.dataview as dv
 from src.view.views.console.worksheet.sql.SqlQuery import SqlQueryFrame
 from src.view.views.console.worksheet.ResultGrid import ResultDataGrid
+from src.view.views.console.worksheet.FilterChipBar import FilterChipBar
 from src.view.util.FileOperationsUtil import FileOperations
 from wx import ITEM_CHECK
 try:
@@ -303,10 +304,12 @@ class CreatingResultWithToolbarPanel(wx.Panel):
 #         self.bottomResultToolbar = self.constructBottomResultToolBar()
 #         self.resultPanel = ResultPanel(self, data=self.getData())
         self.resultPanel = ResultDataGrid(self, data=self.getData())
+        self.filterChipBar = FilterChipBar(self, grid=self.resultPanel)
 #         bottomResultToolbar = self.constructBottomResultToolBar()
 
         ####################################################################
         vBox.Add(self.topResultToolbar , 0, wx.EXPAND | wx.ALL, 0)
+        vBox.Add(self.filterChipBar , 0, wx.EXPAND | wx.ALL, 0)
         vBox.Add(self.resultPanel , 1, wx.EXPAND | wx.ALL, 0)
         vBox.Add(self.bottomResultToolbar , 0, wx.EXPAND | wx.ALL, 0)
 #         vBox.Add(bottomResultToolbar , 0, wx.EXPAND | wx.ALL, 0)
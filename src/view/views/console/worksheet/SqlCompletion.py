@@ -0,0 +1,237 @@
+'''
+Created on 18-Oct-2026
+
+@author: vijay
+'''
+import re
+from collections import OrderedDict
+import sqlparse
+from sqlparse import tokens as T
+import logging.config
+from src.view.constants import LOG_SETTINGS
+
+logging.config.dictConfig(LOG_SETTINGS)
+logger = logging.getLogger('extensive')
+
+# statement separators outside of string literals, quoted names and comments.
+# Unterminated literals and comments run to the end of the buffer as they do for sqlite.
+STATEMENT_SEPARATOR_PATTERN = re.compile(rb"""'[^']*(?:''[^']*)*'?|"[^"]*(?:""[^"]*)*"?|`[^`]*`?|\[[^\]]*\]?|--[^\n]*|/\*.*?(?:\*/|\Z)|;""", re.DOTALL)
+WORD_PATTERN = re.compile(r'[\w$]*$')
+QUALIFIER_PATTERN = re.compile(r'(`[^`]+`|"[^"]+"|\[[^\]]+\]|[\w$]+)\.$')
+TOKEN_CACHE_SIZE = 32
+TABLE_KEYWORDS = ('FROM', 'JOIN', 'UPDATE', 'INTO', 'TABLE')
+COLUMN_KEYWORDS = ('SELECT', 'WHERE', 'ON', 'AND', 'OR', 'NOT', 'BY', 'SET', 'HAVING', 'DISTINCT', 'CASE', 'WHEN', 'THEN', 'ELSE', 'USING')
+DEFAULT_ADVICE = ("select * from ", "create table Table_1 ( id number); ", "desc ")
+# images registered by SqlStyleTextCtrl.registerAllImages
+TABLE_IMAGE = 2
+COLUMN_IMAGE = 3
+
+
+def getKeyword(token):
+    return ' '.join(token.value.upper().split())
+
+
+def unquoteName(name):
+    if name and name[0] in '"`[':
+        return name[1:-1]
+    return name
+
+
+class StatementTokenizer():
+    '''
+    Finds the statement around the caret without lexing the whole buffer.
+
+    Separator positions are byte offsets of the Scintilla buffer. They are
+    valid up to validUpTo, an edit drops the separators at and after the
+    edited position and lexing resumes from the last separator before it,
+    where the lexer is known to be outside of literals and comments. Lexing
+    stops at the first separator after the caret, the rest of the buffer is
+    lexed when the caret gets there.
+
+    Parsed tokens are cached per statement text, moving the caret inside a
+    statement parses nothing.
+
+    @param getTextRange: callable(start, end) returning bytes of the buffer
+    @param getLength: callable returning length of the buffer in bytes
+    '''
+
+    def __init__(self, getTextRange=None, getLength=None):
+        self.getTextRange = getTextRange
+        self.getLength = getLength
+        self.separators = list()
+        self.validUpTo = 0
+        self.tokenCache = OrderedDict()
+
+    def onModified(self, position=0):
+        '''
+        text was inserted or deleted at position.
+        '''
+        while self.separators and self.separators[-1] >= position:
+            self.separators.pop()
+        self.validUpTo = self.separators[-1] + 1 if self.separators else 0
+
+    def reset(self):
+        self.onModified(0)
+
+    def lexUntil(self, position=0):
+        '''
+        lex from validUpTo until the first separator at or after position.
+        '''
+        if self.separators and self.separators[-1] >= position:
+            return
+        length = self.getLength()
+        if self.validUpTo >= length:
+            return
+        text = self.getTextRange(self.validUpTo, length)
+        offset = self.validUpTo
+        for match in STATEMENT_SEPARATOR_PATTERN.finditer(text):
+            if match.group() == b';':
+                separator = offset + match.start()
+                self.separators.append(separator)
+                self.validUpTo = separator + 1
+                if separator >= position:
+                    return
+        self.validUpTo = length
+
+    def getStatementBounds(self, position=0):
+        '''
+        @return: (start, end) byte offsets of the statement containing position
+        '''
+        self.lexUntil(position)
+        start, end = 0, None
+        for separator in reversed(self.separators):
+            if separator < position:
+                start = separator + 1
+                break
+            end = separator
+        if end is None:
+            end = self.getLength() if self.validUpTo >= self.getLength() else self.validUpTo
+        return start, end
+
+    def getStatement(self, position=0):
+        '''
+        @return: (statement text, caret offset in statement text)
+        '''
+        start, end = self.getStatementBounds(position)
+        statement = self.getTextRange(start, end)
+        before = statement[:position - start].decode('utf-8', errors='replace')
+        after = statement[position - start:].decode('utf-8', errors='replace')
+        return before + after, len(before)
+
+    def getTokens(self, sqlText=None):
+        '''
+        @return: non whitespace, non comment tokens of sqlText
+        '''
+        tokens = self.tokenCache.get(sqlText)
+        if tokens is None:
+            parsed = sqlparse.parse(sqlText)
+            tokens = [token for statement in parsed for token in statement.flatten() if not token.is_whitespace and token.ttype not in T.Comment]
+            self.tokenCache[sqlText] = tokens
+            while len(self.tokenCache) > TOKEN_CACHE_SIZE:
+                self.tokenCache.popitem(last=False)
+        else:
+            self.tokenCache.move_to_end(sqlText)
+        return tokens
+
+
+class SqlCompleter():
+    '''
+    Completion candidates at the caret from the statement around it and a
+    SchemaCatalog: tables and views after FROM, JOIN, UPDATE and INTO,
+    columns of the statement's tables and their aliases after SELECT, WHERE,
+    ON, BY and SET, columns of one table after its name or alias and a dot.
+
+    @param tokenizer: StatementTokenizer of the editor
+    '''
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer
+
+    def getAdvice(self, position=0, catalog=None):
+        '''
+        @return: (advice list, length of the word already typed)
+        '''
+        sqlText, caret = self.tokenizer.getStatement(position)
+        beforeCaret = sqlText[:caret]
+        word = WORD_PATTERN.search(beforeCaret).group()
+        beforeWord = beforeCaret[:len(beforeCaret) - len(word)]
+        tableNames = self.getTableNames(catalog)
+        aliases = self.getAliases(self.tokenizer.getTokens(sqlText), tableNames)
+
+        qualifier = QUALIFIER_PATTERN.search(beforeWord)
+        if qualifier:
+            tableName = aliases.get(unquoteName(qualifier.group(1)).lower())
+            advice = self.getColumnAdvice(catalog, [tableName] if tableName else [])
+        else:
+            names = set(aliases) | {columnName.split('?')[0].lower() for columnName in self.getColumnAdvice(catalog, tableNames.values())}
+            keyword = self.getPreviousKeyword(self.tokenizer.getTokens(beforeWord), names)
+            if keyword in TABLE_KEYWORDS or (keyword and keyword.endswith(' JOIN')):
+                advice = [f'{name}?{TABLE_IMAGE}' for name in tableNames.values()]
+            elif keyword in COLUMN_KEYWORDS or (keyword and keyword.endswith(' BY')):
+                referenced = list(OrderedDict.fromkeys(aliases.values())) or list(tableNames.values())
+                advice = [f'{alias}?{TABLE_IMAGE}' for alias, tableName in aliases.items() if alias != tableName.lower()]
+                advice += self.getColumnAdvice(catalog, referenced)
+            else:
+                advice = list(DEFAULT_ADVICE)
+        if word:
+            matching = [item for item in advice if item.lower().startswith(word.lower())]
+            advice = matching or advice
+        return advice, len(word.encode('utf-8'))
+
+    def getTableNames(self, catalog=None):
+        '''
+        @return: dict of lower case name to table or view name
+        '''
+        if catalog is None:
+            return dict()
+        return {name.lower(): name for name in sorted(catalog.getTableNames() + catalog.getViewNames(), key=str.lower)}
+
+    def getAliases(self, tokens=None, tableNames=None):
+        '''
+        tables named after FROM, JOIN and UPDATE, by their alias and by their own name.
+        @return: dict of lower case alias to table name
+        '''
+        aliases = OrderedDict()
+        inFrom = False
+        for index, token in enumerate(tokens[:-1]):
+            if token.is_keyword:
+                keyword = getKeyword(token)
+                inFrom = keyword in ('FROM', 'JOIN', 'UPDATE') or keyword.endswith(' JOIN')
+                if not inFrom:
+                    continue
+            elif not (inFrom and token.ttype in T.Punctuation and token.value == ','):
+                # comma separated tables of FROM
+                continue
+            nameIndex = index + 1
+            # schema qualified name
+            if nameIndex + 2 < len(tokens) and tokens[nameIndex + 1].value == '.':
+                nameIndex += 2
+            tableName = tableNames.get(unquoteName(tokens[nameIndex].value).lower())
+            if tableName is None:
+                continue
+            aliases[tableName.lower()] = tableName
+            aliasIndex = nameIndex + 1
+            if aliasIndex < len(tokens) and tokens[aliasIndex].is_keyword and getKeyword(tokens[aliasIndex]) == 'AS':
+                aliasIndex += 1
+            if aliasIndex < len(tokens) and tokens[aliasIndex].ttype in (T.Name, T.String.Symbol):
+                aliases[unquoteName(tokens[aliasIndex].value).lower()] = tableName
+        return aliases
+
+    def getPreviousKeyword(self, tokens=None, names=None):
+        '''
+        a comma continues the list of the keyword before it. Column names
+        like date or data are keyword tokens to sqlparse, they are skipped.
+        '''
+        for token in reversed(tokens):
+            if token.is_keyword and not (token.ttype is T.Keyword and token.value.lower() in names):
+                return getKeyword(token)
+        return None
+
+    def getColumnAdvice(self, catalog=None, tableNames=None):
+        if catalog is None:
+            return list()
+        columnNames = OrderedDict()
+        for tableName in tableNames:
+            for column in catalog.getColumns(tableName):
+                columnNames.setdefault(column.name, None)
+        return [f'{columnName}?{COLUMN_IMAGE}' for columnName in columnNames]
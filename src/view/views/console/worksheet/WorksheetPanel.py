@@ -13,7 +13,8 @@ except ImportError: # if it's not there locally, try the wxPython lib.
     import wx.lib.agw.aui as aui
     from wx.lib.agw.aui import aui_switcherdialog as ASD
 
-from src.view.constants import ID_RUN, ID_TEXTCTRL_AUTO_COMPLETE, ID_SQL_LOG
+from src.view.constants import ID_RUN, ID_TEXTCTRL_AUTO_COMPLETE, ID_SQL_LOG, \
+    ID_CANCEL_QUERY, ID_EXPORT_QUERY, ID_EXPLAIN_QUERY
 from wx import ID_SPELL_CHECK
 from src.view.views.console.worksheet.EditorPanel import CreatingEditorPanel
 from src.view.views.console.worksheet.ResultListPanel import CreateResultSheetTabPanel
@@ -317,6 +318,9 @@ class CreatingWorksheetWithToolbarPanel(wx.Panel):
 
         tb1.AddSimpleTool(ID_RUN, "Run", self.fileOperations.getImageBitmap("webinar.png"), short_help_string="Run   (Ctrl+Enter)")
         tb1.AddSimpleTool(ID_executeScript, "Run Script  F9", self.fileOperations.getImageBitmap("sql_script_exec.png"), short_help_string="Run Script  F9")
+        tb1.AddSimpleTool(ID_CANCEL_QUERY, "Cancel", self.fileOperations.getImageBitmap("progress_stop.png"), short_help_string="Cancel running query")
+        tb1.AddSimpleTool(ID_EXPORT_QUERY, "Export query", self.fileOperations.getImageBitmap("table_export.png"), short_help_string="Export query result to file")
+        tb1.AddSimpleTool(ID_EXPLAIN_QUERY, "Explain / Profile", self.fileOperations.getImageBitmap("sql_plan.png"), short_help_string="Explain query plan and profile query")
         tb1.AddSeparator()
         tb1.AddSimpleTool(ID_SPELL_CHECK, "Spelling check", self.fileOperations.getImageBitmap("abc.png"), short_help_string="Spelling check")
 
@@ -335,9 +339,24 @@ class CreatingWorksheetWithToolbarPanel(wx.Panel):
 
     def bindingEvent(self):
         self.Bind(wx.EVT_MENU, self.executeSQL, id=ID_RUN)
+        self.Bind(wx.EVT_MENU, self.cancelQuery, id=ID_CANCEL_QUERY)
+        self.Bind(wx.EVT_MENU, self.exportQuery, id=ID_EXPORT_QUERY)
+        self.Bind(wx.EVT_MENU, self.explainQuery, id=ID_EXPLAIN_QUERY)
         self.Bind(wx.EVT_MENU, self.onSpellCheck, id=ID_SPELL_CHECK)
         self.Bind(wx.EVT_MENU, self.onSqlLog, id=ID_SQL_LOG)
 
+    def cancelQuery(self, event):
+        logger.debug('CreatingWorksheetWithToolbarPanel.cancelQuery')
+        self.worksheetPanel.editorPanel.sstc.cancelQuery()
+
+    def exportQuery(self, event):
+        logger.debug('CreatingWorksheetWithToolbarPanel.exportQuery')
+        self.worksheetPanel.editorPanel.sstc.exportQuery()
+
+    def explainQuery(self, event):
+        logger.debug('CreatingWorksheetWithToolbarPanel.explainQuery')
+        self.worksheetPanel.editorPanel.sstc.explainQuery()
+
     def executeSQL(self, event):
         logger.debug('CreatingWorksheetWithToolbarPanel.executeSQL')
         self.GetTopLevelParent()
@@ -1,11 +1,17 @@
 import wx
+import wx.grid as gridlib
 
 import logging.config
-from src.view.constants import  LOG_SETTINGS, ID_ADD_ROW, ID_DUPLICATE_ROW, ID_DELETE_ROW, ID_SAVE_ROW, ID_REFRESH_ROW
+from src.view.constants import  LOG_SETTINGS, ID_ADD_ROW, ID_DUPLICATE_ROW, ID_DELETE_ROW, ID_SAVE_ROW, ID_REFRESH_ROW, \
+    ID_FIRST_RESULT, ID_PREVIOUS_RESULT, ID_NEXT_RESULT, ID_LAST_RESULT
 from src.view.util.FileOperationsUtil import FileOperations
 from src.sqlite_executer.ConnectExecuteSqlite import SQLExecuter, ManageSqliteDatabase
+from src.sqlite_executer.ResultSet import ResultSet
+from src.sqlite_executer.TablePager import TablePager
+from src.sqlite_executer.ChangeTracker import ChangeTracker
 from src.view.util.parsingUtil import SqlParser
 from src.view.views.console.worksheet.ResultGrid import ResultDataGrid
+from src.view.views.console.worksheet.FilterChipBar import FilterChipBar
 from src.view.views.console.SqlOutputPanel import SqlConsoleOutputPanel
 try:
     from agw import aui
@@ -26,7 +32,7 @@ Columns Tab:
 Indexes Tab:
     Index Name, Table, Index Type, Ascending, Unique, Qualifier, Cardinality, Index Description
 Data Tab:
-    Table data with 20 row.
+    Table data one page at a time, keyset paged by TablePager.
 
 References Tab:
     Name , Owner, Ref Table, Type, Ref Object, On Delete, On Update, Deferability
@@ -140,7 +146,9 @@ class CreatingTableInfoToolbarPanel(wx.Panel):
         self.tabName = kw['tabName']
         self.dataSourceTreeNode = kw['dataSourceTreeNode']
         self.data = list()
-        self.sqlList = dict()
+        self.tablePager = None
+        self.changeTracker = None
+        self.rowCountEstimate = None
         vBox = wx.BoxSizer(wx.VERTICAL)
         logger.debug(kw)
         ####################################################################
@@ -150,14 +158,19 @@ class CreatingTableInfoToolbarPanel(wx.Panel):
 #         self.topResultToolbar = self.constructTopResultToolBar()
         self.bottomResultToolbar = wx.StatusBar(self)
         self.resultPanel, self.toolbar = self.getPanelByTabName(tableName=kw['tableName'], tabName=kw['tabName'])
+        self.filterChipBar = FilterChipBar(self, grid=self.resultPanel)
 #         self.resultPanel = ResultPanel(self, data=None)
-        self.bottomResultToolbar.SetStatusText("some text")
+        if self.tablePager:
+            self.updatePageStatus()
+        else:
+            self.bottomResultToolbar.SetStatusText("some text")
 #         self.bottomResultToolbar = self.constructBottomResultToolBar()
 #         self.resultPanel = ResultDataGrid(self, data=self.getData())
 #         bottomResultToolbar = self.constructBottomResultToolBar()
         
         ####################################################################
         vBox.Add(self.toolbar , 0, wx.EXPAND | wx.ALL, 0)
+        vBox.Add(self.filterChipBar , 0, wx.EXPAND | wx.ALL, 0)
 #         vBox.Add(self.resultPanel , 1, wx.EXPAND | wx.ALL, 0)
         vBox.Add(self.resultPanel , 1, wx.EXPAND | wx.ALL)
         vBox.Add(self.bottomResultToolbar , 0, wx.EXPAND | wx.ALL, 0)
@@ -175,6 +188,10 @@ class CreatingTableInfoToolbarPanel(wx.Panel):
         tb1.SetToolBitmapSize(wx.Size(42, 42))
 
         if tabName == 'Data':
+            self.pageNumberCtrl = wx.TextCtrl(tb1, -1, '1', size=(60, -1), style=wx.TE_PROCESS_ENTER | wx.TE_RIGHT)
+            self.pageNumberCtrl.SetToolTip('Jump to page')
+            self.pageNumberCtrl.Bind(wx.EVT_TEXT_ENTER, self.onJumpToPage)
+            self.pageCountText = wx.StaticText(tb1, -1, '/ 1')
             tools = [
                 (ID_SAVE_ROW, "Save", "save_to_database.png", 'Save (Ctrl+S)', self.onSave),
                 (),
@@ -182,10 +199,19 @@ class CreatingTableInfoToolbarPanel(wx.Panel):
                 (ID_ADD_ROW, "Add a new row", "row_add.png", 'Add a new row', self.onAddRow),
                 (ID_DUPLICATE_ROW, "Duplicate selected row", "row_copy.png", 'Duplicate selected row', self.onDuplicateRow),
                 (ID_DELETE_ROW, "Delete selected row", "row_delete.png", 'Delete selected row', self.onDeleteRow),
+                (),
+                (ID_FIRST_RESULT, "First page", "resultset_first.png", 'First page', self.onFirstPage),
+                (ID_PREVIOUS_RESULT, "Previous page", "resultset_previous.png", 'Previous page', self.onPreviousPage),
+                ('control', self.pageNumberCtrl),
+                ('control', self.pageCountText),
+                (ID_NEXT_RESULT, "Next page", "resultset_next.png", 'Next page', self.onNextPage),
+                (ID_LAST_RESULT, "Last page", "resultset_last.png", 'Last page', self.onLastPage),
                 ]
             for tool in tools:
                 if len(tool) == 0:
                     tb1.AddSeparator()
+                elif len(tool) == 2:
+                    tb1.AddControl(tool[1])
                 else:
                     logger.debug(tool)
                     toolItem = tb1.AddSimpleTool(tool[0], tool[1], self.fileOperations.getImageBitmap(imageName=tool[2]), short_help_string=tool[3])
@@ -208,236 +234,163 @@ class CreatingTableInfoToolbarPanel(wx.Panel):
 
     def onSave(self, event):
         logger.debug('onSave')
-        
-        # finding rows to be updated
-        originalData = self.resultPanel.getData()
-        for row in range(self.resultPanel.GetNumberRows()):
-            rowMatch = True
-            rowPresent = False
-            for col in range(self.resultPanel.GetNumberCols()):
-                newVal = self.resultPanel.GetCellValue(row, col)
-                if row + 1 in originalData:
-                    rowPresent = True
-                    originalValue = originalData[row + 1][col]
-                    if '-______-NULL' == originalValue:
-                        originalValue = originalValue.replace('-______-', '')
-                    if str(originalValue) != newVal:
-                        rowMatch = False
-                        break
-                else:
-                    rowPresent = False
-            if rowPresent and not rowMatch:
-                newData = [self.resultPanel.GetCellValue(row, col) for col in range(self.resultPanel.GetNumberCols())]
-                columnClauseForUpdate = self.getColumnClauseForUpdate(newData=newData)
-                whereClause = self.getWhereClause(originalData[row + 1])
-                sql = f"UPDATE '{self.dataSourceTreeNode.nodeLabel}' SET {columnClauseForUpdate} WHERE {whereClause} ;"
-                self.sqlList[row] = {
-                                    'sql':sql,
-                                    'dml':'UPDATE',
-                                    'tableName':self.dataSourceTreeNode.nodeLabel,
-                                    'columns':self.dataSourceTreeNode.sqlType.columns,
-                                    'newValues':newData,
-                                    'oldValues':originalData[row + 1]
-                                    }
-            elif not rowPresent:
-                newData = [self.resultPanel.GetCellValue(row, col) for col in range(self.resultPanel.GetNumberCols())]
-                self.sqlList.get(row)['values']=newData
-        db = ManageSqliteDatabase(connectionName=self.dataSourceTreeNode.dataSource.connectionName, databaseAbsolutePath=self.dataSourceTreeNode.dataSource.filePath)
-        for row, sqlListRow in self.sqlList.items():
-            sql = self.getSql(sqlListRow).get('sql')
-            db.executeText(sql)
-        self.sqlList = dict()
-# #         sqlText = self.generateSql()
-#         db = ManageSqliteDatabase(connectionName=self.dataSourceTreeNode.dataSource.connectionName, databaseAbsolutePath=self.dataSourceTreeNode.dataSource.filePath)
-# #         db.executeText(sqlText)
-#         
-#         originalData = self.resultPanel.getData()
-#         originalDataSet = set()
-#         for k, v in originalData.items():
-#             if k > 0:
-#                 originalDataSet.add(tuple([str(x) for x in v]))
-#         
-#         newData = set()
-#         
-#         for row in range(self.resultPanel.GetNumberRows()):
-#             newRow = []
-#             for col in range(self.resultPanel.GetNumberCols()):
-#                 val = self.resultPanel.GetCellValue(row, col)
-#                 if self.resultPanel.GetCellTextColour(row, col) == wx.LIGHT_GREY and val in ('NULL', 'BLOB'):
-#                     newRow.append(f'-______-{val}')
-#                 else:
-#                     newRow.append(self.resultPanel.GetCellValue(row, col))
-#             newData.add(tuple(newRow))
-#         
-#         sql = self.generateSql(oldDataSet=originalDataSet, newDataSet=newData)
-#         print(sql)
+        if not self.changeTracker:
+            return
+        self.resultPanel.SaveEditControlValue()
+        if not self.changeTracker.hasChanges():
+            return
+        saveResult = self.changeTracker.save()
+        if saveResult.error:
+            self.bottomResultToolbar.SetStatusText(str(saveResult))
+            return
+        self.showTablePage(self.tablePager.refresh)
+        self.bottomResultToolbar.SetStatusText(str(saveResult))
+
+    def onCellValueChanged(self, row, col, value):
+        if self.changeTracker and row < len(self.changeTracker.rows) and col < len(self.changeTracker.headers):
+            self.changeTracker.setValue(row, col, value)
 
     def onRefresh(self, event):
         logger.debug('onRefresh')
-        self.sqlList = dict()
-        db = ManageSqliteDatabase(connectionName=self.dataSourceTreeNode.dataSource.connectionName, databaseAbsolutePath=self.dataSourceTreeNode.dataSource.filePath)
-#         result = db.sqlite_select(tableName="sqlite_master")
-        data = None
-        tableName = self.GetParent().GetParent().tableName
-        if tableName:
-            data = db.executeText(text=f"SELECT * FROM '{tableName}' LIMIT 500;")
-        if data:
-            logger.debug('setResultData count: %s', len(data.keys()))
-        self.resultPanel.addData(data)
-        self.resultPanel.Layout()
+        if self.tablePager:
+            self.rowCountEstimate = None
+            self.showTablePage(self.tablePager.refresh)
+
+    def onFirstPage(self, event):
+        self.showTablePage(self.tablePager.firstPage)
+
+    def onPreviousPage(self, event):
+        self.showTablePage(self.tablePager.previousPage)
+
+    def onNextPage(self, event):
+        self.showTablePage(self.tablePager.nextPage)
+
+    def onLastPage(self, event):
+        self.showTablePage(lambda: self.tablePager.lastPage(rowCount=self.getRowCountEstimate()))
+
+    def onJumpToPage(self, event):
+        try:
+            pageNumber = int(self.pageNumberCtrl.GetValue())
+        except ValueError:
+            pageNumber = self.tablePager.page.pageNumber if self.tablePager.page else 1
+        self.showTablePage(lambda: self.tablePager.jumpToPage(pageNumber))
+
+    def onSortColumn(self, event):
+        '''
+        Column label click sorts ascending, then descending, then by key again.
+        '''
+        col = event.GetCol()
+        if col < 0 or not self.tablePager or not self.tablePager.page:
+            return
+        columnName = self.tablePager.page.headers[col]
+        if self.tablePager.sortColumn != columnName:
+            self.tablePager.setSortColumn(columnName, descending=False)
+        elif not self.tablePager.descending:
+            self.tablePager.setSortColumn(columnName, descending=True)
+        else:
+            self.tablePager.setSortColumn(None)
+        self.showTablePage(self.tablePager.firstPage)
+
+    def showTablePage(self, pageLoader=None, grid=None):
+        '''
+        @param pageLoader: TablePager method returning the page to show
+        '''
+        if grid is None:
+            grid = self.resultPanel
+        try:
+            page = pageLoader()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            return
+        # unsaved edits of the previous page are dropped
+        self.changeTracker.trackPage(page, keyColumns=self.tablePager.keyColumns)
+        grid.addData(page.toResultSet())
+        sortColumn = self.tablePager.sortColumn
+        if sortColumn in page.headers:
+            arrow = ' \u25bc' if self.tablePager.descending else ' \u25b2'
+            grid.SetColLabelValue(page.headers.index(sortColumn), f'{sortColumn}{arrow}')
+        grid.Layout()
+        if hasattr(self, 'resultPanel'):
+            self.updatePageStatus()
+
+    def getRowCountEstimate(self):
+        if self.rowCountEstimate is None:
+            try:
+                self.rowCountEstimate = self.tablePager.estimateRowCount()
+            except Exception as e:
+                logger.error(e, exc_info=True)
+                self.rowCountEstimate = (0, False)
+        return self.rowCountEstimate[0]
+
+    def updatePageStatus(self):
+        page = self.tablePager.page
+        if page is None:
+            return
+        rowCount = self.getRowCountEstimate()
+        approximate = '' if self.rowCountEstimate[1] else '~'
+        pages = max((rowCount + self.tablePager.pageSize - 1) // self.tablePager.pageSize, page.pageNumber)
+        self.pageNumberCtrl.SetValue(str(page.pageNumber))
+        self.pageCountText.SetLabel(f'/ {approximate}{pages}')
+        firstRow = (page.pageNumber - 1) * self.tablePager.pageSize + 1
+        self.bottomResultToolbar.SetStatusText(f'Rows {firstRow} - {firstRow + len(page.rows) - 1} of {approximate}{rowCount}')
 
     def onAddRow(self, event):
         logger.debug('onAddRow')
-        logger.debug(self.resultPanel.GetNumberRows())
-#         self.newRows[self.resultPanel.GetNumberRows()+1]=list()
-#         data=self.resultPanel.getData()
-        columnsName = [column.name for column in self.dataSourceTreeNode.sqlType.columns]
-        values = 'null,' * len(columnsName)
-        values = values[:-1]
-        valuesList = values[:-1].split(',')
-        columns = "`,`".join(columnsName)
-        sql = f'''INSERT INTO '{self.dataSourceTreeNode.nodeLabel}' (`{columns}`) VALUES ({values});'''
-#         self.sqlList[self.resultPanel.GetNumberRows()] = sql
-        self.sqlList[self.resultPanel.GetNumberRows()] = {
-                                    'sql':sql,
-                                    'dml':'INSERT',
-                                    'tableName':self.dataSourceTreeNode.nodeLabel,
-                                    'columns':columns,
-                                    'values':valuesList
-                                    }
+        if not self.changeTracker:
+            return
+        self.changeTracker.appendRow()
         self.resultPanel.AppendRows(numRows=1, updateLabels=True)
-        
-        # TODO : a logic for save insert, update , delete has to go here
+
     def onDuplicateRow(self, event):
         logger.debug('onDuplicateRow')
 
     def onDeleteRow(self, event):
         seletedRows = list(self.resultPanel.GetSelectedRows())
         logger.debug(f'onDeleteRow: {seletedRows}')
-        seletedRows.sort(reverse=True)
-        originalData = self.resultPanel.getData()
-        for selectedRow in seletedRows:
-            if selectedRow in self.sqlList:
-                del self.sqlList[selectedRow]
-            elif selectedRow in originalData:
-                columnsName = [column.name for column in self.dataSourceTreeNode.sqlType.columns]
-                columns = "`,`".join(columnsName)
-                data = originalData[selectedRow + 1]
-                whereClause = self.getWhereClause(data)
-                sql = f"""DELETE FROM '{self.dataSourceTreeNode.nodeLabel}' WHERE {whereClause} ;"""
-#                 self.sqlList[selectedRow] = sql
-                self.sqlList[selectedRow] = {
-                                    'sql':sql,
-                                    'dml':'DELETE',
-                                    'tableName':self.dataSourceTreeNode.nodeLabel,
-                                    'columns':columns,
-                                    'values':data
-                                    }
-#             self.newRows.append(list())
-#             if selectedRow+1 in self.newRows: 
-#                 del self.newRows[selectedRow+1]
-            self.resultPanel.DeleteRows(pos=selectedRow, numRows=1, updateLabels=True)
-
-#         self.resultPanel.DeleteRows(pos=0, numRows=numRows, updateLabels=True)
-#         self.resultPanel.dele  
-    def getSql(self, sqlListRow): 
-        sql=None
-        columnsName = [column.name for column in self.dataSourceTreeNode.sqlType.columns]
-        columns = "`,`".join(columnsName)
-        if sqlListRow.get('dml') == 'DELETE':
-            whereClause = self.getWhereClause(sqlListRow.get('values'))
-            sql = f"""DELETE FROM '{sqlListRow.get('tableName')}' WHERE {whereClause} ;"""
-        elif sqlListRow.get('dml') == 'INSERT':
-#             columns = "`,`".join(sqlListRow.get('columns'))
-            values="','".join(sqlListRow.get('values'))
-            sql = f'''INSERT INTO '{sqlListRow.get('tableName')}' (`{sqlListRow.get('columns')}`) VALUES ('{values}');'''
-        elif sqlListRow.get('dml') == 'UPDATE':
-            columnClauseForUpdate = self.getColumnClauseForUpdate(newData=sqlListRow.get('newValues'))
-            whereClause = self.getWhereClause(sqlListRow.get('oldValues'))
-            sql = f"UPDATE '{self.dataSourceTreeNode.nodeLabel}' SET {columnClauseForUpdate} WHERE {whereClause} ;"
-        sqlListRow['sql']=sql
-        return sqlListRow   
-        
-    def getColumnClauseForUpdate(self, newData=None):
-        columnClauseForUpdate = []
-        for idx, column in enumerate(self.dataSourceTreeNode.sqlType.columns):
-            dataStr = newData[idx]
-            if '-______-NULL' == dataStr:
-                dataStr = dataStr.replace('-______-', '')
-            if column.primaryKey != 1:
-                columnClauseForUpdate.append(f" `{column.name}` = {dataStr}")
-        columnClauseForUpdateStr = ",".join(columnClauseForUpdate)     
-        
-        return columnClauseForUpdateStr
-
-    def getWhereClause(self, data):
-        whereClasue = []
-        for idx, column in enumerate(self.dataSourceTreeNode.sqlType.columns):
-            dataStr = data[idx]
-            if '-______-NULL' == dataStr:
-                dataStr = dataStr.replace('-______-', '')
-                whereClasue.append(f" `{column.name}` is {dataStr}")
-            else:
-                whereClasue.append(f" `{column.name}`={dataStr}")
-        whereClasueStr = " AND".join(whereClasue)
-        return whereClasueStr
-
-    def generateSql(self, oldDataSet=None, newDataSet=None):
-        logger.debug('generateSql')
-        intersect = oldDataSet.intersection(newDataSet)
-        insertSqlData = newDataSet - oldDataSet
-        oldPKSet = set(self.getPrimaryKeyValue(oldDataSet))
-        newPKSet = set(self.getPrimaryKeyValue(newDataSet))
-        insertPKSet = set(self.getPrimaryKeyValue(insertSqlData))
-        updatePKSet = oldPKSet.intersection(insertPKSet)
-        columnsName = [column.name for column in self.dataSourceTreeNode.sqlType.columns]
-        columns = "','".join(columnsName)
-        updateSqlDataSet = set()
-        valuesList = list()
-        for insertSqlDataRow in insertSqlData:
-            if insertSqlDataRow[0] in updatePKSet:
-                updateSqlDataSet.add(insertSqlDataRow)
-            else:
-                valuesList.append("','".join(insertSqlDataRow))
-        sqlList = list()
-        for values in valuesList: 
-            sqlList.append(f'''INSERT INTO '{self.dataSourceTreeNode.nodeLabel}' ('{columns}') VALUES ('{values}');''')
-        return '\n'.join(sqlList)
-
-    def getPrimaryKeyValue(self, oldDataSet):
-        return [str(oldData[0]) for oldData in oldDataSet]
+        # grid rows differ from tracked rows while the grid is sorted or filtered
+        sourceRows = sorted(set(self.resultPanel.getSourceRows(seletedRows)), reverse=True)
+        for sourceRow in sourceRows:
+            if self.changeTracker and sourceRow < len(self.changeTracker.rows):
+                self.changeTracker.deleteRow(sourceRow)
+        self.resultPanel.deleteSourceRows(sourceRows)
 
     def getPanelByTabName(self, tableName=None, tabName=None):
         toolbar = self.constructTopResultToolBar()
         resultPanel = wx.Panel()
-        tableData = None
         sampleData = None
         indexData = None
         referencesData = None
         triggersData = None
         sqlData = None
         db = None
+        schemaCatalog = None
         try:
 #             selectedItemText, dbFilePath = self.findingConnectionName()
             db = ManageSqliteDatabase(connectionName=self.dataSourceTreeNode.dataSource.connectionName, databaseAbsolutePath=self.dataSourceTreeNode.dataSource.filePath)
-            result = db.sqlite_select(tableName="sqlite_master")
-            for row in result:
-                # selection of table and table name
-                if row[0] == 'table' and row[1] == tableName:
-                    tableData = {
-                        0:("#", "Name", "Datatype", "PRIMARY KEY", "Nullable", "Unique", "Auto increment", "Default data", "Description")
-                    }
-                    indexData = None
-                    sqlData = row[4]
+            schemaCatalog = db.getSchemaCatalog()
+            sqlType = schemaCatalog.getSqlType(tableName)
+            if sqlType and sqlType.type == 'table':
+                sqlData = sqlType.sql
+                indexData = ResultSet.fromRows(headers=("Index Name", "Unique", "Origin", "Partial", "Columns"),
+                                               columnTypes=('VARCHAR', 'BOOLEAN', 'VARCHAR', 'BOOLEAN', 'VARCHAR'),
+                                               rows=[(indexInfo.name, indexInfo.unique, indexInfo.origin, indexInfo.partialIndex, ', '.join(str(c) for c in indexInfo.columns))
+                                                     for indexInfo in schemaCatalog.getIndexes(tableName)])
+                referencesData = ResultSet.fromRows(headers=("Name", "Column", "Ref Table", "Ref Column", "On Update", "On Delete", "Match"),
+                                                    rows=[(f'{foreignKey.tableName}_fk_{foreignKey.id}', f'{foreignKey.tableName}.{foreignKey.fromColumn}', foreignKey.refTableName,
+                                                           foreignKey.toColumn, foreignKey.onUpdate, foreignKey.onDelete, foreignKey.match)
+                                                          for foreignKey in schemaCatalog.getForeignKeys(tableName) + schemaCatalog.getReferences(tableName)])
+                triggersData = ResultSet.fromRows(headers=("Name", "Table", "Description"),
+                                                  rows=[(trigger.name, trigger.tbl_name, trigger.sql) for trigger in schemaCatalog.getTriggers(tableName)])
         except Exception as e:
             logger.error(e, exc_info=True)
             
         if tabName == 'Columns':
             resultPanel = ResultDataGrid(self, data=None)
-            if tableName:
-                rows = db.executeText(f"pragma table_info('{tableName}');")
-                if rows:
-                    rows[-1] = ['INTEGER', 'VARCHAR', 'VARCHAR', 'BOOLEAN', 'VARCHAR', 'BOOLEAN' ]
+            if tableName and schemaCatalog:
+                rows = ResultSet.fromRows(headers=('cid', 'name', 'type', 'notnull', 'dflt_value', 'pk'),
+                                          columnTypes=('INTEGER', 'VARCHAR', 'VARCHAR', 'BOOLEAN', 'VARCHAR', 'BOOLEAN'),
+                                          rows=[(column.sequence, column.name, column.dataType, column.nullable, column.defultValue, column.primaryKey)
+                                                for column in schemaCatalog.getColumns(tableName)])
                 resultPanel.addData(rows)
         elif tabName == 'Indexes':
             resultPanel = ResultDataGrid(self, data=None)
@@ -446,14 +399,12 @@ class CreatingTableInfoToolbarPanel(wx.Panel):
         elif tabName == 'Data':
             toolbar = self.constructTopResultToolBar(tabName=tabName)
             resultPanel = ResultDataGrid(self, data=None)
-            data = None
             if tableName:
-                data = db.executeText(text=f"SELECT * FROM `{tableName}` LIMIT 500;")
-            if data:
-                logger.debug('setResultData count: %s', len(data.keys()))
-#                 self.bottomResultToolbar.SetStatusText("Count: {}".format(str(len(data.keys()))))
-                resultPanel.addData(data)
-                resultPanel.Layout()
+                self.tablePager = TablePager(databaseAbsolutePath=self.dataSourceTreeNode.dataSource.filePath, tableName=tableName)
+                self.changeTracker = ChangeTracker(databaseAbsolutePath=self.dataSourceTreeNode.dataSource.filePath, tableName=tableName)
+                resultPanel.Bind(gridlib.EVT_GRID_LABEL_LEFT_CLICK, self.onSortColumn)
+                resultPanel.cellChangeListener = self.onCellValueChanged
+                self.showTablePage(self.tablePager.firstPage, grid=resultPanel)
         elif tabName == 'References':
             resultPanel = ResultDataGrid(self, data=None)
             resultPanel.addData(referencesData)
@@ -18,6 +18,9 @@ from src.sqlite_executer.ConnectExecuteSqlite import ManageSqliteDatabase, \
 
 from pubsub import pub
 from src.view.importing.importCsvExcel import ImportingCsvExcelFrame
+from src.view.exporting.exportData import exportData
+from src.view.compare.compareDatabase import compareDatabases
+from src.view.advisor.indexAdvisor import adviseIndexes
 from src.view.table.CreateTable import CreateTableFrame
 import datetime
 from src.view.views.console.worksheet.tableInfoPanel import CreatingTableInfoPanel
@@ -26,10 +29,14 @@ from src.view.schema.CreateSchemaViewer import CreateErDiagramFrame
 from src.view.views.database.explorer.GenerateSql import GenerateSqlFrame
 from src.view.views.database.properties.PropertiesPanel import PropertiesFrame
 import itertools
+import threading
 
 logging.config.dictConfig(LOG_SETTINGS)
 logger = logging.getLogger('extensive')
 
+# folders of a table filled on a worker thread when expanded
+LAZY_FOLDER_TYPES = ('folder_column', 'folder_unique_key', 'folder_foreign_key', 'folder_references', 'folder_table_index')
+
 
 class DataSource():
     
@@ -37,9 +44,14 @@ class DataSource():
         self.connectionName = connectionName
         self.filePath = filePath
         self.isConnected = False
+        # incremented on connect and disconnect, stale background loads are dropped
+        self.generation = 0
 
 
 class DataSourceTreeNode():
+    '''
+    children is None until the child nodes of a lazily filled node are loaded.
+    '''
     
     def __init__(self, depth=None, dataSource=None, nodeLabel=None, imageName=None, children=None, sqlType=None, nodeType=None):
         self.depth = depth
@@ -352,9 +364,97 @@ class DatabaseTree(TreeCtrl):
     def _OnItemExpanding(self, evt):
         logger.debug('_OnItemExpanding')
         item = evt.GetItem()
+        dataSourceTreeNode = self.GetItemData(item)
+        if isinstance(dataSourceTreeNode, DataSourceTreeNode) and dataSourceTreeNode.children is None:
+            if dataSourceTreeNode.nodeType == 'table':
+                self.appendTableFolders(item, dataSourceTreeNode)
+            elif dataSourceTreeNode.nodeType in LAZY_FOLDER_TYPES:
+                self.loadFolderChildren(item, dataSourceTreeNode)
 #         self.DoItemExpanding(item)
         evt.Skip()
 
+    def appendTableFolders(self, item, tableTreeNode):
+        '''
+        Folder nodes of a table are added when the table is expanded.
+        '''
+        tableTreeNode.children = list()
+        dataSource = tableTreeNode.dataSource
+        sqlTypeObject = tableTreeNode.sqlType
+        columnCount = len(sqlTypeObject.columns) if sqlTypeObject.columns is not None else 0
+        for nodeType, nodeLabel in (('folder_column', f'Columns ({columnCount})'), ('folder_unique_key', 'Unique Keys'), ('folder_foreign_key', 'Foreign Keys'),
+                                    ('folder_references', 'References'), ('folder_table_index', 'Indexes')):
+            dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=nodeLabel, imageName=f"folder.png", children=None, nodeType=nodeType)
+            dataSourceTreeNode.setSqlType(sqlTypeObject)
+            tableTreeNode.children.append(dataSourceTreeNode)
+            self.appendNode(targetNode=item, nodeLabel=nodeLabel, dataSourceTreeNode=dataSourceTreeNode)
+
+    def loadFolderChildren(self, item, folderTreeNode):
+        '''
+        Schema of the table is read on a worker thread, child nodes are added
+        by onFolderChildrenLoaded on the UI thread.
+        '''
+        folderTreeNode.children = list()
+        self.DeleteChildren(item)
+        loadingNode = DataSourceTreeNode(dataSource=folderTreeNode.dataSource, nodeLabel='Loading...', imageName="folder.png", children=list(), nodeType='loading')
+        self.appendNode(targetNode=item, nodeLabel=loadingNode.nodeLabel, dataSourceTreeNode=loadingNode)
+        dataSource = folderTreeNode.dataSource
+        generation = dataSource.generation
+        tableName = folderTreeNode.sqlType.name
+
+        def run():
+            childNodes = list()
+            try:
+                with ManageSqliteDatabase(connectionName=dataSource.connectionName, databaseAbsolutePath=dataSource.filePath) as manageSqliteDatabase:
+                    schemaCatalog = manageSqliteDatabase.getSchemaCatalog()
+                    childNodes = self.getFolderChildNodes(folderTreeNode, schemaCatalog, tableName)
+            except Exception as e:
+                logger.error(e, exc_info=True)
+            wx.CallAfter(self.onFolderChildrenLoaded, item, folderTreeNode, generation, childNodes)
+
+        threading.Thread(target=run, name=f'DatabaseTree-{tableName}', daemon=True).start()
+
+    def getFolderChildNodes(self, folderTreeNode, schemaCatalog, tableName):
+        '''
+        runs on worker thread, creates only DataSourceTreeNode objects.
+        @return: list of DataSourceTreeNode
+        '''
+        dataSource = folderTreeNode.dataSource
+        sqlTypeObject = schemaCatalog.getSqlType(tableName)
+        childNodes = list()
+        if folderTreeNode.nodeType == 'folder_column':
+            for column in schemaCatalog.getColumns(tableName):
+                childNodes.append(DataSourceTreeNode(dataSource=dataSource, nodeLabel=f'{column.name}', imageName=self.getColumnImageName(column), children=list(), nodeType="column"))
+        elif folderTreeNode.nodeType == 'folder_unique_key':
+            for indexInfo in schemaCatalog.getIndexes(tableName):
+                if str(indexInfo.unique) == '1':
+                    childNodes.append(DataSourceTreeNode(dataSource=dataSource, nodeLabel=f"{indexInfo.name} ({', '.join(str(c) for c in indexInfo.columns)})",
+                                                         imageName="unique_constraint.png", children=list(), nodeType="unique_key"))
+        elif folderTreeNode.nodeType == 'folder_foreign_key':
+            for foreignKey in schemaCatalog.getForeignKeys(tableName):
+                childNodes.append(DataSourceTreeNode(dataSource=dataSource, nodeLabel=f'{foreignKey.fromColumn} -> {foreignKey.refTableName}.{foreignKey.toColumn}',
+                                                     imageName="foreign_key_column.png", children=list(), nodeType="foreign_key"))
+        elif folderTreeNode.nodeType == 'folder_references':
+            for foreignKey in schemaCatalog.getReferences(tableName):
+                childNodes.append(DataSourceTreeNode(dataSource=dataSource, nodeLabel=f'{foreignKey.tableName}.{foreignKey.fromColumn}',
+                                                     imageName="reference.png", children=list(), nodeType="reference"))
+        elif folderTreeNode.nodeType == 'folder_table_index':
+            for indexInfo in schemaCatalog.getIndexes(tableName):
+                childNodes.append(DataSourceTreeNode(dataSource=dataSource, nodeLabel=f'{indexInfo.name}', imageName="index.png", children=list(), nodeType="table_index"))
+        for childNode in childNodes:
+            childNode.setSqlType(sqlTypeObject)
+        return childNodes
+
+    def onFolderChildrenLoaded(self, item, folderTreeNode, generation, childNodes):
+        if not self or folderTreeNode.dataSource.generation != generation:
+            # tree was refreshed or disconnected meanwhile, item is gone
+            return
+        self.DeleteChildren(item)
+        folderTreeNode.children = childNodes
+        for childNode in childNodes:
+            self.appendNode(targetNode=item, nodeLabel=childNode.nodeLabel, dataSourceTreeNode=childNode)
+        if not childNodes:
+            self.SetItemHasChildren(item, False)
+
     def _OnMenu(self, evt):
         logger.debug('_OnMenu')
         try:
@@ -520,6 +620,9 @@ class DatabaseTree(TreeCtrl):
                 self.Bind(wx.EVT_MENU, lambda e:  self.onConnectDatabase(e, nodes), item2)  
                 item1 = menu.Append(ID_DISCONNECT_DB, "Disconnect")
                 self.Bind(wx.EVT_MENU, lambda e: self.onDisconnectDb(e, nodes), item1)
+
+            indexAdvisorItem = menu.Append(wx.ID_ANY, "Index advisor")
+            self.Bind(wx.EVT_MENU, lambda e: self.onIndexAdvisor(e, nodes), indexAdvisorItem)
             
             deleteMenuItem = wx.MenuItem(menu, wx.ID_DELETE, "Delete reference \t Delete")
             delBmp = wx.ArtProvider.GetBitmap(wx.ART_DELETE, wx.ART_MENU, (16, 16))
@@ -746,6 +849,14 @@ class DatabaseTree(TreeCtrl):
         
     def onExport(self, event, nodes):
         logger.debug('onExport')
+        for node in nodes:
+            dataSourceTreeNode = self.GetItemData(node)
+            if dataSourceTreeNode.nodeType != 'table' or not dataSourceTreeNode.sqlType:
+                logger.debug('onExport: select a table to export')
+                continue
+            tableName = dataSourceTreeNode.sqlType.name
+            exportData(parent=self, name=tableName, connectionName=dataSourceTreeNode.dataSource.connectionName,
+                       databaseAbsolutePath=dataSourceTreeNode.dataSource.filePath, tableName=tableName)
 
     def onImport(self, event, nodes):
         logger.debug('onImport')
@@ -759,14 +870,26 @@ class DatabaseTree(TreeCtrl):
         for node in nodes:
             dataSourceTreeNode = self.GetItemData(node)
             logger.debug(dataSourceTreeNode.dataSource.connectionName)
+            dataSourceTreeNode.dataSource.generation += 1
             SQLExecuter().removeConnctionRow(dataSourceTreeNode.dataSource.connectionName)
             self.Delete(node)
 #         self.onRefresh(event, nodes)
 
     def onCompareDatabase(self, event, nodes):
-        logger.debug('onCompareDatabase')   
-#         asf=self.OnCompareItems(nodes[0], nodes[1])
-#         print(asf)
+        '''
+        first selected database is the source, migration script changes the second one into it.
+        '''
+        logger.debug('onCompareDatabase')
+        source, target = [self.GetItemData(node).dataSource for node in nodes[:2]]
+        compareDatabases(parent=self, sourceConnectionName=source.connectionName, sourcePath=source.filePath,
+                         targetConnectionName=target.connectionName, targetPath=target.filePath)
+
+    def onIndexAdvisor(self, event, nodes):
+        logger.debug('onIndexAdvisor')
+        for node in nodes:
+            dataSourceTreeNode = self.GetItemData(node)
+            adviseIndexes(parent=self, connectionName=dataSourceTreeNode.dataSource.connectionName,
+                          databaseAbsolutePath=dataSourceTreeNode.dataSource.filePath)
 
     def onDisconnectDb(self, event, nodes):
         logger.debug('onDisconnectDb')   
@@ -774,6 +897,7 @@ class DatabaseTree(TreeCtrl):
         for node in nodes:
             dataSourceTreeNode = self.GetItemData(node)
             dataSourceTreeNode.dataSource.isConnected = False
+            dataSourceTreeNode.dataSource.generation += 1
             self.SetItemHasChildren(node, self.hasNodeChildren(dataSourceTreeNode))
             self.DeleteChildren(node)
             
@@ -785,12 +909,14 @@ class DatabaseTree(TreeCtrl):
     def onConnectDb(self, event, nodes):
         '''
             this method have been used to expand database navigator tree.
+            Only the object list is loaded, table details are added on expand.
         '''
         logger.debug('onConnectDb')
         for node in nodes:
             itemId = node
             dataSourceTreeNode = self.GetItemData(node)
             dataSourceTreeNode.dataSource.isConnected = True
+            dataSourceTreeNode.dataSource.generation += 1
             self.SetItemHasChildren(itemId, self.hasNodeChildren(dataSourceTreeNode))
             # logic to connect
             self.deleteChildren(itemId)
@@ -810,32 +936,16 @@ class DatabaseTree(TreeCtrl):
                     dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=nodeLabel, imageName=imageName, children=None, nodeType=f'folder_{key}')
                     
                     tableNode = self.appendNode(targetNode=itemId, nodeLabel=dataSourceTreeNode.nodeLabel , dataSourceTreeNode=dataSourceTreeNode)
-                    for sqlTypeObject in groupList:
-                        dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=f'{sqlTypeObject.name}', imageName=f"{sqlTypeObject.type}.png", children=None, nodeType=f"{sqlTypeObject.type}")
-                        dataSourceTreeNode.setSqlType(sqlTypeObject)
-                        child_itemId_1 = self.appendNode(targetNode=tableNode, nodeLabel=f'{sqlTypeObject.name}' , dataSourceTreeNode=dataSourceTreeNode)
-                        if sqlTypeObject.type == 'table':
-                            
-                            dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=nodeLabel, imageName=f"folder.png", children=None, nodeType="folder_column")
-                            dataSourceTreeNode.setSqlType(sqlTypeObject)
-                            child1_1 = self.appendNode(targetNode=child_itemId_1, nodeLabel=f'Columns ({len(sqlTypeObject.columns)})', dataSourceTreeNode=dataSourceTreeNode) 
-                            
-                            dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=nodeLabel, imageName=f"folder.png", children=None, nodeType="folder_unique_key")
-                            dataSourceTreeNode.setSqlType(sqlTypeObject)
-                            child1_2 = self.appendNode(targetNode=child_itemId_1, nodeLabel='Unique Keys', dataSourceTreeNode=dataSourceTreeNode) 
-                            
-                            dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=nodeLabel, imageName=f"folder.png", children=None, nodeType="folder_foreign_key")
-                            dataSourceTreeNode.setSqlType(sqlTypeObject)
-                            child1_3 = self.appendNode(targetNode=child_itemId_1, nodeLabel='Foreign Keys', dataSourceTreeNode=dataSourceTreeNode) 
-                            
-                            dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=nodeLabel, imageName=f"folder.png", children=None, nodeType="folder_references")
+                    self.Freeze()
+                    try:
+                        for sqlTypeObject in groupList:
+                            # tables get their folder nodes in _OnItemExpanding
+                            dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=f'{sqlTypeObject.name}', imageName=f"{sqlTypeObject.type}.png",
+                                                                    children=None if sqlTypeObject.type == 'table' else list(), nodeType=f"{sqlTypeObject.type}")
                             dataSourceTreeNode.setSqlType(sqlTypeObject)
-                            child1_4 = self.appendNode(targetNode=child_itemId_1, nodeLabel='References', dataSourceTreeNode=dataSourceTreeNode) 
-                            for column in sqlTypeObject.columns:
-
-                                dataSourceTreeNode = DataSourceTreeNode(dataSource=dataSource, nodeLabel=f'{column.name}', imageName=self.getColumnImageName(column), children=None, nodeType="column")
-                                dataSourceTreeNode.setSqlType(sqlTypeObject)
-                                child_itemId_1_0 = self.appendNode(targetNode=child1_1, nodeLabel=f'{column.name}' , dataSourceTreeNode=dataSourceTreeNode)
+                            self.appendNode(targetNode=tableNode, nodeLabel=f'{sqlTypeObject.name}' , dataSourceTreeNode=dataSourceTreeNode)
+                    finally:
+                        self.Thaw()
                 
             else:
                 updateStatus = f"Unable to connect '{ dataSourceTreeNode.dataSource.filePath } , No such file. "
@@ -1030,6 +1140,9 @@ class DatabaseTree(TreeCtrl):
         hasChildren = False
         if dataSourceTreeNode.depth == 0 and dataSourceTreeNode.dataSource.isConnected:
             hasChildren = True
+        elif dataSourceTreeNode.nodeType == 'table' or dataSourceTreeNode.nodeType in LAZY_FOLDER_TYPES:
+            # expand button is shown before the children are loaded
+            hasChildren = True
         return hasChildren
 
     def getDataSourceTreeNodeImage(self, dataSourceTreeNode=None):
@@ -116,25 +116,7 @@ class CreateButtonPanel(wx.Panel):
         
     def onApplyCloseClick(self, event):
         logger.debug('onApplyCloseClick')
-        data = self.GetTopLevelParent().createImportingCsvPanel.data
-        tableName = self.GetTopLevelParent().createImportingCsvPanel.tableNameText.GetValue()
-        fileOperations = FileOperations()
-#         data = fileOperations.readCsvFile(filePath=filePath, columnNameFirstRow=True, delimiter=",", quotechar='|')
-#         logger.info(len(data))    
-#         logger.info(data)
-        createTableScript = fileOperations.createTableScript(tableName=tableName, columnHeader=data[0])
-        logger.debug(createTableScript)
-        sqlList = fileOperations.sqlScript(tableName=tableName, data=data)
-        logger.debug(sqlList)
-        connectionName = self.GetTopLevelParent().connectionName
-        importStatus = SQLUtils().importingData(connectionName=connectionName, sqlList=sqlList)
-        dlg = wx.MessageDialog(self, importStatus,
-                       'Importing data status',
-                       wx.OK | wx.ICON_INFORMATION
-                       # wx.YES_NO | wx.NO_DEFAULT | wx.CANCEL | wx.ICON_INFORMATION
-                       )
-        dlg.ShowModal()
-        dlg.Destroy()
+        # properties are applied by the panels, csv import is done by importCsvExcel with BulkImporter
         self.GetTopLevelParent().Destroy()
         
     def onCancelButtonClick(self, event):
@@ -11,13 +11,18 @@ from wx import ListCtrl
 from src.view.constants import ID_COPY_COLUMN_HEADER
 import string
 import  wx.grid as gridlib
-from src.sqlite_executer.ConnectExecuteSqlite import SQLExecuter
+from src.sqlite_executer.ConnectionPool import ConnectionPoolManager
+from src.sqlite_executer.SqlHistoryWriter import SqlHistoryWriter, SQL_LOG_COLUMNS
 import logging.config
 from src.view.constants import LOG_SETTINGS
 
 logging.config.dictConfig(LOG_SETTINGS)
 logger = logging.getLogger('extensive')
 
+HISTORY_PAGE_SIZE = 200
+# rows left below the visible area when the next page is loaded
+HISTORY_PREFETCH_ROWS = 50
+
 
 #---------------------------------------------------------------------------
 class MyCellEditor(gridlib.PyGridCellEditor):
@@ -201,100 +206,149 @@ class MyCellEditor(gridlib.PyGridCellEditor):
         return MyCellEditor()
         
             
-class HistoryGrid(gridlib.Grid):
-    def __init__(self, parent, model=None, data=None):
-        gridlib.Grid.__init__(self, parent, -1)
+class HistoryGridTable(gridlib.GridTableBase):
+    '''
+    Virtual table over sql_log rows, newest first. Only the first page is
+    read up front, older rows are read one page at a time by keyset on
+    (created_time, id).
+    '''
+
+    def __init__(self, pageSize=HISTORY_PAGE_SIZE):
+        gridlib.GridTableBase.__init__(self)
+        self.pageSize = pageSize
+        self.headers = SQL_LOG_COLUMNS
+        self.rows = list()
+        self.hasMore = True
+
+    def readPage(self, before=None):
+        '''
+        @param before: (created_time, id) of last loaded row, None for first page
+        @return: list of rows
+        '''
+        sqlText = 'select id, sql, connection_name, created_time, executed, duration from sql_log'
+        params = list()
+        if before:
+            sqlText += ' where created_time < ? or (created_time = ? and id < ?)'
+            params = [before[0], before[0], before[1]]
+        sqlText += ' order by created_time desc, id desc limit ?'
+        params.append(self.pageSize)
+        databasePath = SqlHistoryWriter.getInstance().databasePath
+        conn = ConnectionPoolManager.lease(databasePath)
+        try:
+            return conn.execute(sqlText, params).fetchall()
+        except Exception as e:
+            logger.error(e, exc_info=True)
+            return list()
+        finally:
+            ConnectionPoolManager.release(databasePath, conn)
+
+    def loadNextPage(self):
+        '''
+        append next older page.
+        @return: number of rows appended
+        '''
+        if not self.hasMore:
+            return 0
+        before = (self.rows[-1][3], self.rows[-1][0]) if self.rows else None
+        rows = self.readPage(before=before)
+        self.hasMore = len(rows) == self.pageSize
+        if rows:
+            self.rows.extend(rows)
+            grid = self.GetView()
+            if grid:
+                grid.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_APPENDED, len(rows)))
+        return len(rows)
+
+    def insertNewRows(self, rows):
+        '''
+        insert rows written after the grid was loaded on top.
+        @param rows: list of rows in SQL_LOG_COLUMNS order, oldest first
+        '''
+        knownIds = set(row[0] for row in self.rows[:len(rows)])
+        rows = [row for row in reversed(rows) if row[0] not in knownIds]
+        if rows:
+            self.rows[0:0] = rows
+            grid = self.GetView()
+            if grid:
+                grid.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_INSERTED, 0, len(rows)))
+
+    def GetNumberRows(self):
+        return len(self.rows)
+
+    def GetNumberCols(self):
+        return len(self.headers)
+
+    def IsEmptyCell(self, row, col):
+        return False
+
+    def GetValue(self, row, col):
+        return str(self.rows[row][col])
+
+    def SetValue(self, row, col, value):
+        pass
+
+    def GetColLabelValue(self, col):
+        return self.headers[col]
 
-        self.CreateGrid(0, 0)
 
-        # Somebody changed the grid so the type registry takes precedence
-        # over the default attribute set for editors and renderers, so we
-        # have to set null handlers for the type registry before the
-        # default editor will get used otherwise...
-        # self.RegisterDataType(wxGRID_VALUE_STRING, None, None)
-        # self.SetDefaultEditor(MyCellEditor())
-
-        # Or we could just do it like this:
-        # self.RegisterDataType(wx.GRID_VALUE_STRING,
-        #                      wx.GridCellStringRenderer(),
-        #                      MyCellEditor())
-        #                       )
-
-        # but for this example, we'll just set the custom editor on one cell
-#         self.SetCellEditor(1, 0, MyCellEditor())
-#         self.SetCellValue(1, 0, "Try to edit this box")
-# 
-#         # and on a column
-#         attr = gridlib.GridCellAttr()
-#         attr.SetEditor(MyCellEditor())
-#         self.SetColAttr(2, attr)
-#         self.SetCellValue(1, 2, "or any in this column")
-# 
-#         self.SetColSize(0, 150)
-#         self.SetColSize(1, 150)
-#         self.SetColSize(2, 150)
-        sqlExecuter = SQLExecuter(database='_opal.sqlite')
-        sqlText='select * from sql_log order by created_time desc;'
-        sqlOutput = sqlExecuter.executeText(sqlText)
-        if sqlOutput:
-            self.addData(data=sqlOutput)
-
-
-
-
-    def addData(self, data=None):
-#         logger.debug(self.GetRowSizes())
-#         logger.debug(self.GetColSizes())
-        self.ClearGrid()
-        logger.debug('rows: %s', self.GetNumberRows())
-        logger.debug('cols: %s', self.GetNumberCols())
-#         self.DeleteRows()
-        currentRows,currentCols = (self.GetNumberRows(), self.GetNumberCols())
-        newRows = len(data) - 1
-        newCols = len(data[0])
-#         self.AppendRows(numRows=len(data)-1, updateLabels=True)   
-#         if len(data) > 0 :
-#             self.AppendCols(numCols=len(data[0]), updateLabels=True)  
-        if newRows < currentRows:
-            # - Delete rows:
-            self.DeleteRows(0, currentRows - newRows, True)
-
-        if newRows > currentRows:
-            # - append currentRows:
-            self.AppendRows(newRows - currentRows)
-            
-            
-        if newCols < currentCols:
-            # - Delete rows:
-            self.DeleteCols(pos=0, numCols=currentCols - newCols, updateLabels=True)
+class HistoryGrid(gridlib.Grid):
+    '''
+    SQL history. New rows come from SqlHistoryWriter, older rows are loaded
+    when scrolled near the end.
+    '''
 
-        if newCols > currentCols:
-            # - append currentRows:
-            self.AppendCols(newCols - currentCols)
-        
+    def __init__(self, parent, model=None, data=None):
+        gridlib.Grid.__init__(self, parent, -1)
+        self.table = HistoryGridTable()
+        self.SetTable(self.table, True)
+        self.EnableEditing(False)
+        self.setColumnSizes()
+        self.table.loadNextPage()
+        self.Bind(wx.EVT_SCROLLWIN, self.onScroll)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.onDestroy)
+        SqlHistoryWriter.getInstance().addListener(self.onHistoryWritten)
+
+    def setColumnSizes(self):
+        columnSizes = {'id': 25, 'sql': 250, 'connection_name': 120}
+        for idx, header in enumerate(self.table.headers):
+            self.SetColSize(idx, columnSizes.get(header, 100))
+
+    def onScroll(self, event):
+        event.Skip()
+        wx.CallAfter(self.loadMoreIfNeeded)
+
+    def loadMoreIfNeeded(self):
+        if not self or not self.table.hasMore:
+            return
+        lastVisibleRow = self.YToRow(self.CalcUnscrolledPosition(0, self.GetGridWindow().GetClientSize()[1])[1])
+        if lastVisibleRow == wx.NOT_FOUND or lastVisibleRow >= self.table.GetNumberRows() - HISTORY_PREFETCH_ROWS:
+            self.table.loadNextPage()
+
+    def onHistoryWritten(self, rows):
+        # called on the writer thread
+        wx.CallAfter(self.addNewRows, rows)
+
+    def addNewRows(self, rows):
+        if self:
+            self.table.insertNewRows(rows)
+
+    def onDestroy(self, event):
+        if event.GetEventObject() is self:
+            SqlHistoryWriter.getInstance().removeListener(self.onHistoryWritten)
+        event.Skip()
+
+    def reload(self):
+        '''
+        drop loaded rows and read the first page again.
+        '''
+        numRows = self.table.GetNumberRows()
+        self.table.rows = list()
+        self.table.hasMore = True
+        if numRows:
+            self.ProcessTableMessage(gridlib.GridTableMessage(self.table, gridlib.GRIDTABLE_NOTIFY_ROWS_DELETED, 0, numRows))
+        self.table.loadNextPage()
+        self.ForceRefresh()
 
-        for dataKey, dataValue in data.items():
-#             logger.error("dataKey: %s dataValue: %s",dataKey, dataValue)
-            for idx, colValue in enumerate(dataValue):
-#                 print(idx, dataValue)
-                if dataKey == 0:
-                    self.SetColLabelValue(idx, str(colValue))
-                    str(colValue)
-                    if str(colValue)== 'id':
-                        self.SetColSize(idx,25)
-                    elif str(colValue)=='sql':
-                        self.SetColSize(idx,250)
-                    elif str(colValue)=='connection_name':
-                        self.SetColSize(idx,120)
-                    elif str(colValue)=='creation_time':
-                        self.SetColSize(idx,100)
-                    elif str(colValue)=='executed':
-                        self.SetColSize(idx,100)
-                    elif str(colValue)=='duration':
-                        self.SetColSize(idx,100)
-                else:
-                    self.SetCellValue(dataKey - 1, idx, str(colValue))
-        self.Refresh()        
 #----------------------------------------------------------------------
 
 # def runTest(frame, nb, log):